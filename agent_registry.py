@@ -12,6 +12,15 @@ FEATURES:
 - Verification of agent authenticity
 - Public API for querying agent info
 
+INDEXES:
+- Capability / AgentType / owner -> agent ids (inverted indexes)
+- Reputation index: score (0-100) -> jobs completed -> agent ids, kept
+  current by update_reputation(); tiers are score ranges over it
+- Verified and deactivated agent sets
+Queries intersect the predicate sets (smallest first), count matches per
+score bucket, and walk the reputation index from the top until they have
+k agents, so a top-k never sorts the whole registry.
+
 ANALOGY:
 - Like a professional license + LinkedIn profile for AI agents
 - Any platform can verify an agent's credentials
@@ -19,7 +28,9 @@ ANALOGY:
 """
 
 import hashlib
+import heapq
 import json
+import math
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Any, Optional, Set
 from dataclasses import dataclass, field, asdict
@@ -103,6 +114,17 @@ TIER_THRESHOLDS = {
     ReputationTier.DIAMOND: (95, 100)
 }
 
+# Score 0 is only reachable with no completed jobs (any completed job scores
+# 3+), so every tier is a score range over the reputation buckets
+TIER_SCORES = {
+    ReputationTier.UNVERIFIED: range(0, 1),
+    ReputationTier.BRONZE: range(1, 50),
+    ReputationTier.SILVER: range(50, 70),
+    ReputationTier.GOLD: range(70, 85),
+    ReputationTier.PLATINUM: range(85, 95),
+    ReputationTier.DIAMOND: range(95, 101)
+}
+
 TIER_BADGES = {
     ReputationTier.UNVERIFIED: "⚪",
     ReputationTier.BRONZE: "🥉",
@@ -117,7 +139,7 @@ TIER_BADGES = {
 # AGENT DATA STRUCTURES
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class AgentReputation:
     """Agent's reputation metrics"""
     score: int = 0  # 0-100
@@ -168,7 +190,7 @@ class AgentReputation:
         self.update_tier()
 
 
-@dataclass
+@dataclass(slots=True)
 class RegisteredAgent:
     """A registered agent in the protocol"""
     agent_id: str
@@ -225,6 +247,17 @@ class RegisteredAgent:
 # AGENT REGISTRY
 # ============================================================
 
+def _parse_enums(enum_cls, values: Optional[List[str]]) -> list:
+    """Enum members for the given strings, skipping unknown ones"""
+    parsed = []
+    for value in values or ():
+        try:
+            parsed.append(enum_cls(value.lower()))
+        except ValueError:
+            pass
+    return parsed
+
+
 class AgentRegistry:
     """
     The central registry for all AI agents
@@ -241,6 +274,12 @@ class AgentRegistry:
         self._agents_by_capability: Dict[Capability, Set[str]] = {cap: set() for cap in Capability}
         self._agents_by_type: Dict[AgentType, Set[str]] = {t: set() for t in AgentType}
         self._reserved_names: Set[str] = set()
+        # score -> jobs_completed -> {agent_id: registration seq}
+        self._agents_by_score: List[Dict[int, Dict[str, int]]] = [{} for _ in range(101)]
+        self._score_counts: List[int] = [0] * 101
+        self._verified: Set[str] = set()
+        self._inactive: Set[str] = set()
+        self._registered = 0
     
     def register(
         self,
@@ -327,6 +366,10 @@ class AgentRegistry:
         # Index by type
         self._agents_by_type[agent_type_enum].add(agent_id)
         
+        # Index by reputation
+        self._index_reputation(agent_id, agent.reputation, self._registered)
+        self._registered += 1
+        
         return {
             "ok": True,
             "agent_id": agent_id,
@@ -337,6 +380,19 @@ class AgentRegistry:
             "message": "Agent registered. Stake 100+ AIGx and complete 5 jobs to verify."
         }
     
+    def _index_reputation(self, agent_id: str, rep: AgentReputation, seq: int):
+        self._agents_by_score[rep.score].setdefault(rep.jobs_completed, {})[agent_id] = seq
+        self._score_counts[rep.score] += 1
+    
+    def _unindex_reputation(self, agent_id: str, score: int, jobs_completed: int) -> int:
+        cells = self._agents_by_score[score]
+        cell = cells[jobs_completed]
+        seq = cell.pop(agent_id)
+        if not cell:
+            del cells[jobs_completed]
+        self._score_counts[score] -= 1
+        return seq
+    
     def get_agent(self, agent_id: str) -> Optional[RegisteredAgent]:
         """Get agent by ID"""
         return self._agents.get(agent_id)
@@ -360,49 +416,136 @@ class AgentRegistry:
         """
         Search for agents by criteria
         """
-        # Start with all agents
-        candidates = set(self._agents.keys())
+        result = self.query_agents(
+            capabilities=[capability] if capability else None,
+            agent_types=[agent_type] if agent_type else None,
+            min_reputation=min_reputation,
+            verified_only=verified_only,
+            active_only=active_only,
+            limit=limit
+        )
         
-        # Filter by capability
-        if capability:
-            try:
-                cap_enum = Capability(capability.lower())
-                candidates &= self._agents_by_capability.get(cap_enum, set())
-            except ValueError:
-                pass
+        return {
+            "ok": True,
+            "count": len(result["agents"]),
+            "total_matching": result["total_matching"],
+            "agents": result["agents"]
+        }
+    
+    def _top(self, limit: int, **filters) -> tuple:
+        """
+        Top agents by (score, jobs completed, earliest registration)
         
-        # Filter by type
-        if agent_type:
-            try:
-                type_enum = AgentType(agent_type.lower())
-                candidates &= self._agents_by_type.get(type_enum, set())
-            except ValueError:
-                pass
-        
-        # Apply other filters
-        results = []
-        for agent_id in candidates:
-            agent = self._agents[agent_id]
-            
-            if active_only and not agent.is_active:
-                continue
-            
-            if verified_only and not agent.is_verified:
-                continue
-            
-            if agent.reputation.score < min_reputation:
+        Returns (agents, total_matching). Capability filters are ANDed,
+        agent types and tiers ORed; unknown values are ignored.
+        """
+        capabilities = _parse_enums(Capability, filters.get("capabilities"))
+        agent_types = _parse_enums(AgentType, filters.get("agent_types"))
+        tiers = _parse_enums(ReputationTier, filters.get("tiers"))
+        owner_id = filters.get("owner_id")
+        active_only = filters.get("active_only", True)
+        
+        lo = max(0, math.ceil(filters.get("min_reputation") or 0))
+        hi = min(100, int(filters.get("max_reputation", 100)))
+        scores = range(lo, hi + 1)
+        if tiers:
+            allowed = set().union(*(TIER_SCORES[t] for t in tiers))
+            scores = [score for score in scores if score in allowed]
+        
+        index_sets = [self._agents_by_capability[c] for c in capabilities]
+        if owner_id is not None:
+            index_sets.append(set(self._agents_by_owner.get(owner_id, ())))
+        if filters.get("verified_only"):
+            index_sets.append(self._verified)
+        type_sets = [self._agents_by_type[t] for t in agent_types]
+        inactive = self._inactive if active_only else set()
+        
+        # AND the predicate sets (smallest first), then OR over the types
+        candidates = None
+        if index_sets:
+            index_sets.sort(key=len)
+            candidates = index_sets[0].intersection(*index_sets[1:])
+            if type_sets:
+                candidates = set().union(*(candidates & t for t in type_sets))
+        elif type_sets:
+            candidates = type_sets[0] if len(type_sets) == 1 else set().union(*type_sets)
+        
+        # Count matches (set ops per score bucket, no per-agent work)
+        if candidates is None:
+            total = sum(self._score_counts[score] for score in scores)
+            excluded = inactive
+        elif len(scores) == 101:
+            total = len(candidates)
+            excluded = candidates & inactive
+        else:
+            total = sum(
+                len(cell.keys() & candidates)
+                for score in scores
+                for cell in self._agents_by_score[score].values()
+            )
+            excluded = candidates & inactive
+        if excluded:
+            score_ok = set(scores)
+            total -= sum(1 for agent_id in excluded if self._agents[agent_id].reputation.score in score_ok)
+        
+        # Walk the reputation index from the top until we have `limit` agents
+        top: List[RegisteredAgent] = []
+        for score in reversed(scores):
+            if len(top) >= limit:
+                break
+            if not self._score_counts[score]:
                 continue
-            
-            results.append(agent.to_public_dict())
-        
-        # Sort by reputation score
-        results.sort(key=lambda x: x["reputation"]["score"], reverse=True)
+            cells = self._agents_by_score[score]
+            for jobs in sorted(cells, reverse=True):
+                cell = cells[jobs]
+                hits = cell.keys() & candidates if candidates is not None else cell.keys()
+                ranked = heapq.nsmallest(
+                    limit - len(top),
+                    ((cell[agent_id], agent_id) for agent_id in hits if agent_id not in inactive)
+                )
+                top.extend(self._agents[agent_id] for _, agent_id in ranked)
+                if len(top) >= limit:
+                    break
+        return top, total
+    
+    def query_agents(
+        self,
+        capabilities: List[str] = None,
+        agent_types: List[str] = None,
+        tiers: List[str] = None,
+        min_reputation: int = 0,
+        max_reputation: int = 100,
+        owner_id: str = None,
+        verified_only: bool = False,
+        active_only: bool = True,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Top-k agents matching every given predicate, best reputation first
         
+        Args:
+            capabilities: Agent must have ALL of these
+            agent_types: Agent is ANY of these types
+            tiers: Agent is in ANY of these reputation tiers
+            min_reputation / max_reputation: Score range (inclusive)
+            owner_id: Only this owner's agents
+        """
+        agents, total = self._top(
+            max(0, limit),
+            capabilities=capabilities,
+            agent_types=agent_types,
+            tiers=tiers,
+            min_reputation=min_reputation,
+            max_reputation=max_reputation,
+            owner_id=owner_id,
+            verified_only=verified_only,
+            active_only=active_only
+        )
         return {
             "ok": True,
-            "count": len(results[:limit]),
-            "total_matching": len(results),
-            "agents": results[:limit]
+            "count": len(agents),
+            "total_matching": total,
+            "agents": [agent.to_public_dict() for agent in agents]
         }
     
     def update_reputation(
@@ -423,6 +566,7 @@ class AgentRegistry:
         
         rep = agent.reputation
         now = datetime.now(timezone.utc).isoformat()
+        old_score, old_jobs = rep.score, rep.jobs_completed
         
         # Update job counts
         if job_completed:
@@ -455,11 +599,15 @@ class AgentRegistry:
         
         # Recalculate score and tier
         rep.calculate_score()
+        if (rep.score, rep.jobs_completed) != (old_score, old_jobs):
+            seq = self._unindex_reputation(agent_id, old_score, old_jobs)
+            self._index_reputation(agent_id, rep, seq)
         
         # Check for verification eligibility
         if not agent.is_verified and rep.jobs_completed >= 5 and agent.stake_aigx >= 100:
             agent.is_verified = True
             rep.badges.append("verified")
+            self._verified.add(agent_id)
         
         # Update active timestamp
         agent.last_active_at = now
@@ -487,6 +635,7 @@ class AgentRegistry:
         if not agent.is_verified and agent.reputation.jobs_completed >= 5 and new_stake >= 100:
             agent.is_verified = True
             agent.reputation.badges.append("verified")
+            self._verified.add(agent_id)
         
         return {
             "ok": True,
@@ -506,6 +655,7 @@ class AgentRegistry:
             return {"ok": False, "error": "not_owner"}
         
         agent.is_active = False
+        self._inactive.add(agent_id)
         
         return {"ok": True, "agent_id": agent_id, "status": "deactivated"}
     
@@ -523,11 +673,10 @@ class AgentRegistry:
     
     def get_leaderboard(self, limit: int = 20) -> Dict:
         """Get top agents by reputation"""
-        agents = list(self._agents.values())
-        agents.sort(key=lambda a: (a.reputation.score, a.reputation.jobs_completed), reverse=True)
+        agents, _ = self._top(max(0, limit), active_only=False)
         
         leaderboard = []
-        for rank, agent in enumerate(agents[:limit], 1):
+        for rank, agent in enumerate(agents, 1):
             leaderboard.append({
                 "rank": rank,
                 "agent_id": agent.agent_id,
@@ -548,8 +697,8 @@ class AgentRegistry:
     
     def get_stats(self) -> Dict:
         """Get registry statistics"""
-        active_agents = len([a for a in self._agents.values() if a.is_active])
-        verified_agents = len([a for a in self._agents.values() if a.is_verified])
+        active_agents = len(self._agents) - len(self._inactive)
+        verified_agents = len(self._verified)
         
         # Capability distribution
         capability_counts = {
@@ -564,9 +713,10 @@ class AgentRegistry:
         }
         
         # Tier distribution
-        tier_counts = {tier.value: 0 for tier in ReputationTier}
-        for agent in self._agents.values():
-            tier_counts[agent.reputation.tier.value] += 1
+        tier_counts = {
+            tier.value: sum(self._score_counts[score] for score in scores)
+            for tier, scores in TIER_SCORES.items()
+        }
         
         return {
             "ok": True,
@@ -11,13 +11,114 @@ Handles:
 """
 
 import os
-from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Tuple
+import threading
+from datetime import date, datetime, timezone, timedelta
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime, timezone
 
 from aigx_config import AIGX_CONFIG
 from log_to_jsonbin import get_user, list_users
-from log_to_jsonbin_merged import log_agent_update, append_intent_ledger
+from log_to_jsonbin_merged import log_agent_update, log_agent_updates, append_intent_ledger
+
+ACTIVE_DAYS_KEPT = 365  # activeDays history kept on the user record
+
+# ============================================================
+# ACTIVITY INDEX
+# ============================================================
+
+class ActivityIndex:
+    """
+    In-process view of who was active when.
+    
+    Each user's active days are a bitset (a Python int; bit n is day
+    ordinal base + n) covering the last ACTIVE_DAYS_KEPT days, and the
+    users active on each recent day are collected as activity is recorded,
+    so the daily job never scans every user to find today's actives.
+    """
+    
+    def __init__(self):
+        self._days: Dict[str, Tuple[int, int]] = {}  # username -> (base ordinal, bits)
+        self._active_on: Dict[int, Set[str]] = {}    # day ordinal -> usernames
+        self._complete_from = datetime.now(timezone.utc).date().toordinal() + 1
+        self._lock = threading.Lock()
+    
+    def load(self, username: str, active_days: List[str]) -> None:
+        """Seed a user's bitset from their stored activeDays (once per process)"""
+        if username in self._days:
+            return
+        ordinals = []
+        for d in active_days:
+            try:
+                ordinals.append(date.fromisoformat(d).toordinal())
+            except (TypeError, ValueError):
+                continue
+        bits = 0
+        base = min(ordinals) if ordinals else 0
+        for o in ordinals:
+            bits |= 1 << (o - base)
+        with self._lock:
+            self._days.setdefault(username, (base, bits))
+    
+    def mark(self, username: str, day: int) -> bool:
+        """Record activity on a day ordinal; True if it wasn't set yet"""
+        with self._lock:
+            base, bits = self._days.get(username, (day, 0))
+            if not bits:
+                base = day
+            if day < base:
+                bits, base = bits << (base - day), day
+            offset = day - base
+            # Drop days that fell out of the kept window
+            overflow = offset - ACTIVE_DAYS_KEPT
+            if overflow > 0:
+                bits >>= overflow
+                base += overflow
+                offset -= overflow
+            new = not (bits >> offset) & 1
+            self._days[username] = (base, bits | (1 << offset))
+            self._active_on.setdefault(day, set()).add(username)
+            for old in [d for d in self._active_on if d < day - 1]:
+                del self._active_on[old]
+            return new
+    
+    def is_active(self, username: str, day: int) -> bool:
+        base, bits = self._days.get(username, (0, 0))
+        return day >= base and bool((bits >> (day - base)) & 1)
+    
+    def streak(self, username: str, day: int) -> int:
+        """Consecutive active days ending on day (0 if not active that day)"""
+        base, bits = self._days.get(username, (0, 0))
+        if day < base:
+            return 0
+        offset = day - base
+        window = (1 << (offset + 1)) - 1
+        gaps = ~bits & window
+        return offset + 1 - gaps.bit_length()
+    
+    def active_on(self, day: int) -> Optional[Set[str]]:
+        """Users active on a day, or None if this process didn't see the whole day"""
+        if day < self._complete_from:
+            return None
+        return set(self._active_on.get(day, ()))
+    
+    def mark_complete(self, day: int) -> None:
+        """The day's active set was rebuilt from stored records"""
+        self._complete_from = min(self._complete_from, day)
+    
+    def get_stats(self) -> Dict:
+        return {
+            "users_indexed": len(self._days),
+            "active_days_tracked": {date.fromordinal(d).isoformat(): len(u) for d, u in self._active_on.items()},
+            "complete_from": date.fromordinal(self._complete_from).isoformat()
+        }
+
+
+_activity_index = ActivityIndex()
+
+
+def get_activity_index() -> ActivityIndex:
+    return _activity_index
+
 
 # ============================================================
 # ACTIVITY TRACKING
@@ -44,8 +145,20 @@ def record_activity(username: str, activity_type: str = "login") -> Dict:
     if not user:
         return {"ok": False, "error": "User not found"}
     
-    now = datetime.now(timezone.utc)
+    result = _apply_activity(user, activity_type)
+    log_agent_update(user)
+    return result
+
+
+def _apply_activity(user: Dict, activity_type: str, now: datetime = None) -> Dict:
+    """
+    Update a user record's activity tracking and award due rewards in place
+    (no I/O; callers persist the record).
+    """
+    now = now or datetime.now(timezone.utc)
     today_str = now.strftime("%Y-%m-%d")
+    today = now.date().toordinal()
+    username = user.get("username")
     
     # Initialize activity tracking if needed
     if "activityTracking" not in user:
@@ -93,14 +206,29 @@ def record_activity(username: str, activity_type: str = "login") -> Dict:
     # ============================================================
     
     active_days = tracking.get("activeDays", [])
+    index = get_activity_index()
+    index.load(username, active_days)
+    index.mark(username, today)
     
-    # Add today if not already tracked
-    if today_str not in active_days:
+    # Add today if not already tracked (days are appended in order, so
+    # today can only be the last entry)
+    if active_days[-1:] != [today_str]:
         active_days.append(today_str)
         tracking["totalActiveDays"] = len(active_days)
     
-    # Calculate current streak
-    streak = _calculate_streak(active_days)
+    # Extend the streak from the last day it was counted; records from
+    # before streakDay was tracked are counted once from the index bitset
+    # (seeded from activeDays above)
+    streak_day = tracking.get("streakDay")
+    if streak_day == today_str:
+        streak = tracking.get("currentStreak", 0) or 1
+    elif streak_day == (now - timedelta(days=1)).strftime("%Y-%m-%d"):
+        streak = tracking.get("currentStreak", 0) + 1
+    elif streak_day:
+        streak = 1
+    else:
+        streak = index.streak(username, today)
+    tracking["streakDay"] = today_str
     tracking["currentStreak"] = streak
     tracking["longestStreak"] = max(tracking.get("longestStreak", 0), streak)
     
@@ -161,11 +289,9 @@ def record_activity(username: str, activity_type: str = "login") -> Dict:
     # ============================================================
     
     tracking["lastActive"] = now.isoformat()
-    tracking["activeDays"] = active_days[-365:]  # Keep last year only
+    tracking["activeDays"] = active_days[-ACTIVE_DAYS_KEPT:]  # Keep last year only
     user["activityTracking"] = tracking
     
-    log_agent_update(user)
-    
     return {
         "ok": True,
         "rewards_earned": rewards_earned,
@@ -178,41 +304,6 @@ def record_activity(username: str, activity_type: str = "login") -> Dict:
     }
 
 
-def _calculate_streak(active_days: List[str]) -> int:
-    """
-    Calculate current consecutive day streak.
-    
-    Args:
-        active_days: List of date strings in YYYY-MM-DD format
-        
-    Returns:
-        int: Number of consecutive days
-    """
-    if not active_days:
-        return 0
-    
-    # Sort dates
-    sorted_dates = sorted([datetime.strptime(d, "%Y-%m-%d") for d in active_days])
-    
-    # Start from most recent date
-    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-    streak = 0
-    
-    # Check backwards from today
-    check_date = today
-    for date in reversed(sorted_dates):
-        date_normalized = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        if date_normalized == check_date:
-            streak += 1
-            check_date -= timedelta(days=1)
-        elif date_normalized < check_date:
-            # Gap found, streak broken
-            break
-    
-    return streak
-
-
 # ============================================================
 # REFERRAL REWARDS
 # ============================================================
@@ -430,30 +521,46 @@ def process_all_active_users() -> Dict:
     Process activity rewards for all users who were active today.
     This should be run as a daily cron job.
     
+    Only today's active users (collected by the activity index as activity
+    arrives) are processed, and their updated records are written back in
+    one batch. If this process hasn't seen all of today's activity (e.g. it
+    restarted), today's set is rebuilt once from the stored activeDays.
+    
     Returns:
         dict: Processing summary
     """
-    from log_to_jsonbin import list_users
-    
-    all_users = list_users()
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    now = datetime.now(timezone.utc)
+    today = now.strftime("%Y-%m-%d")
+    day = now.date().toordinal()
+    index = get_activity_index()
+    
+    active = index.active_on(day)
+    all_users = list_users() if active is None or active else []
+    if active is None:
+        for user in all_users:
+            index.load(user.get("username"), user.get("activityTracking", {}).get("activeDays", []))
+        active = {u.get("username") for u in all_users if index.is_active(u.get("username"), day)}
+        index.mark_complete(day)
     
     processed = 0
     rewarded = 0
     total_aigx_distributed = 0.0
+    touched = []
     
     for user in all_users:
-        tracking = user.get("activityTracking", {})
-        active_days = tracking.get("activeDays", [])
+        if user.get("username") not in active:
+            continue
         
-        # Check if user was active today
-        if today in active_days:
-            result = record_activity(user["username"], activity_type="daily_check")
-            processed += 1
-            
-            if result.get("ok") and result.get("total_aigx", 0) > 0:
-                rewarded += 1
-                total_aigx_distributed += result["total_aigx"]
+        result = _apply_activity(user, activity_type="daily_check", now=now)
+        processed += 1
+        touched.append(user)
+        
+        if result.get("ok") and result.get("total_aigx", 0) > 0:
+            rewarded += 1
+            total_aigx_distributed += result["total_aigx"]
+    
+    if touched:
+        log_agent_updates(touched)
     
     return {
         "ok": True,
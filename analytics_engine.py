@@ -2,9 +2,17 @@
 AiGentsy Financial Analytics Dashboard
 Revenue tracking, forecasting, and performance metrics
 """
+import time as _time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
 
+# Try numpy for the columnar ledger store, fallback to per-entry loops
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 def _now():
     return datetime.now(timezone.utc).isoformat()
 
@@ -16,6 +24,458 @@ def _days_ago(ts_iso: str) -> int:
         return 9999
 
 
+_NAN = float("nan")
+
+
+def _epoch(ts_iso: Any) -> float:
+    """Epoch seconds of an ISO timestamp; NaN where _days_ago() would give 9999"""
+    try:
+        then = datetime.fromisoformat(ts_iso.replace("Z", "+00:00"))
+        if then.tzinfo is None:
+            return _NAN  # naive timestamps can't be compared with now(timezone.utc)
+        return then.timestamp()
+    except:
+        return _NAN
+
+
+def _num(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _fingerprint(entry: Any) -> Any:
+    """Identity of the last ingested ledger entry / intent (lists are re-fetched every request)"""
+    if isinstance(entry, dict):
+        return (entry.get("ts"), entry.get("created_at"), entry.get("amount"), entry.get("basis"), entry.get("id"))
+    return repr(entry)
+
+
+# ============ COLUMNAR LEDGER STORE ============
+
+_SCORE_TIERS = ((85, "expert"), (70, "proficient"), (50, "competent"), (30, "developing"))
+_REVENUE_TIERS = ((5000, "high"), (1000, "medium"))
+
+
+class _Table:
+    """Growable typed columns plus an alive mask (rows of re-ingested users are tombstoned)"""
+
+    def __init__(self, **dtypes):
+        self.dtypes = dtypes
+        self.cols = {name: np.empty(1024, dtype) for name, dtype in dtypes.items()}
+        self.alive = np.empty(1024, dtype=bool)
+        self.n = 0
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return self.n - self.dead
+
+    def col(self, name: str):
+        return self.cols[name][:self.n]
+
+    def append(self, rows: Dict[str, list]):
+        k = len(next(iter(rows.values())))
+        if not k:
+            return
+        need = self.n + k
+        if need > len(self.alive):
+            cap = max(need, 2 * len(self.alive))
+            for name, arr in self.cols.items():
+                grown = np.empty(cap, dtype=arr.dtype)
+                grown[:self.n] = arr[:self.n]
+                self.cols[name] = grown
+            grown = np.empty(cap, dtype=bool)
+            grown[:self.n] = self.alive[:self.n]
+            self.alive = grown
+        for name, values in rows.items():
+            self.cols[name][self.n:need] = values
+        self.alive[self.n:need] = True
+        self.n = need
+
+    def drop_users(self, codes: List[int]):
+        if not codes or not self.n:
+            return
+        hit = np.isin(self.col("user"), codes) & self.alive[:self.n]
+        self.dead += int(hit.sum())
+        self.alive[:self.n][hit] = False
+
+    def compact(self) -> bool:
+        if self.dead * 2 < self.n:
+            return False
+        keep = self.alive[:self.n]
+        for name in self.cols:
+            self.cols[name] = self.cols[name][:self.n][keep].copy()
+        self.n = len(self.cols["user"])
+        self.alive = np.ones(self.n, dtype=bool)
+        self.dead = 0
+        return True
+
+
+class LedgerStore:
+    """
+    Columnar projection of every user's ownership.ledger and intents.
+
+    Ledger rows hold user, ts (epoch), basis, amount and currency as typed
+    columns (basis/currency dictionary-encoded); intent rows hold user and
+    created_at. sync(users) only parses entries appended since the last
+    sync - a user whose ledger was rewritten (shorter, or the last seen
+    entry changed) has their rows dropped and re-ingested - and refreshes
+    the per-user balance/score columns. The metrics below are masked
+    group-bys over those columns.
+    """
+
+    def __init__(self):
+        self.user_codes: Dict[str, int] = {}
+        self.user_keys: List[str] = []
+        self.basis_codes: Dict[Any, int] = {}
+        self.currency_codes: Dict[Any, int] = {}
+        self.currencies: List[Any] = []
+        self.ledger = _Table(user=np.int32, ts=np.float64, basis=np.int32, amount=np.float64, currency=np.int32)
+        self.intents = _Table(user=np.int32, ts=np.float64)
+        self._ledger_seen: Dict[int, tuple] = {}   # user code -> (entries ingested, last entry fingerprint)
+        self._intents_seen: Dict[int, tuple] = {}
+        self._signup_months: Dict[Any, str] = {}
+        self._name_codes: Dict[Any, int] = {}       # raw username -> code (users sharing one count once)
+
+        # Per-user columns from the last sync (indexed by user code)
+        self.order = np.zeros(0, dtype=np.int32)    # user codes in users-list order
+        self.present = np.zeros(0, dtype=bool)
+        self.name_group = np.zeros(0, dtype=np.int32)
+        self._absent_users = False                  # users with rows missing from the last sync
+        self.users: Dict[str, Any] = {}
+        self.signup_raw: List[Any] = []
+        self.agent_names: List[Any] = []
+
+        self.stats = {"syncs": 0, "ledger_rows_ingested": 0, "intent_rows_ingested": 0,
+                      "users_reingested": 0, "compactions": 0, "last_sync_ms": 0.0}
+
+    @staticmethod
+    def _code(codes: Dict[Any, int], value: Any, values: Optional[list] = None) -> int:
+        try:
+            code = codes.get(value)
+        except TypeError:
+            value = str(value)
+            code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            if values is not None:
+                values.append(value)
+        return code
+
+    def _user_code(self, key: str) -> int:
+        code = self.user_codes.get(key)
+        if code is None:
+            code = self.user_codes[key] = len(self.user_keys)
+            self.user_keys.append(key)
+        return code
+
+    def _tail(self, seen: Dict[int, tuple], code: int, items: list, dropped: List[int]) -> int:
+        """Index of the first not-yet-ingested item (0 + drop if the list was rewritten)"""
+        prev = seen.get(code)
+        if prev is None:
+            return 0
+        count, fp = prev
+        if len(items) >= count and (count == 0 or _fingerprint(items[count - 1]) == fp):
+            return count
+        dropped.append(code)
+        return 0
+
+    def sync(self, users: List[Dict[str, Any]]) -> "LedgerStore":
+        """Ingest new ledger entries / intents and refresh per-user columns"""
+        start = _time.perf_counter()
+        ledger_rows = {"user": [], "ts": [], "basis": [], "amount": [], "currency": []}
+        intent_rows = {"user": [], "ts": []}
+        drop_ledger: List[int] = []
+        drop_intents: List[int] = []
+        order = []
+        scalars = {"ocl_limit": [], "ocl_outstanding": [], "aigx": [], "usd": [], "outcome_score": [], "active": []}
+        signup, agent_names, names, taken = {}, {}, [], set()
+
+        l_user, l_ts, l_basis, l_amount, l_cur = (ledger_rows[k] for k in ("user", "ts", "basis", "amount", "currency"))
+        basis_codes, currency_codes = self.basis_codes, self.currency_codes
+
+        for idx, user in enumerate(users):
+            name = user.get("username")
+            key = name if isinstance(name, str) and name not in taken else f"\x00{idx}"
+            taken.add(key)
+            code = self._user_code(key)
+            order.append(code)
+            names.append(self._code(self._name_codes, name))
+
+            ownership = user.get("ownership") or {}
+            ocl = user.get("ocl") or {}
+            ledger = ownership.get("ledger") or []
+            intents = user.get("intents") or []
+            scalars["ocl_limit"].append(_num(ocl.get("limit", 0)))
+            scalars["ocl_outstanding"].append(_num(ocl.get("outstanding", 0)))
+            scalars["aigx"].append(_num(ownership.get("aigx", 0)))
+            scalars["usd"].append(_num(ownership.get("usd", 0)))
+            scalars["outcome_score"].append(int(_num(user.get("outcomeScore", 0))))
+            scalars["active"].append(bool(intents or ledger))
+            signup[code] = (user.get("consent") or {}).get("timestamp") or user.get("created_at", "")
+            agent_names[code] = (user.get("consent") or {}).get("username") or name
+
+            first = self._tail(self._ledger_seen, code, ledger, drop_ledger)
+            if first < len(ledger):
+                for entry in ledger[first:]:
+                    l_user.append(code)
+                    l_ts.append(_epoch(entry.get("ts", "")))
+                    basis = entry.get("basis", "")
+                    l_basis.append(basis_codes[basis] if basis in basis_codes else self._code(basis_codes, basis))
+                    l_amount.append(_num(entry.get("amount", 0)))
+                    currency = entry.get("currency", "USD")
+                    l_cur.append(currency_codes[currency] if currency in currency_codes
+                                 else self._code(currency_codes, currency, self.currencies))
+                self._ledger_seen[code] = (len(ledger), _fingerprint(ledger[-1]))
+            elif not ledger:
+                self._ledger_seen[code] = (0, None)
+
+            first = self._tail(self._intents_seen, code, intents, drop_intents)
+            if first < len(intents):
+                for intent in intents[first:]:
+                    intent_rows["user"].append(code)
+                    intent_rows["ts"].append(_epoch(intent.get("created_at", "")))
+                self._intents_seen[code] = (len(intents), _fingerprint(intents[-1]))
+            elif not intents:
+                self._intents_seen[code] = (0, None)
+
+        # Drop rewritten users' old rows before appending their fresh ones
+        self.ledger.drop_users(drop_ledger)
+        self.intents.drop_users(drop_intents)
+        self.ledger.append(ledger_rows)
+        self.intents.append(intent_rows)
+        for table in (self.ledger, self.intents):
+            if table.compact():
+                self.stats["compactions"] += 1
+
+        n_users = len(self.user_keys)
+        self.order = np.asarray(order, dtype=np.int32)
+        self.present = np.zeros(n_users, dtype=bool)
+        self.present[self.order] = True
+        self.name_group = np.zeros(n_users, dtype=np.int32)
+        self.name_group[self.order] = names
+        self._absent_users = not self.present.all()
+        self.users = {}
+        for name, values in scalars.items():
+            column = np.zeros(n_users, dtype=bool if name == "active" else np.int64 if name == "outcome_score" else np.float64)
+            column[self.order] = values
+            self.users[name] = column
+        self.signup_raw = [None] * n_users
+        self.agent_names = [None] * n_users
+        for code, raw in signup.items():
+            self.signup_raw[code] = raw
+            self.agent_names[code] = agent_names[code]
+
+        self.stats["syncs"] += 1
+        self.stats["ledger_rows_ingested"] += len(l_user)
+        self.stats["intent_rows_ingested"] += len(intent_rows["user"])
+        self.stats["users_reingested"] += len(set(drop_ledger) | set(drop_intents))
+        self.stats["last_sync_ms"] = round((_time.perf_counter() - start) * 1000, 2)
+        return self
+
+    # ---------- masks / group-bys ----------
+
+    def _window(self, table: _Table, period_days: int):
+        """Rows of present users with _days_ago(ts) <= period_days"""
+        ts = table.col("ts")
+        mask = ts > _time.time() - (period_days + 1) * 86400
+        if period_days >= 9999:
+            mask |= np.isnan(ts)  # unparseable timestamps count as 9999 days old
+        if table.dead:
+            mask &= table.alive[:table.n]
+        if self._absent_users:
+            mask &= self.present[table.col("user")]
+        return mask
+
+    def _distinct_names(self, user_codes) -> int:
+        return int(np.count_nonzero(np.bincount(self.name_group[user_codes], minlength=len(self._name_codes))))
+
+    def _basis(self, mask, basis: str):
+        code = self.basis_codes.get(basis, -1)
+        return mask & (self.ledger.col("basis") == code)
+
+    def _per_user(self, mask, weights=None):
+        return np.bincount(self.ledger.col("user")[mask], weights=None if weights is None else weights[mask],
+                           minlength=len(self.user_keys))
+
+    def revenue_metrics(self, period_days: int = 30) -> Dict[str, Any]:
+        window = self._window(self.ledger, period_days)
+        amount = self.ledger.col("amount")
+        revenue = self._basis(window, "revenue") & (amount > 0)
+        fees = self._basis(window, "platform_fee")
+
+        total_revenue = float(amount[revenue].sum())
+        total_fees = float(np.abs(amount[fees]).sum())
+        completed_orders = int(revenue.sum())
+        active_agents = self._distinct_names(self.ledger.col("user")[revenue])
+        active_buyers = self._distinct_names(self.intents.col("user")[self._window(self.intents, period_days)])
+
+        avg_order_value = round(total_revenue / completed_orders, 2) if completed_orders > 0 else 0
+        avg_fee_per_order = round(total_fees / completed_orders, 2) if completed_orders > 0 else 0
+
+        return {
+            "period_days": period_days,
+            "total_revenue": round(total_revenue, 2),
+            "total_fees": round(total_fees, 2),
+            "net_revenue": round(total_revenue - total_fees, 2),
+            "completed_orders": completed_orders,
+            "avg_order_value": avg_order_value,
+            "avg_fee_per_order": avg_fee_per_order,
+            "active_agents": active_agents,
+            "active_buyers": active_buyers,
+            "calculated_at": _now()
+        }
+
+    def revenue_by_currency(self, period_days: int = 30) -> Dict[str, float]:
+        revenue = self._basis(self._window(self.ledger, period_days), "revenue")
+        currency = self.ledger.col("currency")[revenue]
+        n = len(self.currencies)
+        totals = np.bincount(currency, weights=self.ledger.col("amount")[revenue], minlength=n)
+        counts = np.bincount(currency, minlength=n)
+        return {self.currencies[c]: round(float(totals[c]), 2) for c in np.flatnonzero(counts)}
+
+    def agent_aggregates(self, period_days: int = 30) -> Dict[str, Any]:
+        """calculate_agent_metrics() counters for every user at once (arrays indexed by user code)"""
+        window = self._window(self.ledger, period_days)
+        amount = self.ledger.col("amount")
+        revenue = self._basis(window, "revenue") & (amount > 0)
+        fees = self._basis(window, "platform_fee")
+        return {
+            "completed_jobs": self._per_user(revenue).astype(np.int64),
+            "total_earned": self._per_user(revenue, amount),
+            "total_fees_paid": self._per_user(fees, np.abs(amount)),
+            "on_time_deliveries": self._per_user(self._basis(window, "sla_bonus")).astype(np.int64),
+            "disputes": self._per_user(self._basis(window, "bond_slash")).astype(np.int64),
+        }
+
+    def agent_metrics(self, code: int, agg: Dict[str, Any], period_days: int) -> Dict[str, Any]:
+        """Same dict as calculate_agent_metrics() for one user code"""
+        completed_jobs = int(agg["completed_jobs"][code])
+        total_earned = float(agg["total_earned"][code])
+        total_fees_paid = float(agg["total_fees_paid"][code])
+        ocl_limit = float(self.users["ocl_limit"][code])
+        ocl_outstanding = float(self.users["ocl_outstanding"][code])
+        return {
+            "username": self.agent_names[code],
+            "period_days": period_days,
+            "completed_jobs": completed_jobs,
+            "total_earned": total_earned,
+            "total_fees_paid": total_fees_paid,
+            "net_earnings": round(total_earned - total_fees_paid, 2),
+            "avg_job_value": round(total_earned / completed_jobs, 2) if completed_jobs > 0 else 0,
+            "on_time_rate": round(int(agg["on_time_deliveries"][code]) / completed_jobs, 2) if completed_jobs > 0 else 0,
+            "dispute_rate": round(int(agg["disputes"][code]) / completed_jobs, 2) if completed_jobs > 0 else 0,
+            "outcome_score": int(self.users["outcome_score"][code]),
+            "balances": {
+                "aigx": round(float(self.users["aigx"][code]), 2),
+                "usd": round(float(self.users["usd"][code]), 2)
+            },
+            "ocl": {
+                "limit": round(ocl_limit, 2),
+                "outstanding": round(ocl_outstanding, 2),
+                "available": round(ocl_limit - ocl_outstanding, 2)
+            },
+            "calculated_at": _now()
+        }
+
+    def rank_agents(self, metric: str, limit: int, period_days: int = 30) -> Dict[str, Any]:
+        agg = self.agent_aggregates(period_days)
+        agents = self.order[self.users["active"][self.order]]
+        if metric in ("total_earned", "completed_jobs", "outcome_score", "on_time_rate"):
+            if metric == "outcome_score":
+                values = self.users["outcome_score"][agents]
+            elif metric == "on_time_rate":
+                jobs = agg["completed_jobs"][agents]
+                values = np.round(np.divide(agg["on_time_deliveries"][agents], jobs,
+                                            out=np.zeros(len(agents)), where=jobs > 0), 2)
+            else:
+                values = agg[metric][agents]
+            agents = agents[np.argsort(-values, kind="stable")]
+        return {
+            "metric": metric,
+            "total_agents": len(agents),
+            "top_agents": [self.agent_metrics(int(code), agg, period_days) for code in agents[:max(limit, 0)]],
+            "limit": limit
+        }
+
+    def balance_totals(self) -> Dict[str, float]:
+        return {name: float(self.users[name][self.order].sum())
+                for name in ("ocl_limit", "ocl_outstanding", "aigx", "usd")}
+
+    def user_value(self, username: str, column: str, default: float = 0.0) -> float:
+        code = self.user_codes.get(username)
+        if code is None or not self.present[code]:
+            return default
+        return float(self.users[column][code])
+
+    def cohorts(self, cohort_by: str) -> Dict[str, Dict[str, Any]]:
+        agg = self.agent_aggregates(90)
+        order = self.order
+        if cohort_by == "signup_month":
+            months = self._signup_months
+            keys = []
+            for code in order.tolist():
+                raw = self.signup_raw[code]
+                key = months.get(raw) if isinstance(raw, str) else None
+                if key is None:
+                    try:
+                        key = datetime.fromisoformat(raw.replace("Z", "+00:00")).strftime("%Y-%m")
+                    except:
+                        key = "unknown"
+                    if isinstance(raw, str):
+                        months[raw] = key
+                keys.append(key)
+            keys = np.asarray(keys, dtype=object)
+        elif cohort_by == "outcome_score_tier":
+            score = self.users["outcome_score"][order]
+            keys = np.select([score >= t for t, _ in _SCORE_TIERS], [k for _, k in _SCORE_TIERS], "novice")
+        elif cohort_by == "revenue_tier":
+            earned = agg["total_earned"][order]
+            keys = np.select([earned >= t for t, _ in _REVENUE_TIERS] + [earned > 0],
+                             [k for _, k in _REVENUE_TIERS] + ["low"], "inactive")
+        else:
+            keys = np.full(len(order), "", dtype=object)
+
+        if not len(order):
+            return {}
+        labels, first, inverse = np.unique(keys.astype(str), return_index=True, return_inverse=True)
+        users = np.bincount(inverse, minlength=len(labels))
+        revenue = np.bincount(inverse, weights=agg["total_earned"][order], minlength=len(labels))
+        jobs = np.bincount(inverse, weights=agg["completed_jobs"][order], minlength=len(labels))
+        cohorts = {}
+        for i in np.argsort(first):  # first-appearance order, like the per-user loop
+            total = float(revenue[i])
+            cohorts[str(labels[i])] = {
+                "users": int(users[i]),
+                "total_revenue": round(total, 2),
+                "completed_jobs": int(jobs[i]),
+                "avg_revenue_per_user": round(total / int(users[i]), 2) if users[i] > 0 else 0
+            }
+        return cohorts
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "users": int(self.present.sum()),
+            "ledger_rows": len(self.ledger),
+            "intent_rows": len(self.intents),
+            "bases": len(self.basis_codes),
+            "currencies": len(self.currencies),
+        }
+
+
+_ledger_store: Optional[LedgerStore] = None
+
+
+def get_ledger_store() -> LedgerStore:
+    """Process-wide columnar store (numpy required)"""
+    global _ledger_store
+    if _ledger_store is None:
+        _ledger_store = LedgerStore()
+    return _ledger_store
+
+
 # ============ REVENUE ANALYTICS ============
 
 def calculate_revenue_metrics(
@@ -25,6 +485,9 @@ def calculate_revenue_metrics(
     """
     Calculate platform revenue metrics
     """
+    if HAS_NUMPY:
+        return get_ledger_store().sync(users).revenue_metrics(period_days)
+    
     total_revenue = 0.0
     total_fees = 0.0
     completed_orders = 0
@@ -82,6 +545,14 @@ def calculate_revenue_by_currency(
     """
     Break down revenue by currency
     """
+    if HAS_NUMPY:
+        revenue_by_currency = get_ledger_store().sync(users).revenue_by_currency(period_days)
+        return {
+            "period_days": period_days,
+            "revenue_by_currency": revenue_by_currency,
+            "total_currencies": len(revenue_by_currency)
+        }
+    
     revenue_by_currency = {}
     
     for user in users:
@@ -239,6 +710,9 @@ def rank_agents_by_performance(
     
     metric options: total_earned, completed_jobs, outcome_score, on_time_rate
     """
+    if HAS_NUMPY:
+        return get_ledger_store().sync(users).rank_agents(metric, limit, period_days=30)
+    
     agent_metrics = []
     
     for user in users:
@@ -270,9 +744,38 @@ def calculate_platform_health(
     """
     Calculate overall platform financial health
     """
-    # Revenue metrics
-    revenue_30d = calculate_revenue_metrics(users, period_days=30)
-    revenue_7d = calculate_revenue_metrics(users, period_days=7)
+    if HAS_NUMPY:
+        store = get_ledger_store().sync(users)
+        revenue_30d = store.revenue_metrics(30)
+        revenue_7d = store.revenue_metrics(7)
+        totals = store.balance_totals()
+        total_ocl_limit = totals["ocl_limit"]
+        total_ocl_outstanding = totals["ocl_outstanding"]
+        total_aigx = totals["aigx"]
+        total_usd = totals["usd"]
+        insurance_pool = store.user_value("insurance_pool", "aigx")
+    else:
+        # Revenue metrics
+        revenue_30d = calculate_revenue_metrics(users, period_days=30)
+        revenue_7d = calculate_revenue_metrics(users, period_days=7)
+        
+        # OCL metrics
+        total_ocl_limit = 0.0
+        total_ocl_outstanding = 0.0
+        total_aigx = 0.0
+        total_usd = 0.0
+        
+        for user in users:
+            total_ocl_limit += float(user.get("ocl", {}).get("limit", 0))
+            total_ocl_outstanding += float(user.get("ocl", {}).get("outstanding", 0))
+            total_aigx += float(user.get("ownership", {}).get("aigx", 0))
+            total_usd += float(user.get("ownership", {}).get("usd", 0))
+        
+        # Insurance pool
+        insurance_pool = 0.0
+        for user in users:
+            if user.get("username") == "insurance_pool":
+                insurance_pool = float(user.get("ownership", {}).get("aigx", 0))
     
     # Growth rate (7d vs 30d normalized)
     daily_30d = revenue_30d["total_revenue"] / 30
@@ -280,26 +783,8 @@ def calculate_platform_health(
     
     growth_rate = ((daily_7d - daily_30d) / daily_30d) if daily_30d > 0 else 0
     
-    # OCL metrics
-    total_ocl_limit = 0.0
-    total_ocl_outstanding = 0.0
-    total_aigx = 0.0
-    total_usd = 0.0
-    
-    for user in users:
-        total_ocl_limit += float(user.get("ocl", {}).get("limit", 0))
-        total_ocl_outstanding += float(user.get("ocl", {}).get("outstanding", 0))
-        total_aigx += float(user.get("ownership", {}).get("aigx", 0))
-        total_usd += float(user.get("ownership", {}).get("usd", 0))
-    
     ocl_utilization = (total_ocl_outstanding / total_ocl_limit) if total_ocl_limit > 0 else 0
     
-    # Insurance pool
-    insurance_pool = 0.0
-    for user in users:
-        if user.get("username") == "insurance_pool":
-            insurance_pool = float(user.get("ownership", {}).get("aigx", 0))
-    
     # Health score (0-100)
     health_score = 100
     
@@ -356,6 +841,15 @@ def generate_cohort_analysis(
     
     cohort_by options: signup_month, outcome_score_tier, revenue_tier
     """
+    if HAS_NUMPY:
+        cohorts = get_ledger_store().sync(users).cohorts(cohort_by)
+        return {
+            "cohort_by": cohort_by,
+            "total_cohorts": len(cohorts),
+            "cohorts": cohorts,
+            "generated_at": _now()
+        }
+    
     cohorts = {}
     
     for user in users:
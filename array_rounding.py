@@ -0,0 +1,27 @@
+"""
+Array rounding that matches Python's round()
+
+np.rint/np.round and round(x, digits) agree except where the scaled value
+sits within float error of a .5 tie; batch paths (pricing, waterfall
+distributions) must return exactly what their scalar paths return, so those
+few values are redone with round(). Requires numpy; callers gate on their
+own HAS_NUMPY.
+"""
+
+import numpy as np
+
+
+def round_array(values, digits: int = 2):
+    """Round an array to `digits` decimals exactly like Python's round(x, digits)"""
+    values = np.asarray(values, dtype=float)
+    scale = 10.0 ** digits
+    scaled = values * scale
+    out = np.rint(scaled) / scale
+    with np.errstate(invalid="ignore"):
+        frac = scaled - np.floor(scaled)
+    near_tie = np.abs(frac - 0.5) <= 4 * np.spacing(np.abs(scaled))
+    near_tie |= ~np.isfinite(scaled)
+    if near_tie.any():
+        idx = np.flatnonzero(near_tie)
+        out.flat[idx] = [round(v, digits) for v in values.flat[idx].tolist()]
+    return out
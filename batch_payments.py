@@ -5,11 +5,27 @@ Pay multiple agents at once with bulk invoice generation
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 import asyncio
+import inspect
+
+from payment_executor import PaymentExecutor, get_payment_executor
+
+# Executor bookkeeping that is not part of a payment result
+_INTERNAL_KEYS = ("ok", "retryable", "rate_limited", "resumed")
 
 def _now():
     return datetime.now(timezone.utc).isoformat()
 
 
+def _index_users(users: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """username (or consent username) -> user, first match wins like the old scan"""
+    index: Dict[str, Dict[str, Any]] = {}
+    for u in users:
+        for name in (u.get("username"), u.get("consent", {}).get("username")):
+            if name is not None and name not in index:
+                index[name] = u
+    return index
+
+
 async def create_batch_payment(
     payments: List[Dict[str, Any]],
     batch_id: str = None,
@@ -48,77 +64,94 @@ async def create_batch_payment(
 async def execute_batch_payment(
     batch: Dict[str, Any],
     users: List[Dict[str, Any]],
-    credit_function
+    credit_function,
+    executor: Optional[PaymentExecutor] = None
 ) -> Dict[str, Any]:
     """
     Execute a batch payment - credit all agents
+    
+    Users are looked up through one username index built per batch, and
+    payments already marked successful in batch["results"] (same
+    idempotency key) are kept rather than credited again, so re-submitting
+    a returned batch only pays what is left.
+    
+    credit_function may be async (e.g. a Stripe transfer taking the key as
+    `idempotency_key`): those payments run concurrently through the
+    payment executor, paced against the Stripe rate limit and checkpointed
+    so an interrupted batch resumes where it stopped.
     """
-    results = []
-    successful = 0
-    failed = 0
+    executor = executor or get_payment_executor()
+    by_username = _index_users(users)
+    paid = {
+        r["idempotency_key"]: r for r in batch.get("results", [])
+        if r.get("status") == "success" and r.get("idempotency_key")
+    }
+    external = inspect.iscoroutinefunction(credit_function)
     
-    for payment in batch["payments"]:
+    async def pay(payment: Dict[str, Any], key: str) -> Dict[str, Any]:
         username = payment.get("username")
         amount = float(payment.get("amount", 0))
         currency = payment.get("currency", "USD")
         reason = payment.get("reason", "batch_payment")
         
-        # Find user
-        user = None
-        for u in users:
-            if u.get("username") == username or u.get("consent", {}).get("username") == username:
-                user = u
-                break
+        if key in paid:
+            return {**paid[key], "ok": True}
         
+        user = by_username.get(username)
         if not user:
-            results.append({
+            return {
+                "ok": False,
                 "username": username,
                 "status": "failed",
                 "error": "user_not_found",
                 "amount": amount,
                 "currency": currency
-            })
-            failed += 1
-            continue
+            }
         
         # Credit user
         try:
-            credit_result = credit_function(user, amount, currency, reason)
-            
-            if credit_result.get("ok"):
-                results.append({
-                    "username": username,
-                    "status": "success",
-                    "amount": amount,
-                    "currency": currency,
-                    "new_balance": credit_result.get("new_balance")
-                })
-                successful += 1
+            if external:
+                credit_result = await credit_function(user, amount, currency, reason, idempotency_key=key)
             else:
-                results.append({
-                    "username": username,
-                    "status": "failed",
-                    "error": credit_result.get("error"),
-                    "amount": amount,
-                    "currency": currency
-                })
-                failed += 1
-        
+                credit_result = credit_function(user, amount, currency, reason)
         except Exception as e:
-            results.append({
+            credit_result = {"ok": False, "error": str(e)}
+        
+        if credit_result.get("ok"):
+            return {
+                "ok": True,
                 "username": username,
-                "status": "failed",
-                "error": str(e),
+                "status": "success",
                 "amount": amount,
-                "currency": currency
-            })
-            failed += 1
+                "currency": currency,
+                "new_balance": credit_result.get("new_balance")
+            }
+        return {
+            "ok": False,
+            "username": username,
+            "status": "failed",
+            "error": credit_result.get("error"),
+            "amount": amount,
+            "currency": currency,
+            "retryable": credit_result.get("retryable", False),
+            "rate_limited": credit_result.get("rate_limited", False)
+        }
+    
+    run = await executor.run(
+        batch["id"], batch["payments"], pay,
+        paced=external, checkpoint=external
+    )
+    results = [
+        {k: v for k, v in r.items() if k not in _INTERNAL_KEYS}
+        for r in run["results"]
+    ]
     
     batch["status"] = "completed"
     batch["completed_at"] = _now()
-    batch["successful"] = successful
-    batch["failed"] = failed
+    batch["successful"] = run["successful"]
+    batch["failed"] = run["failed"]
     batch["results"] = results
+    batch["elapsed_seconds"] = run["elapsed_seconds"]
     
     return batch
 
@@ -129,6 +162,8 @@ async def generate_bulk_invoices(
 ) -> Dict[str, Any]:
     """
     Generate invoices for multiple completed intents
+    
+    One invoice per intent id, even if an intent is listed twice.
     """
     from uuid import uuid4
     
@@ -136,15 +171,18 @@ async def generate_bulk_invoices(
         batch_id = f"inv_batch_{uuid4().hex[:12]}"
     
     invoices = []
+    invoiced = set()
     total_amount = 0.0
+    generated_at = _now()
     
     for intent in intents:
         agent = intent.get("agent")
         price = float(intent.get("price_usd", 0))
         intent_id = intent.get("id")
         
-        if not all([agent, price, intent_id]):
+        if not all([agent, price, intent_id]) or intent_id in invoiced:
             continue
+        invoiced.add(intent_id)
         
         invoice = {
             "id": f"inv_{uuid4().hex[:8]}",
@@ -154,7 +192,7 @@ async def generate_bulk_invoices(
             "currency": "USD",
             "status": "generated",
             "batch_id": batch_id,
-            "generated_at": _now()
+            "generated_at": generated_at
         }
         
         invoices.append(invoice)
@@ -177,23 +215,32 @@ async def batch_revenue_recognition(
 ) -> Dict[str, Any]:
     """
     Process revenue recognition for multiple invoices
+    
+    Invoices already marked paid are skipped, so re-submitting a batch
+    does not credit the same revenue twice.
     """
     results = []
     total_revenue = 0.0
     total_fees = 0.0
     total_net = 0.0
+    by_username = _index_users(users)
     
     for invoice in invoices:
         agent_username = invoice.get("agent")
         amount = float(invoice.get("amount", 0))
         currency = invoice.get("currency", "USD")
         
+        if invoice.get("status") == "paid":
+            results.append({
+                "invoice_id": invoice.get("id"),
+                "agent": agent_username,
+                "status": "skipped",
+                "error": "already_paid"
+            })
+            continue
+        
         # Find agent
-        agent_user = None
-        for u in users:
-            if u.get("username") == agent_username or u.get("consent", {}).get("username") == agent_username:
-                agent_user = u
-                break
+        agent_user = by_username.get(agent_username)
         
         if not agent_user:
             results.append({
@@ -251,6 +298,7 @@ async def batch_revenue_recognition(
         "total_invoices": len(invoices),
         "successful": len([r for r in results if r["status"] == "success"]),
         "failed": len([r for r in results if r["status"] == "failed"]),
+        "skipped": len([r for r in results if r["status"] == "skipped"]),
         "total_revenue": round(total_revenue, 2),
         "total_fees": round(total_fees, 2),
         "total_net": round(total_net, 2),
@@ -342,7 +390,8 @@ def generate_payment_report(
 async def retry_failed_payments(
     batch: Dict[str, Any],
     users: List[Dict[str, Any]],
-    credit_function
+    credit_function,
+    executor: Optional[PaymentExecutor] = None
 ) -> Dict[str, Any]:
     """
     Retry all failed payments from a batch
@@ -376,6 +425,6 @@ async def retry_failed_payments(
     )
     
     # Execute retry
-    result = await execute_batch_payment(retry_batch, users, credit_function)
+    result = await execute_batch_payment(retry_batch, users, credit_function, executor)
     
     return result
@@ -14,14 +14,21 @@ Events to publish (append-only):
 - bundle.attach: which runbooks co-sold
 - passport.verified: downstream usage
 - connector.health: latency, fail rate, rate-limit incidents
+
+Delivery is off the hot path: emit() validates, appends to history and
+enqueues into a bounded ring buffer. Local handlers, SSE publishing and
+MetaHive contributions run from a worker task on the running event loop,
+which drains the buffer in batches. Without a running loop (scripts, sync
+callers) events are delivered inline as before; flush() drains on demand.
 """
 
-from typing import Dict, Any, List, Callable, Optional
+from typing import Dict, List, Callable, Optional
 from datetime import datetime, timezone
-from collections import defaultdict
+from collections import defaultdict, deque
 import asyncio
 import json
 import hashlib
+import time
 
 # Try to import MetaHive for network-wide distribution
 try:
@@ -106,10 +113,43 @@ class BrainEvents:
         }
     }
 
-    def __init__(self):
+    # Delivery tuning
+    QUEUE_LIMIT = 50000       # ring buffer size; oldest undelivered events are dropped when full
+    DRAIN_BATCH = 256         # events delivered per worker iteration before yielding
+    HIVE_BATCH = 64           # hive contributions awaited together
+    LAG_SAMPLES = 1024        # recent delivery-lag samples kept for percentiles
+
+    # Map event types to MetaHive pattern types
+    HIVE_PATTERN_MAP = {
+        "coi.executed": "fulfillment_workflow",
+        "pricing.quoted": "pricing_insight",
+        "ifx.order_filled": "market_maker_spread",
+        "dealgraph.tranche_bound": "tranche_allocation",
+        "placement.auction": "monetization_strategy",
+        "connector.health": "ai_routing"
+    }
+
+    def __init__(self, queue_limit: int = None, history_limit: int = 10000):
         self._handlers: Dict[str, List[Callable]] = defaultdict(list)
-        self._history: List[Dict[str, Any]] = []
-        self._history_limit = 10000
+        self._history_limit = max(1, history_limit)  # 0 would make deque(maxlen=0) drop every event
+        self._history: deque = deque(maxlen=self._history_limit)
+        self._type_counts: Dict[str, int] = defaultdict(int)
+
+        # Pending deliveries: (enqueued_at_monotonic, event)
+        self._queue: deque = deque(maxlen=queue_limit or self.QUEUE_LIMIT)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._worker_loop = None
+        self._hive_tasks: set = set()
+
+        # Delivery metrics
+        self._enqueued = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._handler_errors = 0
+        self._hive_submitted = 0
+        self._lag_samples: deque = deque(maxlen=self.LAG_SAMPLES)
+        self._lag_max_ms = 0.0
 
     def on(self, event_type: str, handler: Callable):
         """Register event handler"""
@@ -124,6 +164,9 @@ class BrainEvents:
         """
         Emit an event to all channels.
 
+        Validates and records the event, then enqueues it for delivery and
+        returns immediately when called from a running event loop.
+
         Args:
             event_type: Event type (e.g., "coi.executed")
             payload: Event payload
@@ -139,54 +182,144 @@ class BrainEvents:
             return {"ok": False, "error": f"missing_fields:{missing}"}
 
         # Create event envelope
+        ts = _now_iso()
         event = {
-            "event_id": f"evt_{_hash_payload(payload)}_{_now_iso()[:19].replace(':', '')}",
+            "event_id": f"evt_{_hash_payload(payload)}_{ts[:19].replace(':', '')}",
             "type": event_type,
-            "ts": _now_iso(),
+            "ts": ts,
             "payload": payload
         }
 
-        # Store in history
+        # Store in history (deque evicts the oldest in O(1))
+        if len(self._history) == self._history_limit:
+            evicted = self._history[0]["type"]
+            self._type_counts[evicted] -= 1
+            if self._type_counts[evicted] <= 0:
+                del self._type_counts[evicted]
         self._history.append(event)
-        if len(self._history) > self._history_limit:
-            self._history = self._history[-self._history_limit:]
+        self._type_counts[event_type] += 1
+
+        # Enqueue for delivery
+        if len(self._queue) == self._queue.maxlen:
+            self._dropped += 1
+        self._queue.append((time.monotonic(), event))
+        self._enqueued += 1
 
-        # Call local handlers
-        for handler in self._handlers.get(event_type, []):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None:
+            # No loop to hand off to - deliver inline
+            self.flush()
+        else:
+            self._ensure_worker(loop)
+            self._wakeup.set()
+
+        return {"ok": True, "event_id": event["event_id"], "queued": loop is not None}
+
+    # ------------------------------------------------------------------
+    # Delivery
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self, loop):
+        """Start (or restart) the delivery worker on the running loop"""
+        if self._worker is not None and not self._worker.done() and self._worker_loop is loop:
+            return
+        self._wakeup = asyncio.Event()
+        self._worker_loop = loop
+        self._worker = loop.create_task(self._run_worker())
+
+    async def _run_worker(self):
+        """Drain the ring buffer in batches, yielding between batches"""
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            contributions = self._drain(self.DRAIN_BATCH)
+            if contributions:
+                await self._submit_hive_batch(contributions)
+            await asyncio.sleep(0)
+
+    def _drain(self, max_events: Optional[int] = None) -> List[dict]:
+        """
+        Deliver queued events to handlers and SSE.
+
+        Returns the MetaHive contributions collected from the delivered
+        events so the caller can submit them as a batch.
+        """
+        contributions = []
+        delivered = 0
+        while self._queue and (max_events is None or delivered < max_events):
+            enqueued_at, event = self._queue.popleft()
+            self._deliver(event)
+            delivered += 1
+
+            lag_ms = (time.monotonic() - enqueued_at) * 1000
+            self._lag_samples.append(lag_ms)
+            if lag_ms > self._lag_max_ms:
+                self._lag_max_ms = lag_ms
+
+            if METAHIVE_AVAILABLE:
+                contribution = self._contribute_to_hive(event["type"], event["payload"])
+                if contribution:
+                    contributions.append(contribution)
+
+        self._delivered += delivered
+        return contributions
+
+    def _deliver(self, event: dict):
+        """Run local handlers and publish to SSE for one event"""
+        payload = event["payload"]
+        for handler in self._handlers.get(event["type"], []):
             try:
                 handler(payload)
-            except Exception as e:
-                pass  # Don't fail on handler errors
+            except Exception:
+                self._handler_errors += 1  # Don't fail on handler errors
 
         # Emit to SSE for dashboards
         if SSE_AVAILABLE:
             try:
-                sse_publish(f"brain.{event_type}", event)
+                sse_publish(f"brain.{event['type']}", event)
             except Exception:
                 pass
 
-        # Contribute to MetaHive for network learning
-        if METAHIVE_AVAILABLE:
-            self._contribute_to_hive(event_type, payload)
-
-        return {"ok": True, "event_id": event["event_id"]}
+    async def _submit_hive_batch(self, contributions: List[dict]):
+        """Await hive contributions in bounded batches"""
+        for i in range(0, len(contributions), self.HIVE_BATCH):
+            chunk = contributions[i:i + self.HIVE_BATCH]
+            await asyncio.gather(
+                *(contribute_to_hive(**c) for c in chunk),
+                return_exceptions=True
+            )
+            self._hive_submitted += len(chunk)
+
+    def flush(self) -> dict:
+        """
+        Synchronously deliver everything queued.
 
-    def _contribute_to_hive(self, event_type: str, payload: dict):
-        """Contribute event to MetaHive for network-wide learning"""
+        Intended for tests and shutdown. Hive contributions are scheduled on
+        the running loop if there is one, otherwise skipped.
+        """
+        contributions = self._drain()
+        if contributions:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                task = loop.create_task(self._submit_hive_batch(contributions))
+                self._hive_tasks.add(task)
+                task.add_done_callback(self._hive_tasks.discard)
+        return {"ok": True, "pending": len(self._queue), "delivered": self._delivered}
+
+    def _contribute_to_hive(self, event_type: str, payload: dict) -> Optional[dict]:
+        """Build MetaHive contribution kwargs for an event (None if not mapped)"""
         try:
-            # Map event types to pattern types
-            pattern_map = {
-                "coi.executed": "fulfillment_workflow",
-                "pricing.quoted": "pricing_insight",
-                "ifx.order_filled": "market_maker_spread",
-                "dealgraph.tranche_bound": "tranche_allocation",
-                "placement.auction": "monetization_strategy",
-                "connector.health": "ai_routing"
-            }
-
-            pattern_type = pattern_map.get(event_type)
+            pattern_type = self.HIVE_PATTERN_MAP.get(event_type)
             if not pattern_type:
-                return
+                return None
 
             # Calculate quality/ROAS from payload
             roas = 1.0
@@ -211,35 +344,58 @@ class BrainEvents:
                 quality = max(0.3, 1 - slippage * 10)
                 revenue = payload.get("fill_size", 0) * payload.get("fill_price", 0)
 
-            # Async contribute
-            asyncio.create_task(contribute_to_hive(
+            return dict(
                 username=payload.get("actor_id", "brain"),
                 pattern_type=pattern_type,
                 context={"event_type": event_type, **{k: v for k, v in payload.items() if k not in ["actor_id"]}},
                 action={"type": event_type},
                 outcome={"roas": roas, "quality_score": quality, "revenue": revenue},
                 anonymize=True
-            ))
+            )
         except Exception:
-            pass
+            return None
 
     def get_history(self, event_type: str = None, limit: int = 100) -> List[dict]:
         """Get event history"""
-        events = self._history
-        if event_type:
-            events = [e for e in events if e["type"] == event_type]
-        return list(reversed(events[-limit:]))
+        out = []
+        for e in reversed(self._history):
+            if event_type and e["type"] != event_type:
+                continue
+            out.append(e)
+            if len(out) >= limit:
+                break
+        return out
+
+    def get_delivery_stats(self) -> dict:
+        """Get delivery-lag and queue metrics"""
+        lags = sorted(self._lag_samples)
+        n = len(lags)
+
+        def pct(p: float) -> float:
+            return round(lags[min(n - 1, int(p * n))], 3) if n else 0.0
+
+        return {
+            "queue_depth": len(self._queue),
+            "queue_limit": self._queue.maxlen,
+            "enqueued": self._enqueued,
+            "delivered": self._delivered,
+            "dropped": self._dropped,
+            "handler_errors": self._handler_errors,
+            "hive_submitted": self._hive_submitted,
+            "lag_ms_p50": pct(0.50),
+            "lag_ms_p95": pct(0.95),
+            "lag_ms_p99": pct(0.99),
+            "lag_ms_max": round(self._lag_max_ms, 3),
+            "worker_running": self._worker is not None and not self._worker.done()
+        }
 
     def get_stats(self) -> dict:
         """Get event statistics"""
-        by_type = defaultdict(int)
-        for e in self._history:
-            by_type[e["type"]] += 1
-
         return {
             "total_events": len(self._history),
-            "by_type": dict(by_type),
-            "handlers_registered": {k: len(v) for k, v in self._handlers.items()}
+            "by_type": dict(self._type_counts),
+            "handlers_registered": {k: len(v) for k, v in self._handlers.items()},
+            "delivery": self.get_delivery_stats()
         }
 
 
@@ -260,3 +416,8 @@ def on_event(event_type: str, handler: Callable):
 def get_event_history(event_type: str = None, limit: int = 100) -> List[dict]:
     """Get event history from default instance"""
     return _brain_events.get_history(event_type, limit)
+
+
+def flush_events() -> dict:
+    """Synchronously deliver queued events on default instance"""
+    return _brain_events.flush()
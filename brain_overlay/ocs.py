@@ -16,11 +16,27 @@ Formula:
     tenure = min(20, age_days * 0.05)
     penalty = min(25, disputes * 3)
     OCS = max(0, base + reliability + tenure - penalty)
+
+Scores are cached per entity. Age only moves in whole days, so a cached
+score stays valid until the next outcome for that entity or until its
+next day boundary. The leaderboard is a sorted index updated on each
+outcome; rescore_all() recomputes every entity in one (vectorized when
+numpy is available) pass for nightly jobs.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 from collections import defaultdict
+import bisect
+
+# Try numpy for bulk rescoring, fallback to per-record loop
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+_DAY_SECONDS = 86400
 
 
 def _now_iso() -> str:
@@ -34,6 +50,13 @@ def _now_iso() -> str:
     return ts
 
 
+def _parse_epoch(ts: str) -> float:
+    """Parse ISO timestamp (Z or +00:00) to epoch seconds"""
+    if ts.endswith('Z'):
+        ts = ts[:-1] + '+00:00'
+    return datetime.fromisoformat(ts).timestamp()
+
+
 class OCSEngine:
     """
     Outcome Credit Score calculation and tracking.
@@ -65,6 +88,16 @@ class OCSEngine:
 
     def __init__(self):
         self._scores: Dict[str, Dict[str, Any]] = {}
+        # entity_id -> parsed created_at epoch (parsed once per entity)
+        self._created_epoch: Dict[str, float] = {}
+        # entity_id -> (score, valid_until_epoch)
+        self._score_cache: Dict[str, Tuple[float, float]] = {}
+        # Leaderboard index: ascending list of (-ocs, seq, entity_id)
+        self._leaderboard: List[Tuple[float, int, str]] = []
+        self._leader_keys: Dict[str, Tuple[float, int, str]] = {}
+        self._seq = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     def _get_record(self, entity_id: str) -> Dict[str, Any]:
         """Get or create entity record"""
@@ -79,35 +112,79 @@ class OCSEngine:
                 "ocs": 50,  # Default starting score
                 "tier": "standard"
             }
+            self._index_score(entity_id, 50)
         return self._scores[entity_id]
 
     def score(self, entity_id: str) -> float:
-        """Calculate current OCS for entity"""
+        """Calculate current OCS for entity (cached until next outcome or day boundary)"""
         record = self._get_record(entity_id)
-        return self._calculate_score(record)
-
-    def _calculate_score(self, record: Dict[str, Any]) -> float:
-        """Calculate OCS from record"""
-        proofs = record.get("proofs", 0)
-        sla_hits = record.get("sla_hits", 0)
-        disputes = record.get("disputes", 0)
-
-        # Calculate age in days - handle both Z and +00:00 formats
-        created_str = record["created_at"]
-        if created_str.endswith('Z'):
-            created_str = created_str[:-1] + '+00:00'
-        created = datetime.fromisoformat(created_str)
-        age_days = (datetime.now(timezone.utc) - created).days
-
-        # Formula components
+        now = datetime.now(timezone.utc).timestamp()
+        cached = self._score_cache.get(entity_id)
+        if cached is not None and now < cached[1]:
+            self._cache_hits += 1
+            return cached[0]
+        self._cache_misses += 1
+        return self._calculate_score(record, now)
+
+    def invalidate(self, entity_id: str = None):
+        """Drop cached score for one entity, or all entities"""
+        if entity_id is None:
+            self._score_cache.clear()
+        else:
+            self._score_cache.pop(entity_id, None)
+
+    def _created(self, record: Dict[str, Any]) -> float:
+        """Get parsed created_at epoch for record"""
+        entity_id = record["entity_id"]
+        created = self._created_epoch.get(entity_id)
+        if created is None:
+            created = _parse_epoch(record["created_at"])
+            self._created_epoch[entity_id] = created
+        return created
+
+    @staticmethod
+    def _formula(proofs: int, sla_hits: int, disputes: int, age_days: int) -> float:
+        """OCS formula for scalar inputs"""
         base = min(1.0, proofs / 100) ** 0.5 * 60
         reliability = max(0, (sla_hits - disputes)) * 0.2
         tenure = min(20, age_days * 0.05)
         penalty = min(25, disputes * 3)
-
-        ocs = round(max(0, min(100, base + reliability + tenure - penalty)), 2)
+        return round(max(0, min(100, base + reliability + tenure - penalty)), 2)
+
+    def _calculate_score(self, record: Dict[str, Any], now: float = None) -> float:
+        """Calculate OCS from record and cache it until the next day boundary"""
+        if now is None:
+            now = datetime.now(timezone.utc).timestamp()
+        created = self._created(record)
+        age_days = int((now - created) // _DAY_SECONDS)
+
+        ocs = self._formula(
+            record.get("proofs", 0),
+            record.get("sla_hits", 0),
+            record.get("disputes", 0),
+            age_days
+        )
+        valid_until = created + (age_days + 1) * _DAY_SECONDS
+        self._score_cache[record["entity_id"]] = (ocs, valid_until)
         return ocs
 
+    def _index_score(self, entity_id: str, ocs: float):
+        """Insert or move entity in the leaderboard index"""
+        old = self._leader_keys.get(entity_id)
+        if old is not None:
+            if old[0] == -ocs:
+                return
+            i = bisect.bisect_left(self._leaderboard, old)
+            if i < len(self._leaderboard) and self._leaderboard[i] == old:
+                del self._leaderboard[i]
+            seq = old[1]
+        else:
+            self._seq += 1
+            seq = self._seq
+        key = (-ocs, seq, entity_id)
+        bisect.insort(self._leaderboard, key)
+        self._leader_keys[entity_id] = key
+
     def _get_tier(self, ocs: float) -> str:
         """Get tier for OCS value"""
         for tier, threshold in sorted(self.TIERS.items(), key=lambda x: -x[1]):
@@ -147,10 +224,12 @@ class OCSEngine:
         if dispute:
             record["disputes"] += 1
 
-        # Recalculate
+        # Recalculate (counts changed, so the cached score is stale)
+        self._score_cache.pop(entity_id, None)
         record["ocs"] = self._calculate_score(record)
         record["tier"] = self._get_tier(record["ocs"])
         record["last_updated"] = _now_iso()
+        self._index_score(entity_id, record["ocs"])
 
         delta = record["ocs"] - old_ocs
 
@@ -229,19 +308,71 @@ class OCSEngine:
         }
 
     def get_leaderboard(self, limit: int = 20) -> List[Dict[str, Any]]:
-        """Get top entities by OCS"""
-        entities = sorted(
-            self._scores.values(),
-            key=lambda x: x.get("ocs", 0),
-            reverse=True
-        )
-        return [{
-            "entity_id": e["entity_id"],
-            "ocs": e["ocs"],
-            "tier": self._get_tier(e["ocs"]),
-            "proofs": e["proofs"],
-            "sla_hits": e["sla_hits"]
-        } for e in entities[:limit]]
+        """Get top entities by OCS (reads the sorted index, no rescoring)"""
+        out = []
+        for _, _, entity_id in self._leaderboard[:limit]:
+            e = self._scores[entity_id]
+            out.append({
+                "entity_id": e["entity_id"],
+                "ocs": e["ocs"],
+                "tier": self._get_tier(e["ocs"]),
+                "proofs": e["proofs"],
+                "sla_hits": e["sla_hits"]
+            })
+        return out
+
+    def rescore_all(self) -> Dict[str, Any]:
+        """
+        Recompute stored OCS and tier for every entity in one pass.
+
+        Intended for the nightly job that rolls tenure forward. Uses numpy
+        when available; results match per-entity scoring exactly.
+        """
+        if not self._scores:
+            return {"ok": True, "rescored": 0, "changed": 0}
+
+        now = datetime.now(timezone.utc).timestamp()
+        records = list(self._scores.values())
+        created = [self._created(r) for r in records]
+
+        if HAS_NUMPY:
+            proofs = np.array([r.get("proofs", 0) for r in records], dtype=np.float64)
+            sla = np.array([r.get("sla_hits", 0) for r in records], dtype=np.float64)
+            disputes = np.array([r.get("disputes", 0) for r in records], dtype=np.float64)
+            created_arr = np.array(created, dtype=np.float64)
+            age_days = np.floor_divide(now - created_arr, _DAY_SECONDS)
+
+            base = np.minimum(1.0, proofs / 100) ** 0.5 * 60
+            reliability = np.maximum(0, sla - disputes) * 0.2
+            tenure = np.minimum(20, age_days * 0.05)
+            penalty = np.minimum(25, disputes * 3)
+            raw = np.maximum(0, np.minimum(100, base + reliability + tenure - penalty))
+            # Python round() on the float values keeps results identical to score()
+            scores = [round(v, 2) for v in raw.tolist()]
+            ages = age_days.astype(np.int64).tolist()
+        else:
+            ages = [int((now - c) // _DAY_SECONDS) for c in created]
+            scores = [
+                self._formula(r.get("proofs", 0), r.get("sla_hits", 0), r.get("disputes", 0), a)
+                for r, a in zip(records, ages)
+            ]
+
+        changed = 0
+        for r, c, a, ocs in zip(records, created, ages, scores):
+            entity_id = r["entity_id"]
+            self._score_cache[entity_id] = (ocs, c + (a + 1) * _DAY_SECONDS)
+            if r["ocs"] != ocs:
+                changed += 1
+                r["ocs"] = ocs
+                r["tier"] = self._get_tier(ocs)
+
+        # Rebuild leaderboard in one sort, keeping insertion order for ties
+        keys = [(-r["ocs"], self._leader_keys[r["entity_id"]][1], r["entity_id"]) for r in records]
+        keys.sort()
+        self._leaderboard = keys
+        self._leader_keys = {k[2]: k for k in keys}
+
+        return {"ok": True, "rescored": len(records), "changed": changed}
 
     def get_stats(self) -> Dict[str, Any]:
         """Get OCS system statistics"""
@@ -257,7 +388,12 @@ class OCSEngine:
             "total_entities": len(self._scores),
             "avg_ocs": round(sum(scores) / len(scores), 1),
             "median_ocs": round(sorted(scores)[len(scores) // 2], 1),
-            "by_tier": dict(by_tier)
+            "by_tier": dict(by_tier),
+            "cache": {
+                "entries": len(self._score_cache),
+                "hits": self._cache_hits,
+                "misses": self._cache_misses
+            }
         }
 
 
@@ -288,3 +424,8 @@ def get_pricing_adjustment(entity_id: str) -> Dict[str, Any]:
 def get_access_level(entity_id: str) -> Dict[str, Any]:
     """Get access permissions from OCS"""
     return _ocs_engine.get_access_level(entity_id)
+
+
+def rescore_all() -> Dict[str, Any]:
+    """Bulk recompute OCS for all entities (nightly)"""
+    return _ocs_engine.rescore_all()
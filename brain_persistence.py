@@ -5,9 +5,19 @@ BRAIN PERSISTENCE - Save/Load MetaHive + AI Family Learning
 
 Persists learning data across restarts so the system actually learns over time.
 
-STORAGE:
-1. File-based (local JSON) - Always used as primary/backup
-2. JSONBin (cloud) - Uses existing JSONBIN_URL for cross-deploy persistence
+STORAGE (tiered):
+1. Local delta log (primary) - data/brain/{store}.base + {store}.delta per
+   sub-store (metahive, ai_family, yield_memory). Each save is diffed
+   against the last one per entry (top-level key, per-user / per-key map
+   entry, or 256-item list chunk) and only changed entries are appended as
+   a compressed frame. The delta log is folded into a new base once it
+   outgrows it.
+2. JSONBin (cloud) - Uses existing JSONBIN_URL for cross-deploy persistence.
+   A full snapshot is pushed at most every BRAIN_REMOTE_SYNC_INTERVAL seconds
+   when something changed, from the background writer.
+
+Saves only serialize + diff on the caller's thread; file and network writes
+happen on a background writer thread. Sub-stores load lazily on first use.
 
 Uses your existing JSONBin setup - stores brain data under "brain_learning" key.
 
@@ -16,16 +26,36 @@ Uses your existing JSONBin setup - stores brain data under "brain_learning" key.
 
 import os
 import json
+import time
+import zlib
+import queue
+import atexit
+import struct
 import logging
+import threading
+from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
 
 logger = logging.getLogger(__name__)
 
 # Storage paths (local backup)
 DATA_DIR = Path(__file__).parent / "data"
-BRAIN_LEARNING_FILE = DATA_DIR / "brain_learning.json"
+BRAIN_LEARNING_FILE = DATA_DIR / "brain_learning.json"   # legacy single-blob file, imported once
+BRAIN_DIR = DATA_DIR / "brain"
 
 # JSONBin config - uses your existing env vars
 JSONBIN_URL = os.getenv("JSONBIN_URL", "")
@@ -34,28 +64,225 @@ JSONBIN_SECRET = os.getenv("JSONBIN_SECRET", "")
 # Key used to store brain data in JSONBin (won't conflict with user data)
 BRAIN_DATA_KEY = "brain_learning"
 
+SUB_STORES = ("metahive", "ai_family", "yield_memory")
+
+LIST_CHUNK = 256                    # List items per delta entry
+COMPACT_MIN_BYTES = 256 * 1024      # Never compact a smaller delta log
+COMPACT_RATIO = 1.0                 # Compact when delta log > ratio x base
+REMOTE_SYNC_INTERVAL = float(os.getenv("BRAIN_REMOTE_SYNC_INTERVAL", "60"))
+
+_SEP = "\x1f"                       # Separates top-level key from sub-key in entry paths
+_MAP = "__brain_map__"
+_LIST = "__brain_list__"
+_FRAME = struct.Struct(">cI")       # codec byte + payload length
+_CODEC_ZLIB = b"z"
+_CODEC_ZSTD = b"Z"
+
 
 def _now() -> str:
     return datetime.now(timezone.utc).isoformat() + "Z"
 
 
+def _parse_saved_at(value: Any) -> float:
+    """Epoch seconds from a saved_at string (0 if missing/unparseable)"""
+    if not isinstance(value, str):
+        return 0.0
+    try:
+        dt = datetime.fromisoformat(value.rstrip("Z"))
+        return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp()
+    except ValueError:
+        return 0.0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SERIALIZATION - orjson/zstd when installed, json/zlib otherwise
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _dumps(obj: Any) -> bytes:
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits
+    return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+def _frame(raw: bytes) -> bytes:
+    if HAS_ZSTD:
+        codec, payload = _CODEC_ZSTD, zstandard.ZstdCompressor(level=3).compress(raw)
+    else:
+        codec, payload = _CODEC_ZLIB, zlib.compress(raw, 6)
+    return _FRAME.pack(codec, len(payload)) + payload
+
+
+def _unframe(codec: bytes, payload: bytes) -> bytes:
+    if codec == _CODEC_ZLIB:
+        return zlib.decompress(payload)
+    if codec == _CODEC_ZSTD:
+        if not HAS_ZSTD:
+            raise RuntimeError("brain data was written with zstandard, which is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise ValueError(f"unknown frame codec {codec!r}")
+
+
+def _read_frames(path: Path) -> Tuple[List[Dict], int]:
+    """Decoded frames from a segment file and the byte offset after the last good one"""
+    try:
+        blob = path.read_bytes()
+    except FileNotFoundError:
+        return [], 0
+    frames, offset = [], 0
+    while offset + _FRAME.size <= len(blob):
+        codec, length = _FRAME.unpack_from(blob, offset)
+        end = offset + _FRAME.size + length
+        if end > len(blob):
+            break  # Torn write at the tail
+        try:
+            frames.append(_loads(_unframe(codec, blob[offset + _FRAME.size:end])))
+        except Exception as e:
+            logger.error(f"❌ Corrupt brain frame in {path.name} at {offset}: {e}")
+            break
+        offset = end
+    if offset < len(blob):
+        logger.warning(f"⚠️ Truncating {len(blob) - offset} trailing bytes in {path.name}")
+        with open(path, "r+b") as f:
+            f.truncate(offset)
+    return frames, offset
+
+
+def _delta_payload(ts: float, changed: Dict[str, bytes], removed: List[str]) -> bytes:
+    """JSON {"ts", "set", "del"} assembled from already-serialized entry values"""
+    sets = b",".join(_dumps(path) + b":" + raw for path, raw in changed.items())
+    return b'{"ts":' + _dumps(ts) + b',"set":{' + sets + b'},"del":' + _dumps(removed) + b"}"
+
+
+def _flatten(state: Dict[str, Any]) -> Dict[str, bytes]:
+    """Sub-store dict -> {entry path: serialized value}"""
+    entries: Dict[str, bytes] = {}
+    for key, value in state.items():
+        key = str(key)
+        if isinstance(value, dict):
+            entries[key] = _dumps({_MAP: 1})
+            for sub, sub_value in value.items():
+                entries[key + _SEP + str(sub)] = _dumps(sub_value)
+        elif isinstance(value, list) and len(value) > LIST_CHUNK:
+            chunks = (len(value) + LIST_CHUNK - 1) // LIST_CHUNK
+            entries[key] = _dumps({_LIST: chunks})
+            for i in range(chunks):
+                entries[f"{key}{_SEP}#{i}"] = _dumps(value[i * LIST_CHUNK:(i + 1) * LIST_CHUNK])
+        else:
+            entries[key] = _dumps(value)
+    return entries
+
+
+def _unflatten(entries: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of _flatten over decoded entry values"""
+    state: Dict[str, Any] = {}
+    children: Dict[str, Dict[str, Any]] = defaultdict(dict)
+    for path, value in entries.items():
+        if _SEP in path:
+            key, sub = path.split(_SEP, 1)
+            children[key][sub] = value
+        else:
+            state[path] = value
+    for key, value in state.items():
+        if isinstance(value, dict) and len(value) == 1:
+            if _MAP in value:
+                state[key] = children.get(key, {})
+            elif _LIST in value:
+                chunks = children.get(key, {})
+                items: List[Any] = []
+                for i in range(value[_LIST]):
+                    items.extend(chunks.get(f"#{i}", []))
+                state[key] = items
+    return state
+
+
+class _SubStore:
+    """Local segment files and diff state for one sub-store"""
+
+    def __init__(self, name: str, directory: Path):
+        self.name = name
+        self.base_path = directory / f"{name}.base"
+        self.delta_path = directory / f"{name}.delta"
+        self.digests: Optional[Dict[str, int]] = None   # None until loaded
+        self.updated_at = 0.0
+        self.base_bytes = 0
+        self.delta_bytes = 0
+
+    def exists(self) -> bool:
+        return self.base_path.exists() or self.delta_path.exists()
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """Replay base + delta frames into {entry path: value}; None if no files"""
+        if not self.exists():
+            return None
+        entries: Dict[str, Any] = {}
+        base, self.base_bytes = _read_frames(self.base_path)
+        deltas, self.delta_bytes = _read_frames(self.delta_path)
+        for frame in base + deltas:
+            entries.update(frame.get("set", {}))
+            for path in frame.get("del", []):
+                entries.pop(path, None)
+            self.updated_at = max(self.updated_at, frame.get("ts", 0))
+        return entries
+
+
+_FLUSH = object()
+
+
 class BrainPersistence:
     """
     Handles persistence for all AI learning systems.
 
-    Uses existing JSONBin for cloud persistence + local file backup.
-    Stores all brain data under "brain_learning" key to avoid conflicts.
+    Uses a local per-sub-store delta log as the primary tier, with a
+    debounced JSONBin snapshot for cross-deploy persistence. Stores all
+    brain data under "brain_learning" key to avoid conflicts.
     """
 
-    def __init__(self):
+    def __init__(self, brain_dir: Path = BRAIN_DIR, remote_interval: float = REMOTE_SYNC_INTERVAL):
         self.use_jsonbin = bool(JSONBIN_URL and JSONBIN_SECRET)
+        self.brain_dir = Path(brain_dir)
+        self.remote_interval = remote_interval
         self._ensure_data_dir()
         self._http_client = None
+
+        self._stores = {name: _SubStore(name, self.brain_dir) for name in SUB_STORES}
+        self._lock = threading.RLock()
+        # One whole-bin GET + PUT at a time: the brain writer and the genome
+        # sync both rewrite the same JSONBin record
+        self._remote_lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._remote_record: Optional[Dict] = None
+        self._remote_fetched = False
+        self._remote_dirty = False
+        self._last_remote_push = 0.0
+
+        self.metrics = {
+            "saves": 0,
+            "unchanged_saves": 0,
+            "entries_written": 0,
+            "delta_frames": 0,
+            "bytes_written": 0,
+            "compactions": 0,
+            "remote_pushes": 0,
+            "remote_failures": 0,
+            "save_ms_total": 0.0,
+            "save_ms_max": 0.0,
+            "write_ms_total": 0.0,
+            "write_ms_max": 0.0,
+        }
         logger.info(f"🧠 BrainPersistence initialized (JSONBin: {self.use_jsonbin})")
 
     def _ensure_data_dir(self):
         """Create data directory if it doesn't exist"""
         DATA_DIR.mkdir(parents=True, exist_ok=True)
+        self.brain_dir.mkdir(parents=True, exist_ok=True)
 
     def _get_http_client(self):
         """Get HTTP client (lazy init)"""
@@ -78,39 +305,108 @@ class BrainPersistence:
         ai_family_data: Dict = None,
         yield_memory_data: Dict = None
     ) -> bool:
-        """Save all brain learning data"""
-
-        # Build combined state
-        state = {
-            "saved_at": _now(),
-            "version": "2.0",
-            "metahive": metahive_data or {},
-            "ai_family": ai_family_data or {},
-            "yield_memory": yield_memory_data or {}
-        }
+        """Save the given sub-stores (None leaves a sub-store unchanged)"""
+        ok = True
+        for name, data in (("metahive", metahive_data),
+                           ("ai_family", ai_family_data),
+                           ("yield_memory", yield_memory_data)):
+            if data is not None:
+                ok = self.save_store(name, data) and ok
+        return ok
 
-        # Always save to local file first (backup)
-        self._save_to_file(state)
+    def load_all(self) -> Optional[Dict]:
+        """Load all brain learning data"""
+        data = {name: self.load_store(name) for name in SUB_STORES}
+        if not any(data.values()):
+            return None
+        updated = max(s.updated_at for s in self._stores.values())
+        return {
+            "saved_at": datetime.fromtimestamp(updated, timezone.utc).isoformat() + "Z" if updated else _now(),
+            "version": "3.0",
+            **{name: value or {} for name, value in data.items()},
+        }
 
-        # Then save to JSONBin if configured
-        if self.use_jsonbin:
-            return self._save_to_jsonbin(state)
+    def save_store(self, name: str, data: Dict, partial: bool = False) -> bool:
+        """
+        Diff one sub-store against its last save and queue the changed entries.
 
-        return True
+        With partial=True, dict-valued keys in `data` hold only the entries
+        that changed (e.g. just the users touched since the last save);
+        entries not present are kept rather than deleted.
 
-    def load_all(self) -> Optional[Dict]:
-        """Load all brain learning data"""
+        Serialization and diffing run here; disk and network writes run on
+        the background writer.
+        """
+        start = time.perf_counter()
+        store = self._stores[name]
+        try:
+            entries = _flatten(data)
+        except Exception as e:
+            logger.error(f"❌ Could not serialize {name}: {e}")
+            return False
 
-        # Try JSONBin first (most up-to-date)
-        if self.use_jsonbin:
-            data = self._load_from_jsonbin()
-            if data:
-                # Also update local backup
-                self._save_to_file(data)
-                return data
+        digests = {path: hash(raw) for path, raw in entries.items()}
+        with self._lock:
+            if store.digests is None:
+                self._load_locked(name)
+            previous = store.digests or {}
+            changed = {path: entries[path] for path, d in digests.items() if previous.get(path) != d}
+            if partial:
+                # Only non-map keys are replaced wholesale (e.g. a re-chunked list)
+                replaced = {k for k, v in data.items() if not isinstance(v, dict)}
+                removed = [path for path in previous
+                           if path not in digests and path.split(_SEP, 1)[0] in replaced]
+                for path in removed:
+                    del previous[path]
+                previous.update(digests)
+                store.digests = previous
+            else:
+                removed = [path for path in previous if path not in digests]
+                store.digests = digests
+
+        if changed or removed:
+            self._enqueue((name, time.time(), changed, removed))
+        else:
+            self.metrics["unchanged_saves"] += 1
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.metrics["saves"] += 1
+        self.metrics["save_ms_total"] += elapsed
+        self.metrics["save_ms_max"] = max(self.metrics["save_ms_max"], elapsed)
+        return True
 
-        # Fall back to local file
-        return self._load_from_file()
+    def load_store(self, name: str) -> Optional[Dict]:
+        """Load one sub-store (local log, or JSONBin / legacy file if newer or missing)"""
+        with self._lock:
+            return self._load_locked(name)
+
+    def _load_locked(self, name: str) -> Optional[Dict]:
+        store = self._stores[name]
+        entries = store.read()
+        state = _unflatten(entries) if entries is not None else None
+
+        # JSONBin wins when it holds a newer snapshot (e.g. another deploy wrote it)
+        remote = self._remote_brain()
+        if remote and remote.get(name) and _parse_saved_at(remote.get("saved_at")) > store.updated_at:
+            state = remote[name]
+            self._adopt(name, state, _parse_saved_at(remote.get("saved_at")))
+        elif state is None:
+            legacy = self._load_from_file()
+            if legacy and legacy.get(name):
+                state = legacy[name]
+                self._adopt(name, state, _parse_saved_at(legacy.get("saved_at")))
+                logger.info(f"📂 Imported {name} from {BRAIN_LEARNING_FILE.name}")
+
+        if store.digests is None or state is not None:
+            store.digests = {path: hash(raw) for path, raw in _flatten(state or {}).items()}
+        return state
+
+    def _adopt(self, name: str, state: Dict, ts: float):
+        """Write an externally sourced snapshot as the local base"""
+        store = self._stores[name]
+        entries = _flatten(state)
+        self._write_base(store, entries, ts or time.time())
+        store.updated_at = ts or time.time()
 
     # ═══════════════════════════════════════════════════════════════════════════
     # COMPONENT-SPECIFIC SAVE/LOAD
@@ -118,76 +414,164 @@ class BrainPersistence:
 
     def save_metahive(self, data: Dict) -> bool:
         """Save MetaHive data"""
-        current = self.load_all() or {}
-        current["metahive"] = data
-        current["saved_at"] = _now()
-        return self.save_all(
-            metahive_data=data,
-            ai_family_data=current.get("ai_family"),
-            yield_memory_data=current.get("yield_memory")
-        )
+        return self.save_store("metahive", data)
 
     def load_metahive(self) -> Optional[Dict]:
         """Load MetaHive data"""
-        data = self.load_all()
-        return data.get("metahive") if data else None
+        return self.load_store("metahive")
 
     def save_ai_family(self, data: Dict) -> bool:
         """Save AI Family Brain data"""
-        current = self.load_all() or {}
-        current["ai_family"] = data
-        current["saved_at"] = _now()
-        return self.save_all(
-            metahive_data=current.get("metahive"),
-            ai_family_data=data,
-            yield_memory_data=current.get("yield_memory")
-        )
+        return self.save_store("ai_family", data)
 
     def load_ai_family(self) -> Optional[Dict]:
         """Load AI Family Brain data"""
-        data = self.load_all()
-        return data.get("ai_family") if data else None
+        return self.load_store("ai_family")
 
     def save_yield_memory(self, data: Dict) -> bool:
         """Save Yield Memory data"""
-        current = self.load_all() or {}
-        current["yield_memory"] = data
-        current["saved_at"] = _now()
-        return self.save_all(
-            metahive_data=current.get("metahive"),
-            ai_family_data=current.get("ai_family"),
-            yield_memory_data=data
-        )
+        return self.save_store("yield_memory", data)
 
     def load_yield_memory(self) -> Optional[Dict]:
         """Load Yield Memory data"""
-        data = self.load_all()
-        return data.get("yield_memory") if data else None
+        return self.load_store("yield_memory")
 
     # ═══════════════════════════════════════════════════════════════════════════
-    # FILE STORAGE (Local backup)
+    # BACKGROUND WRITER
     # ═══════════════════════════════════════════════════════════════════════════
 
-    def _save_to_file(self, data: Dict) -> bool:
-        """Save data to local JSON file"""
-        try:
-            self._ensure_data_dir()
+    def _enqueue(self, item):
+        self._queue.put(item)
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._run_writer, name="brain-writer", daemon=True)
+                    self._writer.start()
+                    atexit.register(self.flush)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Block until queued saves are on disk (and pushed to JSONBin if due)"""
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
 
-            # Write to temp file first, then rename (atomic)
-            temp_path = BRAIN_LEARNING_FILE.with_suffix('.tmp')
-            with open(temp_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+    def _run_writer(self):
+        while True:
+            try:
+                items = [self._queue.get(timeout=max(1.0, self.remote_interval))]
+            except queue.Empty:
+                items = []
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            flushes = [item[1] for item in items if item[0] is _FLUSH]
+            try:
+                self._write_batch([item for item in items if item[0] is not _FLUSH])
+                self._maybe_push_remote(force=bool(flushes))
+            except Exception as e:
+                logger.error(f"❌ Brain writer error: {e}")
+            for done in flushes:
+                done.set()
+
+    def _write_batch(self, items: List[Tuple]):
+        """Coalesce queued saves per sub-store and append one frame each"""
+        merged: Dict[str, List] = {}
+        for name, ts, changed, removed in items:
+            if name not in merged:
+                merged[name] = [ts, dict(changed), set(removed)]
+                continue
+            m = merged[name]
+            m[0] = ts
+            for path in removed:
+                m[1].pop(path, None)
+            m[2].difference_update(changed)
+            m[2].update(removed)
+            m[1].update(changed)
+
+        for name, (ts, changed, removed) in merged.items():
+            start = time.perf_counter()
+            store = self._stores[name]
+            frame = _frame(_delta_payload(ts, changed, sorted(removed)))
+            # Held so a concurrent load never sees (and truncates) a half-written frame
+            with self._lock:
+                fd = os.open(store.delta_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, frame)
+                finally:
+                    os.close(fd)
+                store.delta_bytes += len(frame)
+                store.updated_at = ts
+                self.metrics["delta_frames"] += 1
+                self.metrics["entries_written"] += len(changed) + len(removed)
+                self.metrics["bytes_written"] += len(frame)
+
+                if store.delta_bytes > max(COMPACT_MIN_BYTES, COMPACT_RATIO * store.base_bytes):
+                    # The new base is the state after this frame, so replaying
+                    # any leftover delta on top of it is harmless
+                    current = store.read() or {}
+                    self._write_base(store, {path: _dumps(v) for path, v in current.items()}, ts)
+                    self.metrics["compactions"] += 1
+
+            elapsed = (time.perf_counter() - start) * 1000
+            self.metrics["write_ms_total"] += elapsed
+            self.metrics["write_ms_max"] = max(self.metrics["write_ms_max"], elapsed)
+            self._remote_dirty = True
+
+    def _write_base(self, store: _SubStore, entries: Dict[str, bytes], ts: float):
+        """Replace base with a full snapshot and truncate the delta log"""
+        frame = _frame(_delta_payload(ts, entries, []))
+        tmp_path = store.base_path.with_suffix(".base.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(frame)
+        os.replace(tmp_path, store.base_path)
+        with open(store.delta_path, "wb"):
+            pass
+        store.base_bytes = len(frame)
+        store.delta_bytes = 0
+        self.metrics["bytes_written"] += len(frame)
 
-            temp_path.rename(BRAIN_LEARNING_FILE)
-            logger.debug(f"💾 Saved to local file")
-            return True
+    # ═══════════════════════════════════════════════════════════════════════════
+    # JSONBIN STORAGE (Cloud persistence)
+    # ═══════════════════════════════════════════════════════════════════════════
 
-        except Exception as e:
-            logger.error(f"❌ Failed to save local file: {e}")
-            return False
+    def _maybe_push_remote(self, force: bool = False):
+        """Push a full snapshot rebuilt from the local tier, at most once per interval"""
+        if not (self.use_jsonbin and self._remote_dirty):
+            return
+        if not force and time.time() - self._last_remote_push < self.remote_interval:
+            return
+        with self._lock:
+            # saved_at is the newest local write, so a restart with this disk
+            # intact keeps preferring the local tier
+            updated = max(s.updated_at for s in self._stores.values()) or time.time()
+            state = {"saved_at": datetime.fromtimestamp(updated, timezone.utc).isoformat() + "Z", "version": "3.0"}
+            for name, store in self._stores.items():
+                entries = store.read()
+                state[name] = _unflatten(entries) if entries is not None else {}
+        self._remote_dirty = False
+        self._last_remote_push = time.time()
+        if self._save_to_jsonbin(state):
+            self.metrics["remote_pushes"] += 1
+        else:
+            self.metrics["remote_failures"] += 1
+            self._remote_dirty = True
+
+    def _remote_brain(self) -> Optional[Dict]:
+        """JSONBin brain record, fetched at most once per process (for lazy loads)"""
+        if not self.use_jsonbin:
+            return None
+        if not self._remote_fetched:
+            self._remote_fetched = True
+            self._remote_record = self._load_from_jsonbin()
+        return self._remote_record
 
     def _load_from_file(self) -> Optional[Dict]:
-        """Load data from local JSON file"""
+        """Load the legacy single-blob JSON file"""
         try:
             if BRAIN_LEARNING_FILE.exists():
                 with open(BRAIN_LEARNING_FILE, 'r') as f:
@@ -200,46 +584,77 @@ class BrainPersistence:
             logger.error(f"❌ Failed to load local file: {e}")
             return None
 
-    # ═══════════════════════════════════════════════════════════════════════════
-    # JSONBIN STORAGE (Cloud persistence)
-    # ═══════════════════════════════════════════════════════════════════════════
-
     def _save_to_jsonbin(self, brain_data: Dict) -> bool:
         """Save brain data to JSONBin under 'brain_learning' key"""
-        try:
-            client = self._get_http_client()
-
-            # First, get current JSONBin content
-            headers = {"X-Master-Key": JSONBIN_SECRET}
-            response = client.get(JSONBIN_URL, headers=headers)
-
-            if response.status_code == 200:
-                # Parse existing data
-                result = response.json()
-                existing = result.get("record", {})
-                if isinstance(existing, list):
-                    # Convert list to dict if needed
-                    existing = {"users": existing}
-            else:
-                existing = {}
+        with self._remote_lock:
+            try:
+                client = self._get_http_client()
+
+                # First, get current JSONBin content
+                headers = {"X-Master-Key": JSONBIN_SECRET}
+                response = client.get(JSONBIN_URL, headers=headers)
+
+                if response.status_code == 200:
+                    # Parse existing data
+                    result = response.json()
+                    existing = result.get("record", {})
+                    if isinstance(existing, list):
+                        # Convert list to dict if needed
+                        existing = {"users": existing}
+                else:
+                    existing = {}
+
+                # Update with brain data (preserves other keys like user data)
+                existing[BRAIN_DATA_KEY] = brain_data
+
+                # Save back to JSONBin
+                headers["Content-Type"] = "application/json"
+                response = client.put(JSONBIN_URL, headers=headers, json=existing)
+
+                if response.status_code == 200:
+                    logger.info("☁️ Saved brain learning to JSONBin")
+                    return True
+                else:
+                    logger.warning(f"⚠️ JSONBin save failed: {response.status_code}")
+                    return False
+
+            except Exception as e:
+                logger.error(f"❌ JSONBin save error: {e}")
+                return False
 
-            # Update with brain data (preserves other keys like user data)
-            existing[BRAIN_DATA_KEY] = brain_data
+    def merge_into_jsonbin(self, key: str, entries: Dict[str, Any]) -> bool:
+        """Merge entries into the dict stored under `key` in one GET + PUT"""
+        with self._remote_lock:
+            try:
+                client = self._get_http_client()
 
-            # Save back to JSONBin
-            headers["Content-Type"] = "application/json"
-            response = client.put(JSONBIN_URL, headers=headers, json=existing)
+                headers = {"X-Master-Key": JSONBIN_SECRET}
+                response = client.get(JSONBIN_URL, headers=headers)
 
-            if response.status_code == 200:
-                logger.info("☁️ Saved brain learning to JSONBin")
-                return True
-            else:
-                logger.warning(f"⚠️ JSONBin save failed: {response.status_code}")
+                existing = {}
+                if response.status_code == 200:
+                    existing = response.json().get("record", {})
+                    if isinstance(existing, list):
+                        existing = {"users": existing}
+
+                section = existing.get(key)
+                if not isinstance(section, dict):
+                    section = {}
+                section.update(entries)
+                existing[key] = section
+
+                headers["Content-Type"] = "application/json"
+                response = client.put(JSONBIN_URL, headers=headers, json=existing)
+
+                if response.status_code == 200:
+                    logger.info(f"☁️ Merged {len(entries)} entries into JSONBin '{key}'")
+                    return True
+                logger.warning(f"⚠️ JSONBin merge failed: {response.status_code}")
                 return False
 
-        except Exception as e:
-            logger.error(f"❌ JSONBin save error: {e}")
-            return False
+            except Exception as e:
+                logger.error(f"❌ JSONBin merge error: {e}")
+                return False
 
     def _load_from_jsonbin(self) -> Optional[Dict]:
         """Load brain data from JSONBin"""
@@ -275,19 +690,30 @@ class BrainPersistence:
 
     def get_storage_stats(self) -> Dict[str, Any]:
         """Get storage statistics"""
+        m = self.metrics
         stats = {
             "jsonbin_enabled": self.use_jsonbin,
             "jsonbin_url": JSONBIN_URL[:50] + "..." if JSONBIN_URL else None,
-            "local_file": str(BRAIN_LEARNING_FILE),
-            "local_file_exists": BRAIN_LEARNING_FILE.exists()
+            "local_dir": str(self.brain_dir),
+            "codec": ("orjson" if HAS_ORJSON else "json") + "+" + ("zstd" if HAS_ZSTD else "zlib"),
+            "pending_writes": self._queue.qsize(),
+            "sub_stores": {
+                name: {
+                    "loaded": store.digests is not None,
+                    "entries": len(store.digests or {}),
+                    "base_kb": round(store.base_bytes / 1024, 2),
+                    "delta_kb": round(store.delta_bytes / 1024, 2),
+                    "updated_at": datetime.fromtimestamp(store.updated_at, timezone.utc).isoformat()
+                    if store.updated_at else None,
+                }
+                for name, store in self._stores.items()
+            },
+            "metrics": {
+                **m,
+                "save_ms_avg": round(m["save_ms_total"] / max(1, m["saves"]), 3),
+                "write_ms_avg": round(m["write_ms_total"] / max(1, m["delta_frames"]), 3),
+            },
         }
-
-        if BRAIN_LEARNING_FILE.exists():
-            stats["local_file_size_kb"] = round(BRAIN_LEARNING_FILE.stat().st_size / 1024, 2)
-            stats["local_file_modified"] = datetime.fromtimestamp(
-                BRAIN_LEARNING_FILE.stat().st_mtime
-            ).isoformat()
-
         return stats
 
 
@@ -361,16 +787,23 @@ def load_ai_family_learning() -> Optional[Dict]:
 
 def save_yield_memory_learning(
     yield_memory: Dict[str, List[Dict]],
-    user_ai_preferences: Dict[str, Dict]
+    user_ai_preferences: Dict[str, Dict],
+    partial: bool = False,
+    user_count: Optional[int] = None
 ) -> bool:
-    """Save Yield Memory to persistent storage"""
+    """
+    Save Yield Memory to persistent storage
+
+    With partial=True, the dicts hold only users changed since the last
+    save; pass the overall user_count alongside.
+    """
     data = {
         "yield_memory": yield_memory,
         "user_ai_preferences": user_ai_preferences,
-        "user_count": len(yield_memory),
+        "user_count": user_count if user_count is not None else len(yield_memory),
         "saved_at": _now()
     }
-    return get_persistence().save_yield_memory(data)
+    return get_persistence().save_store("yield_memory", data, partial=partial)
 
 
 def load_yield_memory_learning() -> Optional[Dict]:
@@ -384,7 +817,7 @@ print(f"""
 ═══════════════════════════════════════════════════════════════════════════════
 
    JSONBin Cloud Storage: {"✓ ENABLED" if JSONBIN_URL and JSONBIN_SECRET else "✗ Disabled (no JSONBIN_URL)"}
-   Local File Backup: ✓ data/brain_learning.json
+   Local Delta Log: ✓ data/brain/ (per sub-store base + delta)
 
    Brain data stored under key: "{BRAIN_DATA_KEY}"
    (Won't conflict with your existing JSONBin user data)
@@ -6,12 +6,21 @@ Features:
 - Pattern-based blocking
 - Reason tracking
 - Runtime additions
+
+Lookups:
+- Domains live in a reversed-label trie, so a block on example.com also
+  covers www.example.com, m.example.com, etc.
+- All patterns are OR-ed into one regex; only URLs it matches are
+  re-checked pattern by pattern to pick the reason.
+- Verdicts are LRU-cached per host and per URL. The caches are cleared
+  whenever the block lists change.
 """
 
 import re
 import logging
-from typing import Dict, List, Optional, Set, Tuple
-from urllib.parse import urlparse
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +55,64 @@ BLOCKED_DOMAINS: Dict[str, str] = {
     'scam-site.example': 'Known scam',
 }
 
+# Verdict cache sizes
+HOST_CACHE_SIZE = 65536
+URL_CACHE_SIZE = 262144
+
+_TERMINAL = ''
+
+
+def _build_trie(domains: Dict[str, str]) -> Dict:
+    """Build a reversed-label trie: {'com': {'facebook': {'': reason}}}"""
+    trie: Dict = {}
+    for domain, reason in domains.items():
+        labels = domain.lower().strip('.').split('.')
+        node = trie
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        node.setdefault(_TERMINAL, reason)
+    return trie
+
+
+def _trie_lookup(trie: Dict, host: str) -> Optional[str]:
+    """Reason for the most specific blocked suffix of host, if any"""
+    node = trie
+    reason = None
+    for label in reversed(host.split('.')):
+        node = node.get(label)
+        if node is None:
+            break
+        if _TERMINAL in node:
+            reason = node[_TERMINAL]
+    return reason
+
+
+def extract_host(url: str) -> str:
+    """
+    Lowercased hostname of url (no userinfo, port or trailing dot).
+
+    Plain http(s) URLs are sliced directly; anything else goes through
+    urlsplit. Returns '' when the URL has no network location.
+    """
+    if url.startswith(('https://', 'http://')) and not any(c in url for c in '\t\r\n'):
+        rest = url[8:] if url[4] == 's' else url[7:]
+        end = len(rest)
+        for sep in '/?#':
+            i = rest.find(sep, 0, end)
+            if i >= 0:
+                end = i
+        netloc = rest[:end]
+    else:
+        netloc = urlsplit(url).netloc
+
+    host = netloc.rpartition('@')[2]
+    if host.startswith('['):
+        host = host[:host.find(']') + 1]
+    else:
+        host = host.partition(':')[0]
+    return host.lower().rstrip('.')
+
+
 # Patterns to block
 BLOCKED_PATTERNS: List[Tuple[str, str]] = [
     (r'\.mil$', 'Military domain'),
@@ -92,6 +159,56 @@ class DNTRegistry:
             'pattern_blocks': 0,
         }
 
+        self._rebuild()
+
+    def _rebuild(self):
+        """Recompile tries, combined pattern and caches from the block lists"""
+        self._domain_trie = _build_trie(self.blocked_domains)
+        self._runtime_trie = _build_trie(self.runtime_blocks)
+        self._any_pattern = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern, _ in self.blocked_patterns),
+            re.IGNORECASE
+        ) if self.blocked_patterns else None
+        self._host_verdict = lru_cache(maxsize=HOST_CACHE_SIZE)(self._host_verdict_uncached)
+        self._url_verdict = lru_cache(maxsize=URL_CACHE_SIZE)(self._url_verdict_uncached)
+
+    def _host_verdict_uncached(self, host: str) -> Optional[str]:
+        """Domain block reason for host (permanent list first, then runtime)"""
+        reason = _trie_lookup(self._domain_trie, host)
+        if reason is None and self.runtime_blocks:
+            reason = _trie_lookup(self._runtime_trie, host)
+        return reason
+
+    def _url_verdict_uncached(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """(block kind, reason) for url; kind is 'domain', 'pattern' or None"""
+        try:
+            host = extract_host(url)
+            if not host:
+                return None, None
+
+            reason = self._host_verdict(host)
+            if reason is not None:
+                return 'domain', reason
+
+            if self._any_pattern is not None and self._any_pattern.search(url):
+                for pattern, reason in self.compiled_patterns:
+                    if pattern.search(url):
+                        return 'pattern', reason
+
+            return None, None
+
+        except Exception as e:
+            logger.debug(f"[dnt] Error checking {url}: {e}")
+            return None, None
+
+    def _count(self, kind: Optional[str], n: int = 1):
+        if kind == 'domain':
+            self.stats['blocked'] += n
+            self.stats['domain_blocks'] += n
+        elif kind == 'pattern':
+            self.stats['blocked'] += n
+            self.stats['pattern_blocks'] += n
+
     def is_blocked(self, url: str) -> Tuple[bool, Optional[str]]:
         """
         Check if URL is blocked.
@@ -100,55 +217,43 @@ class DNTRegistry:
             Tuple of (is_blocked, reason)
         """
         self.stats['checked'] += 1
-
-        try:
-            parsed = urlparse(url)
-            host = parsed.netloc.lower()
-
-            if not host:
-                return False, None
-
-            # Check exact domain match
-            if host in self.blocked_domains:
-                self.stats['blocked'] += 1
-                self.stats['domain_blocks'] += 1
-                reason = self.blocked_domains[host]
-                logger.info(f"[dnt] Blocked {host}: {reason}")
-                return True, reason
-
-            # Check runtime blocks
-            if host in self.runtime_blocks:
-                self.stats['blocked'] += 1
-                self.stats['domain_blocks'] += 1
-                reason = self.runtime_blocks[host]
-                return True, reason
-
-            # Check domain without www
-            host_no_www = host.replace('www.', '')
-            if host_no_www in self.blocked_domains:
-                self.stats['blocked'] += 1
-                self.stats['domain_blocks'] += 1
-                reason = self.blocked_domains[host_no_www]
-                return True, reason
-
-            # Check patterns
-            for pattern, reason in self.compiled_patterns:
-                if pattern.search(url):
-                    self.stats['blocked'] += 1
-                    self.stats['pattern_blocks'] += 1
-                    logger.info(f"[dnt] Pattern blocked {url}: {reason}")
-                    return True, reason
-
+        kind, reason = self._url_verdict(url)
+        if kind is None:
             return False, None
+        self._count(kind)
+        logger.debug(f"[dnt] Blocked {url}: {reason}")
+        return True, reason
 
-        except Exception as e:
-            logger.debug(f"[dnt] Error checking {url}: {e}")
-            return False, None
+    def check_many(self, urls: Iterable[str]) -> List[Tuple[bool, Optional[str]]]:
+        """
+        Check many URLs at once.
+
+        Same verdicts as is_blocked() per URL; stats are updated once for
+        the whole batch.
+        """
+        verdict = self._url_verdict
+        results = []
+        domain_blocks = pattern_blocks = 0
+        for url in urls:
+            kind, reason = verdict(url)
+            if kind is None:
+                results.append((False, None))
+            else:
+                results.append((True, reason))
+                if kind == 'domain':
+                    domain_blocks += 1
+                else:
+                    pattern_blocks += 1
+        self.stats['checked'] += len(results)
+        self._count('domain', domain_blocks)
+        self._count('pattern', pattern_blocks)
+        return results
 
     def add_block(self, domain: str, reason: str):
-        """Add domain to runtime blocklist"""
+        """Add domain (and its subdomains) to runtime blocklist"""
         domain = domain.lower().replace('www.', '')
         self.runtime_blocks[domain] = reason
+        self._rebuild()
         logger.info(f"[dnt] Added block: {domain} ({reason})")
 
     def remove_block(self, domain: str):
@@ -156,6 +261,7 @@ class DNTRegistry:
         domain = domain.lower().replace('www.', '')
         if domain in self.runtime_blocks:
             del self.runtime_blocks[domain]
+            self._rebuild()
             logger.info(f"[dnt] Removed block: {domain}")
 
     def get_blocked_domains(self) -> List[Dict]:
@@ -180,14 +286,14 @@ class DNTRegistry:
 
     def filter_urls(self, urls: List[str]) -> List[str]:
         """Filter list of URLs, removing blocked ones"""
-        return [url for url in urls if not self.is_blocked(url)[0]]
+        verdicts = self.check_many(urls)
+        return [url for url, (is_blocked, _) in zip(urls, verdicts) if not is_blocked]
 
     def filter_opportunities(self, opportunities: List[Dict]) -> List[Dict]:
         """Filter opportunities, removing those with blocked URLs"""
+        verdicts = self.check_many([opp.get('url', '') for opp in opportunities])
         filtered = []
-        for opp in opportunities:
-            url = opp.get('url', '')
-            is_blocked, reason = self.is_blocked(url)
+        for opp, (is_blocked, reason) in zip(opportunities, verdicts):
             if is_blocked:
                 opp['blocked'] = True
                 opp['blocked_reason'] = reason
@@ -197,11 +303,14 @@ class DNTRegistry:
 
     def get_stats(self) -> Dict:
         """Get registry stats"""
+        url_cache = self._url_verdict.cache_info()
         return {
             **self.stats,
             'permanent_blocks': len(self.blocked_domains),
             'runtime_blocks': len(self.runtime_blocks),
             'patterns': len(self.blocked_patterns),
+            'url_cache_hits': url_cache.hits,
+            'url_cache_size': url_cache.currsize,
         }
 
 
@@ -1,31 +1,33 @@
 """
-RATE LIMITER: Per-Host Token Bucket Rate Limiting
+RATE LIMITER: Per-Host Rate Limiting Service
+
+One limiter shared by every component that sends requests to external
+hosts (discovery collector, headless connector, compliance guards), so
+their combined rate respects each host's limit.
 
 Features:
-- Token bucket algorithm
-- Per-host rate limits
-- Configurable defaults
-- Burst handling
+- GCRA (generic cell rate algorithm): token-bucket semantics kept as one
+  "theoretical arrival time" per host
+- Per-host rates with burst capacity
+- Weighted costs (an expensive request can consume several tokens)
+- robots.txt Crawl-delay integration (set by compliance.robots_guard)
+- Waiters reserve their slot on arrival (FIFO) and sleep until it comes
+  up; the event loop's timer heap wakes them, nothing polls
+- Optional SQLite backend so several worker processes share one limit
+  (set RATE_LIMIT_DB to the database path)
 """
 
 import asyncio
+import os
+import sqlite3
+import threading
 import time
 import logging
-from typing import Dict, Optional
-from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class TokenBucket:
-    """Token bucket for rate limiting"""
-    tokens: float
-    last_update: float
-    rate: float  # tokens per second
-    capacity: float  # max tokens
-
-
 # Default rate limits per host
 DEFAULT_RATES: Dict[str, Dict] = {
     # High rate (1 req/s)
@@ -61,14 +63,114 @@ DEFAULT_RATES: Dict[str, Dict] = {
 }
 
 
+class MemoryBackend:
+    """In-process GCRA state: host -> theoretical arrival time"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._tat: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(
+        self, host: str, increment: float, window: float, now: float, max_wait: Optional[float]
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Reserve the next slot for host.
+
+        Returns (wait_seconds, new_tat), or None without reserving when the
+        wait would exceed max_wait.
+        """
+        with self._lock:
+            new_tat = max(self._tat.get(host, now), now) + increment
+            wait = max(0.0, new_tat - window - now)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tat[host] = new_tat
+            return wait, new_tat
+
+    def refund(self, host: str, increment: float, new_tat: float):
+        """Give back a reservation if no later one was made on top of it"""
+        with self._lock:
+            if self._tat.get(host) == new_tat:
+                self._tat[host] = new_tat - increment
+
+    def peek(self, host: str, increment: float, window: float, now: float) -> float:
+        """Wait a reservation would need right now, without making it"""
+        with self._lock:
+            return max(0.0, max(self._tat.get(host, now), now) + increment - window - now)
+
+    def host_count(self) -> int:
+        return len(self._tat)
+
+
+class SQLiteBackend:
+    """
+    GCRA state in a SQLite table, shared by every process using the same
+    file. Each reservation is one short IMMEDIATE transaction.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_tat (host TEXT PRIMARY KEY, tat REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def _tat(self, host: str, now: float) -> float:
+        row = self._conn.execute("SELECT tat FROM rate_limit_tat WHERE host = ?", (host,)).fetchone()
+        return max(row[0], now) if row else now
+
+    def reserve(
+        self, host: str, increment: float, window: float, now: float, max_wait: Optional[float]
+    ) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                new_tat = self._tat(host, now) + increment
+                wait = max(0.0, new_tat - window - now)
+                if max_wait is not None and wait > max_wait:
+                    self._conn.execute("ROLLBACK")
+                    return None
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit_tat (host, tat) VALUES (?, ?)", (host, new_tat)
+                )
+                self._conn.execute("COMMIT")
+                return wait, new_tat
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def refund(self, host: str, increment: float, new_tat: float):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE rate_limit_tat SET tat = ? WHERE host = ? AND tat = ?",
+                (new_tat - increment, host, new_tat)
+            )
+
+    def peek(self, host: str, increment: float, window: float, now: float) -> float:
+        with self._lock:
+            return max(0.0, self._tat(host, now) + increment - window - now)
+
+    def host_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rate_limit_tat").fetchone()[0]
+
+
 class RateLimiter:
     """
-    Per-host token bucket rate limiter.
+    Per-host GCRA rate limiter.
 
     Features:
     - Configurable per-host rates
     - Burst capacity
-    - Async waiting
+    - Weighted costs
+    - Crawl-delay floors
+    - Async waiting (FIFO by arrival)
     """
 
     DEFAULT_RATE = 0.5  # requests per second
@@ -78,79 +180,78 @@ class RateLimiter:
         self,
         default_rate: Optional[float] = None,
         default_capacity: Optional[float] = None,
-        host_rates: Optional[Dict[str, Dict]] = None
+        host_rates: Optional[Dict[str, Dict]] = None,
+        backend=None
     ):
         self.default_rate = default_rate or self.DEFAULT_RATE
         self.default_capacity = default_capacity or self.DEFAULT_CAPACITY
-        self.host_rates = host_rates or DEFAULT_RATES
+        self.host_rates = dict(host_rates or DEFAULT_RATES)
+        self.crawl_delays: Dict[str, float] = {}
+        self.backend = backend or MemoryBackend()
+
+        # host -> (emission interval, burst window) in seconds
+        self._limits: Dict[str, Tuple[float, float]] = {}
 
-        self.buckets: Dict[str, TokenBucket] = {}
         self.stats = {
             'requests': 0,
             'waited': 0,
             'total_wait_time': 0.0,
+            'max_wait_time': 0.0,
+            'rejected': 0,
+            'cancelled': 0,
+            'tokens': 0.0,
         }
-        self._lock = asyncio.Lock()
 
-    def _get_bucket(self, host: str) -> TokenBucket:
-        """Get or create token bucket for host"""
-        if host not in self.buckets:
+    def _limit(self, host: str) -> Tuple[float, float]:
+        """Emission interval and burst window for host"""
+        limit = self._limits.get(host)
+        if limit is None:
             config = self.host_rates.get(host, {})
             rate = config.get('rate', self.default_rate)
             capacity = config.get('capacity', self.default_capacity)
+            interval = 1.0 / rate
 
-            self.buckets[host] = TokenBucket(
-                tokens=capacity,  # Start full
-                last_update=time.time(),
-                rate=rate,
-                capacity=capacity,
-            )
+            crawl_delay = self.crawl_delays.get(host)
+            if crawl_delay:
+                # Crawl-delay means one request per delay, no bursts
+                interval = max(interval, crawl_delay)
+                capacity = 1
 
-        return self.buckets[host]
+            limit = self._limits[host] = (interval, capacity * interval)
+        return limit
 
-    def _refill(self, bucket: TokenBucket):
-        """Refill bucket based on elapsed time"""
-        now = time.time()
-        elapsed = now - bucket.last_update
-
-        # Add tokens based on elapsed time
-        bucket.tokens = min(
-            bucket.capacity,
-            bucket.tokens + elapsed * bucket.rate
-        )
-        bucket.last_update = now
-
-    async def acquire(self, host: str, tokens: float = 1.0) -> float:
+    async def acquire(
+        self, host: str, tokens: float = 1.0, max_wait: Optional[float] = None
+    ) -> Optional[float]:
         """
-        Acquire tokens from bucket, waiting if necessary.
+        Acquire tokens for host, waiting if necessary.
 
-        Returns wait time in seconds.
+        Returns wait time in seconds, or None (without waiting or
+        consuming anything) when the wait would exceed max_wait.
         """
-        async with self._lock:
-            self.stats['requests'] += 1
-            bucket = self._get_bucket(host)
-            self._refill(bucket)
-
-            if bucket.tokens >= tokens:
-                # Have enough tokens
-                bucket.tokens -= tokens
-                return 0.0
-
-            # Need to wait
-            wait_time = (tokens - bucket.tokens) / bucket.rate
-            self.stats['waited'] += 1
-            self.stats['total_wait_time'] += wait_time
+        interval, window = self._limit(host)
+        increment = tokens * interval
+        self.stats['requests'] += 1
+
+        reservation = self.backend.reserve(host, increment, window, time.time(), max_wait)
+        if reservation is None:
+            self.stats['rejected'] += 1
+            return None
+
+        wait_time, new_tat = reservation
+        self.stats['tokens'] += tokens
 
-        # Wait outside lock
         if wait_time > 0:
+            self.stats['waited'] += 1
+            self.stats['total_wait_time'] += wait_time
+            self.stats['max_wait_time'] = max(self.stats['max_wait_time'], wait_time)
             logger.debug(f"[rate_limit] Waiting {wait_time:.2f}s for {host}")
-            await asyncio.sleep(wait_time)
-
-        # Deduct tokens after wait
-        async with self._lock:
-            bucket = self._get_bucket(host)
-            self._refill(bucket)
-            bucket.tokens -= tokens
+            try:
+                await asyncio.sleep(wait_time)
+            except asyncio.CancelledError:
+                self.backend.refund(host, increment, new_tat)
+                self.stats['cancelled'] += 1
+                raise
 
         return wait_time
 
@@ -160,25 +261,12 @@ class RateLimiter:
 
         Returns True if tokens were acquired.
         """
-        async with self._lock:
-            bucket = self._get_bucket(host)
-            self._refill(bucket)
-
-            if bucket.tokens >= tokens:
-                bucket.tokens -= tokens
-                return True
-
-            return False
+        return await self.acquire(host, tokens, max_wait=0.0) is not None
 
     def get_wait_time(self, host: str, tokens: float = 1.0) -> float:
         """Get estimated wait time without acquiring"""
-        bucket = self._get_bucket(host)
-        self._refill(bucket)
-
-        if bucket.tokens >= tokens:
-            return 0.0
-
-        return (tokens - bucket.tokens) / bucket.rate
+        interval, window = self._limit(host)
+        return self.backend.peek(host, tokens * interval, window, time.time())
 
     def set_rate(self, host: str, rate: float, capacity: Optional[float] = None):
         """Set rate limit for specific host"""
@@ -186,9 +274,15 @@ class RateLimiter:
             'rate': rate,
             'capacity': capacity or self.default_capacity,
         }
-        # Reset bucket
-        if host in self.buckets:
-            del self.buckets[host]
+        self._limits.pop(host, None)
+
+    def set_crawl_delay(self, host: str, crawl_delay: Optional[float]):
+        """Apply (or clear) a robots.txt Crawl-delay floor for host"""
+        if crawl_delay:
+            self.crawl_delays[host] = float(crawl_delay)
+        else:
+            self.crawl_delays.pop(host, None)
+        self._limits.pop(host, None)
 
     def get_stats(self) -> Dict:
         """Get rate limiter stats"""
@@ -197,7 +291,9 @@ class RateLimiter:
             'avg_wait_time': (
                 self.stats['total_wait_time'] / max(1, self.stats['waited'])
             ),
-            'hosts_tracked': len(self.buckets),
+            'hosts_tracked': self.backend.host_count(),
+            'crawl_delays': len(self.crawl_delays),
+            'backend': self.backend.name,
         }
 
 
@@ -206,8 +302,10 @@ _rate_limiter: Optional[RateLimiter] = None
 
 
 def get_rate_limiter() -> RateLimiter:
-    """Get or create rate limiter instance"""
+    """Get or create the shared rate limiter (SQLite-backed if RATE_LIMIT_DB is set)"""
     global _rate_limiter
     if _rate_limiter is None:
-        _rate_limiter = RateLimiter()
+        db_path = os.getenv('RATE_LIMIT_DB')
+        backend = SQLiteBackend(db_path) if db_path else None
+        _rate_limiter = RateLimiter(backend=backend)
     return _rate_limiter
@@ -3,12 +3,11 @@ ROBOTS GUARD: robots.txt Compliance
 
 Features:
 - Parse and cache robots.txt files
-- Respect Crawl-delay directives
+- Respect Crawl-delay directives (fed to the shared rate limiter)
 - Block disallowed paths
 - User-agent specific rules
 """
 
-import asyncio
 import logging
 import time
 from typing import Dict, Optional, Set, Tuple
@@ -16,6 +15,8 @@ from urllib.parse import urlparse, urljoin
 from urllib.robotparser import RobotFileParser
 import aiohttp
 
+from .rate_limit import get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -104,6 +105,7 @@ class RobotsGuard:
         # Fetch fresh
         parser, crawl_delay = await self.fetch_robots(host)
         self.cache[host] = (parser, now, crawl_delay)
+        get_rate_limiter().set_crawl_delay(host, crawl_delay)
 
         return parser, crawl_delay
 
@@ -144,17 +146,8 @@ class RobotsGuard:
             return True, None
 
     async def wait_for_crawl_delay(self, host: str):
-        """Wait for crawl delay if specified"""
-        if host in self.cache:
-            _, _, crawl_delay = self.cache[host]
-            if crawl_delay:
-                last_fetch = self.last_fetch.get(host, 0)
-                now = time.time()
-                wait_time = crawl_delay - (now - last_fetch)
-                if wait_time > 0:
-                    logger.debug(f"[robots_guard] Waiting {wait_time:.1f}s for {host}")
-                    await asyncio.sleep(wait_time)
-
+        """Wait for a request slot on host (crawl delay is enforced by the shared limiter)"""
+        await get_rate_limiter().acquire(host)
         self.last_fetch[host] = time.time()
 
     def clear_cache(self):
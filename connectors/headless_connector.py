@@ -64,9 +64,8 @@ class HeadlessConnector(Connector):
         self._user_agent = config.get("user_agent", "Mozilla/5.0 (compatible; AiGentsy/1.0)")
         self._screenshots_dir = config.get("screenshots_dir", "/tmp/headless_screenshots")
 
-        # Rate limiting
-        self._last_action_time: Dict[str, float] = {}
-        self._min_interval_sec = config.get("min_interval_sec", 2.0)
+        # Rate limiting: tokens each browser action takes from the shared per-host limiter
+        self._rate_cost = config.get("rate_cost", 1.0)
 
     async def health(self) -> ConnectorHealth:
         if not PLAYWRIGHT_AVAILABLE:
@@ -79,12 +78,8 @@ class HeadlessConnector(Connector):
 
     async def _rate_limit(self, domain: str):
         """Enforce per-domain rate limiting"""
-        now = time.time()
-        last = self._last_action_time.get(domain, 0)
-        wait = max(0, self._min_interval_sec - (now - last))
-        if wait > 0:
-            await asyncio.sleep(wait)
-        self._last_action_time[domain] = time.time()
+        from compliance.rate_limit import get_rate_limiter
+        await get_rate_limiter().acquire(domain, tokens=self._rate_cost)
 
     async def execute(
         self,
@@ -6,17 +6,24 @@ Circuit breaker system with exponential backoff for platform connectors.
 Turns warnings into auto-circuit-breakers with configurable cooloff.
 
 Features:
-- Per-connector circuit breakers
+- Per-connector circuit breakers, each with its own lock (no global lock
+  on the hot path; key lookup is a plain dict read)
+- Trips on consecutive failures or on the failure / slow-call rate over
+  a rolling bucketed window
 - Exponential backoff on failures
+- Half-open probing with a bounded number of concurrent probes
 - Health color tracking (green/yellow/red)
-- Automatic recovery attempts
-- ND-JSON event emission
+- Rate-limited ND-JSON event emission
+- Async API (call) and a per-key snapshot of error rate and latency
 
 Usage:
     from connectors.health_breakers import breaker, get_health_status
 
     if not breaker("twitter_dm", healthy=health_check_passed):
         return {"ok": True, "skipped": "platform_cooloff"}
+
+    # Or gate and record a call in one step
+    result = await call("stripe", stripe_client.charge, amount)
 """
 
 import time
@@ -24,7 +31,7 @@ import threading
 import json
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -35,6 +42,42 @@ class HealthColor(Enum):
     RED = "red"        # Unhealthy, circuit open
 
 
+class CircuitOpenError(Exception):
+    """Raised by call() when the breaker rejects the call"""
+
+    def __init__(self, key: str):
+        super().__init__(f"circuit open: {key}")
+        self.key = key
+
+
+# Config
+DEFAULT_COOLOFF = 600       # 10 minutes base
+MAX_COOLOFF = 7200          # 2 hours max
+BACKOFF_FACTOR = 2.0        # Double on each failure
+FAILURE_THRESHOLD = 3       # Consecutive failures before trip
+YELLOW_THRESHOLD = 1        # Failures before yellow
+RECOVERY_SUCCESSES = 3      # Successes to recover to green
+
+WINDOW_SECONDS = 60         # Rolling window for rates
+WINDOW_BUCKETS = 12         # Buckets per window (5s each)
+MIN_WINDOW_CALLS = 20       # Calls in window before rates can trip
+FAILURE_RATE_THRESHOLD = 0.35
+SLOW_RATE_THRESHOLD = 0.6
+SLOW_CALL_MS = 5000         # Calls at or above this latency are slow
+HALF_OPEN_MAX_PROBES = 1    # Concurrent probes once cooloff ends
+
+EMIT_INTERVAL = 5.0         # Min seconds between identical events per key
+
+NDJSON_LOG = Path(__file__).parent.parent / "logs" / "run.ndjson"
+
+_BUCKET_SECONDS = WINDOW_SECONDS / WINDOW_BUCKETS
+
+
+def _new_buckets() -> List[list]:
+    # [bucket_id, successes, failures, slow, latency_sum, latency_n, latency_max]
+    return [[-1, 0, 0, 0, 0.0, 0, 0.0] for _ in range(WINDOW_BUCKETS)]
+
+
 @dataclass
 class BreakerState:
     """State for a single circuit breaker"""
@@ -48,21 +91,48 @@ class BreakerState:
     total_trips: int = 0
     total_recoveries: int = 0
     last_success_ts: float = 0.0
-
-
-# Global state with lock
+    probes_in_flight: int = 0
+    buckets: List[list] = field(default_factory=_new_buckets, repr=False)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def bucket(self, now: float) -> list:
+        """Current window bucket, recycled if it holds an expired slot"""
+        bid = int(now // _BUCKET_SECONDS)
+        b = self.buckets[bid % WINDOW_BUCKETS]
+        if b[0] != bid:
+            b[:] = [bid, 0, 0, 0, 0.0, 0, 0.0]
+        return b
+
+    def window(self, now: float) -> Tuple[int, int, int, float, int, float]:
+        """(successes, failures, slow, latency_sum, latency_n, latency_max) over the window"""
+        oldest = int(now // _BUCKET_SECONDS) - WINDOW_BUCKETS + 1
+        ok = fail = slow = lat_n = 0
+        lat_sum = lat_max = 0.0
+        for b in self.buckets:
+            if b[0] >= oldest:
+                ok += b[1]
+                fail += b[2]
+                slow += b[3]
+                lat_sum += b[4]
+                lat_n += b[5]
+                lat_max = max(lat_max, b[6])
+        return ok, fail, slow, lat_sum, lat_n, lat_max
+
+    def phase(self, now: float) -> str:
+        if now < self.cooloff_until:
+            return "open"
+        if self.color == HealthColor.RED:
+            return "half_open"
+        return "closed"
+
+
+# Global state. Entries are created with setdefault and never removed, so
+# lookups need no lock; each BreakerState guards itself.
 _BREAKERS: Dict[str, BreakerState] = {}
-_LOCK = threading.Lock()
-
-# Config
-DEFAULT_COOLOFF = 600       # 10 minutes base
-MAX_COOLOFF = 7200          # 2 hours max
-BACKOFF_FACTOR = 2.0        # Double on each failure
-FAILURE_THRESHOLD = 3       # Failures before trip
-YELLOW_THRESHOLD = 1        # Failures before yellow
-RECOVERY_SUCCESSES = 3      # Successes to recover to green
 
-NDJSON_LOG = Path(__file__).parent.parent / "logs" / "run.ndjson"
+# Emission rate limiting: (event, key) -> [last_emit_ts, suppressed]
+_EMIT_LAST: Dict[Tuple[str, str], list] = {}
+_EMIT_LOCK = threading.Lock()
 
 
 def _now() -> float:
@@ -84,11 +154,139 @@ def _emit(event: str, **kwargs):
         pass
 
 
+def _emit_limited(events: List[Tuple[str, Dict[str, Any]]]):
+    """
+    Emit events collected under a breaker lock, at most one per
+    (event, key) every EMIT_INTERVAL seconds. Suppressed repeats are
+    reported on the next emitted event.
+    """
+    now = _now()
+    for event, kwargs in events:
+        slot = (event, kwargs.get("key", ""))
+        with _EMIT_LOCK:
+            last = _EMIT_LAST.get(slot)
+            if last is not None and now - last[0] < EMIT_INTERVAL:
+                last[1] += 1
+                continue
+            suppressed = last[1] if last is not None else 0
+            _EMIT_LAST[slot] = [now, 0]
+        if suppressed:
+            kwargs = {**kwargs, "suppressed": suppressed}
+        _emit(event, **kwargs)
+
+
 def _get_breaker(key: str) -> BreakerState:
     """Get or create breaker state"""
-    if key not in _BREAKERS:
-        _BREAKERS[key] = BreakerState(key=key)
-    return _BREAKERS[key]
+    state = _BREAKERS.get(key)
+    if state is None:
+        state = _BREAKERS.setdefault(key, BreakerState(key=key))
+    return state
+
+
+def _trip(state: BreakerState, now: float, cooloff: float, max_cooloff: float,
+          events: list, reason: str) -> bool:
+    """Open the circuit with exponential backoff"""
+    if state.color != HealthColor.RED:
+        state.color = HealthColor.RED
+        state.total_trips += 1
+        events.append(("breaker_tripped", {
+            "key": state.key, "failures": state.consecutive_failures, "reason": reason
+        }))
+
+    actual_cooloff = min(cooloff * state.backoff_multiplier, max_cooloff)
+    state.cooloff_until = now + actual_cooloff
+    state.backoff_multiplier = min(state.backoff_multiplier * BACKOFF_FACTOR, 8.0)
+
+    events.append(("breaker_cooloff", {
+        "key": state.key,
+        "cooloff_seconds": actual_cooloff,
+        "until": datetime.fromtimestamp(state.cooloff_until, timezone.utc).isoformat()
+    }))
+    return False
+
+
+def _rate_trip_reason(state: BreakerState, now: float) -> Optional[str]:
+    """Failure or slow-call rate over the window that should trip, if any"""
+    ok, fail, slow, _, _, _ = state.window(now)
+    calls = ok + fail
+    if calls < MIN_WINDOW_CALLS:
+        return None
+    if fail / calls >= FAILURE_RATE_THRESHOLD:
+        return "failure_rate"
+    if slow / calls >= SLOW_RATE_THRESHOLD:
+        return "slow_rate"
+    return None
+
+
+def _apply(
+    state: BreakerState,
+    healthy: bool,
+    now: float,
+    *,
+    latency_ms: Optional[float],
+    slow_ms: float,
+    cooloff: float,
+    max_cooloff: float,
+    events: list,
+    failure_threshold: int = FAILURE_THRESHOLD
+) -> bool:
+    """Record one outcome on a locked breaker. Returns True if calls may proceed."""
+    b = state.bucket(now)
+    b[1 if healthy else 2] += 1
+    if latency_ms is not None:
+        b[4] += latency_ms
+        b[5] += 1
+        if latency_ms > b[6]:
+            b[6] = latency_ms
+        if latency_ms >= slow_ms:
+            b[3] += 1
+
+    # Results that land while cooling off only feed the window
+    if now < state.cooloff_until:
+        return False
+
+    half_open = state.color == HealthColor.RED
+
+    if healthy:
+        # Success - recovery path
+        state.consecutive_failures = max(0, state.consecutive_failures - 1)
+        state.last_success_ts = now
+        state.backoff_multiplier = max(1.0, state.backoff_multiplier / 2)
+
+        if state.color == HealthColor.RED and state.consecutive_failures == 0:
+            state.color = HealthColor.YELLOW
+            state.total_recoveries += 1
+            # Start the recovered breaker with a clean window
+            state.buckets = _new_buckets()
+            events.append(("breaker_recovering", {"key": state.key, "color": "yellow"}))
+            return True
+
+        elif state.color == HealthColor.YELLOW and state.consecutive_failures == 0:
+            state.color = HealthColor.GREEN
+            events.append(("breaker_recovered", {"key": state.key, "color": "green"}))
+
+        reason = _rate_trip_reason(state, now)
+        if reason:
+            return _trip(state, now, cooloff, max_cooloff, events, reason)
+        return True
+
+    # Failure - trip path
+    state.consecutive_failures += 1
+    state.last_failure_ts = now
+
+    if half_open:
+        return _trip(state, now, cooloff, max_cooloff, events, "probe_failed")
+    if state.consecutive_failures >= failure_threshold:
+        return _trip(state, now, cooloff, max_cooloff, events, "consecutive_failures")
+    reason = _rate_trip_reason(state, now)
+    if reason:
+        return _trip(state, now, cooloff, max_cooloff, events, reason)
+
+    if state.consecutive_failures >= YELLOW_THRESHOLD and state.color == HealthColor.GREEN:
+        state.color = HealthColor.YELLOW
+        events.append(("breaker_degraded", {"key": state.key, "failures": state.consecutive_failures}))
+
+    return True
 
 
 def breaker(
@@ -96,7 +294,10 @@ def breaker(
     healthy: bool,
     *,
     cooloff: float = DEFAULT_COOLOFF,
-    max_cooloff: float = MAX_COOLOFF
+    max_cooloff: float = MAX_COOLOFF,
+    latency_ms: Optional[float] = None,
+    slow_ms: float = SLOW_CALL_MS,
+    failure_threshold: int = FAILURE_THRESHOLD
 ) -> bool:
     """
     Circuit breaker check with exponential backoff.
@@ -106,84 +307,140 @@ def breaker(
         healthy: Result of health check (True = healthy, False = unhealthy)
         cooloff: Base cooloff time in seconds
         max_cooloff: Maximum cooloff time
+        latency_ms: Optional latency of the checked call (feeds slow-call rate)
+        slow_ms: Latency at or above which a call counts as slow
+        failure_threshold: Consecutive failures that trip the breaker
 
     Returns:
         True if operation should proceed, False if circuit is open
     """
-    now = _now()
-
-    with _LOCK:
-        state = _get_breaker(key)
+    state = _get_breaker(key)
+    events: list = []
+    with state.lock:
+        proceed = _apply(
+            state, healthy, _now(),
+            latency_ms=latency_ms, slow_ms=slow_ms,
+            cooloff=cooloff, max_cooloff=max_cooloff, events=events,
+            failure_threshold=failure_threshold
+        )
+    if events:
+        _emit_limited(events)
+    return proceed
+
+
+def allow(key: str) -> Tuple[bool, bool]:
+    """
+    Gate a call before making it. Returns (admitted, probe).
 
-        # Check if still in cooloff
+    Closed: admitted. Open (cooling off): rejected. Half-open: admitted as a
+    probe for at most HALF_OPEN_MAX_PROBES concurrent callers, each of which
+    must report back with record(..., probe=True) (or release() if the call
+    never ran).
+    """
+    state = _get_breaker(key)
+    now = _now()
+    with state.lock:
         if now < state.cooloff_until:
-            # Still cooling off, reject
-            return False
+            return False, False
+        if state.color == HealthColor.RED:
+            if state.probes_in_flight >= HALF_OPEN_MAX_PROBES:
+                return False, False
+            state.probes_in_flight += 1
+            return True, True
+        return True, False
 
-        if healthy:
-            # Success - recovery path
-            state.consecutive_failures = max(0, state.consecutive_failures - 1)
-            state.last_success_ts = now
-            state.backoff_multiplier = max(1.0, state.backoff_multiplier / 2)
 
-            if state.color == HealthColor.RED and state.consecutive_failures == 0:
-                state.color = HealthColor.YELLOW
-                state.total_recoveries += 1
-                _emit("breaker_recovering", key=key, color="yellow")
+def release(key: str):
+    """Give back a half-open probe slot without recording an outcome"""
+    state = _get_breaker(key)
+    with state.lock:
+        state.probes_in_flight = max(0, state.probes_in_flight - 1)
 
-            elif state.color == HealthColor.YELLOW and state.consecutive_failures == 0:
-                state.color = HealthColor.GREEN
-                _emit("breaker_recovered", key=key, color="green")
 
-            return True
+def record(
+    key: str,
+    success: bool,
+    *,
+    latency_ms: Optional[float] = None,
+    cooloff: float = DEFAULT_COOLOFF,
+    max_cooloff: float = MAX_COOLOFF,
+    slow_ms: float = SLOW_CALL_MS,
+    probe: bool = False,
+    failure_threshold: int = FAILURE_THRESHOLD
+) -> bool:
+    """
+    Record the outcome of a call admitted by allow(). Pass probe=True for a
+    call admitted as a half-open probe so its slot is freed. Returns True if
+    the circuit is closed.
+    """
+    state = _get_breaker(key)
+    events: list = []
+    with state.lock:
+        if probe and state.probes_in_flight:
+            state.probes_in_flight -= 1
+        proceed = _apply(
+            state, success, _now(),
+            latency_ms=latency_ms, slow_ms=slow_ms,
+            cooloff=cooloff, max_cooloff=max_cooloff, events=events,
+            failure_threshold=failure_threshold
+        )
+    if events:
+        _emit_limited(events)
+    return proceed
+
+
+async def call(
+    key: str,
+    func: Callable[..., Awaitable[Any]],
+    *args,
+    cooloff: float = DEFAULT_COOLOFF,
+    max_cooloff: float = MAX_COOLOFF,
+    slow_ms: float = SLOW_CALL_MS,
+    **kwargs
+) -> Any:
+    """
+    Await func(*args, **kwargs) behind the breaker.
 
-        else:
-            # Failure - trip path
-            state.consecutive_failures += 1
-            state.last_failure_ts = now
-
-            # Update color
-            if state.consecutive_failures >= FAILURE_THRESHOLD:
-                if state.color != HealthColor.RED:
-                    state.color = HealthColor.RED
-                    state.total_trips += 1
-                    _emit("breaker_tripped", key=key, failures=state.consecutive_failures)
-
-                # Calculate exponential backoff cooloff
-                actual_cooloff = min(
-                    cooloff * state.backoff_multiplier,
-                    max_cooloff
-                )
-                state.cooloff_until = now + actual_cooloff
-                state.backoff_multiplier = min(state.backoff_multiplier * BACKOFF_FACTOR, 8.0)
-
-                _emit(
-                    "breaker_cooloff",
-                    key=key,
-                    cooloff_seconds=actual_cooloff,
-                    until=datetime.fromtimestamp(state.cooloff_until, timezone.utc).isoformat()
-                )
-
-                return False
-
-            elif state.consecutive_failures >= YELLOW_THRESHOLD:
-                if state.color == HealthColor.GREEN:
-                    state.color = HealthColor.YELLOW
-                    _emit("breaker_degraded", key=key, failures=state.consecutive_failures)
+    Raises CircuitOpenError without calling func when the circuit is open
+    (or half-open with all probe slots taken). Exceptions from func are
+    recorded as failures and re-raised.
+    """
+    admitted, probe = allow(key)
+    if not admitted:
+        raise CircuitOpenError(key)
 
-            return True
+    started = time.perf_counter()
+    try:
+        result = await func(*args, **kwargs)
+    except BaseException as e:
+        if isinstance(e, Exception):
+            record(key, False, latency_ms=(time.perf_counter() - started) * 1000,
+                   cooloff=cooloff, max_cooloff=max_cooloff, slow_ms=slow_ms, probe=probe)
+        elif probe:
+            release(key)  # cancelled - no verdict on the dependency
+        raise
+
+    record(key, True, latency_ms=(time.perf_counter() - started) * 1000,
+           cooloff=cooloff, max_cooloff=max_cooloff, slow_ms=slow_ms, probe=probe)
+    return result
 
 
 def reset_breaker(key: str) -> Dict[str, Any]:
     """Manually reset a breaker"""
-    with _LOCK:
-        if key in _BREAKERS:
-            old_state = _BREAKERS[key]
-            _BREAKERS[key] = BreakerState(key=key)
-            _emit("breaker_manual_reset", key=key)
-            return {"ok": True, "previous_color": old_state.color.value}
+    state = _BREAKERS.get(key)
+    if state is None:
         return {"ok": False, "error": "breaker_not_found"}
 
+    with state.lock:
+        previous_color = state.color.value
+        fresh = BreakerState(key=key)
+        for name in ("color", "consecutive_failures", "last_failure_ts", "cooloff_until",
+                     "cooloff_seconds", "backoff_multiplier", "total_trips",
+                     "total_recoveries", "last_success_ts", "probes_in_flight", "buckets"):
+            setattr(state, name, getattr(fresh, name))
+    _emit("breaker_manual_reset", key=key)
+    return {"ok": True, "previous_color": previous_color}
+
 
 def get_health_status(key: str = None) -> Dict[str, Any]:
     """
@@ -198,8 +455,8 @@ def get_health_status(key: str = None) -> Dict[str, Any]:
     now = _now()
 
     if key:
-        with _LOCK:
-            state = _get_breaker(key)
+        state = _get_breaker(key)
+        with state.lock:
             return {
                 "key": key,
                 "color": state.color.value,
@@ -212,37 +469,68 @@ def get_health_status(key: str = None) -> Dict[str, Any]:
             }
 
     # All breakers
-    with _LOCK:
-        return {
-            "breakers": {
-                k: {
-                    "color": v.color.value,
-                    "failures": v.consecutive_failures,
-                    "in_cooloff": now < v.cooloff_until,
-                    "total_trips": v.total_trips
-                }
-                for k, v in _BREAKERS.items()
-            },
-            "summary": {
-                "total": len(_BREAKERS),
-                "green": len([b for b in _BREAKERS.values() if b.color == HealthColor.GREEN]),
-                "yellow": len([b for b in _BREAKERS.values() if b.color == HealthColor.YELLOW]),
-                "red": len([b for b in _BREAKERS.values() if b.color == HealthColor.RED])
+    states = list(_BREAKERS.values())
+    return {
+        "breakers": {
+            v.key: {
+                "color": v.color.value,
+                "failures": v.consecutive_failures,
+                "in_cooloff": now < v.cooloff_until,
+                "total_trips": v.total_trips
             }
+            for v in states
+        },
+        "summary": {
+            "total": len(states),
+            "green": len([b for b in states if b.color == HealthColor.GREEN]),
+            "yellow": len([b for b in states if b.color == HealthColor.YELLOW]),
+            "red": len([b for b in states if b.color == HealthColor.RED])
         }
+    }
+
+
+def snapshot() -> Dict[str, Any]:
+    """
+    Per-key breaker state with error rate and latency over the rolling
+    window. Backs the breaker snapshot endpoint.
+    """
+    now = _now()
+    breakers = {}
+    for state in list(_BREAKERS.values()):
+        with state.lock:
+            ok, fail, slow, lat_sum, lat_n, lat_max = state.window(now)
+            calls = ok + fail
+            breakers[state.key] = {
+                "state": state.phase(now),
+                "color": state.color.value,
+                "calls": calls,
+                "error_rate": round(fail / calls, 4) if calls else 0.0,
+                "slow_rate": round(slow / calls, 4) if calls else 0.0,
+                "avg_latency_ms": round(lat_sum / lat_n, 2) if lat_n else None,
+                "max_latency_ms": round(lat_max, 2) if lat_n else None,
+                "consecutive_failures": state.consecutive_failures,
+                "cooloff_remaining_seconds": round(max(0, state.cooloff_until - now), 1),
+                "probes_in_flight": state.probes_in_flight,
+                "total_trips": state.total_trips
+            }
+    return {"ts": _now_iso(), "window_seconds": WINDOW_SECONDS, "breakers": breakers}
+
+
+def is_open(key: str) -> bool:
+    """Check if a breaker is in cooloff (calls should be skipped)"""
+    state = _BREAKERS.get(key)
+    return state is not None and _now() < state.cooloff_until
 
 
 def is_healthy(key: str) -> bool:
     """Quick check if a breaker is healthy (green)"""
-    with _LOCK:
-        state = _get_breaker(key)
-        return state.color == HealthColor.GREEN and _now() >= state.cooloff_until
+    state = _get_breaker(key)
+    return state.color == HealthColor.GREEN and _now() >= state.cooloff_until
 
 
 def get_all_red_breakers() -> list:
     """Get list of all red (tripped) breakers"""
-    with _LOCK:
-        return [k for k, v in _BREAKERS.items() if v.color == HealthColor.RED]
+    return [v.key for v in list(_BREAKERS.values()) if v.color == HealthColor.RED]
 
 
 # Pre-configured breaker wrappers for common platforms
@@ -3,17 +3,49 @@ Connector Registry & Outcome Executor
 =====================================
 
 Central registry for all connectors with intelligent routing and execution.
+
+Execution modes:
+- "sequential": try ranked connectors one at a time (default)
+- "race": run the top-N ranked connectors concurrently and take the first
+  success; with hedge=True the next connector is only launched once the
+  current ones have run past their p95 latency. Losers are cancelled.
+
+Circuit state lives in connectors.health_breakers (shared with platform
+breakers). Connectors keep their own policy: a circuit opens after
+CIRCUIT_FAILURES consecutive failures for a flat CIRCUIT_COOLOFF (no
+exponential backoff). The shared breakers add a failure-rate trip over
+their rolling window and half-open probing: once the cooloff ends, one
+call is admitted as a probe and a failed probe re-opens the circuit. Every
+attempt (sequential or race) is gated with allow() and reported with
+record(). Observed latencies are kept per connector and feed back into
+score_connector().
 """
 
-from typing import Dict, Any, List, Optional, Type
-from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple, Type
+from collections import OrderedDict, deque
 import asyncio
 import logging
+import time
 
 from .base import Connector, ConnectorResult, ConnectorHealth, CostEstimate
+from . import health_breakers
 
 logger = logging.getLogger("connector_registry")
 
+# Circuit breaker policy for connectors: open after CIRCUIT_FAILURES
+# consecutive failures, for a flat CIRCUIT_COOLOFF seconds
+CIRCUIT_FAILURES = 5
+CIRCUIT_COOLOFF = 300
+_CIRCUIT_POLICY = {"cooloff": CIRCUIT_COOLOFF, "max_cooloff": CIRCUIT_COOLOFF, "failure_threshold": CIRCUIT_FAILURES}
+
+# Idempotency cache bounds
+IDEMPOTENCY_TTL = 3600
+IDEMPOTENCY_MAX = 10000
+
+# Latency samples kept per connector, and samples needed before they are trusted
+LATENCY_WINDOW = 256
+LATENCY_MIN_SAMPLES = 10
+
 
 # ============================================================================
 # OUTCOME SCHEMA & VALIDATION
@@ -78,13 +110,19 @@ def validate_outcome(outcome: Dict[str, Any]) -> tuple[bool, Dict[str, Any]]:
 # CONNECTOR SCORING
 # ============================================================================
 
-def score_connector(connector: Connector, outcome: Dict[str, Any]) -> float:
+def score_connector(
+    connector: Connector,
+    outcome: Dict[str, Any],
+    observed_latency_ms: Optional[float] = None
+) -> float:
     """
     Score a connector for executing an outcome.
 
     Score = (margin × success_rate × speed_factor) - risk_cost
 
-    Higher score = better choice for this outcome.
+    Higher score = better choice for this outcome. observed_latency_ms
+    (e.g. the registry's measured p50) overrides the connector's declared
+    avg_latency_ms.
     """
     pricing = outcome.get("pricing", {})
     sla = outcome.get("sla", {})
@@ -98,6 +136,8 @@ def score_connector(connector: Connector, outcome: Dict[str, Any]) -> float:
     # Connector characteristics
     success_rate = getattr(connector, "success_rate", 0.9)
     avg_latency_ms = getattr(connector, "avg_latency_ms", 1000)
+    if observed_latency_ms is not None:
+        avg_latency_ms = observed_latency_ms
     avg_latency_sec = avg_latency_ms / 1000
 
     # Speed factor: bonus for fast connectors relative to deadline
@@ -121,6 +161,74 @@ def score_connector(connector: Connector, outcome: Dict[str, Any]) -> float:
     return max(score, 0)
 
 
+# ============================================================================
+# LATENCY TRACKING & IDEMPOTENCY CACHE
+# ============================================================================
+
+class LatencyHistogram:
+    """Rolling window of recent latencies for one connector"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: deque = deque(maxlen=window)
+        self._sorted: Optional[List[float]] = None
+
+    def record(self, latency_ms: float):
+        self._samples.append(latency_ms)
+        self._sorted = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Latency at quantile q (0-1), None if no samples"""
+        if not self._samples:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        idx = min(len(self._sorted) - 1, int(q * len(self._sorted)))
+        return self._sorted[idx]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": len(self._samples),
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99)
+        }
+
+
+class IdempotencyCache:
+    """LRU cache of successful results whose entries expire after ttl seconds"""
+
+    def __init__(self, ttl: float = IDEMPOTENCY_TTL, max_entries: int = IDEMPOTENCY_MAX):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (result, expires_at)
+
+    def get(self, key: str) -> Optional[ConnectorResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        result, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: str, result: ConnectorResult):
+        self._entries[key] = (result, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 # ============================================================================
 # CONNECTOR REGISTRY
 # ============================================================================
@@ -135,8 +243,8 @@ class ConnectorRegistry:
     def __init__(self):
         self._connectors: Dict[str, Connector] = {}
         self._capability_index: Dict[str, List[str]] = {}  # capability -> [connector_names]
-        self._circuit_breakers: Dict[str, Dict] = {}
-        self._idempotency_cache: Dict[str, ConnectorResult] = {}
+        self._idempotency_cache = IdempotencyCache()
+        self._latency: Dict[str, LatencyHistogram] = {}
 
     def register(self, connector: Connector) -> None:
         """Register a connector"""
@@ -186,28 +294,53 @@ class ConnectorRegistry:
 
     def _is_circuit_open(self, connector_name: str) -> bool:
         """Check if circuit breaker is open for a connector"""
-        cb = self._circuit_breakers.get(connector_name, {})
-        if cb.get("open_until", 0) > datetime.now(timezone.utc).timestamp():
-            return True
-        return False
-
-    def _record_failure(self, connector_name: str):
-        """Record a failure and potentially open circuit breaker"""
-        if connector_name not in self._circuit_breakers:
-            self._circuit_breakers[connector_name] = {"failures": 0, "open_until": 0}
+        return health_breakers.is_open(connector_name)
 
-        cb = self._circuit_breakers[connector_name]
-        cb["failures"] = cb.get("failures", 0) + 1
+    def _admit(self, connector_name: str) -> Tuple[bool, bool]:
+        """Gate one attempt on the connector's circuit breaker: (admitted, probe)"""
+        return health_breakers.allow(connector_name)
 
-        # Open circuit after 5 consecutive failures
-        if cb["failures"] >= 5:
-            cb["open_until"] = datetime.now(timezone.utc).timestamp() + 300  # 5 min cooldown
+    def _record_failure(self, connector_name: str, probe: bool = False):
+        """Record a failure and potentially open circuit breaker"""
+        if not health_breakers.record(connector_name, False, probe=probe, **_CIRCUIT_POLICY):
             logger.warning(f"Circuit breaker opened for {connector_name}")
 
-    def _record_success(self, connector_name: str):
-        """Record success and reset circuit breaker"""
-        if connector_name in self._circuit_breakers:
-            self._circuit_breakers[connector_name] = {"failures": 0, "open_until": 0}
+    def _record_success(self, connector_name: str, probe: bool = False):
+        """Record success on the connector's circuit breaker"""
+        health_breakers.record(connector_name, True, probe=probe, **_CIRCUIT_POLICY)
+
+    def _release(self, connector_name: str, probe: bool):
+        """An admitted attempt ended without a verdict (cancelled, or the connector answered not-ok)"""
+        if probe:
+            health_breakers.release(connector_name)
+
+    def record_latency(self, connector_name: str, latency_ms: float):
+        """Record an observed execution latency for a connector"""
+        hist = self._latency.get(connector_name)
+        if hist is None:
+            hist = self._latency[connector_name] = LatencyHistogram()
+        hist.record(latency_ms)
+
+    def latency_quantile(self, connector_name: str, q: float) -> Optional[float]:
+        """Observed latency quantile, None until enough samples are recorded"""
+        hist = self._latency.get(connector_name)
+        if hist is None or len(hist) < LATENCY_MIN_SAMPLES:
+            return None
+        return hist.quantile(q)
+
+    def score(self, connector: Connector, outcome: Dict[str, Any]) -> float:
+        """score_connector() using the observed p50 latency when available"""
+        return score_connector(
+            connector, outcome,
+            observed_latency_ms=self.latency_quantile(connector.name, 0.50)
+        )
+
+    def hedge_delay(self, connector: Connector) -> float:
+        """Seconds to wait on a connector before hedging: its p95 latency"""
+        p95 = self.latency_quantile(connector.name, 0.95)
+        if p95 is None:
+            p95 = 2 * getattr(connector, "avg_latency_ms", 1000)
+        return p95 / 1000
 
     async def health_check_all(self) -> Dict[str, ConnectorHealth]:
         """Run health checks on all connectors"""
@@ -269,10 +402,10 @@ class ConnectorRegistry:
             "connectors": len(self._connectors),
             "capabilities": len(self._capability_index),
             "circuit_breakers_open": sum(
-                1 for cb in self._circuit_breakers.values()
-                if cb.get("open_until", 0) > datetime.now(timezone.utc).timestamp()
+                1 for name in self._connectors if self._is_circuit_open(name)
             ),
-            "idempotency_cache_size": len(self._idempotency_cache)
+            "idempotency_cache_size": len(self._idempotency_cache),
+            "latency": {name: hist.to_dict() for name, hist in self._latency.items()}
         }
 
 
@@ -286,7 +419,10 @@ async def execute_outcome(
     *,
     prefer_connector: Optional[str] = None,
     max_retries: int = 3,
-    fallback_to_any: bool = True
+    fallback_to_any: bool = True,
+    mode: str = "sequential",
+    race_top_n: int = 2,
+    hedge: bool = True
 ) -> Dict[str, Any]:
     """
     Execute an outcome using the best available connector.
@@ -295,15 +431,21 @@ async def execute_outcome(
     1. Validate outcome spec
     2. Find capable connectors
     3. Rank by score (EV)
-    4. Try in order with circuit breaker checks
+    4. Try in order (or race) with circuit breaker checks
     5. Return result with proofs
 
     Args:
         registry: The connector registry
         outcome: Outcome specification (COI)
         prefer_connector: Optional preferred connector name
-        max_retries: Maximum retry attempts per connector
+        max_retries: Maximum retry attempts per connector (sequential mode)
         fallback_to_any: If True, try headless fallback if all else fails
+        mode: "sequential" or "race". Race mode may run the same outcome on
+            several connectors, so only use it for outcomes that are safe to
+            duplicate or that connectors dedupe by idempotency_key.
+        race_top_n: Maximum connectors in flight at once (race mode)
+        hedge: In race mode, launch the next connector only after the
+            in-flight one exceeds its p95 latency instead of all at once
 
     Returns:
         Execution result with proofs and connector info
@@ -321,8 +463,8 @@ async def execute_outcome(
     idempotency_key = outcome.get("idempotency_key")
 
     # Check idempotency cache
-    if idempotency_key and idempotency_key in registry._idempotency_cache:
-        cached = registry._idempotency_cache[idempotency_key]
+    cached = registry._idempotency_cache.get(idempotency_key) if idempotency_key else None
+    if cached is not None:
         return {
             "ok": cached.ok,
             "data": cached.data,
@@ -355,37 +497,37 @@ async def execute_outcome(
         }
 
     # Rank by score
-    ranked = sorted(candidates, key=lambda c: score_connector(c, outcome), reverse=True)
+    ranked = sorted(candidates, key=lambda c: registry.score(c, outcome), reverse=True)
+
+    timeout = outcome.get("sla", {}).get("deadline_sec", 60)
+
+    if mode == "race":
+        return await _execute_race(
+            registry, ranked, outcome,
+            timeout=timeout, top_n=max(1, race_top_n), hedge=hedge
+        )
 
     # Try connectors in order
     errors = []
-    timeout = outcome.get("sla", {}).get("deadline_sec", 60)
 
     for connector in ranked:
-        # Check circuit breaker
-        if registry._is_circuit_open(connector.name):
-            errors.append({"connector": connector.name, "error": "circuit_open"})
-            continue
-
-        # Execute with retries
+        # Execute with retries, each attempt admitted by the circuit breaker
         for attempt in range(1, max_retries + 1):
+            admitted, probe = registry._admit(connector.name)
+            if not admitted:
+                errors.append({"connector": connector.name, "error": "circuit_open"})
+                break
+
             try:
-                result = await asyncio.wait_for(
-                    connector.execute(
-                        action=outcome_type,
-                        params=outcome.get("inputs", {}),
-                        idempotency_key=idempotency_key,
-                        timeout=timeout
-                    ),
-                    timeout=timeout
-                )
+                result, elapsed_ms = await _attempt(connector, outcome, timeout)
 
                 if result.ok:
-                    registry._record_success(connector.name)
+                    registry._record_success(connector.name, probe)
+                    registry.record_latency(connector.name, elapsed_ms)
 
                     # Cache successful result
                     if idempotency_key:
-                        registry._idempotency_cache[idempotency_key] = result
+                        registry._idempotency_cache.put(idempotency_key, result)
 
                     return {
                         "ok": True,
@@ -396,6 +538,8 @@ async def execute_outcome(
                         "attempt": attempt
                     }
 
+                registry._release(connector.name, probe)
+
                 # Non-retryable failure
                 if not result.retryable:
                     errors.append({
@@ -419,7 +563,7 @@ async def execute_outcome(
                     "error": "timeout",
                     "attempt": attempt
                 })
-                registry._record_failure(connector.name)
+                registry._record_failure(connector.name, probe)
 
             except Exception as e:
                 errors.append({
@@ -427,7 +571,11 @@ async def execute_outcome(
                     "error": str(e),
                     "attempt": attempt
                 })
-                registry._record_failure(connector.name)
+                registry._record_failure(connector.name, probe)
+
+            except BaseException:
+                registry._release(connector.name, probe)
+                raise
 
     # All connectors failed
     return {
@@ -437,6 +585,129 @@ async def execute_outcome(
     }
 
 
+async def _attempt(connector: Connector, outcome: Dict[str, Any], timeout: float) -> tuple:
+    """Run one connector execution under the SLA timeout, returning (result, elapsed_ms)"""
+    started = time.perf_counter()
+    result = await asyncio.wait_for(
+        connector.execute(
+            action=outcome["outcome_type"],
+            params=outcome.get("inputs", {}),
+            idempotency_key=outcome.get("idempotency_key"),
+            timeout=timeout
+        ),
+        timeout=timeout
+    )
+    return result, (time.perf_counter() - started) * 1000
+
+
+async def _execute_race(
+    registry: ConnectorRegistry,
+    ranked: List[Connector],
+    outcome: Dict[str, Any],
+    *,
+    timeout: float,
+    top_n: int,
+    hedge: bool
+) -> Dict[str, Any]:
+    """
+    Race ranked connectors, at most top_n in flight, first success wins.
+
+    A failed attempt frees its slot and the next ranked connector starts
+    immediately. With hedge=True a slot is also filled once the newest
+    in-flight attempt outlives its connector's p95 latency. Remaining
+    attempts are cancelled when one succeeds.
+    """
+    errors = []
+    queue = list(ranked)
+
+    loop = asyncio.get_running_loop()
+    in_flight: Dict[asyncio.Task, Tuple[Connector, bool]] = {}
+    launched = 0
+    next_hedge_at: Optional[float] = None
+
+    def launch():
+        nonlocal launched, next_hedge_at
+        connector = queue.pop(0)
+        admitted, probe = registry._admit(connector.name)
+        if not admitted:
+            errors.append({"connector": connector.name, "error": "circuit_open"})
+            return
+        task = asyncio.ensure_future(_attempt(connector, outcome, timeout))
+        in_flight[task] = (connector, probe)
+        launched += 1
+        next_hedge_at = loop.time() + registry.hedge_delay(connector) if hedge else None
+
+    try:
+        while queue and len(in_flight) < (1 if hedge else top_n):
+            launch()
+
+        while in_flight:
+            wait_timeout = None
+            if next_hedge_at is not None and queue and len(in_flight) < top_n:
+                wait_timeout = max(0.0, next_hedge_at - loop.time())
+
+            done, _ = await asyncio.wait(
+                in_flight, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if not done:
+                # Slowest-path hedge: in-flight attempt ran past its p95
+                launch()
+                continue
+
+            for task in done:
+                connector, probe = in_flight.pop(task)
+                try:
+                    result, elapsed_ms = task.result()
+                except asyncio.TimeoutError:
+                    errors.append({"connector": connector.name, "error": "timeout"})
+                    registry._record_failure(connector.name, probe)
+                    continue
+                except Exception as e:
+                    errors.append({"connector": connector.name, "error": str(e)})
+                    registry._record_failure(connector.name, probe)
+                    continue
+
+                if result.ok:
+                    registry._record_success(connector.name, probe)
+                    registry.record_latency(connector.name, elapsed_ms)
+
+                    idempotency_key = outcome.get("idempotency_key")
+                    if idempotency_key:
+                        registry._idempotency_cache.put(idempotency_key, result)
+
+                    return {
+                        "ok": True,
+                        "data": result.data,
+                        "proofs": result.proofs,
+                        "connector": connector.name,
+                        "latency_ms": result.latency_ms,
+                        "mode": "race",
+                        "launched": launched
+                    }
+
+                registry._release(connector.name, probe)
+                errors.append({"connector": connector.name, "error": result.error})
+
+            # Refill slots freed by failures
+            while queue and len(in_flight) < (1 if hedge else top_n):
+                launch()
+
+    finally:
+        for task, (connector, probe) in in_flight.items():
+            task.cancel()
+            registry._release(connector.name, probe)  # Cancelled loser: no verdict
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    return {
+        "ok": False,
+        "error": "all_connectors_failed",
+        "attempts": errors,
+        "mode": "race"
+    }
+
+
 # ============================================================================
 # SINGLETON REGISTRY & HELPER FUNCTIONS
 # ============================================================================
@@ -11,15 +11,21 @@ Flow:
 3. Generate AI response using Claude
 4. Send response back via same channel
 5. Continue until handshake acceptance or decline
+
+Storage: one JSON line per conversation write in data/conversations.jsonl
+(last line for an id wins), appended only for conversations that changed
+and compacted once stale lines outnumber live ones.
 """
 
 import os
 import json
+import time
 import logging
 import asyncio
 import httpx
+from collections import deque
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Set, Tuple
 from pathlib import Path
 from enum import Enum
 from dataclasses import dataclass, field, asdict
@@ -28,7 +34,18 @@ logger = logging.getLogger(__name__)
 
 # Persistence
 DATA_DIR = Path(__file__).parent.parent / "data"
-CONVERSATIONS_FILE = DATA_DIR / "conversations.json"
+CONVERSATIONS_FILE = DATA_DIR / "conversations.json"   # legacy snapshot, imported once
+CONVERSATIONS_LOG = DATA_DIR / "conversations.jsonl"
+
+COMPACT_MIN_LINES = 1000      # Never compact tiny logs
+COMPACT_RATIO = 2.0           # Compact when log lines > ratio x live conversations
+
+# Reply handling
+REPLY_CONCURRENCY = int(os.getenv("CONVERSATION_REPLY_CONCURRENCY", "4"))
+REPLY_SPACING_SECONDS = 1.0   # Delay between responses per worker (rate limits)
+LOOKUP_CONCURRENCY = 4        # Parallel Twitter lookups during a DM poll
+TWITTER_USERS_BATCH = 100     # Max ids per GET /2/users
+CYCLE_WINDOW = 100            # Monitor cycles kept for timing percentiles
 
 
 class ConversationState(Enum):
@@ -67,6 +84,87 @@ class Conversation:
     our_twitter_id: Optional[str] = None
 
 
+class ConversationStore:
+    """
+    Keyed JSONL record store for conversations.
+
+    Each write appends one line {"id": ..., "conv": {...}}; on load the last
+    line per id wins. compact() rewrites the file with one line per live
+    conversation.
+    """
+
+    def __init__(self, path: Path = CONVERSATIONS_LOG, legacy_file: Optional[Path] = CONVERSATIONS_FILE):
+        self.path = Path(path)
+        self.legacy_file = Path(legacy_file) if legacy_file else None
+        self.lines = 0
+
+    def load(self) -> Dict[str, Conversation]:
+        """Replay the log (or import the legacy snapshot if there is no log)"""
+        conversations: Dict[str, Conversation] = {}
+        if not self.path.exists():
+            self._migrate_legacy(conversations)
+            return conversations
+
+        with open(self.path, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    conversations[record['id']] = Conversation(**record['conv'])
+                except Exception as e:
+                    # A torn last line from a crash mid-write is skipped
+                    logger.warning(f"Skipping bad conversation record: {e}")
+                    continue
+                self.lines += 1
+        return conversations
+
+    def put(self, conversations: Iterable[Conversation]):
+        """Append one record per conversation in a single write"""
+        payload = "".join(
+            json.dumps({'id': c.id, 'conv': asdict(c)}, separators=(",", ":"), default=str) + "\n"
+            for c in conversations
+        )
+        if not payload:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, payload.encode("utf-8"))
+        finally:
+            os.close(fd)
+        self.lines += payload.count("\n")
+
+    def needs_compaction(self, live: int) -> bool:
+        return self.lines > COMPACT_MIN_LINES and self.lines > COMPACT_RATIO * max(live, 1)
+
+    def compact(self, conversations: Dict[str, Conversation]):
+        """Rewrite the log with only the latest record per conversation"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = str(self.path) + ".tmp"
+        with open(tmp_path, 'w') as f:
+            for c in conversations.values():
+                f.write(json.dumps({'id': c.id, 'conv': asdict(c)}, separators=(",", ":"), default=str) + "\n")
+        os.replace(tmp_path, self.path)
+        logger.info(f"Compacted conversation log: {self.lines} -> {len(conversations)} lines")
+        self.lines = len(conversations)
+
+    def _migrate_legacy(self, conversations: Dict[str, Conversation]):
+        """Import data/conversations.json into a fresh log"""
+        if not self.legacy_file or not self.legacy_file.exists():
+            return
+        try:
+            with open(self.legacy_file, 'r') as f:
+                data = json.load(f)
+            for conv_id, conv_data in data.get('conversations', {}).items():
+                conversations[conv_id] = Conversation(**conv_data)
+        except Exception as e:
+            logger.warning(f"Could not load legacy conversations: {e}")
+            return
+        self.compact(conversations)
+        logger.info(f"Migrated {len(conversations)} conversations from {self.legacy_file.name}")
+
+
 class ConversationManager:
     """
     Manages autonomous conversations across platforms.
@@ -74,8 +172,27 @@ class ConversationManager:
     Monitors for replies and generates AI responses.
     """
 
-    def __init__(self):
+    def __init__(self, store: Optional[ConversationStore] = None):
         self.conversations: Dict[str, Conversation] = {}
+        self.store = store or ConversationStore()
+        self._dirty: Set[str] = set()
+        # Indexes: conv ids by (platform, user_id), (platform, username.lower()) and state
+        self._by_user: Dict[Tuple[str, str], List[str]] = {}
+        self._by_username: Dict[Tuple[str, str], List[str]] = {}
+        self._by_state: Dict[str, Set[str]] = {}
+        self._reply_semaphore = asyncio.Semaphore(max(1, REPLY_CONCURRENCY))
+        self._cycle_ms: deque = deque(maxlen=CYCLE_WINDOW)
+        self.monitor_stats = {
+            'cycles': 0,
+            'errors': 0,
+            'replies_found': 0,
+            'responses_sent': 0,
+            'last_cycle_at': None,
+            'last_cycle_ms': None,
+            'last_check_ms': None,
+            'last_process_ms': None,
+            'last_save_ms': None,
+        }
         self.twitter_bearer = os.getenv('TWITTER_BEARER_TOKEN')
         self.twitter_access = os.getenv('TWITTER_ACCESS_TOKEN')
         self.twitter_access_secret = os.getenv('TWITTER_ACCESS_SECRET')
@@ -94,30 +211,79 @@ class ConversationManager:
         logger.info(f"ConversationManager initialized with {len(self.conversations)} conversations")
 
     def _load_conversations(self):
-        """Load conversations from persistent storage"""
+        """Load conversations from persistent storage and build the indexes"""
         try:
-            if CONVERSATIONS_FILE.exists():
-                with open(CONVERSATIONS_FILE, 'r') as f:
-                    data = json.load(f)
-                    for conv_id, conv_data in data.get('conversations', {}).items():
-                        self.conversations[conv_id] = Conversation(**conv_data)
-                    logger.info(f"Loaded {len(self.conversations)} conversations")
+            self.conversations = self.store.load()
+            for conv in self.conversations.values():
+                self._index(conv)
+            logger.info(f"Loaded {len(self.conversations)} conversations")
         except Exception as e:
             logger.warning(f"Could not load conversations: {e}")
 
     def _save_conversations(self):
-        """Save conversations to persistent storage"""
+        """Persist conversations changed since the last save"""
+        if not self._dirty:
+            return
         try:
-            DATA_DIR.mkdir(parents=True, exist_ok=True)
-            data = {
-                'conversations': {cid: asdict(c) for cid, c in self.conversations.items()},
-                'saved_at': datetime.now(timezone.utc).isoformat()
-            }
-            with open(CONVERSATIONS_FILE, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            changed = [self.conversations[cid] for cid in self._dirty if cid in self.conversations]
+            self._dirty.clear()
+            self.store.put(changed)
+            if self.store.needs_compaction(len(self.conversations)):
+                self.store.compact(self.conversations)
         except Exception as e:
             logger.error(f"Could not save conversations: {e}")
 
+    def _mark_dirty(self, conv: Conversation):
+        self._dirty.add(conv.id)
+
+    # ── indexes ──
+
+    def _index(self, conv: Conversation):
+        self._by_user.setdefault((conv.platform, conv.user_id), []).append(conv.id)
+        self._by_username.setdefault((conv.platform, conv.username.lower()), []).append(conv.id)
+        self._by_state.setdefault(conv.state, set()).add(conv.id)
+
+    def _unindex(self, conv: Conversation):
+        for index, key in ((self._by_user, (conv.platform, conv.user_id)),
+                           (self._by_username, (conv.platform, conv.username.lower()))):
+            ids = index.get(key)
+            if ids and conv.id in ids:
+                ids.remove(conv.id)
+                if not ids:
+                    del index[key]
+        ids = self._by_state.get(conv.state)
+        if ids:
+            ids.discard(conv.id)
+            if not ids:
+                del self._by_state[conv.state]
+
+    def _add_conversation(self, conv: Conversation):
+        """Insert or replace a conversation, keeping the indexes in step"""
+        existing = self.conversations.get(conv.id)
+        if existing is not None:
+            self._unindex(existing)
+            # Re-insert at the end so dict order matches the index lists
+            del self.conversations[conv.id]
+        self.conversations[conv.id] = conv
+        self._index(conv)
+        self._mark_dirty(conv)
+
+    def _set_state(self, conv: Conversation, state: str):
+        if state == conv.state:
+            return
+        ids = self._by_state.get(conv.state)
+        if ids:
+            ids.discard(conv.id)
+            if not ids:
+                del self._by_state[conv.state]
+        conv.state = state
+        self._by_state.setdefault(state, set()).add(conv.id)
+        self._mark_dirty(conv)
+
+    def get_conversations_by_state(self, state: str) -> List[Conversation]:
+        """Conversations currently in the given state"""
+        return [self.conversations[cid] for cid in self._by_state.get(state, ())]
+
     def register_outreach(
         self,
         platform: str,
@@ -152,7 +318,7 @@ class ConversationManager:
             }]
         )
 
-        self.conversations[conv_id] = conversation
+        self._add_conversation(conversation)
         self._save_conversations()
 
         logger.info(f"Registered outreach conversation: {conv_id}")
@@ -180,6 +346,9 @@ class ConversationManager:
         # email_replies = await self._check_email_replies()
         # replies.extend(email_replies)
 
+        # Persist any conversations created while matching
+        self._save_conversations()
+
         return replies
 
     async def _check_twitter_dms(self) -> List[Dict]:
@@ -235,6 +404,8 @@ class ConversationManager:
 
             # Track which message IDs we've already processed this run
             processed_this_run = set()
+            # First event per unknown sender, resolved in one batch below
+            unknown_senders: Dict[str, Dict] = {}
 
             for event in events:
                 sender_id = event.get('sender_id')
@@ -256,7 +427,6 @@ class ConversationManager:
 
                 if conv:
                     # Known conversation - check if message is new
-                    msg_id = event.get('id')
                     if any(m.get('message_id') == msg_id for m in conv.messages):
                         continue  # Already processed this message
 
@@ -284,56 +454,85 @@ class ConversationManager:
                     })
                     logger.info(f"Found reply from known @{conv.username}: {msg_text[:50]}...")
 
-                else:
-                    # Unknown conversation - check if we sent them a DM first (orphaned outreach)
-                    # Look for our messages in this DM conversation
-                    our_msg = await self._find_our_message_in_conversation(dm_conv_id, auth)
+                elif sender_id not in unknown_senders:
+                    unknown_senders[sender_id] = event
 
-                    if our_msg:
-                        # We did reach out to this person - auto-create conversation
-                        username = await self._get_twitter_username(sender_id, auth)
+            if unknown_senders:
+                replies.extend(await self._adopt_orphan_dms(list(unknown_senders.values()), auth))
 
-                        # Try to extract contract_id from our original message
-                        contract_id = self._extract_contract_id(our_msg)
+        except Exception as e:
+            logger.error(f"Error checking Twitter DMs: {e}", exc_info=True)
 
-                        # Create new conversation on-the-fly
-                        conv_id = f"twitter_{sender_id}_orphan_{msg_id[:8]}"
-                        new_conv = Conversation(
-                            id=conv_id,
-                            platform='twitter',
-                            user_id=sender_id,
-                            username=username or f"user_{sender_id}",
-                            contract_id=contract_id or 'unknown',
-                            opportunity_id='orphan',
-                            state='in_conversation',
-                            messages=[
-                                {
-                                    'from_us': True,
-                                    'text': our_msg,
-                                    'timestamp': datetime.now(timezone.utc).isoformat(),
-                                    'platform': 'twitter'
-                                }
-                            ]
-                        )
-                        self.conversations[conv_id] = new_conv
-                        self._save_conversations()
+        return replies
 
-                        logger.info(f"Auto-created conversation for orphan DM from @{username}")
+    async def _adopt_orphan_dms(self, events: List[Dict], auth) -> List[Dict]:
+        """
+        Turn DMs from unknown senders into conversations when we messaged them first.
 
-                        replies.append({
-                            'platform': 'twitter',
-                            'conversation_id': conv_id,
-                            'user_id': sender_id,
-                            'username': username or f"user_{sender_id}",
-                            'message': msg_text,
-                            'message_id': msg_id,
-                            'contract_id': contract_id or 'unknown',
-                            'opportunity_id': 'orphan',
-                            'dm_conversation_id': dm_conv_id
-                        })
+        Outreach detection runs concurrently (one lookup per DM conversation)
+        and usernames are resolved with a single batched users call.
+        """
+        lookup_limit = asyncio.Semaphore(LOOKUP_CONCURRENCY)
 
-        except Exception as e:
-            logger.error(f"Error checking Twitter DMs: {e}", exc_info=True)
+        async def find_ours(dm_conv_id):
+            async with lookup_limit:
+                return await self._find_our_message_in_conversation(dm_conv_id, auth)
+
+        dm_conv_ids = list({e.get('dm_conversation_id') for e in events if e.get('dm_conversation_id')})
+        found = await asyncio.gather(*(find_ours(d) for d in dm_conv_ids))
+        our_messages = dict(zip(dm_conv_ids, found))
+
+        # Only senders we actually reached out to
+        outreach = [e for e in events if our_messages.get(e.get('dm_conversation_id'))]
+        if not outreach:
+            return []
+        usernames = await self._get_twitter_usernames([e.get('sender_id') for e in outreach], auth)
+
+        replies = []
+        for event in outreach:
+            sender_id = event.get('sender_id')
+            msg_id = event.get('id')
+            dm_conv_id = event.get('dm_conversation_id')
+            our_msg = our_messages[dm_conv_id]
+            username = usernames.get(sender_id)
+
+            # Try to extract contract_id from our original message
+            contract_id = self._extract_contract_id(our_msg)
+
+            # Create new conversation on-the-fly
+            conv_id = f"twitter_{sender_id}_orphan_{msg_id[:8]}"
+            new_conv = Conversation(
+                id=conv_id,
+                platform='twitter',
+                user_id=sender_id,
+                username=username or f"user_{sender_id}",
+                contract_id=contract_id or 'unknown',
+                opportunity_id='orphan',
+                state='in_conversation',
+                messages=[
+                    {
+                        'from_us': True,
+                        'text': our_msg,
+                        'timestamp': datetime.now(timezone.utc).isoformat(),
+                        'platform': 'twitter'
+                    }
+                ]
+            )
+            self._add_conversation(new_conv)
+
+            logger.info(f"Auto-created conversation for orphan DM from @{username}")
+
+            replies.append({
+                'platform': 'twitter',
+                'conversation_id': conv_id,
+                'user_id': sender_id,
+                'username': username or f"user_{sender_id}",
+                'message': event.get('text', ''),
+                'message_id': msg_id,
+                'contract_id': contract_id or 'unknown',
+                'opportunity_id': 'orphan',
+                'dm_conversation_id': dm_conv_id
+            })
 
         return replies
 
@@ -449,8 +648,7 @@ class ConversationManager:
                             state='in_conversation',
                             messages=[]
                         )
-                        self.conversations[conv_id] = new_conv
-                        self._save_conversations()
+                        self._add_conversation(new_conv)
 
                         replies.append({
                             'platform': 'twitter_mention',
@@ -473,10 +671,8 @@ class ConversationManager:
 
     def _find_conversation_by_username(self, platform: str, username: str) -> Optional[Conversation]:
         """Find conversation by platform and username"""
-        for conv in self.conversations.values():
-            if conv.platform == platform and conv.username.lower() == username.lower():
-                return conv
-        return None
+        ids = self._by_username.get((platform, username.lower()))
+        return self.conversations[ids[0]] if ids else None
 
     async def _find_our_message_in_conversation(self, dm_conv_id: str, auth) -> Optional[str]:
         """Find if we sent a message in this DM conversation (outreach detection)"""
@@ -484,7 +680,8 @@ class ConversationManager:
             import requests
 
             # Get messages in this specific conversation
-            resp = requests.get(
+            resp = await asyncio.to_thread(
+                requests.get,
                 f"https://api.twitter.com/2/dm_conversations/{dm_conv_id}/dm_events",
                 params={
                     "dm_event.fields": "id,text,sender_id,created_at",
@@ -507,21 +704,31 @@ class ConversationManager:
 
     async def _get_twitter_username(self, user_id: str, auth) -> Optional[str]:
         """Get Twitter username from user ID"""
+        return (await self._get_twitter_usernames([user_id], auth)).get(user_id)
+
+    async def _get_twitter_usernames(self, user_ids: List[str], auth) -> Dict[str, str]:
+        """Resolve Twitter user IDs to usernames, up to 100 per request"""
+        usernames: Dict[str, str] = {}
         try:
             import requests
 
-            resp = requests.get(
-                f"https://api.twitter.com/2/users/{user_id}",
-                auth=auth
-            )
+            ids = list(dict.fromkeys(u for u in user_ids if u))
+            for i in range(0, len(ids), TWITTER_USERS_BATCH):
+                resp = await asyncio.to_thread(
+                    requests.get,
+                    "https://api.twitter.com/2/users",
+                    params={"ids": ",".join(ids[i:i + TWITTER_USERS_BATCH])},
+                    auth=auth
+                )
 
-            if resp.status_code == 200:
-                return resp.json().get('data', {}).get('username')
+                if resp.status_code == 200:
+                    for user in resp.json().get('data', []):
+                        usernames[user.get('id')] = user.get('username')
 
         except Exception as e:
-            logger.warning(f"Could not get username for {user_id}: {e}")
+            logger.warning(f"Could not get usernames for {len(user_ids)} users: {e}")
 
-        return None
+        return usernames
 
     def _extract_contract_id(self, message: str) -> Optional[str]:
         """Extract contract ID from a message containing client-room URL"""
@@ -540,10 +747,8 @@ class ConversationManager:
 
     def _find_conversation_by_user(self, platform: str, user_id: str) -> Optional[Conversation]:
         """Find conversation by platform and user ID"""
-        for conv in self.conversations.values():
-            if conv.platform == platform and conv.user_id == user_id:
-                return conv
-        return None
+        ids = self._by_user.get((platform, user_id))
+        return self.conversations[ids[0]] if ids else None
 
     async def process_reply(self, reply: Dict) -> Optional[str]:
         """
@@ -567,19 +772,20 @@ class ConversationManager:
             'message_id': reply.get('message_id')
         })
         conv.last_activity = datetime.now(timezone.utc).isoformat()
+        self._mark_dirty(conv)
 
         # Update state based on message content
-        conv.state = self._determine_state(user_message, conv.state)
+        self._set_state(conv, self._determine_state(user_message, conv.state))
 
         # Check for explicit decline or acceptance
         if self._is_decline(user_message):
-            conv.state = ConversationState.DECLINED.value
+            self._set_state(conv, ConversationState.DECLINED.value)
             self._save_conversations()
             logger.info(f"Conversation {conv.id} declined")
             return None  # Don't respond to explicit declines
 
         if self._is_acceptance(user_message):
-            conv.state = ConversationState.HANDSHAKE_ACCEPTED.value
+            self._set_state(conv, ConversationState.HANDSHAKE_ACCEPTED.value)
 
         # Generate AI response
         response = await self._generate_response(conv, user_message)
@@ -600,6 +806,7 @@ class ConversationManager:
                 'platform': reply['platform']
             })
             conv.last_activity = datetime.now(timezone.utc).isoformat()
+            self._mark_dirty(conv)
             self._save_conversations()
 
             logger.info(f"Sent response to @{conv.username}: {response[:50]}...")
@@ -945,41 +1152,96 @@ Generate a natural response. If they seem interested, reference the link in the
         """
         Main monitoring loop - check for replies and respond.
 
-        Run this on a schedule (every 2-5 minutes).
+        Run this on a schedule (every 2-5 minutes). Replies are handled
+        concurrently across conversations (up to REPLY_CONCURRENCY at once)
+        and in arrival order within a conversation.
         """
         logger.info("Checking for conversation replies...")
+        stats = self.monitor_stats
+        cycle_start = time.perf_counter()
 
         try:
             # Check for new replies
             replies = await self.check_for_replies()
+            checked = time.perf_counter()
+            stats['last_check_ms'] = round((checked - cycle_start) * 1000, 1)
+            stats['replies_found'] += len(replies)
 
             logger.info(f"Found {len(replies)} new replies")
 
-            # Process each reply
+            # Group by conversation so one thread never has two replies in flight
+            by_conversation: Dict[str, List[Dict]] = {}
             for reply in replies:
-                response = await self.process_reply(reply)
+                by_conversation.setdefault(reply.get('conversation_id'), []).append(reply)
+
+            sent = await asyncio.gather(*(self._process_thread(group) for group in by_conversation.values()))
+            stats['responses_sent'] += sum(sent)
+            processed = time.perf_counter()
+            stats['last_process_ms'] = round((processed - checked) * 1000, 1)
+
+            self._save_conversations()
+            stats['last_save_ms'] = round((time.perf_counter() - processed) * 1000, 1)
+
+        except Exception as e:
+            stats['errors'] += 1
+            logger.error(f"Error in monitor loop: {e}")
+
+        finally:
+            cycle_ms = (time.perf_counter() - cycle_start) * 1000
+            self._cycle_ms.append(cycle_ms)
+            stats['cycles'] += 1
+            stats['last_cycle_ms'] = round(cycle_ms, 1)
+            stats['last_cycle_at'] = datetime.now(timezone.utc).isoformat()
+
+    async def _process_thread(self, replies: List[Dict]) -> int:
+        """Process one conversation's replies in order; returns responses sent"""
+        sent = 0
+        async with self._reply_semaphore:
+            for reply in replies:
+                try:
+                    response = await self.process_reply(reply)
+                except Exception as e:
+                    self.monitor_stats['errors'] += 1
+                    logger.error(f"Error processing reply in {reply.get('conversation_id')}: {e}")
+                    response = None
                 if response:
+                    sent += 1
                     logger.info(f"Responded to {reply.get('username')}")
 
                 # Small delay between responses to avoid rate limits
-                await asyncio.sleep(1)
+                await asyncio.sleep(REPLY_SPACING_SECONDS)
+        return sent
 
-        except Exception as e:
-            logger.error(f"Error in monitor loop: {e}")
+    def get_monitor_stats(self) -> Dict:
+        """Monitor loop counters and cycle timing (p50/p95 over recent cycles)"""
+        durations = sorted(self._cycle_ms)
+
+        def pct(q):
+            return round(durations[min(len(durations) - 1, int(q * len(durations)))], 1) if durations else None
+
+        return {
+            **self.monitor_stats,
+            'cycle_ms_p50': pct(0.50),
+            'cycle_ms_p95': pct(0.95),
+            'reply_concurrency': REPLY_CONCURRENCY,
+        }
 
     def get_stats(self) -> Dict:
         """Get conversation statistics"""
-        states = {}
-        for conv in self.conversations.values():
-            states[conv.state] = states.get(conv.state, 0) + 1
+        platforms = {'twitter': 0, 'email': 0}
+        for (platform, _), ids in self._by_user.items():
+            if platform in platforms:
+                platforms[platform] += len(ids)
 
         return {
             'total_conversations': len(self.conversations),
-            'by_state': states,
-            'platforms': {
-                'twitter': len([c for c in self.conversations.values() if c.platform == 'twitter']),
-                'email': len([c for c in self.conversations.values() if c.platform == 'email'])
-            }
+            'by_state': {state: len(ids) for state, ids in self._by_state.items()},
+            'platforms': platforms,
+            'storage': {
+                'log_lines': self.store.lines,
+                'pending_writes': len(self._dirty),
+            },
+            'monitor': self.get_monitor_stats(),
         }
 
 
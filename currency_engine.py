@@ -1,9 +1,18 @@
 """
 AiGentsy Multi-Currency Engine
 Support for AIGx, USD, EUR, GBP + conversion
+
+Fiat rates come from FXRateService: refreshed in the background every
+FX_REFRESH_INTERVAL seconds and served from memory, so conversions never
+wait on the rates API. Each table served is kept in a timestamped ring
+(rates_at / convert_at) for backdated conversions.
 """
+import asyncio
+import os
+import time
+from bisect import bisect_right
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
 import httpx
 
 def _now():
@@ -22,143 +31,281 @@ AIGX_RATES = {
     "CREDITS": 100   # 1 AIGx = 100 credits
 }
 
-# Fiat exchange rates (updated periodically)
+# Fiat exchange rates (static fallback until the first live refresh)
 FIAT_RATES = {
     "USD": {"EUR": 0.92, "GBP": 0.79},
     "EUR": {"USD": 1.09, "GBP": 0.86},
     "GBP": {"USD": 1.27, "EUR": 1.16}
 }
 
+# Live rates (exchangerate-api.com free tier, USD based)
+FX_API_URL = os.getenv("FX_API_URL", "https://api.exchangerate-api.com/v4/latest/USD")
+FX_REFRESH_INTERVAL = float(os.getenv("FX_REFRESH_INTERVAL", "3600"))  # Seconds between background refreshes
+FX_RETRY_INTERVAL = 60            # Seconds before retrying a failed refresh
+FX_FETCH_TIMEOUT = 5
+FX_STALE_AFTER = 2 * FX_REFRESH_INTERVAL
+FX_HISTORY_SIZE = 24 * 30         # Rate tables kept for backdated conversions (~30 days hourly)
+
+
+def _cross_rates(usd_rates: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+    """Full fiat cross table from USD-based quotes (every pair is a direct lookup)"""
+    per_usd = {"USD": 1.0}
+    for currency in FIAT_RATES:
+        if currency != "USD" and usd_rates.get(currency):
+            per_usd[currency] = float(usd_rates[currency])
+    return {
+        base: {quote: quote_rate / base_rate for quote, quote_rate in per_usd.items() if quote != base}
+        for base, base_rate in per_usd.items()
+    }
+
+
+def _epoch(when: Union[datetime, str, float, int]) -> float:
+    if isinstance(when, (int, float)):
+        return float(when)
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when.replace("Z", "+00:00"))
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+class FXRateService:
+    """
+    In-memory fiat rates with background refresh.
+
+    rates() is a plain attribute read. refresh() is single-flight: callers
+    arriving while a fetch is in flight await that fetch instead of starting
+    another. A failed refresh keeps serving the last good table.
+    """
+
+    def __init__(
+        self,
+        url: str = FX_API_URL,
+        interval: float = FX_REFRESH_INTERVAL,
+        history_size: int = FX_HISTORY_SIZE
+    ):
+        self.url = url
+        self.interval = interval
+        self.history_size = history_size
+        self._rates: Dict[str, Dict[str, float]] = FIAT_RATES
+        self._source = "static"
+        self._updated_at: Optional[float] = None   # Last successful live refresh
+        self._provider_date: Optional[str] = None
+        self._history_ts: List[float] = []
+        self._history: List[Dict[str, Dict[str, float]]] = []
+        self._last_attempt: Optional[float] = None
+        self._inflight: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            "refreshes": 0,
+            "failures": 0,
+            "consecutive_failures": 0,
+            "joined_inflight": 0,
+            "last_error": None,
+            "last_attempt_at": None
+        }
+
+    # ── reads ──
+
+    def rates(self) -> Dict[str, Dict[str, float]]:
+        """Current rate table (treat as read-only)"""
+        return self._rates
+
+    def as_of(self) -> str:
+        if self._updated_at is None:
+            return "static"
+        return datetime.fromtimestamp(self._updated_at, timezone.utc).isoformat()
+
+    def age_seconds(self) -> Optional[float]:
+        return None if self._updated_at is None else time.time() - self._updated_at
+
+    def is_stale(self) -> bool:
+        age = self.age_seconds()
+        return age is None or age > FX_STALE_AFTER
+
+    def covers(self, when: Union[datetime, str, float, int]) -> bool:
+        """True if the in-memory history holds a live table for `when` (it is empty after a restart)"""
+        return bool(self._history_ts) and _epoch(when) >= self._history_ts[0]
+
+    def rates_at(self, when: Union[datetime, str, float, int]) -> Dict[str, Dict[str, float]]:
+        """Rate table in effect at `when` (static rates when `when` predates the history)"""
+        i = bisect_right(self._history_ts, _epoch(when)) - 1
+        return self._history[i] if i >= 0 else FIAT_RATES
+
+    # ── refresh ──
+
+    def _record(self, table: Dict[str, Dict[str, float]], provider_date: Optional[str]):
+        now = time.time()
+        self._rates = table
+        self._source = "live"
+        self._updated_at = now
+        self._provider_date = provider_date
+        self._history_ts.append(now)
+        self._history.append(table)
+        if len(self._history) > 2 * self.history_size:
+            # Trim in bulk so appends stay O(1) amortized
+            del self._history_ts[:-self.history_size]
+            del self._history[:-self.history_size]
+
+    async def _fetch(self) -> bool:
+        self._last_attempt = time.time()
+        self.stats["last_attempt_at"] = _now()
+        try:
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.AsyncClient(timeout=FX_FETCH_TIMEOUT)
+            response = await self._client.get(self.url)
+            response.raise_for_status()
+            data = response.json()
+            table = _cross_rates(data.get("rates", {}))
+            if len(table) < 2:
+                raise ValueError("no fiat quotes in response")
+        except Exception as e:
+            self.stats["failures"] += 1
+            self.stats["consecutive_failures"] += 1
+            self.stats["last_error"] = str(e) or type(e).__name__
+            print(f"⚠️ Live rates fetch failed: {e}")
+            return False
+
+        self._record(table, data.get("date"))
+        self.stats["refreshes"] += 1
+        self.stats["consecutive_failures"] = 0
+        return True
+
+    async def refresh(self) -> bool:
+        """Fetch live rates now (joins the in-flight fetch if there is one)"""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._fetch())
+        else:
+            self.stats["joined_inflight"] += 1
+        # shield: a cancelled caller must not cancel the fetch other callers share
+        return await asyncio.shield(self._inflight)
+
+    async def ensure_fresh(self) -> bool:
+        """Refresh only if the rates are stale and no attempt failed in the last FX_RETRY_INTERVAL"""
+        if not self.is_stale():
+            return True
+        if self._last_attempt is not None and time.time() - self._last_attempt < FX_RETRY_INTERVAL:
+            return False
+        return await self.refresh()
+
+    async def run(self):
+        """Background refresh loop"""
+        while True:
+            ok = await self.refresh()
+            await asyncio.sleep(self.interval if ok else min(self.interval, FX_RETRY_INTERVAL))
+
+    def start(self) -> asyncio.Task:
+        """Start the background refresh loop on the running event loop (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+
+    # ── conversion ──
+
+    def convert_at(
+        self,
+        amount: float,
+        from_currency: str,
+        to_currency: str,
+        when: Union[datetime, str, float, int]
+    ) -> Dict[str, Any]:
+        """
+        convert_currency() at the rates in effect at `when`
+        
+        Falls back to the static table (source "static", no rates_at) when
+        `when` predates the rate history, e.g. right after a restart.
+        """
+        result = convert_currency(amount, from_currency, to_currency, self.rates_at(when))
+        if result.get("ok"):
+            if self.covers(when):
+                result["source"] = "history"
+                result["rates_at"] = when if isinstance(when, str) else datetime.fromtimestamp(_epoch(when), timezone.utc).isoformat()
+            else:
+                result["source"] = "static"
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        age = self.age_seconds()
+        return {
+            **self.stats,
+            "source": self._source,
+            "as_of": self.as_of(),
+            "provider_date": self._provider_date,
+            "age_seconds": None if age is None else round(age, 1),
+            "stale": self.is_stale(),
+            "stale_after_seconds": FX_STALE_AFTER,
+            "refresh_interval_seconds": self.interval,
+            "background_refresh": self._task is not None and not self._task.done(),
+            "history_entries": len(self._history),
+            "history_oldest": (datetime.fromtimestamp(self._history_ts[0], timezone.utc).isoformat()
+                               if self._history_ts else None),
+            "currencies": sorted(self._rates)
+        }
+
+
+_fx_service: Optional[FXRateService] = None
+
+
+def get_fx_service() -> FXRateService:
+    """Get singleton FX rate service"""
+    global _fx_service
+    if _fx_service is None:
+        _fx_service = FXRateService()
+    return _fx_service
+
 
 async def fetch_live_rates() -> Dict[str, Dict[str, float]]:
     """
-    Fetch live exchange rates from external API
-    Falls back to static rates if API fails
+    Current exchange rates from the FX rate service
+    Refreshes first only if the rates are stale; static rates if the API fails
     """
-    try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            # Using exchangerate-api.com (free tier)
-            response = await client.get(
-                "https://api.exchangerate-api.com/v4/latest/USD"
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                rates = data.get("rates", {})
-                
-                return {
-                    "USD": {
-                        "EUR": rates.get("EUR", 0.92),
-                        "GBP": rates.get("GBP", 0.79)
-                    },
-                    "timestamp": data.get("date", _now())
-                }
-    
-    except Exception as e:
-        print(f"⚠️ Live rates fetch failed: {e}")
-    
-    # Fallback to static rates
-    return FIAT_RATES
+    service = get_fx_service()
+    await service.ensure_fresh()
+    return {**service.rates(), "timestamp": service.as_of()}
 
 
-def convert_currency(
-    amount: float,
+def _resolve_rate(
     from_currency: str,
     to_currency: str,
-    rates: Dict[str, Dict[str, float]] = None
-) -> Dict[str, Any]:
-    """
-    Convert amount from one currency to another
-    """
-    from_currency = from_currency.upper()
-    to_currency = to_currency.upper()
-    
+    rates: Dict[str, Dict[str, float]]
+) -> Tuple[Optional[float], Optional[Dict[str, Any]]]:
+    """(rate, None) or (None, error result) for upper-cased currency codes"""
     # Same currency - no conversion
     if from_currency == to_currency:
-        return {
-            "ok": True,
-            "from_amount": amount,
-            "from_currency": from_currency,
-            "to_amount": amount,
-            "to_currency": to_currency,
-            "rate": 1.0
-        }
+        return 1.0, None
     
     # Validate currencies
     if from_currency not in SUPPORTED_CURRENCIES:
-        return {
+        return None, {
             "ok": False,
             "error": "unsupported_from_currency",
             "supported": SUPPORTED_CURRENCIES
         }
     
     if to_currency not in SUPPORTED_CURRENCIES:
-        return {
+        return None, {
             "ok": False,
             "error": "unsupported_to_currency",
             "supported": SUPPORTED_CURRENCIES
         }
     
-    # Use provided rates or fallback to static
-    if not rates:
-        rates = FIAT_RATES
-    
     # AIGx conversions
     if from_currency == "AIGx":
-        rate = AIGX_RATES.get(to_currency, 1.0)
-        to_amount = round(amount * rate, 2)
-        
-        return {
-            "ok": True,
-            "from_amount": amount,
-            "from_currency": from_currency,
-            "to_amount": to_amount,
-            "to_currency": to_currency,
-            "rate": rate
-        }
+        return AIGX_RATES.get(to_currency, 1.0), None
     
     if to_currency == "AIGx":
-        rate = 1.0 / AIGX_RATES.get(from_currency, 1.0)
-        to_amount = round(amount * rate, 2)
-        
-        return {
-            "ok": True,
-            "from_amount": amount,
-            "from_currency": from_currency,
-            "to_amount": to_amount,
-            "to_currency": to_currency,
-            "rate": rate
-        }
+        return 1.0 / AIGX_RATES.get(from_currency, 1.0), None
     
     # Fiat to fiat conversions
     if from_currency in rates and to_currency in rates[from_currency]:
-        rate = rates[from_currency][to_currency]
-        to_amount = round(amount * rate, 2)
-        
-        return {
-            "ok": True,
-            "from_amount": amount,
-            "from_currency": from_currency,
-            "to_amount": to_amount,
-            "to_currency": to_currency,
-            "rate": rate
-        }
+        return rates[from_currency][to_currency], None
     
     # Inverse conversion
     if to_currency in rates and from_currency in rates[to_currency]:
-        rate = 1.0 / rates[to_currency][from_currency]
-        to_amount = round(amount * rate, 2)
-        
-        return {
-            "ok": True,
-            "from_amount": amount,
-            "from_currency": from_currency,
-            "to_amount": to_amount,
-            "to_currency": to_currency,
-            "rate": rate
-        }
+        return 1.0 / rates[to_currency][from_currency], None
     
-    return {
+    return None, {
         "ok": False,
         "error": "conversion_not_available",
         "from_currency": from_currency,
@@ -166,6 +313,84 @@ def convert_currency(
     }
 
 
+def convert_currency(
+    amount: float,
+    from_currency: str,
+    to_currency: str,
+    rates: Dict[str, Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Convert amount from one currency to another
+    Uses the FX rate service's in-memory rates unless rates are given
+    """
+    from_currency = from_currency.upper()
+    to_currency = to_currency.upper()
+    
+    rate, error = _resolve_rate(from_currency, to_currency, rates or get_fx_service().rates())
+    
+    if error:
+        return error
+    
+    return {
+        "ok": True,
+        "from_amount": amount,
+        "from_currency": from_currency,
+        "to_amount": amount if from_currency == to_currency else round(amount * rate, 2),
+        "to_currency": to_currency,
+        "rate": rate
+    }
+
+
+def convert_many(
+    amounts: Iterable[float],
+    from_currency: str,
+    to_currencies: Iterable[str],
+    at: Union[datetime, str, float, int, None] = None
+) -> Dict[str, Any]:
+    """
+    Convert a list of amounts into several currencies (pricing pages)
+    
+    Reads the rate table once and resolves each currency pair once; amounts
+    are rounded as convert_currency() rounds them. at= converts at the rates
+    in effect at that time (rates_as_of is "static" if that predates the
+    rate history).
+    """
+    if isinstance(to_currencies, str):
+        to_currencies = [to_currencies]
+    service = get_fx_service()
+    rates = service.rates() if at is None else service.rates_at(at)
+    from_currency = from_currency.upper()
+    amounts = list(amounts)
+    
+    converted = {}
+    rates_used = {}
+    errors = {}
+    
+    for to_currency in to_currencies:
+        to_currency = to_currency.upper()
+        rate, error = _resolve_rate(from_currency, to_currency, rates)
+        
+        if error:
+            errors[to_currency] = error["error"]
+            continue
+        
+        rates_used[to_currency] = rate
+        if from_currency == to_currency:
+            converted[to_currency] = amounts
+        else:
+            converted[to_currency] = [round(amount * rate, 2) for amount in amounts]
+    
+    return {
+        "ok": not errors,
+        "from_currency": from_currency,
+        "amounts": amounts,
+        "converted": converted,
+        "rates": rates_used,
+        "errors": errors,
+        "rates_as_of": service.as_of() if at is None else (str(at) if service.covers(at) else "static")
+    }
+
+
 def get_user_balance(
     user: Dict[str, Any],
     currency: str = "USD"
@@ -1980,6 +1980,33 @@ def create_dashboard_endpoints(app):
         from slo_engine import get_buyer_slo_dashboard
         return get_buyer_slo_dashboard(username)
     
+    @app.post("/slo/track")
+    async def slo_track_post(
+        contract_id: str,
+        event_type: str,
+        event_data: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[str] = None
+    ):
+        """
+        Track SLO contract event.
+        
+        Returns:
+            Tracking confirmation (contract and dashboard aggregates updated)
+        """
+        from slo_engine import track_slo_performance_event
+        return track_slo_performance_event(contract_id, event_type, event_data or {}, timestamp)
+    
+    @app.post("/slo/events/bulk")
+    async def slo_events_bulk_post(events: List[Dict[str, Any]]):
+        """
+        Backfill historical SLO events.
+        
+        Returns:
+            Tracked, duplicate, invalid and unapplied event counts
+        """
+        from slo_engine import bulk_track_slo_events
+        return bulk_track_slo_events(events)
+    
     @app.get("/slo/recommend")
     async def slo_recommend_get(
         urgency: str = "medium",
@@ -0,0 +1,537 @@
+"""
+AiGentsy Deal Store
+Primary-key + indexed storage for DealGraph deals, with a change feed
+
+Deals used to live in the `system_dealgraph` user record's `deals` list:
+every lookup was a scan and every change rewrote the whole user array.
+DealStore keeps them by id with secondary indexes (state, buyer,
+lead_agent, intent_id, jv_partner) and persists each change as one record
+appended to a local journal:
+
+    data/deals/deals.journal   {"seq": 7, "op": "put", "deal": {...}}
+                               {"seq": 8, "op": "transition", "id": ..., "state": ..., "updated_at": ..., "entry": {...}}
+    data/deals/deals.snapshot  every live deal, written (by a background thread) when
+                               the journal outgrows it
+
+Transitions and updates are applied under the store lock: validated,
+committed to the journal and re-indexed together, or not at all. Every
+committed change gets a sequence number and goes to the change feed
+(changes(since=...) / subscribe()), so jobs and dashboards react to
+transitions instead of re-scanning every deal.
+
+The `system_dealgraph` record is kept as a mirror for cross-deploy
+survival: the store seeds from it when its journal is empty and rewrites it
+from a background thread, at most every DEAL_MIRROR_INTERVAL seconds.
+Money-moving changes are written through with flush_mirror(), and pending
+changes are pushed at shutdown (atexit, and the app's shutdown hook).
+"""
+import asyncio
+import atexit
+import copy
+import gc
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from dealgraph import DealState, transition_state
+from ndjson_stream import dumps_line as _dumps, loads_line as _loads
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent / "data"
+DEALS_DIR = DATA_DIR / "deals"
+
+INDEXED_FIELDS = ("state", "buyer", "lead_agent", "intent_id")
+FEED_SIZE = 10_000                  # Changes kept for changes(since=...)
+COMPACT_MIN_RECORDS = 50_000        # Never compact a shorter journal
+COMPACT_RATIO = 2.0                 # Compact when journal records > ratio x live deals
+DEAL_MIRROR_INTERVAL = float(os.getenv("DEAL_MIRROR_INTERVAL", "30"))
+MIRROR_USERNAME = "system_dealgraph"
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _state(value: Any) -> Optional[str]:
+    return value.value if isinstance(value, DealState) else value
+
+
+def _index_values(deal: Dict[str, Any]) -> tuple:
+    """(state, buyer, lead_agent, intent_id, jv partner usernames)"""
+    jv_partners = deal.get("jv_partners")
+    return (
+        _state(deal.get("state")), deal.get("buyer"), deal.get("lead_agent"), deal.get("intent_id"),
+        tuple({p.get("username") for p in jv_partners if isinstance(p, dict)}) if jv_partners else ()
+    )
+
+
+class _DealMirror:
+    """Rewrites the system_dealgraph record's deals from a background thread"""
+
+    def __init__(self, store: "DealStore", interval: float = DEAL_MIRROR_INTERVAL):
+        self.store = store
+        self.interval = interval
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._push_lock = threading.Lock()    # One push at a time; a flush waits for one in flight
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"pushes": 0, "failures": 0}
+
+    def mark_dirty(self):
+        with self._lock:
+            self._dirty = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="deal-mirror", daemon=True)
+                self._thread.start()
+                # The thread is a daemon: push what is still pending when the process exits
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> bool:
+        """Push now if anything changed since the last push; True once the mirror is current"""
+        with self._push_lock:
+            return self._push()
+
+    def _push(self) -> bool:
+        with self._lock:
+            if not self._dirty:
+                return True
+            self._dirty = False
+        ok = False
+        try:
+            from log_to_jsonbin import _ok_jsonbin, _read_jsonbin, _write_jsonbin
+            if not _ok_jsonbin():
+                return True  # JSONBin not configured: nothing to mirror
+            records, _raw = _read_jsonbin()
+            if records is not None:
+                system_user = next((u for u in records if isinstance(u, dict) and u.get("username") == MIRROR_USERNAME), None)
+                if system_user is None:
+                    system_user = {"username": MIRROR_USERNAME, "role": "system", "deals": [], "created_at": _now()}
+                    records.append(system_user)
+                system_user["deals"] = self.store.snapshot()
+                ok, _err = _write_jsonbin(records)
+        except Exception as e:
+            logger.warning(f"Deal mirror push failed: {e}")
+        if ok:
+            self.stats["pushes"] += 1
+        else:
+            self.stats["failures"] += 1
+            with self._lock:
+                self._dirty = True
+        return ok
+
+
+class DealStore:
+    """Deals by id, indexed, journaled, with a change feed"""
+
+    def __init__(self, deals_dir: Path = DEALS_DIR, mirror: bool = False):
+        self.deals_dir = Path(deals_dir)
+        self.journal_path = self.deals_dir / "deals.journal"
+        self.snapshot_path = self.deals_dir / "deals.snapshot"
+        self._deals: Dict[str, Dict[str, Any]] = {}
+        self._order: Dict[str, int] = {}
+        self._keys: Dict[str, tuple] = {}
+        self._indexes: Dict[str, Dict[Any, set]] = {f: {} for f in INDEXED_FIELDS + ("jv_partner",)}
+        self._index_list = [self._indexes[f] for f in INDEXED_FIELDS]
+        self._lock = threading.RLock()
+        self._seq = 0
+        self._next_order = 0
+        self._journal = None
+        self._journal_records = 0
+        self._compacting = False
+        self._feed: deque = deque(maxlen=FEED_SIZE)
+        self._subscribers: List[Callable[[Dict[str, Any]], Any]] = []
+        self.mirror = _DealMirror(self) if mirror else None
+        self.stats = {"puts": 0, "transitions": 0, "updates": 0, "rejected": 0, "compactions": 0, "replayed": 0}
+        # Loading allocates millions of containers; cyclic GC passes over
+        # them would dominate the load time
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._load()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    # ── indexes ──
+
+    def _index(self, deal_id: str, deal: Dict[str, Any]):
+        self._unindex(deal_id)
+        self._deals[deal_id] = deal
+        if deal_id not in self._order:
+            self._order[deal_id] = self._next_order
+            self._next_order += 1
+        keys = _index_values(deal)
+        self._keys[deal_id] = keys
+        for index, value in zip(self._index_list, keys):
+            if value is not None:
+                index.setdefault(value, set()).add(deal_id)
+        jv_index = self._indexes["jv_partner"]
+        for value in keys[-1]:
+            if value is not None:
+                jv_index.setdefault(value, set()).add(deal_id)
+
+    def _unindex(self, deal_id: str):
+        keys = self._keys.pop(deal_id, None)
+        if keys is None:
+            return
+        jv_index = self._indexes["jv_partner"]
+        pairs = list(zip(self._index_list, keys)) + [(jv_index, value) for value in keys[-1]]
+        for index, value in pairs:
+            ids = index.get(value)
+            if ids is not None:
+                ids.discard(deal_id)
+                if not ids:
+                    del index[value]
+
+    def _reindex_state(self, deal_id: str, old: Optional[str], new: Optional[str]):
+        index = self._indexes["state"]
+        if old is not None and old in index:
+            index[old].discard(deal_id)
+            if not index[old]:
+                del index[old]
+        if new is not None:
+            index.setdefault(new, set()).add(deal_id)
+        self._keys[deal_id] = (new,) + self._keys[deal_id][1:]
+
+    # ── journal ──
+
+    def _load(self):
+        """Snapshot, then journal records newer than it"""
+        snapshot_seq = 0
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, "rb") as f:
+                header = f.readline()
+                if header:
+                    snapshot_seq = _loads(header).get("seq", 0)
+                for line in f:
+                    deal = _loads(line)
+                    self._index(deal["id"], deal)
+        self._seq = snapshot_seq
+        if self.journal_path.exists():
+            good_end = 0
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # A write cut short by a crash
+                    try:
+                        record = _loads(line)
+                    except ValueError:
+                        logger.warning("Deal journal: skipping unreadable record")
+                        good_end += len(line)
+                        continue
+                    good_end += len(line)
+                    self._journal_records += 1
+                    if record.get("seq", 0) <= snapshot_seq:
+                        continue
+                    self._replay(record)
+                    self._seq = max(self._seq, record.get("seq", 0))
+                    self.stats["replayed"] += 1
+            if good_end < self.journal_path.stat().st_size:
+                logger.warning("Deal journal: dropping torn final record")
+                os.truncate(self.journal_path, good_end)
+
+    def _replay(self, record: Dict[str, Any]):
+        if record["op"] == "put":
+            deal = record["deal"]
+            self._index(deal["id"], deal)
+        elif record["op"] == "transition":
+            deal = self._deals.get(record["id"])
+            if deal is not None:
+                old = _state(deal.get("state"))
+                deal["state"] = record["state"]
+                deal["updated_at"] = record.get("updated_at", record["entry"]["at"])
+                deal.setdefault("state_history", []).append(record["entry"])
+                self._reindex_state(record["id"], old, record["state"])
+
+    def _append(self, record: Dict[str, Any]):
+        if self._journal is None:
+            self.deals_dir.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_path, "ab")
+        # One write per record: a crash leaves at most one torn last line
+        self._journal.write(_dumps(record))
+        self._journal.flush()
+        self._journal_records += 1
+
+    def _commit(self, op: str, deal_id: str, from_state: Optional[str], to_state: Optional[str], record: Dict[str, Any]) -> Dict[str, Any]:
+        self._seq += 1
+        record["seq"] = self._seq
+        self._append(record)  # Raises before anything is published
+        change = {"seq": self._seq, "op": op, "deal_id": deal_id, "from_state": from_state, "to_state": to_state, "at": _now()}
+        self._feed.append(change)
+        return change
+
+    def _publish(self, change: Dict[str, Any]):
+        """Notify subscribers (outside the lock) and schedule housekeeping"""
+        for callback in list(self._subscribers):
+            try:
+                callback(change)
+            except Exception as e:
+                logger.warning(f"Deal change subscriber failed: {e}")
+        if self.mirror is not None:
+            self.mirror.mark_dirty()
+        if (not self._compacting and self._journal_records >= COMPACT_MIN_RECORDS
+                and self._journal_records > COMPACT_RATIO * len(self._deals)):
+            with self._lock:
+                if self._compacting:
+                    return
+                self._compacting = True
+            # Writers may be on the event loop: never write the snapshot on their thread
+            threading.Thread(target=self._compact_in_background, name="deal-compact", daemon=True).start()
+
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logger.warning(f"Deal journal compaction failed: {e}")
+        finally:
+            self._compacting = False
+
+    def compact(self):
+        """Write every live deal to a new snapshot and start an empty journal"""
+        with self._lock:
+            self.deals_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(_dumps({"seq": self._seq, "deals": len(self._deals), "written_at": _now()}))
+                for deal_id in sorted(self._deals, key=self._order.__getitem__):
+                    f.write(_dumps(self._deals[deal_id]))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            # Journal records up to the snapshot seq are skipped on load, so a
+            # crash before this truncation still replays correctly
+            if self._journal is not None:
+                self._journal.close()
+            self._journal = open(self.journal_path, "wb")
+            self._journal_records = 0
+            self.stats["compactions"] += 1
+
+    def flush_mirror(self) -> bool:
+        """Write pending changes through to the system_dealgraph record (blocking)"""
+        return self.mirror.flush() if self.mirror is not None else True
+
+    def close(self):
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    # ── reads ──
+
+    def get(self, deal_id: str) -> Optional[Dict[str, Any]]:
+        """The stored deal; change it only through transition() / update()"""
+        return self._deals.get(deal_id)
+
+    def __len__(self) -> int:
+        return len(self._deals)
+
+    def position(self, deal_id: str) -> int:
+        """Creation-order key (find() returns deals sorted by it)"""
+        return self._order[deal_id]
+
+    def find(
+        self,
+        state: str = None,
+        buyer: str = None,
+        lead_agent: str = None,
+        intent_id: str = None,
+        jv_partner: str = None,
+        limit: int = None
+    ) -> List[Dict[str, Any]]:
+        """Deals matching every given field, in creation order"""
+        filters = {"state": _state(state), "buyer": buyer, "lead_agent": lead_agent,
+                   "intent_id": intent_id, "jv_partner": jv_partner}
+        filters = {f: v for f, v in filters.items() if v is not None}
+        with self._lock:
+            if not filters:
+                ids = list(self._deals)
+            else:
+                sets = sorted((self._indexes[f].get(v, set()) for f, v in filters.items()), key=len)
+                ids = set(sets[0]).intersection(*sets[1:])
+                ids = sorted(ids, key=self._order.__getitem__)
+            if limit is not None:
+                ids = ids[:limit]
+            return [self._deals[i] for i in ids]
+
+    def count_by(self, field: str) -> Dict[Any, int]:
+        """Deal count per indexed value (e.g. count_by("state"))"""
+        with self._lock:
+            return {value: len(ids) for value, ids in self._indexes[field].items()}
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self.find()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Detached JSON copies of every deal (safe to serialize on another thread)"""
+        with self._lock:
+            return [_loads(_dumps(deal)) for deal in self.find()]
+
+    # ── writes ──
+
+    def put(self, deal: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert (or replace) a deal"""
+        deal_id = deal["id"]
+        with self._lock:
+            old = self._deals.get(deal_id)
+            from_state = _state(old.get("state")) if old else None
+            try:
+                change = self._commit("put", deal_id, from_state, _state(deal.get("state")), {"op": "put", "deal": deal})
+            except Exception:
+                self._seq -= 1
+                raise
+            self._index(deal_id, deal)
+            self.stats["puts"] += 1
+        self._publish(change)
+        return change
+
+    def import_deals(self, deals: Iterable[Dict[str, Any]]) -> int:
+        """Put deals not already stored (seeding from the legacy record). Returns count added."""
+        added = 0
+        for deal in deals:
+            if isinstance(deal, dict) and deal.get("id") and deal["id"] not in self._deals:
+                self.put(deal)
+                added += 1
+        return added
+
+    def transition(
+        self,
+        deal_id: str,
+        new_state: DealState,
+        actor: str,
+        metadata: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Atomic dealgraph.transition_state(): validated, applied, journaled and
+        re-indexed under the store lock
+        """
+        with self._lock:
+            deal = self._deals.get(deal_id)
+            if deal is None:
+                return {"ok": False, "error": "deal_not_found", "deal_id": deal_id}
+            from_state = _state(deal.get("state"))
+            before = (deal.get("state"), deal.get("updated_at"), len(deal.get("state_history", [])))
+            result = transition_state(deal, new_state, actor, metadata)
+            if not result.get("ok"):
+                self.stats["rejected"] += 1
+                return result
+            to_state = deal["state"]
+            try:
+                change = self._commit("transition", deal_id, from_state, to_state, {
+                    "op": "transition", "id": deal_id, "state": to_state,
+                    "updated_at": deal["updated_at"], "entry": deal["state_history"][-1]
+                })
+            except Exception:
+                # Not journaled: undo the in-place transition
+                self._seq -= 1
+                deal["state"], deal["updated_at"] = before[0], before[1]
+                del deal["state_history"][before[2]:]
+                raise
+            self._reindex_state(deal_id, from_state, to_state)
+            self.stats["transitions"] += 1
+        self._publish(change)
+        return result
+
+    def update(self, deal_id: str, fn: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run a dealgraph / state_money operation (fn(deal) -> result) atomically.
+
+        fn works on a copy of the deal; the copy replaces the stored deal and
+        is journaled only if the result is ok, so a rejected or failing
+        operation leaves the deal untouched.
+        """
+        with self._lock:
+            deal = self._deals.get(deal_id)
+            if deal is None:
+                return {"ok": False, "error": "deal_not_found", "deal_id": deal_id}
+            working = copy.deepcopy(deal)
+            result = fn(working)
+            if not (isinstance(result, dict) and result.get("ok")):
+                self.stats["rejected"] += 1
+                return result
+            from_state = _state(deal.get("state"))
+            try:
+                change = self._commit("update", deal_id, from_state, _state(working.get("state")), {"op": "put", "deal": working})
+            except Exception:
+                self._seq -= 1
+                raise
+            self._index(deal_id, working)
+            self.stats["updates"] += 1
+        self._publish(change)
+        return result
+
+    # ── change feed ──
+
+    def changes(self, since: int = 0, limit: int = 1000) -> Dict[str, Any]:
+        """Changes after sequence number `since`; pass the returned cursor back"""
+        with self._lock:
+            oldest = self._feed[0]["seq"] if self._feed else self._seq + 1
+            items = [c for c in self._feed if c["seq"] > since][:limit]
+            return {
+                "changes": items,
+                "cursor": items[-1]["seq"] if items else max(since, 0),
+                "latest": self._seq,
+                # Changes older than the feed window were dropped; re-read state
+                "truncated": since + 1 < oldest and since < self._seq
+            }
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], Any]) -> Callable[[], None]:
+        """Call callback(change) after every committed change; returns unsubscribe()"""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback) if callback in self._subscribers else None
+
+    async def follow(self, since: int = 0, heartbeat: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+        """Async stream of change batches from `since` (an empty batch every heartbeat seconds)"""
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        unsubscribe = self.subscribe(lambda change: loop.call_soon_threadsafe(wake.set))
+        try:
+            while True:
+                batch = self.changes(since)
+                if batch["changes"]:
+                    since = batch["cursor"]
+                    yield batch
+                    continue
+                wake.clear()
+                try:
+                    await asyncio.wait_for(wake.wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield batch
+        finally:
+            unsubscribe()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "deals": len(self._deals),
+                "seq": self._seq,
+                "journal_records": self._journal_records,
+                "by_state": self.count_by("state"),
+                "subscribers": len(self._subscribers),
+                "mirror": dict(self.mirror.stats) if self.mirror else None,
+            }
+
+
+_store: Optional[DealStore] = None
+_store_lock = threading.Lock()
+
+
+def get_deal_store() -> DealStore:
+    """Get singleton deal store (mirrored to the system_dealgraph record)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DealStore(DEALS_DIR, mirror=True)
+        return _store
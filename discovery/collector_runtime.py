@@ -10,8 +10,6 @@ Production-grade scraping with:
 - JS rendering fallback
 """
 
-import asyncio
-import time
 import hashlib
 import logging
 from typing import Optional, Dict, List, Any
@@ -28,84 +26,10 @@ try:
 except ImportError:
     async_playwright = None
 
-logger = logging.getLogger(__name__)
-
-
-class TokenBucket:
-    """Per-host rate limiting with token bucket algorithm"""
-
-    def __init__(self, requests_per_minute: int = 30):
-        self.rpm = requests_per_minute
-        self.buckets: Dict[str, Dict] = {}
-        self._lock = asyncio.Lock()
-
-    async def acquire(self, host: str) -> bool:
-        """Acquire token for host, returns True if allowed"""
-        async with self._lock:
-            now = time.time()
-
-            if host not in self.buckets:
-                self.buckets[host] = {
-                    'tokens': self.rpm,
-                    'last_refill': now
-                }
-
-            bucket = self.buckets[host]
-
-            # Refill tokens based on elapsed time
-            elapsed = now - bucket['last_refill']
-            refill = int(elapsed * self.rpm / 60)
-            bucket['tokens'] = min(self.rpm, bucket['tokens'] + refill)
-            bucket['last_refill'] = now
-
-            # Check if token available
-            if bucket['tokens'] > 0:
-                bucket['tokens'] -= 1
-                return True
-
-            return False
-
-    async def wait_for_token(self, host: str, max_wait: float = 5.0) -> bool:
-        """Wait for token, up to max_wait seconds"""
-        start = time.time()
-        while time.time() - start < max_wait:
-            if await self.acquire(host):
-                return True
-            await asyncio.sleep(0.1)
-        return False
-
+from compliance.rate_limit import get_rate_limiter
+from compliance.robots_guard import get_robots_guard
 
-class RobotsGuard:
-    """robots.txt compliance checker"""
-
-    def __init__(self):
-        self.cache: Dict[str, Dict] = {}
-        self.cache_ttl = 3600  # 1 hour
-
-    async def allowed(self, url: str) -> bool:
-        """Check if URL is allowed by robots.txt"""
-        try:
-            parsed = urlparse(url)
-            base_url = f"{parsed.scheme}://{parsed.netloc}"
-
-            # Check cache
-            if base_url in self.cache:
-                entry = self.cache[base_url]
-                if time.time() - entry['fetched_at'] < self.cache_ttl:
-                    return self._check_rules(url, entry['rules'])
-
-            # Fetch robots.txt (simplified - always allow for now)
-            # In production, use robotexclusionrulesparser
-            return True
-
-        except Exception as e:
-            logger.debug(f"robots.txt check failed for {url}: {e}")
-            return True  # Fail open
-
-    def _check_rules(self, url: str, rules: Dict) -> bool:
-        """Check URL against rules"""
-        # Simplified implementation
-        return True
+logger = logging.getLogger(__name__)
 
 
 class ToSRegistry:
@@ -204,8 +128,10 @@ class CollectorRuntime:
     def __init__(self, config: Optional[Dict] = None):
         config = config or {}
 
-        self.rate_limits = TokenBucket(config.get('requests_per_minute', 30))
-        self.robots_guard = RobotsGuard()
+        # Shared per-host limiter (also used by the headless connector)
+        self.rate_limits = get_rate_limiter()
+        # Shared robots.txt cache; feeds each host's Crawl-delay to the limiter
+        self.robots_guard = get_robots_guard()
         self.tos_registry = ToSRegistry()
         self.user_agents = UserAgentPool()
         self.js_fallback = HeadlessFallback()
@@ -246,8 +172,9 @@ class CollectorRuntime:
             parsed = urlparse(url)
             host = parsed.netloc
 
-        # Check robots.txt
-        if not await self.robots_guard.allowed(url):
+        # Check robots.txt (first check per host fetches it and applies its Crawl-delay)
+        allowed, _crawl_delay = await self.robots_guard.can_fetch(url)
+        if not allowed:
             logger.info(f"[collector] Blocked by robots.txt: {url}")
             self.stats['blocked_robots'] += 1
             return None
@@ -259,7 +186,7 @@ class CollectorRuntime:
             return None
 
         # Rate limiting
-        if not await self.rate_limits.wait_for_token(host, max_wait=3.0):
+        if await self.rate_limits.acquire(host, max_wait=3.0) is None:
             logger.warning(f"[collector] Rate limited: {host}")
             self.stats['rate_limited'] += 1
             return None
@@ -326,7 +253,8 @@ class CollectorRuntime:
                     self.stats['rate_limited'],
                     self.stats['errors']
                 ]))
-            )
+            ),
+            'rate_limiter': self.rate_limits.get_stats(),
         }
 
 
@@ -17,6 +17,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from collections import Counter
 
+from .keyword_matcher import get_keyword_matcher
+
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -165,47 +167,60 @@ GIG_SIGNALS = [
 ]
 
 
+_catalog_cache: Dict[str, object] = {"mtime": None, "skus": []}
+
+
 def _load_sku_catalog() -> List[Dict]:
-    """Load the v2 SKU catalog"""
+    """Load the v2 SKU catalog (cached until the file changes)"""
     v2_file = DATA_DIR / "sku_catalog_v2.json"
     if not v2_file.exists():
         return []
     try:
-        data = json.loads(v2_file.read_text())
-        return data.get("skus", [])
+        mtime = v2_file.stat().st_mtime
+        if _catalog_cache["mtime"] != mtime:
+            data = json.loads(v2_file.read_text())
+            _catalog_cache["skus"] = data.get("skus", [])
+            _catalog_cache["mtime"] = mtime
+        return _catalog_cache["skus"]
     except Exception:
         return []
 
 
-def _is_rejected(text: str) -> Optional[str]:
+def _is_rejected(text: str, hits: frozenset = None) -> Optional[str]:
     """Check if opportunity text matches rejection patterns. Returns reason or None."""
-    text_lower = text.lower()
-    for phrase in REJECT_PHRASES:
-        if phrase in text_lower:
-            return f"rejected:{phrase}"
-    return None
+    matcher = get_keyword_matcher()
+    if hits is None:
+        hits = matcher.scan(text)
+    phrase = matcher.first(hits, "fulfill.reject")
+    return f"rejected:{phrase}" if phrase else None
 
 
-def _has_gig_signal(text: str) -> bool:
+def _has_gig_signal(text: str, hits: frozenset = None) -> bool:
     """Check if the opportunity has positive gig/task signals."""
-    text_lower = text.lower()
-    return any(signal in text_lower for signal in GIG_SIGNALS)
+    matcher = get_keyword_matcher()
+    if hits is None:
+        hits = matcher.scan(text)
+    return matcher.any(hits, "fulfill.gig")
 
 
-def _match_sku(text: str) -> Tuple[Optional[str], float]:
+def _match_sku(text: str, hits: frozenset = None) -> Tuple[Optional[str], float]:
     """
     Match opportunity text against SKU catalog keywords.
     Returns (best_sku_id, confidence 0-1).
     """
-    text_lower = text.lower()
+    matcher = get_keyword_matcher()
+    if hits is None:
+        hits = matcher.scan(text)
     best_sku = None
     best_score = 0
+    if not hits:
+        return best_sku, round(best_score, 2)
 
     for sku_id, keywords in SKU_KEYWORDS.items():
-        hits = sum(1 for kw in keywords if kw in text_lower)
-        if hits > 0:
+        hit_count = matcher.count(hits, f"sku.{sku_id}")
+        if hit_count > 0:
             # Confidence = hits / total keywords, capped at 1.0
-            confidence = min(hits / max(len(keywords) * 0.3, 1), 1.0)
+            confidence = min(hit_count / max(len(keywords) * 0.3, 1), 1.0)
             if confidence > best_score:
                 best_score = confidence
                 best_sku = sku_id
@@ -213,17 +228,17 @@ def _match_sku(text: str) -> Tuple[Optional[str], float]:
     return best_sku, round(best_score, 2)
 
 
-def _parse_urgency(text: str) -> str:
+def _parse_urgency(text: str, hits: frozenset = None) -> str:
     """Detect urgency level from text."""
-    text_lower = text.lower()
+    matcher = get_keyword_matcher()
+    if hits is None:
+        hits = matcher.scan(text)
 
-    for signal in IMMEDIATE_SIGNALS:
-        if signal in text_lower:
-            return "immediate"
+    if matcher.any(hits, "fulfill.immediate"):
+        return "immediate"
 
-    for signal in SHORT_TERM_SIGNALS:
-        if signal in text_lower:
-            return "short_term"
+    if matcher.any(hits, "fulfill.short_term"):
+        return "short_term"
 
     return "normal"
 
@@ -249,22 +264,26 @@ def filter_fulfillable(opportunities: List[Dict]) -> List[Dict]:
     urgency_counts = Counter()
     sku_counts = Counter()
 
+    # One keyword pass per opportunity serves every stage below
+    texts = []
     for opp in opportunities:
         title = opp.get("title", "")
         body = opp.get("body", "") or opp.get("text_preview", "") or opp.get("description", "")
-        text = f"{title} {body}"
+        texts.append(f"{title} {body}")
+    all_hits = get_keyword_matcher().scan_batch(texts)
 
+    for opp, text, hits in zip(opportunities, texts, all_hits):
         # Stage 1: Reject non-fulfillable
-        reject_reason = _is_rejected(text)
+        reject_reason = _is_rejected(text, hits)
         if reject_reason:
             rejected_count += 1
             continue
 
         # Stage 2: Match to SKU catalog
-        matched_sku, sku_confidence = _match_sku(text)
+        matched_sku, sku_confidence = _match_sku(text, hits)
 
         # Stage 3: Check gig signals
-        has_gig = _has_gig_signal(text)
+        has_gig = _has_gig_signal(text, hits)
 
         # Keep if matches a SKU OR has gig signals
         if not matched_sku and not has_gig:
@@ -272,7 +291,7 @@ def filter_fulfillable(opportunities: List[Dict]) -> List[Dict]:
             continue
 
         # Stage 4: Parse urgency
-        urgency = _parse_urgency(text)
+        urgency = _parse_urgency(text, hits)
 
         # Enrich opportunity
         opp["_fulfillable"] = True
@@ -9,10 +9,14 @@ Score buyer intent with focus on:
 
 import re
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Optional
+
+from .keyword_matcher import get_keyword_matcher
 
 logger = logging.getLogger(__name__)
 
+URGENCY_KEYWORDS = ['asap', 'urgent', 'immediately', 'today', 'rush', 'deadline']
+
 
 class IntentScorer:
     """
@@ -74,15 +78,6 @@ class IntentScorer:
             'remoteok': {'payment_proximity': 0.6, 'contactability': 0.7},
         }
 
-    def _count_keyword_matches(self, text: str, keywords: List[str]) -> int:
-        """Count how many keywords match in text"""
-        text_lower = text.lower()
-        count = 0
-        for keyword in keywords:
-            if keyword.lower() in text_lower:
-                count += 1
-        return count
-
     def _has_email(self, text: str) -> bool:
         """Check if text contains an email address"""
         email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
@@ -138,9 +133,13 @@ class IntentScorer:
             'contactability': 0.5
         })
 
+        # One keyword pass serves every signal below
+        matcher = get_keyword_matcher()
+        hits = matcher.scan(text)
+
         # Calculate payment proximity
-        intent_matches = self._count_keyword_matches(text, self.high_intent_keywords)
-        negative_matches = self._count_keyword_matches(text, self.negative_signals)
+        intent_matches = matcher.count(hits, "intent.high_intent")
+        negative_matches = matcher.count(hits, "intent.negative")
 
         intent_boost = min(0.4, intent_matches * 0.05)  # Max 0.4 boost
         negative_penalty = min(0.3, negative_matches * 0.1)  # Max 0.3 penalty
@@ -154,7 +153,7 @@ class IntentScorer:
         ))
 
         # Calculate contactability
-        contact_matches = self._count_keyword_matches(text, self.contact_signals)
+        contact_matches = matcher.count(hits, "intent.contact")
         contact_boost = min(0.3, contact_matches * 0.1)
 
         has_email = self._has_email(text)
@@ -171,8 +170,7 @@ class IntentScorer:
         ))
 
         # Determine urgency
-        urgency_keywords = ['asap', 'urgent', 'immediately', 'today', 'rush', 'deadline']
-        urgency_count = self._count_keyword_matches(text, urgency_keywords)
+        urgency_count = matcher.count(hits, "intent.urgency")
         if urgency_count >= 2:
             urgency = 'high'
         elif urgency_count == 1:
@@ -15,25 +15,23 @@ import time
 import logging
 import hashlib
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timezone
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
 # Import discovery components
-from .real_time_sources import REAL_TIME_SOURCES, get_platform_freshness_hours, get_platform_metadata
+from .real_time_sources import REAL_TIME_SOURCES, get_platform_freshness_hours
 from .collector_runtime import get_collector, CollectorRuntime
 from .i18n_normalizer import get_i18n_normalizer, I18nNormalizer
 from .intent_signals import get_intent_scorer, IntentScorer
 from .safety_filter import get_safety_filter, SafetyFilter
 from .entity_resolution import get_entity_resolver, EntityResolver
+from .parser_executor import (
+    get_parser_executor, BS4_AVAILABLE,
+    extract_opportunity_from_element, normalize_json_item,
+)
 
-# Try to import BeautifulSoup
-try:
-    from bs4 import BeautifulSoup
-    BS4_AVAILABLE = True
-except ImportError:
-    BS4_AVAILABLE = False
+if not BS4_AVAILABLE:
     logger.warning("BeautifulSoup not installed")
 
 
@@ -64,6 +62,7 @@ class InternetWideScraper:
         self.intent_scorer = get_intent_scorer()
         self.safety = get_safety_filter()
         self.entity_resolver = get_entity_resolver()
+        self.parser = get_parser_executor(config.get('parser'))
 
         self.timeout = config.get('timeout', 10)
         self.max_concurrent = config.get('max_concurrent', 20)
@@ -249,104 +248,20 @@ class InternetWideScraper:
             return []
 
     async def _parse_html(self, html: str, platform: str, base_url: str) -> List[Dict]:
-        """Parse HTML page for opportunities"""
+        """Parse HTML page for opportunities (large pages run in the parser pool)"""
         if not BS4_AVAILABLE:
             return []
-
-        opportunities = []
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # Generic selectors for common patterns
-        selectors = [
-            'article',
-            '.job', '.job-listing', '.job-item',
-            '.listing', '.listing-item',
-            '.post', '.post-item',
-            '.item', '.story',
-            '.opportunity', '.gig',
-            'tr.athing',  # HackerNews
-            '.thing',  # Reddit
-        ]
-
-        found = set()  # Track URLs to avoid duplicates
-
-        for selector in selectors:
-            for element in soup.select(selector)[:50]:  # Limit per selector
-                opp = self._extract_opportunity_from_element(element, platform, base_url)
-                if opp and opp.get('url') and opp['url'] not in found:
-                    found.add(opp['url'])
-                    opportunities.append(opp)
-
-        return opportunities
+        return await self.parser.parse('html', html, platform, base_url)
 
     async def _parse_json(self, content: str, platform: str, base_url: str) -> List[Dict]:
-        """Parse JSON API response"""
-        import json
-
-        try:
-            data = json.loads(content)
-        except json.JSONDecodeError:
-            return []
-
-        opportunities = []
-
-        # Handle different JSON structures
-        items = []
-        if isinstance(data, list):
-            items = data
-        elif isinstance(data, dict):
-            # Reddit format
-            if 'data' in data and 'children' in data['data']:
-                items = [child['data'] for child in data['data']['children']]
-            # RemoteOK format
-            elif 'jobs' in data:
-                items = data['jobs']
-            # Generic
-            elif 'items' in data:
-                items = data['items']
-            elif 'results' in data:
-                items = data['results']
-
-        for item in items[:100]:
-            opp = self._normalize_json_item(item, platform, base_url)
-            if opp:
-                opportunities.append(opp)
-
-        return opportunities
+        """Parse JSON API response (large payloads run in the parser pool)"""
+        return await self.parser.parse('json', content, platform, base_url)
 
     async def _parse_rss(self, content: str, platform: str, base_url: str) -> List[Dict]:
-        """Parse RSS feed"""
+        """Parse RSS feed (large feeds run in the parser pool)"""
         if not BS4_AVAILABLE:
             return []
-
-        opportunities = []
-        soup = BeautifulSoup(content, 'xml')
-
-        for item in soup.find_all('item')[:50]:
-            title = item.find('title')
-            link = item.find('link')
-            description = item.find('description')
-            pub_date = item.find('pubDate')
-
-            if not title or not link:
-                continue
-
-            opp = {
-                'platform': platform,
-                'url': link.get_text(strip=True),
-                'title': title.get_text(strip=True)[:200],
-                'body': description.get_text(strip=True)[:1000] if description else '',
-                'type': 'opportunity',
-                'discovered_at': datetime.now(timezone.utc).isoformat(),
-                'freshness_score': 1.0,
-            }
-
-            if pub_date:
-                opp['posted_at'] = pub_date.get_text(strip=True)
-
-            opportunities.append(opp)
-
-        return opportunities
+        return await self.parser.parse('rss', content, platform, base_url)
 
     def _extract_opportunity_from_element(
         self,
@@ -355,128 +270,11 @@ class InternetWideScraper:
         base_url: str
     ) -> Optional[Dict]:
         """Extract opportunity from HTML element"""
-        try:
-            # Find link
-            link = element.select_one('a[href]')
-            if not link:
-                link = element.find('a')
-
-            if not link:
-                return None
-
-            href = link.get('href', '')
-            if not href or href.startswith('#') or href.startswith('javascript:'):
-                return None
-
-            # Make absolute URL
-            if not href.startswith('http'):
-                href = urljoin(base_url, href)
-
-            # Get title
-            title = link.get_text(strip=True)
-            if not title or len(title) < 5:
-                # Try element text
-                title = element.get_text(strip=True)[:200]
-
-            if not title or len(title) < 5:
-                return None
-
-            # Get body text
-            body = element.get_text(strip=True)[:1000]
-
-            # Get metadata
-            metadata = get_platform_metadata(platform)
-
-            return {
-                'platform': platform,
-                'url': href,
-                'title': title,
-                'body': body if body != title else '',
-                'type': 'opportunity',
-                'discovered_at': datetime.now(timezone.utc).isoformat(),
-                'freshness_score': 1.0,
-                'win_probability': metadata.get('win_rate', 0.1),
-                'value': metadata.get('avg_value', 500),
-            }
-
-        except Exception as e:
-            logger.debug(f"[scraper] Element extraction failed: {e}")
-            return None
+        return extract_opportunity_from_element(element, platform, base_url)
 
     def _normalize_json_item(self, item: Dict, platform: str, base_url: str) -> Optional[Dict]:
         """Normalize JSON item to opportunity format"""
-        if not isinstance(item, dict):
-            return None
-
-        # Extract URL
-        url = (
-            item.get('url') or
-            item.get('link') or
-            item.get('permalink') or
-            item.get('application_url') or
-            ''
-        )
-
-        # Reddit URLs
-        if platform.startswith('reddit') and not url and item.get('permalink'):
-            url = f"https://www.reddit.com{item['permalink']}"
-
-        if not url:
-            return None
-
-        # Extract title
-        title = (
-            item.get('title') or
-            item.get('name') or
-            item.get('position') or
-            item.get('headline') or
-            ''
-        )[:200]
-
-        if not title:
-            return None
-
-        # Extract body
-        body = (
-            item.get('body') or
-            item.get('selftext') or
-            item.get('description') or
-            item.get('content') or
-            ''
-        )[:1000]
-
-        # Get metadata
-        metadata = get_platform_metadata(platform)
-
-        # Extract value if present
-        value = (
-            item.get('budget') or
-            item.get('salary') or
-            item.get('compensation') or
-            metadata.get('avg_value', 500)
-        )
-        if isinstance(value, str):
-            # Try to extract number
-            import re
-            match = re.search(r'(\d+)', value.replace(',', ''))
-            value = int(match.group(1)) if match else metadata.get('avg_value', 500)
-
-        return {
-            'platform': platform,
-            'url': url,
-            'title': title,
-            'body': body,
-            'type': 'opportunity',
-            'discovered_at': datetime.now(timezone.utc).isoformat(),
-            'freshness_score': 1.0,
-            'win_probability': metadata.get('win_rate', 0.1),
-            'value': value,
-            'source_data': {
-                'author': item.get('author'),
-                'created_utc': item.get('created_utc'),
-                'score': item.get('score'),
-            }
-        }
+        return normalize_json_item(item, platform, base_url)
 
     def get_stats(self) -> Dict:
         """Get scraper stats"""
@@ -497,6 +295,7 @@ class InternetWideScraper:
             'collector': self.collector.get_stats(),
             'entity_resolver': self.entity_resolver.get_stats(),
             'i18n': self.i18n.get_stats(),
+            'parser': self.parser.get_stats(),
             'parsing_debug': {
                 'total_platforms': len(self.parsing_debug),
                 'problematic_platforms': problematic,
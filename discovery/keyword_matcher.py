@@ -0,0 +1,194 @@
+"""
+KEYWORD MATCHER: Shared multi-pattern matching for discovery filters
+
+The intent scorer, safety filter and fulfillability filter all ask the
+same question of the same text: which of these keywords occur as
+substrings? This module answers it for every keyword set in one pass.
+
+How it works:
+- With pyahocorasick installed, all keywords go into one Aho-Corasick
+  automaton that reports every (overlapping) hit in a single C pass.
+- Otherwise all keywords (lowercased) go into one trie-shaped regex, so
+  the regex engine walks shared prefixes once instead of trying each
+  keyword. Searching from every hit start finds the longest keyword at
+  each position; every shorter keyword that is a substring of a hit is
+  added from a table precomputed at build time.
+- Either way the result equals running `kw in text.lower()` for every
+  keyword. Scan results are cached per text (LRU), so filters that look
+  at the same title/body share the work.
+"""
+
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Try Aho-Corasick automaton, fallback to compiled trie regex
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Build a regex that matches the longest keyword at the current position"""
+    trie: Dict = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict) -> Optional[str]:
+        terminal = "" in node
+        branches = [re.escape(ch) + (build(child) or "")
+                    for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return None
+        if len(branches) == 1:
+            body = branches[0]
+            return f"(?:{body})?" if terminal else body
+        alt = "(?:" + "|".join(branches) + ")"
+        return alt + "?" if terminal else alt
+
+    return build(trie) or ""
+
+
+class KeywordMatcher:
+    """
+    One-pass matcher over named keyword groups.
+
+    Usage:
+        matcher = KeywordMatcher({"scam": [...], "gig": [...]})
+        hits = matcher.scan(text)                 # frozenset of keywords
+        matcher.count(hits, "scam")               # like sum(kw in text for kw in group)
+        matcher.first(hits, "reject")             # first group keyword present, in list order
+    """
+
+    def __init__(self, groups: Dict[str, List[str]], cache_size: int = 8192):
+        self.groups: Dict[str, List[str]] = {name: [kw.lower() for kw in kws] for name, kws in groups.items()}
+        # Keywords are matched against stripped text, so they are stripped too
+        self.groups = {name: [kw.strip() for kw in kws] for name, kws in self.groups.items()}
+        keywords = sorted({kw for kws in self.groups.values() for kw in kws if kw})
+
+        # For each keyword, every keyword that is a substring of it (itself included)
+        self._implied: Dict[str, FrozenSet[str]] = {
+            kw: frozenset(other for other in keywords if other in kw)
+            for kw in keywords
+        }
+
+        self._automaton = None
+        self._regex = None
+        if keywords and AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for kw in keywords:
+                self._automaton.add_word(kw, kw)
+            self._automaton.make_automaton()
+        elif keywords:
+            self._regex = re.compile(_trie_pattern(keywords))
+
+        self._scan_cached = lru_cache(maxsize=cache_size)(self._scan)
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        """
+        Return every keyword that occurs in text (case-insensitive).
+
+        The cache key is the lowercased, stripped text, so callers that
+        build the same title/body with different casing or trailing
+        whitespace share one scan.
+        """
+        if not text:
+            return frozenset()
+        return self._scan_cached(text.lower().strip())
+
+    @property
+    def backend(self) -> str:
+        return "ahocorasick" if self._automaton is not None else "regex"
+
+    def _scan(self, text: str) -> FrozenSet[str]:
+        """Scan lowercased text for every keyword"""
+        if self._automaton is not None:
+            return frozenset(kw for _, kw in self._automaton.iter(text))
+        if self._regex is None:
+            return frozenset()
+
+        # Longest keyword at each position where any keyword starts
+        longest = set()
+        search = self._regex.search
+        pos = 0
+        while True:
+            m = search(text, pos)
+            if m is None:
+                break
+            longest.add(m.group())
+            pos = m.start() + 1
+
+        if not longest:
+            return frozenset()
+        hits = set()
+        for kw in longest:
+            hits |= self._implied[kw]
+        return frozenset(hits)
+
+    def scan_batch(self, texts: Iterable[str]) -> List[FrozenSet[str]]:
+        """Scan many texts"""
+        return [self.scan(t) for t in texts]
+
+    def count(self, hits: FrozenSet[str], group: str) -> int:
+        """Number of group entries present in hits"""
+        return sum(1 for kw in self.groups[group] if kw in hits) if hits else 0
+
+    def first(self, hits: FrozenSet[str], group: str) -> Optional[str]:
+        """First group entry (in list order) present in hits"""
+        if hits:
+            for kw in self.groups[group]:
+                if kw in hits:
+                    return kw
+        return None
+
+    def any(self, hits: FrozenSet[str], group: str) -> bool:
+        """Whether any group entry is present in hits"""
+        return self.first(hits, group) is not None
+
+    def cache_info(self):
+        """LRU statistics for the scan cache"""
+        return self._scan_cached.cache_info()
+
+
+# Singleton instance
+_matcher: Optional[KeywordMatcher] = None
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Get or create the shared matcher built from every discovery keyword set"""
+    global _matcher
+    if _matcher is None:
+        from .intent_signals import get_intent_scorer, URGENCY_KEYWORDS
+        from .safety_filter import get_safety_filter
+        from . import fulfillability_filter as ff
+
+        scorer = get_intent_scorer()
+        safety = get_safety_filter()
+        groups = {
+            "intent.high_intent": scorer.high_intent_keywords,
+            "intent.contact": scorer.contact_signals,
+            "intent.negative": scorer.negative_signals,
+            "intent.urgency": URGENCY_KEYWORDS,
+            "safety.scam": safety.scam_indicators,
+            "safety.low_quality": safety.low_quality_signals,
+            "fulfill.reject": ff.REJECT_PHRASES,
+            "fulfill.immediate": ff.IMMEDIATE_SIGNALS,
+            "fulfill.short_term": ff.SHORT_TERM_SIGNALS,
+            "fulfill.gig": ff.GIG_SIGNALS,
+        }
+        for sku_id, keywords in ff.SKU_KEYWORDS.items():
+            groups[f"sku.{sku_id}"] = keywords
+        _matcher = KeywordMatcher(groups)
+        logger.info(
+            f"[keyword_matcher] Compiled {len(_matcher._implied)} keywords across "
+            f"{len(groups)} groups ({_matcher.backend})"
+        )
+    return _matcher
@@ -0,0 +1,472 @@
+"""
+PARSER EXECUTOR: CPU-bound discovery parsing off the event loop
+
+BeautifulSoup, JSON and RSS parsing are pure CPU work. Run inline they
+stall every fetch, SSE stream and API request on the worker while a big
+page is parsed. The executor routes large documents to a process pool
+and parses small ones inline, where the pickling round-trip would cost
+more than the parse.
+
+- Parse functions are module-level and return plain dicts, so they are
+  picklable and run the same inline or in a worker.
+- Workers are warmed at start (bs4 imported, parser primed).
+- A broken pool falls back to inline parsing instead of failing discovery.
+- LoopLagMonitor measures how late the event loop wakes up, so offload
+  gains (or regressions) are visible in stats.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from .real_time_sources import get_platform_metadata
+
+logger = logging.getLogger(__name__)
+
+# Try to import BeautifulSoup
+try:
+    from bs4 import BeautifulSoup
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+# Generic selectors for common listing patterns
+HTML_SELECTORS = [
+    'article',
+    '.job', '.job-listing', '.job-item',
+    '.listing', '.listing-item',
+    '.post', '.post-item',
+    '.item', '.story',
+    '.opportunity', '.gig',
+    'tr.athing',  # HackerNews
+    '.thing',  # Reddit
+]
+
+DEFAULT_INLINE_MAX_BYTES = 64 * 1024
+
+
+# =============================================================================
+# PARSE FUNCTIONS (picklable, run inline or in a worker process)
+# =============================================================================
+
+def parse_html(html: str, platform: str, base_url: str) -> List[Dict]:
+    """Parse HTML page for opportunities"""
+    if not BS4_AVAILABLE:
+        return []
+
+    opportunities = []
+    soup = BeautifulSoup(html, 'html.parser')
+
+    found = set()  # Track URLs to avoid duplicates
+
+    for selector in HTML_SELECTORS:
+        for element in soup.select(selector)[:50]:  # Limit per selector
+            opp = extract_opportunity_from_element(element, platform, base_url)
+            if opp and opp.get('url') and opp['url'] not in found:
+                found.add(opp['url'])
+                opportunities.append(opp)
+
+    return opportunities
+
+
+def parse_json(content: str, platform: str, base_url: str) -> List[Dict]:
+    """Parse JSON API response"""
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        return []
+
+    opportunities = []
+
+    # Handle different JSON structures
+    items = []
+    if isinstance(data, list):
+        items = data
+    elif isinstance(data, dict):
+        # Reddit format
+        if 'data' in data and 'children' in data['data']:
+            items = [child['data'] for child in data['data']['children']]
+        # RemoteOK format
+        elif 'jobs' in data:
+            items = data['jobs']
+        # Generic
+        elif 'items' in data:
+            items = data['items']
+        elif 'results' in data:
+            items = data['results']
+
+    for item in items[:100]:
+        opp = normalize_json_item(item, platform, base_url)
+        if opp:
+            opportunities.append(opp)
+
+    return opportunities
+
+
+def parse_rss(content: str, platform: str, base_url: str) -> List[Dict]:
+    """Parse RSS feed"""
+    if not BS4_AVAILABLE:
+        return []
+
+    opportunities = []
+    soup = BeautifulSoup(content, 'xml')
+
+    for item in soup.find_all('item')[:50]:
+        title = item.find('title')
+        link = item.find('link')
+        description = item.find('description')
+        pub_date = item.find('pubDate')
+
+        if not title or not link:
+            continue
+
+        opp = {
+            'platform': platform,
+            'url': link.get_text(strip=True),
+            'title': title.get_text(strip=True)[:200],
+            'body': description.get_text(strip=True)[:1000] if description else '',
+            'type': 'opportunity',
+            'discovered_at': datetime.now(timezone.utc).isoformat(),
+            'freshness_score': 1.0,
+        }
+
+        if pub_date:
+            opp['posted_at'] = pub_date.get_text(strip=True)
+
+        opportunities.append(opp)
+
+    return opportunities
+
+
+def extract_opportunity_from_element(element, platform: str, base_url: str) -> Optional[Dict]:
+    """Extract opportunity from HTML element"""
+    try:
+        # Find link
+        link = element.select_one('a[href]')
+        if not link:
+            link = element.find('a')
+
+        if not link:
+            return None
+
+        href = link.get('href', '')
+        if not href or href.startswith('#') or href.startswith('javascript:'):
+            return None
+
+        # Make absolute URL
+        if not href.startswith('http'):
+            href = urljoin(base_url, href)
+
+        # Get title
+        title = link.get_text(strip=True)
+        if not title or len(title) < 5:
+            # Try element text
+            title = element.get_text(strip=True)[:200]
+
+        if not title or len(title) < 5:
+            return None
+
+        # Get body text
+        body = element.get_text(strip=True)[:1000]
+
+        # Get metadata
+        metadata = get_platform_metadata(platform)
+
+        return {
+            'platform': platform,
+            'url': href,
+            'title': title,
+            'body': body if body != title else '',
+            'type': 'opportunity',
+            'discovered_at': datetime.now(timezone.utc).isoformat(),
+            'freshness_score': 1.0,
+            'win_probability': metadata.get('win_rate', 0.1),
+            'value': metadata.get('avg_value', 500),
+        }
+
+    except Exception as e:
+        logger.debug(f"[scraper] Element extraction failed: {e}")
+        return None
+
+
+def normalize_json_item(item: Dict, platform: str, base_url: str) -> Optional[Dict]:
+    """Normalize JSON item to opportunity format"""
+    if not isinstance(item, dict):
+        return None
+
+    # Extract URL
+    url = (
+        item.get('url') or
+        item.get('link') or
+        item.get('permalink') or
+        item.get('application_url') or
+        ''
+    )
+
+    # Reddit URLs
+    if platform.startswith('reddit') and not url and item.get('permalink'):
+        url = f"https://www.reddit.com{item['permalink']}"
+
+    if not url:
+        return None
+
+    # Extract title
+    title = (
+        item.get('title') or
+        item.get('name') or
+        item.get('position') or
+        item.get('headline') or
+        ''
+    )[:200]
+
+    if not title:
+        return None
+
+    # Extract body
+    body = (
+        item.get('body') or
+        item.get('selftext') or
+        item.get('description') or
+        item.get('content') or
+        ''
+    )[:1000]
+
+    # Get metadata
+    metadata = get_platform_metadata(platform)
+
+    # Extract value if present
+    value = (
+        item.get('budget') or
+        item.get('salary') or
+        item.get('compensation') or
+        metadata.get('avg_value', 500)
+    )
+    if isinstance(value, str):
+        # Try to extract number
+        match = re.search(r'(\d+)', value.replace(',', ''))
+        value = int(match.group(1)) if match else metadata.get('avg_value', 500)
+
+    return {
+        'platform': platform,
+        'url': url,
+        'title': title,
+        'body': body,
+        'type': 'opportunity',
+        'discovered_at': datetime.now(timezone.utc).isoformat(),
+        'freshness_score': 1.0,
+        'win_probability': metadata.get('win_rate', 0.1),
+        'value': value,
+        'source_data': {
+            'author': item.get('author'),
+            'created_utc': item.get('created_utc'),
+            'score': item.get('score'),
+        }
+    }
+
+
+PARSERS = {
+    'html': parse_html,
+    'json': parse_json,
+    'rss': parse_rss,
+}
+
+
+def _run_parser(kind: str, content: str, platform: str, base_url: str) -> List[Dict]:
+    """Worker entry point"""
+    return PARSERS[kind](content, platform, base_url)
+
+
+def _warm_worker():
+    """Process initializer: import and prime the parsers"""
+    if BS4_AVAILABLE:
+        BeautifulSoup('<article><a href="/x">warm up</a></article>', 'html.parser').select('article')
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+# =============================================================================
+# EVENT LOOP LAG
+# =============================================================================
+
+class LoopLagMonitor:
+    """
+    Measure event-loop lag: how much later than scheduled a periodic
+    sleep wakes up. Sustained lag means something is blocking the loop.
+    """
+
+    def __init__(self, interval: float = 0.05, samples: int = 2048):
+        self.interval = interval
+        self._samples: deque = deque(maxlen=samples)
+        self._max_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start sampling on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop sampling"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - start - self.interval) * 1000)
+            self._samples.append(lag_ms)
+            if lag_ms > self._max_ms:
+                self._max_ms = lag_ms
+
+    def reset(self):
+        self._samples.clear()
+        self._max_ms = 0.0
+
+    def get_stats(self) -> Dict:
+        lags = sorted(self._samples)
+        n = len(lags)
+
+        def pct(p: float) -> float:
+            return round(lags[min(n - 1, int(p * n))], 2) if n else 0.0
+
+        return {
+            'samples': n,
+            'lag_ms_p50': pct(0.50),
+            'lag_ms_p95': pct(0.95),
+            'lag_ms_p99': pct(0.99),
+            'lag_ms_max': round(self._max_ms, 2),
+        }
+
+
+# =============================================================================
+# EXECUTOR
+# =============================================================================
+
+class ParserExecutor:
+    """
+    Route document parsing inline or to a warm process pool by size.
+
+    Config:
+        processes: pool size (0 disables offload; default min(4, cpu_count))
+        inline_max_bytes: documents up to this size are parsed inline
+        monitor_loop_lag: run a LoopLagMonitor while the executor is used
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        config = config or {}
+        default_procs = min(4, os.cpu_count() or 1)
+        self.processes = int(config.get(
+            'processes', os.getenv('DISCOVERY_PARSER_PROCESSES', default_procs)
+        ))
+        self.inline_max_bytes = int(config.get('inline_max_bytes', DEFAULT_INLINE_MAX_BYTES))
+        self.monitor_loop_lag = config.get('monitor_loop_lag', True)
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.lag_monitor = LoopLagMonitor()
+
+        self.stats = {
+            'parsed_inline': 0,
+            'parsed_offloaded': 0,
+            'offload_fallbacks': 0,
+            'bytes_inline': 0,
+            'bytes_offloaded': 0,
+            'parse_seconds_inline': 0.0,
+            'parse_seconds_offloaded': 0.0,
+        }
+
+    def _ensure_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.processes <= 0:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_warm_worker)
+            # Submit one ping per worker so every process is spawned and warmed now
+            for _ in range(self.processes):
+                self._pool.submit(_ping)
+            logger.info(f"[parser_executor] Started {self.processes} parser workers")
+        return self._pool
+
+    def start(self):
+        """Warm the pool (and start lag monitoring if inside a loop)"""
+        self._ensure_pool()
+        if self.monitor_loop_lag:
+            try:
+                self.lag_monitor.start()
+            except RuntimeError:
+                pass  # No running loop yet
+
+    async def parse(self, kind: str, content: str, platform: str, base_url: str) -> List[Dict]:
+        """Parse a document of kind html/json/rss, offloading large ones"""
+        if self.monitor_loop_lag:
+            self.lag_monitor.start()
+
+        size = len(content.encode('utf-8'))  # Bytes, not characters: inline_max_bytes is a byte limit
+        pool = self._ensure_pool() if size > self.inline_max_bytes else None
+
+        if pool is not None:
+            start = time.perf_counter()
+            try:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(pool, _run_parser, kind, content, platform, base_url)
+                self.stats['parsed_offloaded'] += 1
+                self.stats['bytes_offloaded'] += size
+                self.stats['parse_seconds_offloaded'] += time.perf_counter() - start
+                return result
+            except BrokenProcessPool:
+                logger.warning("[parser_executor] Process pool broken, parsing inline")
+                self.stats['offload_fallbacks'] += 1
+                pool.shutdown(wait=False, cancel_futures=True)
+                if self._pool is pool:
+                    self._pool = None
+
+        start = time.perf_counter()
+        result = _run_parser(kind, content, platform, base_url)
+        self.stats['parsed_inline'] += 1
+        self.stats['bytes_inline'] += size
+        self.stats['parse_seconds_inline'] += time.perf_counter() - start
+        return result
+
+    async def close(self):
+        """Stop lag monitoring and shut the pool down"""
+        await self.lag_monitor.stop()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'processes': self.processes,
+            'inline_max_bytes': self.inline_max_bytes,
+            'pool_running': self._pool is not None,
+            'loop_lag': self.lag_monitor.get_stats(),
+        }
+
+
+# Singleton instance
+_parser_executor: Optional[ParserExecutor] = None
+
+
+def get_parser_executor(config: Optional[Dict] = None) -> ParserExecutor:
+    """Get or create parser executor instance"""
+    global _parser_executor
+    if _parser_executor is None:
+        _parser_executor = ParserExecutor(config)
+    return _parser_executor
@@ -9,10 +9,29 @@ Filter out:
 
 import re
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Optional
+
+from .keyword_matcher import get_keyword_matcher
 
 logger = logging.getLogger(__name__)
 
+# Company indicators in text (any match = org presence)
+_COMPANY_RE = re.compile('|'.join([
+    r'\b(?:inc|llc|ltd|corp|company|team|startup)\b',
+    r'\bwe are\b',
+    r'\bout team\b',
+    r'\bour company\b',
+]), re.IGNORECASE)
+
+# Suspicious contact patterns (any match = red flag)
+_CONTACT_RED_FLAG_RE = re.compile('|'.join([
+    r'telegram\s*:?\s*@',  # Telegram-only contact
+    r'whatsapp\s*:?\s*\+',  # WhatsApp-only contact
+    r'signal\s*:?\s*@',  # Signal-only (sometimes ok, but unusual for work)
+    r'contact\s+off\s+platform',
+    r'email\s+me\s+directly',  # Bypassing platform
+]), re.IGNORECASE)
+
 
 class SafetyFilter:
     """
@@ -87,11 +106,6 @@ class SafetyFilter:
             'reddit': 0.1,
         }
 
-    def _count_indicator_matches(self, text: str, indicators: List[str]) -> int:
-        """Count matching indicators"""
-        text_lower = text.lower()
-        return sum(1 for ind in indicators if ind.lower() in text_lower)
-
     def _has_suspicious_budget(self, opp: Dict) -> bool:
         """Check for suspicious budget patterns"""
         budget = opp.get('value', 0) or opp.get('budget', 0) or 0
@@ -127,15 +141,8 @@ class SafetyFilter:
 
         # Check for company indicators in text
         text = f"{opp.get('title', '')} {opp.get('body', '')}"
-        company_patterns = [
-            r'\b(?:inc|llc|ltd|corp|company|team|startup)\b',
-            r'\bwe are\b',
-            r'\bout team\b',
-            r'\bour company\b',
-        ]
-        for pattern in company_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
+        if _COMPANY_RE.search(text):
+            return True
 
         # Check for LinkedIn/website
         url = opp.get('author_url', '') or ''
@@ -146,19 +153,7 @@ class SafetyFilter:
 
     def _has_contact_red_flags(self, text: str) -> bool:
         """Check for suspicious contact patterns"""
-        red_flags = [
-            r'telegram\s*:?\s*@',  # Telegram-only contact
-            r'whatsapp\s*:?\s*\+',  # WhatsApp-only contact
-            r'signal\s*:?\s*@',  # Signal-only (sometimes ok, but unusual for work)
-            r'contact\s+off\s+platform',
-            r'email\s+me\s+directly',  # Bypassing platform
-        ]
-
-        for pattern in red_flags:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-
-        return False
+        return bool(_CONTACT_RED_FLAG_RE.search(text))
 
     def risk_screen(self, opp: Dict) -> Dict:
         """
@@ -186,13 +181,15 @@ class SafetyFilter:
         risk_score += platform_adj
 
         # Scam indicators (major risk)
-        scam_count = self._count_indicator_matches(text, self.scam_indicators)
+        matcher = get_keyword_matcher()
+        hits = matcher.scan(text)
+        scam_count = matcher.count(hits, "safety.scam")
         if scam_count > 0:
             risk_score += min(0.5, scam_count * 0.15)
             risk_reasons.append(f"scam_indicators:{scam_count}")
 
         # Low quality signals (moderate risk)
-        low_quality_count = self._count_indicator_matches(text, self.low_quality_signals)
+        low_quality_count = matcher.count(hits, "safety.low_quality")
         if low_quality_count > 0:
             risk_score += min(0.3, low_quality_count * 0.1)
             risk_reasons.append(f"low_quality:{low_quality_count}")
@@ -1,11 +1,17 @@
 """
 AiGentsy Escrow-Lite (Auth→Capture)
 State-driven payment capture with dispute protection
+
+Stripe calls run on the payment thread pool (the SDK is blocking) and accept an
+idempotency_key, so batches can run them concurrently through the payment
+executor and retry them safely.
 """
 import os
 import stripe
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+from payment_executor import PaymentExecutor, exception_result, get_payment_executor, run_blocking
 
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 
@@ -24,14 +30,16 @@ async def create_payment_intent(
     amount: float,
     buyer_email: str,
     intent_id: str,
-    metadata: dict = None
+    metadata: dict = None,
+    idempotency_key: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Create Stripe PaymentIntent (authorization only)
     Does NOT capture funds immediately
     """
     try:
-        pi = stripe.PaymentIntent.create(
+        pi = await run_blocking(
+            stripe.PaymentIntent.create,
             amount=int(amount * 100),  # Convert to cents
             currency="usd",
             capture_method="manual",  # ⬅️ KEY: Don't capture yet
@@ -40,7 +48,8 @@ async def create_payment_intent(
                 "intent_id": intent_id,
                 "platform": "aigentsy",
                 **(metadata or {})
-            }
+            },
+            idempotency_key=idempotency_key
         )
         
         return {
@@ -51,15 +60,13 @@ async def create_payment_intent(
             "amount": amount
         }
     except stripe.error.StripeError as e:
-        return {
-            "ok": False,
-            "error": str(e)
-        }
+        return exception_result(e)
 
 
 async def capture_payment(
     payment_intent_id: str,
-    amount: Optional[float] = None
+    amount: Optional[float] = None,
+    idempotency_key: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Capture authorized payment (triggered on DELIVERED)
@@ -70,8 +77,10 @@ async def capture_payment(
         if amount:
             capture_params["amount_to_capture"] = int(amount * 100)
         
-        pi = stripe.PaymentIntent.capture(
+        pi = await run_blocking(
+            stripe.PaymentIntent.capture,
             payment_intent_id,
+            idempotency_key=idempotency_key,
             **capture_params
         )
         
@@ -82,10 +91,7 @@ async def capture_payment(
             "captured_at": _now()
         }
     except stripe.error.StripeError as e:
-        return {
-            "ok": False,
-            "error": str(e)
-        }
+        return exception_result(e)
 
 
 async def capture_payment_intent(
@@ -100,13 +106,13 @@ async def capture_payment_intent(
     return await capture_payment(intent_id, amount)
 
     
-async def cancel_payment(payment_intent_id: str) -> Dict[str, Any]:
+async def cancel_payment(payment_intent_id: str, idempotency_key: Optional[str] = None) -> Dict[str, Any]:
     """
     Cancel authorized payment (if dispute or timeout)
     Releases funds back to buyer
     """
     try:
-        pi = stripe.PaymentIntent.cancel(payment_intent_id)
+        pi = await run_blocking(stripe.PaymentIntent.cancel, payment_intent_id, idempotency_key=idempotency_key)
         
         return {
             "ok": True,
@@ -114,10 +120,7 @@ async def cancel_payment(payment_intent_id: str) -> Dict[str, Any]:
             "cancelled_at": _now()
         }
     except stripe.error.StripeError as e:
-        return {
-            "ok": False,
-            "error": str(e)
-        }
+        return exception_result(e)
 
 
 async def get_payment_status(payment_intent_id: str) -> Dict[str, Any]:
@@ -125,7 +128,7 @@ async def get_payment_status(payment_intent_id: str) -> Dict[str, Any]:
     Check payment intent status
     """
     try:
-        pi = stripe.PaymentIntent.retrieve(payment_intent_id)
+        pi = await run_blocking(stripe.PaymentIntent.retrieve, payment_intent_id)
         
         return {
             "ok": True,
@@ -135,13 +138,10 @@ async def get_payment_status(payment_intent_id: str) -> Dict[str, Any]:
             "capturable": pi.status == "requires_capture"
         }
     except stripe.error.StripeError as e:
-        return {
-            "ok": False,
-            "error": str(e)
-        }
+        return exception_result(e)
 
 
-async def auto_capture_on_delivered(intent: Dict[str, Any]) -> Dict[str, Any]:
+async def auto_capture_on_delivered(intent: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
     """
     Called when intent moves to DELIVERED state
     Auto-captures payment if no active disputes
@@ -166,7 +166,7 @@ async def auto_capture_on_delivered(intent: Dict[str, Any]) -> Dict[str, Any]:
         pass
     
     # Capture payment
-    result = await capture_payment(payment_intent_id)
+    result = await capture_payment(payment_intent_id, idempotency_key=idempotency_key)
     
     if result["ok"]:
         # Update intent
@@ -177,10 +177,8 @@ async def auto_capture_on_delivered(intent: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
-async def auto_timeout_release(intent: Dict[str, Any], timeout_days: int = 7) -> Dict[str, Any]:
-    """
-    Auto-release payment if delivery confirmed and no disputes after timeout
-    """
+def _timeout_hold(intent: Dict[str, Any], timeout_days: int) -> Optional[Dict[str, Any]]:
+    """Why an intent cannot be released yet, or None if it is due"""
     if intent.get("status") != "DELIVERED":
         return {"ok": False, "error": "not_delivered"}
     
@@ -211,31 +209,104 @@ async def auto_timeout_release(intent: Dict[str, Any], timeout_days: int = 7) ->
         # If disputes module not available, proceed with capture
         pass
     
+    return None
+
+
+async def auto_timeout_release(
+    intent: Dict[str, Any],
+    timeout_days: int = 7,
+    idempotency_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Auto-release payment if delivery confirmed and no disputes after timeout
+    """
+    hold = _timeout_hold(intent, timeout_days)
+    if hold:
+        return hold
+    
     # Auto-capture
-    return await auto_capture_on_delivered(intent)
+    return await auto_capture_on_delivered(intent, idempotency_key=idempotency_key)
+
+
+async def auto_timeout_release_batch(
+    intents: List[Dict[str, Any]],
+    timeout_days: int = 7,
+    executor: Optional[PaymentExecutor] = None
+) -> Dict[str, Any]:
+    """
+    Run auto_timeout_release over many intents
+    
+    Intents still waiting or blocked are answered without touching Stripe;
+    the due ones are captured concurrently through the payment executor,
+    paced against the Stripe rate limit, with one idempotency key per
+    payment intent and a daily checkpoint, so a re-run the same day skips
+    captures that already went through.
+    """
+    executor = executor or get_payment_executor()
+    results: List[Dict[str, Any]] = []
+    due = []
+    for intent in intents:
+        hold = _timeout_hold(intent, timeout_days)
+        if hold:
+            results.append({"intent_id": intent.get("id"), **hold})
+        else:
+            due.append(intent)
+    
+    async def release(intent: Dict[str, Any], key: str) -> Dict[str, Any]:
+        return await auto_capture_on_delivered(intent, idempotency_key=key)
+    
+    run = await executor.run(
+        f"escrow_release_{datetime.now(timezone.utc):%Y%m%d}",
+        due,
+        release,
+        checkpoint=True,
+        key_fn=lambda batch_id, i, intent: f"escrow_release_{intent.get('payment_intent_id')}"
+    )
+    for intent, result in zip(due, run["results"]):
+        if result.get("resumed"):
+            # Captured by an earlier run whose intent update was not kept
+            intent["payment_captured"] = True
+            intent["payment_captured_at"] = result.get("captured_at")
+            intent["escrow_status"] = "released"
+        results.append({"intent_id": intent.get("id"), **result})
+    
+    return {
+        "ok": True,
+        "checked": len(intents),
+        "due": len(due),
+        "released": run["successful"],
+        "failed": run["failed"],
+        "waiting": len([r for r in results if r.get("waiting")]),
+        "blocked": len([r for r in results if r.get("blocked") or r.get("paused")]),
+        "elapsed_seconds": run["elapsed_seconds"],
+        "results": results
+    }
 
 
 async def partial_refund_on_dispute(
     payment_intent_id: str,
     refund_amount: float,
-    reason: str
+    reason: str,
+    idempotency_key: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Issue partial refund for resolved disputes
     """
     try:
         # First ensure payment was captured
-        pi = stripe.PaymentIntent.retrieve(payment_intent_id)
+        pi = await run_blocking(stripe.PaymentIntent.retrieve, payment_intent_id)
         
         if pi.status != "succeeded":
             return {"ok": False, "error": "payment_not_captured"}
         
         # Create refund
-        refund = stripe.Refund.create(
+        refund = await run_blocking(
+            stripe.Refund.create,
             payment_intent=payment_intent_id,
             amount=int(refund_amount * 100),
             reason="requested_by_customer",
-            metadata={"dispute_reason": reason}
+            metadata={"dispute_reason": reason},
+            idempotency_key=idempotency_key
         )
         
         return {
@@ -245,7 +316,4 @@ async def partial_refund_on_dispute(
             "status": refund.status
         }
     except stripe.error.StripeError as e:
-        return {
-            "ok": False,
-            "error": str(e)
-        }
+        return exception_result(e)
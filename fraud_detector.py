@@ -1,64 +1,54 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from collections import deque
 from datetime import datetime, timezone, timedelta
 from uuid import uuid4
 import httpx
 
+from risk_features import get_risk_engine
+
 _FRAUD_CASES: Dict[str, Dict[str, Any]] = {}
 _BLOCKLIST: List[str] = []
-_ACTION_LOG: List[Dict[str, Any]] = []
+_ACTION_LOG: deque = deque(maxlen=10000)  # Recent checks for audit; signals read the risk feature engine
 
 MAX_ACTIONS_PER_HOUR = 50
 MAX_FAILED_PAYMENTS = 3
 MIN_REPUTATION_SCORE = 20
+MAX_BIDS_PER_HOUR = 30
+MAX_REFUNDS_30D = 3
+MAX_NEW_DEVICES_30D = 3
+AMOUNT_ZSCORE_LIMIT = 4.0
 
 def now_iso():
     return datetime.now(timezone.utc).isoformat() + "Z"
 
 
-async def check_fraud_signals(
-    username: str,
+def _amount(metadata: Dict[str, Any]) -> Optional[float]:
+    try:
+        return float(metadata["amount"]) if metadata.get("amount") is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _score_signals(
+    features: Dict[str, Any],
+    user_data: Dict[str, Any],
     action_type: str,
-    metadata: Dict[str, Any] = None
-) -> Dict[str, Any]:
-    """Check for fraud signals before allowing action"""
+    metadata: Dict[str, Any]
+) -> Tuple[int, List[str]]:
+    """Score one action from the user's precomputed risk features"""
     
-    metadata = metadata or {}
     signals = []
     risk_score = 0
     
-    # Check if user is blocklisted
-    if username in _BLOCKLIST:
-        return {
-            "ok": False,
-            "blocked": True,
-            "reason": "User is blocklisted",
-            "risk_score": 100
-        }
-    
-    # Get user data
-    async with httpx.AsyncClient(timeout=10) as client:
-        try:
-            r = await client.post(
-                "https://aigentsy-ame-runtime.onrender.com/user",
-                json={"username": username}
-            )
-            user_data = r.json().get("record", {})
-        except Exception:
-            user_data = {}
-    
     # SIGNAL 1: Velocity check (30 points)
-    recent_actions = [
-        a for a in _ACTION_LOG
-        if a["username"] == username
-        and (datetime.now(timezone.utc) - datetime.fromisoformat(a["timestamp"].replace("Z", "+00:00"))).seconds < 3600
-    ]
+    recent_actions = features["checks_1h"]
     
-    if len(recent_actions) > MAX_ACTIONS_PER_HOUR:
+    if recent_actions > MAX_ACTIONS_PER_HOUR:
         risk_score += 30
-        signals.append(f"High velocity: {len(recent_actions)} actions in last hour")
+        signals.append(f"High velocity: {recent_actions} actions in last hour")
     
     # SIGNAL 2: Failed payments (25 points)
-    failed_payments = sum(1 for a in _ACTION_LOG if a["username"] == username and a.get("failed_payment"))
+    failed_payments = features["failed_payments_30d"]
     
     if failed_payments >= MAX_FAILED_PAYMENTS:
         risk_score += 25
@@ -83,28 +73,90 @@ async def check_fraud_signals(
     
     # SIGNAL 5: Unusual patterns (10 points each)
     if action_type == "withdrawal":
-        amount = float(metadata.get("amount", 0))
+        amount = _amount(metadata) or 0.0
+        avg_withdrawal = features["avg_withdrawal"]
         
         # Check if withdrawal is much larger than normal
-        past_withdrawals = [
-            a for a in _ACTION_LOG
-            if a["username"] == username and a["action_type"] == "withdrawal"
-        ]
-        
-        if past_withdrawals:
-            avg_withdrawal = sum(float(a.get("metadata", {}).get("amount", 0)) for a in past_withdrawals) / len(past_withdrawals)
-            
-            if amount > avg_withdrawal * 5:
-                risk_score += 10
-                signals.append(f"Unusual withdrawal: ${amount:.2f} vs avg ${avg_withdrawal:.2f}")
+        if avg_withdrawal is not None and amount > avg_withdrawal * 5:
+            risk_score += 10
+            signals.append(f"Unusual withdrawal: ${amount:.2f} vs avg ${avg_withdrawal:.2f}")
+    
+    if features["bids_1h"] > MAX_BIDS_PER_HOUR:
+        risk_score += 10
+        signals.append(f"Bid burst: {features['bids_1h']} bids in last hour")
+    
+    if features["refunds_30d"] >= MAX_REFUNDS_30D:
+        risk_score += 10
+        signals.append(f"Frequent refunds: {features['refunds_30d']} in last 30 days")
+    
+    if features["new_devices_30d"] > MAX_NEW_DEVICES_30D:
+        risk_score += 10
+        signals.append(f"Many new devices: {features['new_devices_30d']} in last 30 days")
+    
+    zscore = features["amount_zscore"]
+    if zscore is not None and zscore > AMOUNT_ZSCORE_LIMIT:
+        risk_score += 10
+        signals.append(f"Amount outlier: z-score {zscore:.1f} against {features['amount_samples']} ledger amounts")
+    
+    return risk_score, signals
+
+
+async def check_fraud_signals(
+    username: str,
+    action_type: str,
+    metadata: Dict[str, Any] = None
+) -> Dict[str, Any]:
+    """Check for fraud signals before allowing action"""
+    
+    metadata = metadata or {}
+    
+    # Check if user is blocklisted
+    if username in _BLOCKLIST:
+        return {
+            "ok": False,
+            "blocked": True,
+            "reason": "User is blocklisted",
+            "risk_score": 100
+        }
+    
+    # Get user data
+    async with httpx.AsyncClient(timeout=10) as client:
+        try:
+            r = await client.post(
+                "https://aigentsy-ame-runtime.onrender.com/user",
+                json={"username": username}
+            )
+            user_data = r.json().get("record", {})
+        except Exception:
+            user_data = {}
+    
+    engine = get_risk_engine()
+    if user_data:
+        engine.sync_user(user_data, username)
+    device_id = metadata.get("device_id") or metadata.get("device_fingerprint")
+    if device_id:
+        engine.record_device(username, device_id)
+    
+    amount = _amount(metadata)
+    features = engine.features(username, amount)
+    risk_score, signals = _score_signals(features, user_data, action_type, metadata)
     
     # Log this action
+    engine.record_check(
+        username,
+        action_type,
+        risk_score,
+        signals,
+        amount=amount if action_type == "withdrawal" else None,
+        failed_payment=bool(metadata.get("failed_payment"))
+    )
     _ACTION_LOG.append({
         "username": username,
         "action_type": action_type,
         "metadata": metadata,
         "timestamp": now_iso(),
-        "risk_score": risk_score
+        "risk_score": risk_score,
+        "signals": signals
     })
     
     # Determine if action should be blocked
@@ -268,18 +320,9 @@ def list_fraud_cases(
 def get_user_risk_profile(username: str) -> Dict[str, Any]:
     """Get comprehensive risk profile for user"""
     
-    user_actions = [a for a in _ACTION_LOG if a["username"] == username]
+    features = get_risk_engine().features(username)
     user_cases = [c for c in _FRAUD_CASES.values() if c.get("username") == username or c.get("reported_user") == username]
     
-    # Calculate average risk score
-    if user_actions:
-        avg_risk = sum(a.get("risk_score", 0) for a in user_actions) / len(user_actions)
-    else:
-        avg_risk = 0
-    
-    # Count high-risk actions
-    high_risk_actions = len([a for a in user_actions if a.get("risk_score", 0) >= 40])
-    
     # Current status
     is_blocked = username in _BLOCKLIST
     active_cases = len([c for c in user_cases if c["status"] in ["SUSPENDED", "UNDER_REVIEW"]])
@@ -289,17 +332,29 @@ def get_user_risk_profile(username: str) -> Dict[str, Any]:
         "username": username,
         "is_blocked": is_blocked,
         "active_cases": active_cases,
-        "total_actions": len(user_actions),
-        "high_risk_actions": high_risk_actions,
-        "avg_risk_score": round(avg_risk, 1),
-        "recent_signals": [
-            a.get("signals", [])
-            for a in sorted(user_actions, key=lambda x: x["timestamp"], reverse=True)[:5]
-            if a.get("risk_score", 0) >= 40
-        ]
+        "total_actions": features["total_checks"],
+        "high_risk_actions": features["high_risk_checks"],
+        "avg_risk_score": round(features["avg_risk_score"], 1),
+        "recent_signals": features["recent_signals"],
+        "features": features
     }
 
 
+def get_risk_features(username: str) -> Dict[str, Any]:
+    """Current risk features for a user"""
+    return {"ok": True, "username": username, "features": get_risk_engine().features(username)}
+
+
+def rescore_users(users: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Batch re-score every user from precomputed features (nothing is logged or suspended)"""
+    
+    def score(features: Dict[str, Any], user: Dict[str, Any]) -> Dict[str, Any]:
+        risk_score, signals = _score_signals(features, user, "rescore", {})
+        return {"risk_score": risk_score, "signals": signals}
+    
+    return get_risk_engine().rescore_all(users, score)
+
+
 def get_fraud_stats() -> Dict[str, Any]:
     """Get fraud detection statistics"""
     
@@ -308,8 +363,9 @@ def get_fraud_stats() -> Dict[str, Any]:
     resolved = len([c for c in _FRAUD_CASES.values() if c["status"] == "RESOLVED"])
     under_review = len([c for c in _FRAUD_CASES.values() if c["status"] == "UNDER_REVIEW"])
     
-    total_actions = len(_ACTION_LOG)
-    high_risk_actions = len([a for a in _ACTION_LOG if a.get("risk_score", 0) >= 40])
+    engine_stats = get_risk_engine().get_stats()
+    total_actions = engine_stats["checks"]
+    high_risk_actions = engine_stats["high_risk_checks"]
     
     return {
         "ok": True,
@@ -324,5 +380,6 @@ def get_fraud_stats() -> Dict[str, Any]:
             "total": total_actions,
             "high_risk": high_risk_actions,
             "high_risk_pct": round((high_risk_actions / total_actions * 100), 1) if total_actions > 0 else 0
-        }
+        },
+        "features": engine_stats
     }
@@ -159,6 +159,50 @@ def log_agent_update(record: dict):
         except Exception as e:
             if VERBOSE: print("Auto-proposal error:", e)
 
+def log_agent_updates(records: list) -> int:
+    """Batch log_agent_update: one JSONBin read and one write for many records (no auto-proposal). Returns records written."""
+    if not records:
+        return 0
+    if not (JSONBIN_URL and JSONBIN_SECRET):
+        if VERBOSE: print("❌ JSONBin creds missing")
+        return 0
+    batch = []
+    for record in records:
+        data = normalize_user_data(record)
+        data.setdefault("runtimeFlags", {})
+        if not data["runtimeFlags"].get("vaultAccess"):
+            data["runtimeFlags"]["vaultAccess"] = True
+        data["traits"] = list(set(data.get("traits", []) + ["vault"]))
+        batch.append(data)
+
+    bin_data = _get()
+    users = bin_data.get("record", [])
+    # Same matching as _upsert (id, then username), indexed once for the batch
+    positions = {}
+    for i, u in enumerate(users):
+        for key in (u.get("id"), u.get("username"), u.get("consent", {}).get("username")):
+            if key:
+                positions.setdefault(key, i)
+    for data in batch:
+        uname = data.get("username") or data.get("consent", {}).get("username")
+        i = positions.get(data.get("id")) if data.get("id") else None
+        if i is None and uname:
+            i = positions.get(uname)
+        if i is None:
+            positions[uname] = len(users)
+            users.append(data)
+        else:
+            users[i] = data
+    _put(users)
+    if VERBOSE: print(f"✅ JSONBin batch upsert complete ({len(batch)} records)")
+
+    for data in batch:
+        try:
+            _collectible_milestones(data)
+        except Exception as e:
+            if VERBOSE: print("Collectible check error:", e)
+    return len(batch)
+
 # ---------- Server-side AIGx credit ----------
 def credit_aigx(username: str, amount: float, basis="uplift", ref=None):
     if not (JSONBIN_URL and JSONBIN_SECRET): return False
@@ -529,6 +529,8 @@ try:
         debit_currency,
         transfer_with_conversion,
         fetch_live_rates,
+        convert_many,
+        get_fx_service,
         SUPPORTED_CURRENCIES
     )
 except Exception as e:
@@ -539,6 +541,8 @@ except Exception as e:
     def debit_currency(u, a, c, r=""): return {"ok": False, "error": "not_available"}
     def transfer_with_conversion(f, t, a, fc, tc, r=""): return {"ok": False, "error": "not_available"}
     async def fetch_live_rates(): return {}
+    def convert_many(a, f, t, at=None): return {"ok": False, "error": "not_available"}
+    get_fx_service = None
     SUPPORTED_CURRENCIES = ["USD", "EUR", "GBP", "AIGx", "CREDITS"]
 
 # ============ BATCH PAYMENT PROCESSING ============
@@ -562,6 +566,18 @@ except Exception as e:
     def generate_payment_report(b, f="summary"): return {"ok": False}
     async def retry_failed_payments(b, u, c): return {"ok": False}
 
+try:
+    from payment_executor import get_payment_executor
+except Exception as e:
+    print(f" payment_executor import failed: {e}")
+    get_payment_executor = None
+
+try:
+    from risk_features import get_risk_engine
+except Exception as e:
+    print(f" risk_features import failed: {e}")
+    get_risk_engine = None
+
 # ============ AUTOMATED TAX REPORTING ============
 try:
     from tax_reporting import (
@@ -572,7 +588,10 @@ try:
         calculate_vat_liability,
         generate_annual_tax_summary,
         batch_generate_1099s,
-        export_tax_csv
+        export_tax_csv,
+        iter_tax_csv,
+        start_batch_1099_job,
+        get_tax_job
     )
 except Exception as e:
     print(f" tax_reporting import failed: {e}")
@@ -584,6 +603,9 @@ except Exception as e:
     def generate_annual_tax_summary(u, y=None): return {"ok": False}
     def batch_generate_1099s(u, y=None): return {"ok": False}
     def export_tax_csv(u, y=None): return {"ok": False}
+    def iter_tax_csv(u, y=None): return iter(())
+    def start_batch_1099_job(u, y=None, c=500): raise RuntimeError("tax_reporting unavailable")
+    def get_tax_job(j): return None
 
 # ============ R³ AUTOPILOT (KEEP-ME-GROWING) ============
 try:
@@ -776,6 +798,12 @@ except Exception as e:
     PLATFORM_FEE = 0.15
     INSURANCE_POOL_CUT = 0.05
 
+try:
+    from deal_store import get_deal_store
+except Exception as e:
+    print(f" deal_store import failed: {e}")
+    def get_deal_store(): raise RuntimeError("deal_store unavailable")
+
 # ============ REAL-WORLD PROOF PIPE ============
 try:
     from proof_pipe import (
@@ -7769,54 +7797,59 @@ async def get_tier_leaderboard(limit: int = 100):
 
 async def auto_release_escrows_job():
     """
-    Runs every 6 hours
     Auto-releases escrows after 7-day timeout with no disputes
+
+    Checks IN_PROGRESS deals (deal store state index), then sleeps until the
+    earliest pending timeout (at most 6 hours). The deal change feed wakes it
+    early when a deal enters IN_PROGRESS.
     """
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    unsubscribe = None
+    
+    def _on_change(change):
+        if change["to_state"] == "IN_PROGRESS" and change["from_state"] != "IN_PROGRESS":
+            loop.call_soon_threadsafe(wake.set)
+    
     while True:
+        wake.clear()
+        sleep_for = 6 * 3600
         try:
             async with httpx.AsyncClient(timeout=30) as client:
-                users = await _load_users(client)
-                
-                system_user = next(
-                    (u for u in users if u.get("username") == "system_dealgraph"),
-                    None
-                )
-                
-                if not system_user:
-                    await asyncio.sleep(6 * 3600)
-                    continue
-                
-                deals = system_user.get("deals", [])
-                in_progress_deals = [
-                    d for d in deals 
-                    if isinstance(d, dict) and d.get("state") == "IN_PROGRESS"
-                ]
-                
-                released_count = 0
-                
-                for deal in in_progress_deals:
-                    try:
-                        timeout_check = check_timeout(deal)
+                store = await _deal_store(client)
+            
+            if unsubscribe is None:
+                unsubscribe = store.subscribe(_on_change)
+            
+            released_count = 0
+            
+            for deal in store.find(state="IN_PROGRESS"):
+                try:
+                    timeout_check = check_timeout(deal)
+                    
+                    if timeout_check.get("timed_out"):
+                        release_result = await _deal_write_through(store, store.update(deal["id"], lambda d: auto_release_on_timeout(
+                            d, bool(d.get("delivery", {}).get("proof"))
+                        )))
                         
-                        if timeout_check.get("timed_out"):
-                            proof_verified = bool(deal.get("delivery", {}).get("proof"))
-                            release_result = auto_release_on_timeout(deal, proof_verified)
-                            
-                            if release_result.get("ok"):
-                                released_count += 1
-                                print(f" Auto-released deal {deal.get('id')}")
+                        if release_result.get("ok"):
+                            released_count += 1
+                            print(f" Auto-released deal {deal.get('id')}")
                     
-                    except Exception as deal_error:
-                        print(f" Deal error: {deal_error}")
-                        continue
+                    elif "hours_remaining" in timeout_check:
+                        sleep_for = min(sleep_for, max(60, timeout_check["hours_remaining"] * 3600 + 60))
                 
-                if released_count > 0:
-                    await _save_users(client, users)
+                except Exception as deal_error:
+                    print(f" Deal error: {deal_error}")
+                    continue
                 
         except Exception as e:
             print(f" Auto-release job error: {e}")
         
-        await asyncio.sleep(6 * 3600)
+        try:
+            await asyncio.wait_for(wake.wait(), sleep_for)
+        except asyncio.TimeoutError:
+            pass
         
 async def conversation_monitor_job():
     """Background job to check for and respond to conversation replies"""
@@ -7994,6 +8027,8 @@ async def startup_event():
     # === EXISTING BACKGROUND TASKS ===
     asyncio.create_task(auto_bid_background())
     asyncio.create_task(auto_release_escrows_job())
+    if get_fx_service:
+        get_fx_service().start()  # FX rates refreshed in the background
     # Gap 1 Fix: Load market maker state from JSONBIN and start autosave
     await _load_market_maker_state()
     asyncio.create_task(_mm_state_autosave_job())
@@ -8011,7 +8046,7 @@ async def startup_event():
     asyncio.create_task(autonomous_token_refresh_job())
 
     print("Background tasks started:")
-    print("  [EXISTING] auto-bid, auto-release, mm-state-autosave, conversation-monitor")
+    print("  [EXISTING] auto-bid, auto-release, fx-rates, mm-state-autosave, conversation-monitor")
     print("  [NEW] full-cycle(30m), unified-engagement(20m), public-engagement(15m),")
     print("         auto-reply(5m), content-campaign(4h), conductor(45m), token-refresh(24h)")
 
@@ -8050,6 +8085,14 @@ async def shutdown_event():
     except Exception as e:
         print(f"   ✗ Yield Memory save error: {e}")
 
+    try:
+        if _DEAL_STORE_SEEDED:
+            # No persistent disk on deploy: the JSONBin mirror is the durable copy
+            ok = await asyncio.to_thread(get_deal_store().flush_mirror)
+            print("   ✓ Deal mirror flushed" if ok else "   ✗ Deal mirror flush failed")
+    except Exception as e:
+        print(f"   ✗ Deal mirror flush error: {e}")
+
     print("🧠 Brain learning state saved")
 
 
@@ -8896,7 +8939,59 @@ async def _load_users(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
         return []
 
 async def _save_users(client: httpx.AsyncClient, users: List[Dict[str, Any]]):
+    store = get_deal_store() if _DEAL_STORE_SEEDED else None
+    if store is not None:
+        # The deal store is the live copy: never write back the deal list loaded with `users`
+        system_user = next((u for u in users if isinstance(u, dict) and u.get("username") == "system_dealgraph"), None)
+        if system_user is not None:
+            system_user["deals"] = await asyncio.to_thread(store.snapshot)
     await _jsonbin_put(client, users)
+    if store is not None and store.mirror is not None:
+        store.mirror.mark_dirty()  # A mirror push may have landed before this PUT
+
+_DEAL_STORE_SEEDED = False
+
+async def _update_deal_and_users(client: httpx.AsyncClient, store, deal_id: str, fn, users: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    store.update() for an operation that also changes records in `users`.
+    
+    The deal is committed, then users are saved together with the deal
+    snapshot in one PUT. If the save fails the stored deal is put back as it
+    was, so the deal and the balances never disagree and the call can be
+    retried.
+    """
+    previous = store.get(deal_id)  # Detached from the store once update() replaces it
+    result = store.update(deal_id, fn)
+    if not result.get("ok"):
+        return result
+    try:
+        await _save_users(client, users)
+    except Exception as e:
+        store.put(previous)
+        print(f"⚠️ Saving users for deal {deal_id} failed, deal rolled back: {e}")
+        return {"ok": False, "error": "save_failed", "deal_id": deal_id, "detail": str(e)}
+    return result
+
+async def _deal_write_through(store, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Push a money-moving deal change to the system_dealgraph mirror before responding"""
+    if isinstance(result, dict) and result.get("ok"):
+        await asyncio.to_thread(store.flush_mirror)
+    return result
+
+async def _deal_store(client: httpx.AsyncClient, users: Optional[List[Dict[str, Any]]] = None):
+    """Deal store, seeded once from the system_dealgraph record (deals missing locally)"""
+    global _DEAL_STORE_SEEDED
+    if _DEAL_STORE_SEEDED:
+        return get_deal_store()
+    store = await asyncio.to_thread(get_deal_store)  # First call replays the journal
+    if users is None:
+        users = await _load_users(client)
+    system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
+    if system_user:
+        await asyncio.to_thread(store.import_deals, system_user.get("deals", []))
+    # An empty load may be a JSONBin hiccup: try again next call
+    _DEAL_STORE_SEEDED = bool(users) or not (JSONBIN_URL and JSONBIN_SECRET)
+    return store
 
 # ---- Shared helpers (added) ----
 async def _get_users_client():
@@ -12809,6 +12904,8 @@ from fastapi import HTTPException
 EVENT_BUS = asyncio.Queue()
 
 async def publish(evt: dict):
+    if get_risk_engine and evt.get("type") == "intent_bid" and evt.get("agent"):
+        get_risk_engine().record_bid(evt["agent"], evt.get("price"))
     try:
         await EVENT_BUS.put(json.dumps(evt))
     except Exception:
@@ -13699,6 +13796,7 @@ from escrow_lite import (
     get_payment_status,
     auto_capture_on_delivered,
     auto_timeout_release,
+    auto_timeout_release_batch,
     partial_refund_on_dispute
 )
 
@@ -13901,6 +13999,42 @@ async def escrow_refund(body: Dict = Body(...)):
         return result
 
 
+@app.post("/escrow/timeout_release")
+async def escrow_timeout_release(body: Dict = Body(default={})):
+    """
+    Capture every delivered intent past its dispute window in one batch
+    (concurrent, paced against Stripe, resumable the same day)
+    """
+    timeout_days = int(body.get("timeout_days", 7))
+
+    async with httpx.AsyncClient(timeout=30) as client:
+        users = await _load_users(client)
+
+        intents = [
+            intent
+            for user in users
+            for intent in user.get("intents", [])
+            if intent.get("status") == "DELIVERED"
+            and intent.get("payment_intent_id")
+            and not intent.get("payment_captured")
+        ]
+
+        result = await auto_timeout_release_batch(intents, timeout_days=timeout_days)
+
+        if any(i.get("payment_captured") for i in intents):
+            await _save_users(client, users)
+
+        return result
+
+
+@app.get("/batch/payment/executor/stats")
+async def payment_executor_stats():
+    """Throughput, retry and rate-limit counters for batch payment execution"""
+    if not get_payment_executor:
+        return {"ok": False, "error": "payment_executor not available"}
+    return {"ok": True, **get_payment_executor().get_stats()}
+
+
 @app.post("/wade/discover-and-queue")
 async def discover_and_queue(request: Request):
     """Run discovery and automatically queue Wade opportunities"""
@@ -14634,12 +14768,56 @@ async def convert_currency_endpoint(body: Dict = Body(...)):
     from_currency = body.get("from_currency", "USD")
     to_currency = body.get("to_currency", "USD")
     
+    at = body.get("at")  # Optional: convert at the rates in effect then (ISO timestamp)
+    
     if amount <= 0:
         return {"error": "invalid_amount", "amount": amount}
     
+    if at and get_fx_service:
+        try:
+            return get_fx_service().convert_at(amount, from_currency, to_currency, at)
+        except ValueError:
+            return {"error": "invalid_timestamp", "at": at}
+    
     result = convert_currency(amount, from_currency, to_currency)
     return result
 
+@app.post("/currency/convert_many")
+async def convert_many_endpoint(body: Dict = Body(...)):
+    """
+    Convert a list of amounts into several currencies (pricing pages)
+    
+    Body:
+    {
+        "amounts": [9.99, 19.99, 99],
+        "from_currency": "USD",
+        "to_currencies": ["EUR", "GBP"],
+        "at": "2025-01-15T00:00:00Z" (optional)
+    }
+    """
+    amounts = body.get("amounts") or []
+    to_currencies = body.get("to_currencies") or []
+    
+    try:
+        amounts = [float(a) for a in amounts]
+    except (TypeError, ValueError):
+        return {"error": "invalid_amounts"}
+    
+    if not amounts or not to_currencies:
+        return {"error": "amounts and to_currencies required"}
+    
+    try:
+        return convert_many(amounts, body.get("from_currency", "USD"), to_currencies, body.get("at"))
+    except ValueError:
+        return {"error": "invalid_timestamp", "at": body.get("at")}
+
+@app.get("/currency/rates/stats")
+async def get_exchange_rate_stats():
+    """FX rate service freshness (age, staleness, refresh failures, history)"""
+    if not get_fx_service:
+        return {"ok": False, "error": "not_available"}
+    return {"ok": True, **get_fx_service().get_stats()}
+
 @app.get("/currency/balance")
 async def get_currency_balance(username: str, currency: str = "USD"):
     """Get user's balance in specified currency"""
@@ -15210,6 +15388,52 @@ async def export_tax_csv_endpoint(username: str, year: int = None):
         
         return csv_data
 
+@app.get("/tax/export_csv/stream")
+async def export_tax_csv_stream_endpoint(username: str, year: int = None):
+    """Export tax data as a CSV file download, streamed row by row"""
+    async with httpx.AsyncClient(timeout=20) as client:
+        users = await _load_users(client)
+        user = _find_user(users, username)
+        
+        if not user:
+            return {"error": "user not found"}
+    
+    filename = f"{username}_{year or datetime.now(timezone.utc).year}_tax.csv"
+    return StreamingResponse(iter_tax_csv(user, year), media_type="text/csv",
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+@app.post("/tax/batch_1099/jobs")
+async def start_batch_1099_job_endpoint(year: int = None, chunk_size: int = 500):
+    """
+    Start a background 1099 run over all agents (one ledger pass per user,
+    chunked, written to CSV). Poll /tax/batch_1099/jobs/{job_id} for progress.
+    Admin only
+    """
+    async with httpx.AsyncClient(timeout=30) as client:
+        users = await _load_users(client)
+    
+    job = start_batch_1099_job(users, year, chunk_size)
+    return job.progress()
+
+@app.get("/tax/batch_1099/jobs/{job_id}")
+async def get_batch_1099_job_endpoint(job_id: str):
+    """Progress of a background 1099 run"""
+    job = get_tax_job(job_id)
+    if not job:
+        return {"ok": False, "error": "job_not_found", "job_id": job_id}
+    return job.progress()
+
+@app.get("/tax/batch_1099/jobs/{job_id}/csv")
+async def download_batch_1099_job_endpoint(job_id: str):
+    """Download a finished 1099 run as CSV"""
+    job = get_tax_job(job_id)
+    if not job:
+        return {"ok": False, "error": "job_not_found", "job_id": job_id}
+    if job.status != "completed":
+        return {"ok": False, "error": "job_not_completed", **job.progress()}
+    return StreamingResponse(job.iter_csv(), media_type="text/csv",
+                             headers={"Content-Disposition": f'attachment; filename="1099_nec_{job.year}.csv"'})
+
         # ============ R³ AUTOPILOT (KEEP-ME-GROWING) ============
 
 @app.get("/r3/autopilot/tiers")
@@ -16907,27 +17131,13 @@ async def authorize_payment_endpoint(body: Dict = Body(...)):
         return {"error": "deal_id, payment_intent_id, and positive amount required"}
     
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        # Find deal
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        # Authorize payment
-        result = authorize_payment(deal, payment_intent_id, amount)
-        
-        if result["ok"]:
-            await _save_users(client, users)
-        
-        return result
+        store = await _deal_store(client)
+    
+    if not store.get(deal_id):
+        return {"error": "deal not found"}
+    
+    # Authorize payment
+    return store.update(deal_id, lambda deal: authorize_payment(deal, payment_intent_id, amount))
 
 @app.post("/money/capture")
 async def capture_payment_endpoint(body: Dict = Body(...)):
@@ -16947,26 +17157,13 @@ async def capture_payment_endpoint(body: Dict = Body(...)):
         return {"error": "deal_id required"}
     
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        # Capture payment
-        result = capture_payment(deal, capture_amount)
-        
-        if result["ok"]:
-            await _save_users(client, users)
-        
-        return result
+        store = await _deal_store(client)
+    
+    if not store.get(deal_id):
+        return {"error": "deal not found"}
+    
+    # Capture payment
+    return await _deal_write_through(store, store.update(deal_id, lambda deal: capture_payment(deal, capture_amount)))
 
 @app.post("/money/pause_dispute")
 async def pause_on_dispute_endpoint(body: Dict = Body(...)):
@@ -16986,47 +17183,27 @@ async def pause_on_dispute_endpoint(body: Dict = Body(...)):
         return {"error": "deal_id required"}
     
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        # Pause on dispute
-        result = pause_on_dispute(deal, dispute_reason)
-        
-        if result["ok"]:
-            await _save_users(client, users)
-        
-        return result
+        store = await _deal_store(client)
+    
+    if not store.get(deal_id):
+        return {"error": "deal not found"}
+    
+    # Pause on dispute
+    return store.update(deal_id, lambda deal: pause_on_dispute(deal, dispute_reason))
 
 @app.get("/money/check_timeout/{deal_id}")
 async def check_timeout_endpoint(deal_id: str):
     """Check if deal has timed out"""
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        result = check_timeout(deal)
-        
-        return {"ok": True, "deal_id": deal_id, **result}
+        store = await _deal_store(client)
+    
+    deal = store.get(deal_id)
+    if not deal:
+        return {"error": "deal not found"}
+    
+    result = check_timeout(deal)
+    
+    return {"ok": True, "deal_id": deal_id, **result}
 
 @app.post("/money/auto_release")
 async def auto_release_on_timeout_endpoint(body: Dict = Body(...)):
@@ -17046,26 +17223,13 @@ async def auto_release_on_timeout_endpoint(body: Dict = Body(...)):
         return {"error": "deal_id required"}
     
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        # Auto-release
-        result = auto_release_on_timeout(deal, proof_verified)
-        
-        if result["ok"]:
-            await _save_users(client, users)
-        
-        return result
+        store = await _deal_store(client)
+    
+    if not store.get(deal_id):
+        return {"error": "deal not found"}
+    
+    # Auto-release
+    return await _deal_write_through(store, store.update(deal_id, lambda deal: auto_release_on_timeout(deal, proof_verified)))
 
 @app.post("/money/void")
 async def void_authorization_endpoint(body: Dict = Body(...)):
@@ -17085,26 +17249,13 @@ async def void_authorization_endpoint(body: Dict = Body(...)):
         return {"error": "deal_id required"}
     
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        # Void authorization
-        result = void_authorization(deal, reason)
-        
-        if result["ok"]:
-            await _save_users(client, users)
-        
-        return result
+        store = await _deal_store(client)
+    
+    if not store.get(deal_id):
+        return {"error": "deal not found"}
+    
+    # Void authorization
+    return store.update(deal_id, lambda deal: void_authorization(deal, reason))
 
 @app.post("/money/webhook")
 async def process_webhook_endpoint(body: Dict = Body(...)):
@@ -17120,146 +17271,120 @@ async def process_webhook_endpoint(body: Dict = Body(...)):
         return {"error": "deal_id not found in webhook metadata"}
     
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        # Process webhook
-        result = process_webhook(body, deal)
-        
-        if result.get("ok") or result.get("error") == "webhook_already_processed":
-            await _save_users(client, users)
-        
-        return result
+        store = await _deal_store(client)
+    
+    if not store.get(deal_id):
+        return {"error": "deal not found"}
+    
+    # Process webhook (a duplicate event changes nothing, so only ok results are committed)
+    return store.update(deal_id, lambda deal: process_webhook(body, deal))
 
 @app.get("/money/timeline/{deal_id}")
 async def get_money_timeline_endpoint(deal_id: str):
     """Get complete money event timeline for deal"""
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        timeline = get_money_timeline(deal)
-        
-        return {"ok": True, **timeline}
+        store = await _deal_store(client)
+    
+    deal = store.get(deal_id)
+    if not deal:
+        return {"error": "deal not found"}
+    
+    timeline = get_money_timeline(deal)
+    
+    return {"ok": True, **timeline}
 
 @app.post("/money/batch_check_timeouts")
 async def batch_check_timeouts():
     """Batch check all active deals for timeouts"""
     async with httpx.AsyncClient(timeout=30) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"ok": True, "timed_out_deals": [], "count": 0}
-        
-        deals = system_user.get("deals", [])
-        
-        # Check all IN_PROGRESS deals
-        in_progress_deals = [d for d in deals if d.get("state") == "IN_PROGRESS"]
-        
-        timed_out = []
-        
-        for deal in in_progress_deals:
-            timeout_check = check_timeout(deal)
-            
-            if timeout_check.get("timed_out"):
-                timed_out.append({
-                    "deal_id": deal["id"],
-                    "timeout_info": timeout_check,
-                    "buyer": deal.get("buyer"),
-                    "lead_agent": deal.get("lead_agent")
-                })
+        store = await _deal_store(client)
+    
+    if not len(store):
+        return {"ok": True, "timed_out_deals": [], "count": 0}
+    
+    # Check all IN_PROGRESS deals (state index)
+    in_progress_deals = store.find(state="IN_PROGRESS")
+    
+    timed_out = []
+    
+    for deal in in_progress_deals:
+        timeout_check = check_timeout(deal)
         
-        return {
-            "ok": True,
-            "total_checked": len(in_progress_deals),
-            "timed_out_count": len(timed_out),
-            "timed_out_deals": timed_out
-        }
+        if timeout_check.get("timed_out"):
+            timed_out.append({
+                "deal_id": deal["id"],
+                "timeout_info": timeout_check,
+                "buyer": deal.get("buyer"),
+                "lead_agent": deal.get("lead_agent")
+            })
+    
+    return {
+        "ok": True,
+        "total_checked": len(in_progress_deals),
+        "timed_out_count": len(timed_out),
+        "timed_out_deals": timed_out
+    }
 
 @app.get("/money/dashboard")
 async def get_money_dashboard():
     """Get state-driven money dashboard"""
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {
-                "ok": True,
-                "total_deals": 0,
-                "message": "No deals yet"
-            }
-        
-        deals = system_user.get("deals", [])
-        
-        # Count by escrow status
-        by_escrow_status = {}
-        for deal in deals:
-            status = deal.get("escrow", {}).get("status", "none")
-            by_escrow_status[status] = by_escrow_status.get(status, 0) + 1
-        
-        # Calculate totals
-        total_authorized = sum([
-            d.get("escrow", {}).get("amount", 0) 
-            for d in deals 
-            if d.get("escrow", {}).get("status") == "authorized"
-        ])
-        
-        total_captured = sum([
-            d.get("escrow", {}).get("captured_amount", 0)
-            for d in deals
-            if d.get("escrow", {}).get("status") == "captured"
-        ])
-        
-        # Count timeouts
-        in_progress = [d for d in deals if d.get("state") == "IN_PROGRESS"]
-        timed_out_count = 0
-        for deal in in_progress:
-            if check_timeout(deal).get("timed_out"):
-                timed_out_count += 1
-        
-        # Count webhooks processed
-        total_webhooks = sum([
-            len(d.get("processed_webhooks", []))
-            for d in deals
-        ])
-        
+        store = await _deal_store(client)
+    
+    if not len(store):
         return {
             "ok": True,
-            "total_deals": len(deals),
-            "escrow_status_breakdown": by_escrow_status,
-            "total_authorized": round(total_authorized, 2),
-            "total_captured": round(total_captured, 2),
-            "deals_in_progress": len(in_progress),
-            "timed_out_deals": timed_out_count,
-            "total_webhooks_processed": total_webhooks,
-            "state_transitions": STATE_TRANSITIONS,
-            "timeout_rules": TIMEOUT_RULES,
-            "dashboard_generated_at": _now()
+            "total_deals": 0,
+            "message": "No deals yet"
         }
+    
+    deals = store.all()
+    
+    # Count by escrow status
+    by_escrow_status = {}
+    for deal in deals:
+        status = deal.get("escrow", {}).get("status", "none")
+        by_escrow_status[status] = by_escrow_status.get(status, 0) + 1
+    
+    # Calculate totals
+    total_authorized = sum([
+        d.get("escrow", {}).get("amount", 0) 
+        for d in deals 
+        if d.get("escrow", {}).get("status") == "authorized"
+    ])
+    
+    total_captured = sum([
+        d.get("escrow", {}).get("captured_amount", 0)
+        for d in deals
+        if d.get("escrow", {}).get("status") == "captured"
+    ])
+    
+    # Count timeouts
+    in_progress = store.find(state="IN_PROGRESS")
+    timed_out_count = 0
+    for deal in in_progress:
+        if check_timeout(deal).get("timed_out"):
+            timed_out_count += 1
+    
+    # Count webhooks processed
+    total_webhooks = sum([
+        len(d.get("processed_webhooks", []))
+        for d in deals
+    ])
+    
+    return {
+        "ok": True,
+        "total_deals": len(deals),
+        "escrow_status_breakdown": by_escrow_status,
+        "total_authorized": round(total_authorized, 2),
+        "total_captured": round(total_captured, 2),
+        "deals_in_progress": len(in_progress),
+        "timed_out_deals": timed_out_count,
+        "total_webhooks_processed": total_webhooks,
+        "state_transitions": STATE_TRANSITIONS,
+        "timeout_rules": TIMEOUT_RULES,
+        "dashboard_generated_at": _now()
+    }
 
 # ============ METABRIDGE AUTO-ASSEMBLE JV TEAMS ============
 
@@ -24158,6 +24283,39 @@ async def protocol_search(
     )
 
 
+@app.get("/protocol/agents/query")
+async def protocol_query(
+    capabilities: str = None,
+    agent_types: str = None,
+    tiers: str = None,
+    min_reputation: int = 0,
+    verified_only: bool = False,
+    limit: int = 50
+):
+    """
+    Top agents matching several predicates at once (comma-separated lists)
+    
+    Examples:
+    - /protocol/agents/query?capabilities=code_generation,code_review&tiers=gold,platinum
+    - /protocol/agents/query?agent_types=claude,gpt&min_reputation=70&limit=10
+    
+    Agents must have ALL capabilities and be ANY of the types / tiers.
+    No authentication required.
+    """
+    def split(value):
+        return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
+    gateway = get_gateway()
+    return gateway.query_agents(
+        capabilities=split(capabilities),
+        agent_types=split(agent_types),
+        tiers=split(tiers),
+        min_reputation=min_reputation,
+        verified_only=verified_only,
+        limit=limit
+    )
+
+
 @app.get("/protocol/leaderboard")
 async def protocol_leaderboard(limit: int = 20):
     """
@@ -27424,63 +27582,41 @@ async def create_deal_endpoint(body: Dict = Body(...)):
         result = create_deal(intent, agent_username, slo_tier, ip_assets, jv_partners)
         
         if result["ok"]:
-            # Store deal
-            system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-            
-            if not system_user:
-                system_user = {
-                    "username": "system_dealgraph",
-                    "role": "system",
-                    "deals": [],
-                    "created_at": _now()
-                }
-                users.append(system_user)
-            
-            system_user.setdefault("deals", []).append(result["deal"])
-            
-            await _save_users(client, users)
-        
+            # Store deal (mirrored to the system_dealgraph record in the background)
+            store = await _deal_store(client, users)
+            store.put(result["deal"])
+
         return result
 
 @app.get("/dealgraph/deal/{deal_id}")
 async def get_deal(deal_id: str):
     """Get deal details"""
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "no_deals_found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found", "deal_id": deal_id}
-        
-        return {"ok": True, "deal": deal}
+        store = await _deal_store(client)
+
+    if not len(store):
+        return {"error": "no_deals_found"}
+
+    deal = store.get(deal_id)
+
+    if not deal:
+        return {"error": "deal not found", "deal_id": deal_id}
+
+    return {"ok": True, "deal": deal}
 
 @app.get("/dealgraph/deal/{deal_id}/summary")
 async def get_deal_summary_endpoint(deal_id: str):
     """Get deal summary"""
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        summary = get_deal_summary(deal)
-        
-        return {"ok": True, **summary}
+        store = await _deal_store(client)
+    
+    deal = store.get(deal_id)
+    if not deal:
+        return {"error": "deal not found"}
+    
+    summary = get_deal_summary(deal)
+    
+    return {"ok": True, **summary}
 
 @app.post("/dealgraph/deal/calculate_split")
 async def calculate_revenue_split_endpoint(body: Dict = Body(...)):
@@ -27538,26 +27674,13 @@ async def accept_deal(body: Dict = Body(...)):
         return {"error": "deal_id and buyer_username required"}
     
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        # Transition to accepted
-        result = transition_state(deal, DealState.ACCEPTED, buyer_username)
-        
-        if result["ok"]:
-            await _save_users(client, users)
-        
-        return result
+        store = await _deal_store(client)
+    
+    if not store.get(deal_id):
+        return {"error": "deal not found"}
+    
+    # Transition to accepted
+    return store.transition(deal_id, DealState.ACCEPTED, buyer_username)
 
 @app.post("/dealgraph/escrow/authorize")
 async def authorize_escrow_endpoint(body: Dict = Body(...)):
@@ -27580,16 +27703,9 @@ async def authorize_escrow_endpoint(body: Dict = Body(...)):
     
     async with httpx.AsyncClient(timeout=20) as client:
         users = await _load_users(client)
+        store = await _deal_store(client, users)
         
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
+        if not store.get(deal_id):
             return {"error": "deal not found"}
         
         # Find buyer
@@ -27598,12 +27714,7 @@ async def authorize_escrow_endpoint(body: Dict = Body(...)):
             return {"error": "buyer not found"}
         
         # Authorize escrow
-        result = authorize_escrow(deal, payment_intent_id, buyer_user)
-        
-        if result["ok"]:
-            await _save_users(client, users)
-        
-        return result
+        return store.update(deal_id, lambda deal: authorize_escrow(deal, payment_intent_id, buyer_user))
 
 @app.post("/dealgraph/bonds/stake")
 async def stake_bonds_endpoint(body: Dict = Body(...)):
@@ -27627,25 +27738,15 @@ async def stake_bonds_endpoint(body: Dict = Body(...)):
     
     async with httpx.AsyncClient(timeout=20) as client:
         users = await _load_users(client)
+        store = await _deal_store(client, users)
         
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
+        if not store.get(deal_id):
             return {"error": "deal not found"}
         
-        # Stake bonds
-        result = stake_bonds(deal, agent_stakes, users)
+        # Stake bonds (debits agent balances in users)
+        result = await _update_deal_and_users(client, store, deal_id, lambda deal: stake_bonds(deal, agent_stakes, users), users)
         
-        if result["ok"]:
-            await _save_users(client, users)
-        
-        return result
+        return await _deal_write_through(store, result)
 
 @app.post("/dealgraph/work/start")
 async def start_work_endpoint(body: Dict = Body(...)):
@@ -27665,26 +27766,13 @@ async def start_work_endpoint(body: Dict = Body(...)):
         return {"error": "deal_id and deadline required"}
     
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        # Start work
-        result = start_work(deal, deadline)
-        
-        if result["ok"]:
-            await _save_users(client, users)
-        
-        return result
+        store = await _deal_store(client)
+    
+    if not store.get(deal_id):
+        return {"error": "deal not found"}
+    
+    # Start work
+    return store.update(deal_id, lambda deal: start_work(deal, deadline))
 
 @app.post("/dealgraph/work/deliver")
 async def mark_delivered_endpoint(body: Dict = Body(...)):
@@ -27704,26 +27792,13 @@ async def mark_delivered_endpoint(body: Dict = Body(...)):
         return {"error": "deal_id required"}
     
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
-            return {"error": "deal not found"}
-        
-        # Mark delivered
-        result = mark_delivered(deal, delivery_timestamp)
-        
-        if result["ok"]:
-            await _save_users(client, users)
-        
-        return result
+        store = await _deal_store(client)
+    
+    if not store.get(deal_id):
+        return {"error": "deal not found"}
+    
+    # Mark delivered
+    return store.update(deal_id, lambda deal: mark_delivered(deal, delivery_timestamp))
 
 @app.post("/dealgraph/settle")
 async def settle_deal_endpoint(body: Dict = Body(...)):
@@ -27749,25 +27824,15 @@ async def settle_deal_endpoint(body: Dict = Body(...)):
     
     async with httpx.AsyncClient(timeout=30) as client:
         users = await _load_users(client)
+        store = await _deal_store(client, users)
         
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"error": "deal not found"}
-        
-        deals = system_user.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
-        
-        if not deal:
+        if not store.get(deal_id):
             return {"error": "deal not found"}
         
-        # Settle deal (atomic operation)
-        result = settle_deal(deal, users)
-        
-        if result["ok"]:
-            await _save_users(client, users)
+        # Settle deal (atomic operation; credits balances in users)
+        result = await _update_deal_and_users(client, store, deal_id, lambda deal: settle_deal(deal, users), users)
         
-        return result
+        return await _deal_write_through(store, result)
 
 @app.get("/dealgraph/deals/list")
 async def list_deals(state: str = None, agent: str = None, buyer: str = None):
@@ -27780,106 +27845,114 @@ async def list_deals(state: str = None, agent: str = None, buyer: str = None):
     - buyer: Filter by buyer
     """
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"ok": True, "deals": [], "count": 0}
-        
-        deals = system_user.get("deals", [])
-        
-        # Apply filters
-        if state:
-            deals = [d for d in deals if d.get("state") == state]
-        
-        if agent:
-            deals = [d for d in deals if d.get("lead_agent") == agent]
-        
-        if buyer:
-            deals = [d for d in deals if d.get("buyer") == buyer]
-        
-        return {"ok": True, "deals": deals, "count": len(deals)}
+        store = await _deal_store(client)
+    
+    # Index lookups (intersection of the given filters)
+    deals = store.find(state=state or None, lead_agent=agent or None, buyer=buyer or None)
+    
+    return {"ok": True, "deals": deals, "count": len(deals)}
 
 @app.get("/dealgraph/agent/{username}/deals")
 async def get_agent_deals(username: str):
     """Get all deals for an agent (lead or JV partner)"""
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {"ok": True, "deals": [], "count": 0}
-        
-        deals = system_user.get("deals", [])
-        
-        # Find deals where user is lead or JV partner
-        agent_deals = []
-        for deal in deals:
-            if deal.get("lead_agent") == username:
-                agent_deals.append(deal)
-            else:
-                # Check JV partners
-                jv_partners = deal.get("jv_partners", [])
-                if any(p.get("username") == username for p in jv_partners):
-                    agent_deals.append(deal)
-        
-        return {"ok": True, "deals": agent_deals, "count": len(agent_deals)}
+        store = await _deal_store(client)
+    
+    # Find deals where user is lead or JV partner
+    agent_deals = store.find(lead_agent=username)
+    seen = {d["id"] for d in agent_deals}
+    agent_deals += [d for d in store.find(jv_partner=username) if d["id"] not in seen]
+    agent_deals.sort(key=lambda d: store.position(d["id"]))
+    
+    return {"ok": True, "deals": agent_deals, "count": len(agent_deals)}
 
 @app.get("/dealgraph/dashboard")
 async def get_dealgraph_dashboard():
     """Get DealGraph system dashboard"""
     async with httpx.AsyncClient(timeout=20) as client:
-        users = await _load_users(client)
-        
-        system_user = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not system_user:
-            return {
-                "ok": True,
-                "total_deals": 0,
-                "message": "No deals created yet"
-            }
-        
-        deals = system_user.get("deals", [])
-        
-        # Count by state
-        by_state = {}
-        for deal in deals:
-            state = deal.get("state", "UNKNOWN")
-            by_state[state] = by_state.get(state, 0) + 1
-        
-        # Calculate totals
-        total_value = sum([d.get("job_value", 0) for d in deals])
-        settled_deals = [d for d in deals if d.get("state") == "COMPLETED"]
-        settled_value = sum([d.get("job_value", 0) for d in settled_deals])
-        
-        # Platform revenue
-        platform_revenue = settled_value * PLATFORM_FEE
-        insurance_pool_total = settled_value * INSURANCE_POOL_CUT
-        
-        # On-time rate
-        delivered_deals = [d for d in deals if d.get("delivery", {}).get("delivered_at")]
-        on_time_count = len([d for d in delivered_deals if d.get("delivery", {}).get("on_time")])
-        on_time_rate = (on_time_count / len(delivered_deals)) if delivered_deals else 0
-        
+        store = await _deal_store(client)
+    
+    if not len(store):
         return {
             "ok": True,
-            "total_deals": len(deals),
-            "deals_by_state": by_state,
-            "total_deal_value": round(total_value, 2),
-            "settled_deals": len(settled_deals),
-            "settled_value": round(settled_value, 2),
-            "platform_revenue": round(platform_revenue, 2),
-            "insurance_pool_contributions": round(insurance_pool_total, 2),
-            "on_time_delivery_rate": round(on_time_rate, 2),
-            "config": {
-                "platform_fee": PLATFORM_FEE,
-                "insurance_pool_cut": INSURANCE_POOL_CUT
-            },
-            "dashboard_generated_at": _now()
+            "total_deals": 0,
+            "message": "No deals created yet"
         }
+    
+    deals = store.all()
+    
+    # Count by state (state index)
+    by_state = {state if state is not None else "UNKNOWN": n for state, n in store.count_by("state").items() if n}
+    
+    # Calculate totals
+    total_value = sum([d.get("job_value", 0) for d in deals])
+    settled_deals = store.find(state="COMPLETED")
+    settled_value = sum([d.get("job_value", 0) for d in settled_deals])
+    
+    # Platform revenue
+    platform_revenue = settled_value * PLATFORM_FEE
+    insurance_pool_total = settled_value * INSURANCE_POOL_CUT
+    
+    # On-time rate
+    delivered_deals = [d for d in deals if d.get("delivery", {}).get("delivered_at")]
+    on_time_count = len([d for d in delivered_deals if d.get("delivery", {}).get("on_time")])
+    on_time_rate = (on_time_count / len(delivered_deals)) if delivered_deals else 0
+    
+    return {
+        "ok": True,
+        "total_deals": len(deals),
+        "deals_by_state": by_state,
+        "total_deal_value": round(total_value, 2),
+        "settled_deals": len(settled_deals),
+        "settled_value": round(settled_value, 2),
+        "platform_revenue": round(platform_revenue, 2),
+        "insurance_pool_contributions": round(insurance_pool_total, 2),
+        "on_time_delivery_rate": round(on_time_rate, 2),
+        "config": {
+            "platform_fee": PLATFORM_FEE,
+            "insurance_pool_cut": INSURANCE_POOL_CUT
+        },
+        "dashboard_generated_at": _now()
+    }
+
+@app.get("/dealgraph/changes")
+async def get_deal_changes(since: int = 0, limit: int = 1000):
+    """
+    Deal change feed (one entry per committed put / transition / update)
+
+    Parameters:
+    - since: Cursor from the previous call (0 = oldest retained change)
+    - limit: Max changes returned
+
+    truncated=true means changes after `since` were dropped from the feed
+    window; re-read /dealgraph/deals/list and continue from `latest`.
+    """
+    async with httpx.AsyncClient(timeout=20) as client:
+        store = await _deal_store(client)
+
+    return {"ok": True, **store.changes(since, max(1, min(limit, 10000)))}
+
+@app.get("/dealgraph/changes/stream")
+async def stream_deal_changes(since: int = 0):
+    """Deal change feed as server-sent events (for dashboards)"""
+    async with httpx.AsyncClient(timeout=20) as client:
+        store = await _deal_store(client)
+
+    async def gen():
+        async for batch in store.follow(since):
+            if batch["changes"]:
+                yield f"id: {batch['cursor']}\ndata: {json.dumps(batch)}\n\n"
+            else:
+                yield ": heartbeat\n\n"
+    return StreamingResponse(gen(), media_type="text/event-stream")
+
+@app.get("/dealgraph/store/stats")
+async def get_deal_store_stats():
+    """Deal store size, journal, feed subscribers and mirror status"""
+    async with httpx.AsyncClient(timeout=20) as client:
+        store = await _deal_store(client)
+
+    return {"ok": True, **store.get_stats()}
 
 # ============ REAL-WORLD PROOF PIPE ============
 
@@ -28198,24 +28271,13 @@ async def attach_proof_to_deal_endpoint(body: Dict = Body(...)):
             return {"error": "proof not found"}
         
         # Find deal
-        deal_system = next((u for u in users if u.get("username") == "system_dealgraph"), None)
-        
-        if not deal_system:
-            return {"error": "deal not found"}
-        
-        deals = deal_system.get("deals", [])
-        deal = next((d for d in deals if d.get("id") == deal_id), None)
+        store = await _deal_store(client, users)
         
-        if not deal:
+        if not store.get(deal_id):
             return {"error": "deal not found"}
         
-        # Attach proof
-        result = attach_proof_to_deal(proof, deal)
-        
-        if result["ok"]:
-            await _save_users(client, users)
-        
-        return result
+        # Attach proof (users carry the proof's deal_id)
+        return await _update_deal_and_users(client, store, deal_id, lambda deal: attach_proof_to_deal(proof, deal), users)
 
 @app.get("/proofs/report")
 async def generate_proof_report_endpoint(start_date: str = None, end_date: str = None):
@@ -31692,8 +31754,11 @@ from yield_memory import (
     get_patterns_to_avoid,
     get_memory_stats,
     export_memory,
-    import_memory
+    import_memory,
+    iter_memory_ndjson,
+    memory_importer
 )
+from ndjson_stream import NDJSON_MEDIA_TYPE, stream_ndjson, aimport_ndjson, get_import_progress
 
 @app.post("/memory/store")
 async def memory_store(
@@ -31764,6 +31829,23 @@ async def memory_import(username: str, json_data: str):
     result = import_memory(username, json_data)
     return result
 
+@app.get("/memory/export.ndjson")
+async def memory_export_ndjson(after: str = None, usernames: str = None):
+    """Stream all users' memory as NDJSON (one user per line; after=<cursor> resumes)"""
+    users = [u for u in usernames.split(",") if u] if usernames else None
+    return StreamingResponse(stream_ndjson(iter_memory_ndjson(after=after, usernames=users)),
+                             media_type=NDJSON_MEDIA_TYPE)
+
+@app.post("/memory/import.ndjson")
+async def memory_import_ndjson(request: Request, cursor: str = None, import_id: str = None):
+    """Import an NDJSON memory export from the request body in chunks (cursor=<cursor> resumes)"""
+    return await aimport_ndjson(memory_importer(cursor=cursor, import_id=import_id), request.stream())
+
+@app.get("/brain/imports/{import_id}")
+async def brain_import_progress(import_id: str):
+    """Last committed cursor of an NDJSON import, for resuming after a dropped upload"""
+    return get_import_progress(import_id)
+
 # ADD HIVE ENDPOINTS HERE
 
 from metahive_brain import (
@@ -31771,7 +31853,10 @@ from metahive_brain import (
     query_hive,
     report_pattern_usage,
     get_hive_stats,
-    get_top_patterns
+    get_top_patterns,
+    iter_hive_ndjson,
+    iter_ai_family_ndjson,
+    hive_importer
 )
 
 @app.post("/hive/contribute")
@@ -31842,6 +31927,22 @@ async def hive_top(
         limit=limit
     )
 
+@app.get("/hive/export.ndjson")
+async def hive_export_ndjson(after: str = None, pattern_type: str = None):
+    """Stream the hive as NDJSON (one contributor/pattern per line; after=<cursor> resumes)"""
+    return StreamingResponse(stream_ndjson(iter_hive_ndjson(after=after, pattern_type=pattern_type)),
+                             media_type=NDJSON_MEDIA_TYPE)
+
+@app.post("/hive/import.ndjson")
+async def hive_import_ndjson(request: Request, cursor: str = None, import_id: str = None):
+    """Merge an NDJSON hive export from the request body in chunks (cursor=<cursor> resumes)"""
+    return await aimport_ndjson(hive_importer(cursor=cursor, import_id=import_id), request.stream())
+
+@app.get("/hive/ai-family/export.ndjson")
+async def hive_ai_family_export_ndjson():
+    """Stream AI family routing/specialization/teaching learnings as NDJSON"""
+    return StreamingResponse(stream_ndjson(iter_ai_family_ndjson()), media_type=NDJSON_MEDIA_TYPE)
+
 from jv_mesh import (
     create_jv_proposal,
     vote_on_jv,
@@ -31936,7 +32037,9 @@ from fraud_detector import (
     get_fraud_case,
     list_fraud_cases,
     get_user_risk_profile,
-    get_fraud_stats
+    get_fraud_stats,
+    get_risk_features,
+    rescore_users
 )
 
 @app.post("/fraud/check")
@@ -31998,6 +32101,19 @@ async def fraud_profile(username: str):
 async def fraud_stats():
     return get_fraud_stats()
 
+@app.get("/fraud/features/{username}")
+async def fraud_features(username: str):
+    """Precomputed risk features (rolling windows) for a user"""
+    return get_risk_features(username)
+
+@app.post("/fraud/rescore")
+async def fraud_rescore(limit: int = 50):
+    """Batch re-score all users from their risk features; returns the riskiest"""
+    users, client = await _get_users_client()
+    result = await asyncio.to_thread(rescore_users, users)
+    result["scores"] = result["scores"][:limit]
+    return result
+
 from dispute_resolution import (
     file_dispute,
     respond_to_dispute,
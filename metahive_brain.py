@@ -48,7 +48,7 @@ PATTERN TYPES:
 ═══════════════════════════════════════════════════════════════════════════════
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 from uuid import uuid4
 from collections import defaultdict
@@ -70,6 +70,8 @@ MIN_QUALITY_FOR_AI_PATTERN = 0.7
 PATTERN_DECAY_DAYS = 90  # Patterns lose weight over time
 AIGX_CONTRIBUTION_REWARD = 0.5
 AIGX_TEACHING_REWARD = 1.0  # Extra reward for AI teaching moments
+NDJSON_FORMAT = "metahive"  # Bulk export/import stream formats (see ndjson_stream)
+AI_FAMILY_NDJSON_FORMAT = "metahive_ai_family"
 
 
 class PatternType(str, Enum):
@@ -263,16 +265,11 @@ async def contribute_to_hive(
     pattern_id = f"hive_{uuid4().hex[:12]}"
     
     # Create hash for deduplication
-    content_hash = hashlib.md5(
-        json.dumps({"context": context, "action": action}, sort_keys=True).encode()
-    ).hexdigest()[:16]
+    content_hash = _content_hash(context, action)
     
     # Check for duplicates
     for existing in _HIVE_PATTERNS:
-        existing_hash = hashlib.md5(
-            json.dumps({"context": existing.context, "action": existing.action}, sort_keys=True).encode()
-        ).hexdigest()[:16]
-        if content_hash == existing_hash:
+        if content_hash == _content_hash(existing.context, existing.action):
             # Boost existing pattern instead
             existing.weight *= 1.1
             existing.usage_count += 1
@@ -722,6 +719,13 @@ def get_top_patterns(
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _content_hash(context: Dict[str, Any], action: Dict[str, Any]) -> str:
+    """Deduplication hash of a pattern's context + action"""
+    return hashlib.md5(
+        json.dumps({"context": context, "action": action}, sort_keys=True).encode()
+    ).hexdigest()[:16]
+
+
 def _calculate_pattern_weight(outcome_score: int, roas: float, quality: float) -> float:
     """Calculate initial pattern weight"""
     score_weight = 0.5 + (outcome_score / 100.0)  # 0.5 - 1.5
@@ -833,28 +837,26 @@ async def _credit_aigx(username: str, amount: float, basis: str, ref: str):
 # EXPORT/IMPORT FOR AI FAMILY BRAIN INTEGRATION
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def export_for_ai_family() -> Dict[str, Any]:
-    """
-    Export hive learnings for AI Family Brain to import.
-    
-    This is the key function for propagating platform-wide learnings
-    to individual AI Family Brain instances.
-    """
+def _iter_ai_family_records() -> Iterator[Dict[str, Any]]:
+    """AI family export records (routing, then specializations, then teachings), in key order"""
     
-    # Get AI routing recommendations
-    routing = {}
-    for task_cat in _TASK_CATEGORY_PATTERNS.keys():
+    # AI routing recommendations
+    for task_cat in sorted(_TASK_CATEGORY_PATTERNS.keys()):
         rec = get_best_ai_routing(task_cat)
         if rec.get("ok") and rec.get("recommendation"):
-            routing[task_cat] = {
+            yield {
+                "kind": "routing",
+                "task_category": task_cat,
                 "recommended_model": rec["recommendation"],
                 "rankings": rec["rankings"][:3]
             }
     
-    # Get specializations
-    specs = get_ai_specializations()
+    # Specializations
+    specs = get_ai_specializations().get("specializations", {})
+    for model in sorted(specs):
+        yield {"kind": "specialization", "model": model, **specs[model]}
     
-    # Get top teaching moments
+    # Top teaching moments
     teaching_pids = _TYPE_INDEX.get(PatternType.AI_TEACHING, [])
     teaching_patterns = sorted(
         [_PATTERN_INDEX[pid] for pid in teaching_pids if pid in _PATTERN_INDEX],
@@ -862,20 +864,42 @@ def export_for_ai_family() -> Dict[str, Any]:
         reverse=True
     )[:20]
     
-    teachings = [
-        {
+    for rank, p in enumerate(teaching_patterns):
+        yield {
+            "kind": "teaching",
+            "rank": rank,
             "teacher": p.ai_model,
             "category": p.task_category,
             "students": p.teaching_students,
             "weight": p.weight
         }
-        for p in teaching_patterns
-    ]
+
+
+def export_for_ai_family() -> Dict[str, Any]:
+    """
+    Export hive learnings for AI Family Brain to import.
+    
+    This is the key function for propagating platform-wide learnings
+    to individual AI Family Brain instances.
+    """
+    
+    routing = {}
+    specializations = {}
+    teachings = []
+    for record in _iter_ai_family_records():
+        kind = record.pop("kind")
+        if kind == "routing":
+            routing[record.pop("task_category")] = record
+        elif kind == "specialization":
+            specializations[record.pop("model")] = record
+        else:
+            record.pop("rank")
+            teachings.append(record)
     
     return {
         "ok": True,
         "routing_recommendations": routing,
-        "specializations": specs.get("specializations", {}),
+        "specializations": specializations,
         "teaching_patterns": teachings,
         "total_ai_patterns": sum(len(pids) for pids in _AI_MODEL_PATTERNS.values()),
         "exported_at": _now()
@@ -923,6 +947,130 @@ def import_from_ai_family(data: Dict[str, Any]) -> Dict[str, Any]:
     return {"ok": True, "imported": imported}
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# BULK NDJSON EXPORT/IMPORT (instance-to-instance migration, see ndjson_stream)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def iter_hive_ndjson(after: Optional[str] = None, pattern_type: str = None) -> Iterator[bytes]:
+    """
+    Stream the hive as NDJSON in key order: contributor stats
+    ("contributor:<name>") then patterns ("pattern:<id>"), one per line.
+
+    after= resumes past a key (an import's cursor). pattern_type limits the
+    export to patterns of that type.
+    """
+    from ndjson_stream import dumps_line, header
+
+    yield header(NDJSON_FORMAT, patterns=len(_HIVE_PATTERNS), after=after)
+    
+    if pattern_type is None:
+        for name in sorted(_CONTRIBUTOR_STATS):
+            if after is None or f"contributor:{name}" > after:
+                yield dumps_line({"kind": "contributor", "contributor": name, "stats": _CONTRIBUTOR_STATS[name]})
+    
+    for pid in sorted(_PATTERN_INDEX):
+        if after is not None and f"pattern:{pid}" <= after:
+            continue
+        pattern = _PATTERN_INDEX.get(pid)
+        if pattern is None:
+            continue
+        record = pattern.to_dict()
+        if pattern_type is None or record["pattern_type"] == pattern_type:
+            yield dumps_line({"kind": "pattern", **record})
+
+
+def iter_ai_family_ndjson() -> Iterator[bytes]:
+    """export_for_ai_family() as NDJSON, one routing/specialization/teaching record per line"""
+    from ndjson_stream import dumps_line, header
+
+    yield header(AI_FAMILY_NDJSON_FORMAT,
+                 total_ai_patterns=sum(len(pids) for pids in _AI_MODEL_PATTERNS.values()))
+    for record in _iter_ai_family_records():
+        yield dumps_line(record)
+
+
+def _parse_hive_record(record: Dict[str, Any]) -> Tuple[str, Any]:
+    """Validate one hive NDJSON record; raises ValueError/KeyError/TypeError if malformed"""
+    kind = record.get("kind")
+    if kind == "contributor":
+        name, stats = record["contributor"], record["stats"]
+        if not isinstance(name, str) or not isinstance(stats, dict):
+            raise TypeError("contributor must be a string and stats an object")
+        return f"contributor:{name}", (kind, name, stats)
+    if kind == "pattern":
+        pattern = HivePattern.from_dict(record)
+        pattern.pattern_type = PatternType(pattern.pattern_type)
+        for attr in ("context", "action", "outcome"):
+            if not isinstance(getattr(pattern, attr), dict):
+                raise TypeError(f"{attr} must be an object")
+        return f"pattern:{pattern.id}", (kind, pattern)
+    raise ValueError(f"unknown record kind {kind!r}")
+
+
+def hive_importer(cursor: Optional[str] = None, import_id: Optional[str] = None, chunk_size: int = None):
+    """
+    NDJSON importer for iter_hive_ndjson() output.
+
+    Patterns merge by id (an existing id is overwritten); a pattern whose
+    context/action duplicates a different existing pattern is dropped, as in
+    contribute_to_hive. Contributor stats merge by taking the larger value
+    per counter, so re-importing the same stream is idempotent. The hive is
+    compressed to MAX_HIVE_PATTERNS and saved after every chunk.
+    """
+    from ndjson_stream import NDJSONImporter, IMPORT_CHUNK
+
+    hashes: Dict[str, str] = {}
+
+    def apply(items: List[Tuple]):
+        if not hashes:
+            hashes.update((_content_hash(p.context, p.action), p.id) for p in _HIVE_PATTERNS)
+        reindex = False
+        
+        for item in items:
+            if item[0] == "contributor":
+                _, name, stats = item
+                current = _CONTRIBUTOR_STATS[name]
+                for k, v in stats.items():
+                    if isinstance(v, (int, float)) and not isinstance(v, bool):
+                        current[k] = max(current.get(k, 0), v)
+                continue
+            
+            pattern = item[1]
+            content_hash = _content_hash(pattern.context, pattern.action)
+            existing = _PATTERN_INDEX.get(pattern.id)
+            if existing is not None:
+                existing.__dict__.update(pattern.__dict__)
+                reindex = True
+            elif hashes.get(content_hash, pattern.id) == pattern.id:
+                _HIVE_PATTERNS.append(pattern)
+                _PATTERN_INDEX[pattern.id] = pattern
+                _TYPE_INDEX[pattern.pattern_type].append(pattern.id)
+                if pattern.ai_model:
+                    _AI_MODEL_PATTERNS[pattern.ai_model].append(pattern.id)
+                if pattern.task_category:
+                    _TASK_CATEGORY_PATTERNS[pattern.task_category].append(pattern.id)
+            else:
+                continue
+            hashes[content_hash] = pattern.id
+        
+        if len(_HIVE_PATTERNS) > MAX_HIVE_PATTERNS:
+            _compress_hive()
+            hashes.clear()
+        elif reindex:
+            _rebuild_indexes()
+        _save_metahive_state()  # persist each chunk so the returned cursor is durable
+
+    return NDJSONImporter(NDJSON_FORMAT, _parse_hive_record, apply,
+                          cursor=cursor, chunk_size=chunk_size or IMPORT_CHUNK, import_id=import_id)
+
+
+def import_hive_ndjson(lines: Iterable, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Import an NDJSON hive export from any iterable of lines (e.g. an open file)"""
+    from ndjson_stream import import_ndjson
+
+    return import_ndjson(hive_importer(cursor=cursor), lines)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # PERSISTENCE FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════════
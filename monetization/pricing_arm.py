@@ -4,12 +4,28 @@ PRICING ARM
 
 Dynamic pricing with surge, FX, wave-aware uplift, and margin guards.
 Integrates with existing pricing_oracle.py for multiplier compatibility.
+
+suggest_batch() prices many items at once with array ops (numpy when
+available) and returns exactly what suggest() returns per item.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Sequence, Union
 import math
 from datetime import datetime, timezone
 
+# Try numpy for batch pricing, fallback to per-item loop
+try:
+    import numpy as np
+    from array_rounding import round_array
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+def round_cents(values):
+    """Round an array of prices to 2 decimals exactly like Python's round(x, 2)"""
+    return round_array(values, 2)
+
 
 class PricingArm:
     """
@@ -83,6 +99,11 @@ class PricingArm:
         if dt is None:
             dt = datetime.now(timezone.utc)
 
+        return round(price * self._time_multiplier(dt), 2)
+
+    @staticmethod
+    def _time_multiplier(dt: datetime) -> float:
+        """Combined weekend and time-of-day multiplier for dt"""
         hour = dt.hour
         day_of_week = dt.weekday()
 
@@ -98,7 +119,7 @@ class PricingArm:
         elif hour < 6 or hour > 22:
             multiplier *= 0.95  # Off hours
 
-        return round(price * multiplier, 2)
+        return multiplier
 
     def floor_margin(self, price: float, cogs: float, min_margin: float = None) -> float:
         """
@@ -159,6 +180,83 @@ class PricingArm:
 
         return p
 
+    def suggest_batch(
+        self,
+        base_prices: Sequence[float],
+        *,
+        fx_rate: Union[float, Sequence[float]] = 1.0,
+        load_pct: Union[float, Sequence[float]] = 0.3,
+        wave_score: Union[float, Sequence[float]] = 0.2,
+        cogs: Union[float, Sequence[float]] = 0.0,
+        min_margin: Union[float, Sequence[float]] = 0.25,
+        apply_time: bool = False
+    ) -> List[float]:
+        """
+        Suggest prices for many items at once.
+
+        Each factor may be a scalar (shared by every item) or a sequence
+        aligned with base_prices. Results are identical to calling
+        suggest() per item.
+        """
+        n = len(base_prices)
+        if n == 0:
+            return []
+
+        if not HAS_NUMPY:
+            def at(v, i):
+                return v if isinstance(v, (int, float)) else v[i]
+            return [
+                self.suggest(
+                    base_prices[i],
+                    fx_rate=at(fx_rate, i),
+                    load_pct=at(load_pct, i),
+                    wave_score=at(wave_score, i),
+                    cogs=at(cogs, i),
+                    min_margin=at(min_margin, i),
+                    apply_time=apply_time
+                )
+                for i in range(n)
+            ]
+
+        def arr(v):
+            return np.broadcast_to(np.asarray(v, dtype=np.float64), (n,))
+
+        base = arr(base_prices)
+        fx, load, wave, cg, mm = arr(fx_rate), arr(load_pct), arr(wave_score), arr(cogs), arr(min_margin)
+
+        # 1. FX
+        p = round_cents(base * fx)
+
+        # 2. Surge (no-op at zero load)
+        threshold = self.config["surge_threshold_low"]
+        max_bump = self.config["surge_max_bump"]
+        linear = 0.2 * np.minimum(1, load / threshold)
+        excess = (load - threshold) / (1 - threshold)
+        accel = 0.2 + (max_bump - 0.2) * np.minimum(1, excess)
+        bump = np.where(load <= threshold, linear, accel)
+        p = np.where(load <= 0, p, round_cents(p * (1 + bump)))
+
+        # 3. Wave
+        score = np.maximum(0, np.minimum(1, wave))
+        p = round_cents(p * (1 + self.config["wave_max_uplift"] * score))
+
+        # 4. Time (one timestamp for the whole batch)
+        if apply_time:
+            p = round_cents(p * self._time_multiplier(datetime.now(timezone.utc)))
+
+        # 5. Margin floor
+        applies = (cg > 0) & (mm < 1)
+        safe_den = np.where(applies, 1 - mm, 1.0)
+        floor_price = round_cents(np.where(applies, cg / safe_den, 0.0))
+        p = np.where(applies, np.maximum(p, floor_price), p)
+
+        # 6. Bounds
+        lo = base * self.config["price_floor_pct"]
+        hi = base * self.config["price_ceiling_pct"]
+        p = round_cents(np.maximum(lo, np.minimum(hi, p)))
+
+        return p.tolist()
+
     def explain(
         self,
         base_price: float,
@@ -254,3 +352,8 @@ def suggest(
 def get_pricing_arm() -> PricingArm:
     """Get the default pricing arm instance"""
     return _default_arm
+
+
+def suggest_batch(base_prices: Sequence[float], **kwargs) -> List[float]:
+    """Suggest prices for many items using default arm"""
+    return _default_arm.suggest_batch(base_prices, **kwargs)
@@ -0,0 +1,281 @@
+"""
+═══════════════════════════════════════════════════════════════════════════════
+NDJSON STREAM - Chunked bulk export/import for the learning stores
+═══════════════════════════════════════════════════════════════════════════════
+
+Moves Yield Memory / MetaHive data between instances one record per line
+instead of one JSON document, so memory stays flat however large the store.
+
+FORMAT:
+    {"format": "yield_memory", "version": 1, "exported_at": ...}   <- header
+    {"username": "alice", "patterns": [...], ...}                    <- records
+    ...
+
+Every record has a key (username, pattern id, ...) and exports are written
+in ascending key order. Imports are validated and applied in chunks; after
+each chunk the importer's cursor is the last applied key. Re-posting the
+same export with cursor=<cursor> (or exporting with after=<cursor>) resumes
+where an interrupted import stopped.
+
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+FORMAT_VERSION = 1
+
+IMPORT_CHUNK = 500                  # Records validated + applied per chunk
+STREAM_CHUNK = 200                  # Lines per StreamingResponse write
+MAX_LINE_BYTES = 16 * 1024 * 1024   # Reject a single record larger than this
+MAX_ERRORS = 100                    # Invalid records reported back per import
+MAX_TRACKED_IMPORTS = 100           # Import progress kept for resumption
+
+_PROGRESS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def dumps_line(obj: Any) -> bytes:
+    """One NDJSON line (compact JSON + newline)"""
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits
+    return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+
+
+def loads_line(line: bytes) -> Any:
+    """Parse one NDJSON line"""
+    return orjson.loads(line) if HAS_ORJSON else json.loads(line)
+
+
+def header(fmt: str, **extra: Any) -> bytes:
+    """Header line identifying the export format"""
+    from datetime import datetime, timezone
+    return dumps_line({"format": fmt, "version": FORMAT_VERSION,
+                       "exported_at": datetime.now(timezone.utc).isoformat() + "Z", **extra})
+
+
+async def stream_ndjson(lines: Iterable[bytes], lines_per_chunk: int = STREAM_CHUNK) -> AsyncIterator[bytes]:
+    """
+    Adapt an export generator for StreamingResponse.
+
+    Runs on the event loop (the stores are plain module dicts, not thread
+    safe) and yields control between chunks so a large export never
+    starves other requests.
+    """
+    batch: List[bytes] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= lines_per_chunk:
+            yield b"".join(batch)
+            batch = []
+            await asyncio.sleep(0)
+    if batch:
+        yield b"".join(batch)
+
+
+async def aiter_lines(chunks: AsyncIterable[bytes], max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[bytes]:
+    """Split an async byte stream (e.g. request.stream()) into lines"""
+    buffer = b""
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        if b"\n" not in chunk:
+            if len(buffer) > max_line_bytes:
+                raise ValueError(f"line exceeds {max_line_bytes} bytes")
+            continue
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# IMPORT
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class NDJSONImporter:
+    """
+    Chunked, cursor-resumable NDJSON import.
+
+    parse(record) -> (key, item) validates one record and raises ValueError /
+    KeyError / TypeError if it is invalid; it may return item None for
+    records that carry nothing to import. apply(items) commits one chunk of
+    valid items (plain or async). Records with key <= the starting cursor
+    were applied by an earlier attempt and are skipped.
+    """
+
+    def __init__(
+        self,
+        fmt: str,
+        parse: Callable[[Dict[str, Any]], Tuple[str, Any]],
+        apply: Callable[[List[Any]], Any],
+        cursor: Optional[str] = None,
+        chunk_size: int = IMPORT_CHUNK,
+        import_id: Optional[str] = None,
+    ):
+        self.fmt = fmt
+        self.parse = parse
+        self.apply = apply
+        self.resume_from = cursor or None
+        self.cursor = cursor or None
+        self.chunk_size = max(1, chunk_size)
+        self.import_id = import_id
+        self.pending: List[Tuple[str, Any]] = []
+        self.lines = 0
+        self.imported = 0
+        self.skipped = 0
+        self.invalid = 0
+        self.chunks = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.fatal: Optional[str] = None
+
+    def _error(self, message: str):
+        self.invalid += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"line": self.lines, "error": message})
+
+    def feed(self, line) -> bool:
+        """Validate one line; True once a chunk is ready to commit"""
+        self.lines += 1
+        if isinstance(line, str):
+            line = line.encode("utf-8")
+        line = line.strip()
+        if not line:
+            return False
+        try:
+            record = loads_line(line)
+        except ValueError as e:
+            self._error(f"invalid json: {e}")
+            return False
+        if not isinstance(record, dict):
+            self._error("record is not an object")
+            return False
+        if "format" in record:
+            if record["format"] != self.fmt:
+                self.fatal = f"expected format {self.fmt!r}, got {record['format']!r}"
+                raise ValueError(self.fatal)
+            return False
+        try:
+            key, item = self.parse(record)
+        except (ValueError, KeyError, TypeError) as e:
+            self._error(f"{type(e).__name__}: {e}")
+            return False
+        if self.resume_from is not None and key <= self.resume_from:
+            self.skipped += 1
+            return False
+        self.pending.append((key, item))
+        return len(self.pending) >= self.chunk_size
+
+    def _take(self) -> Tuple[List[Any], Optional[str]]:
+        chunk, self.pending = self.pending, []
+        items = [item for _, item in chunk if item is not None]
+        self.skipped += len(chunk) - len(items)
+        return items, (max(key for key, _ in chunk) if chunk else None)
+
+    def _committed(self, applied: int, last_key: Optional[str]):
+        self.imported += applied
+        self.chunks += 1
+        if last_key is not None and (self.cursor is None or last_key > self.cursor):
+            self.cursor = last_key
+        self._track()
+
+    def commit(self):
+        """Apply the pending chunk (synchronous apply only)"""
+        items, last_key = self._take()
+        if items:
+            result = self.apply(items)
+            if inspect.isawaitable(result):
+                raise TypeError("apply is async; use acommit()")
+        self._committed(len(items), last_key)
+
+    async def acommit(self):
+        """Apply the pending chunk, awaiting an async apply"""
+        items, last_key = self._take()
+        if items:
+            result = self.apply(items)
+            if inspect.isawaitable(result):
+                await result
+        self._committed(len(items), last_key)
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "ok": self.fatal is None,
+            "format": self.fmt,
+            "import_id": self.import_id,
+            "cursor": self.cursor,
+            "lines": self.lines,
+            "imported": self.imported,
+            "skipped": self.skipped,
+            "invalid": self.invalid,
+            "chunks": self.chunks,
+            "errors": self.errors,
+            **({"error": self.fatal} if self.fatal else {}),
+        }
+
+    def _track(self):
+        if not self.import_id:
+            return
+        _PROGRESS[self.import_id] = self.result()
+        _PROGRESS.move_to_end(self.import_id)
+        while len(_PROGRESS) > MAX_TRACKED_IMPORTS:
+            _PROGRESS.popitem(last=False)
+
+
+def import_ndjson(importer: NDJSONImporter, lines: Iterable) -> Dict[str, Any]:
+    """Run an importer over an iterable of lines (file object, list, generator)"""
+    try:
+        for line in lines:
+            if importer.feed(line):
+                importer.commit()
+        importer.commit()
+    except Exception as e:
+        importer.fatal = importer.fatal or str(e)
+        importer._track()
+        logger.warning(f"NDJSON import ({importer.fmt}) stopped at cursor {importer.cursor}: {e}")
+    return importer.result()
+
+
+async def aimport_ndjson(importer: NDJSONImporter, chunks: AsyncIterable[bytes]) -> Dict[str, Any]:
+    """
+    Run an importer over an async byte stream (e.g. request.stream()).
+
+    A dropped connection or a fatal error still leaves every committed chunk
+    applied; the result (and get_import_progress(import_id)) carries the
+    cursor to resume from.
+    """
+    try:
+        async for line in aiter_lines(chunks):
+            if importer.feed(line):
+                await importer.acommit()
+                await asyncio.sleep(0)
+        await importer.acommit()
+    except Exception as e:
+        importer.fatal = importer.fatal or str(e) or type(e).__name__
+        importer._track()
+        logger.warning(f"NDJSON import ({importer.fmt}) stopped at cursor {importer.cursor}: {e!r}")
+    return importer.result()
+
+
+def get_import_progress(import_id: str) -> Dict[str, Any]:
+    """Last committed state of a tracked import (for resuming after a disconnect)"""
+    progress = _PROGRESS.get(import_id)
+    if progress is None:
+        return {"ok": False, "error": "unknown_import_id", "import_id": import_id}
+    return progress
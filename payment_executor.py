@@ -0,0 +1,324 @@
+"""
+AiGentsy Payment Executor
+Bounded-concurrency runner for batch payouts and Stripe operations
+
+Month-end batches (payouts, escrow releases, retries) used to run one item
+at a time, and every Stripe call blocked on the previous one. PaymentExecutor
+runs a batch with up to `concurrency` items in flight:
+
+- every item gets a deterministic idempotency key (batch id + position +
+  item hash) that the operation passes to Stripe, so a retried or resumed
+  request is deduplicated instead of charged twice
+- Stripe-bound operations are paced through one token bucket
+  (STRIPE_MAX_RPS, shared by every worker and batch); a 429 pauses the
+  bucket for the backoff delay before the item is retried
+- successful items are appended to data/payment_batches/<batch_id>.jsonl
+  when checkpointing is on, and re-running the batch skips them
+- results stream out as they complete (stream()), and run() folds them
+  into the batch summary as they arrive
+
+Operations are `async def op(item, idempotency_key) -> {"ok": ...}`. A
+failed result marked "retryable" (or "rate_limited") is retried up to
+PAYMENT_MAX_RETRIES times; exceptions are caught and reported as failures.
+Blocking SDK calls go through run_blocking(), a thread pool sized for
+STRIPE_THREADS requests in flight (the default asyncio pool is capped at
+cpu_count + 4 threads).
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent / "data"
+CHECKPOINT_DIR = DATA_DIR / "payment_batches"
+
+PAYMENT_CONCURRENCY = int(os.getenv("PAYMENT_CONCURRENCY", "8"))
+STRIPE_MAX_RPS = float(os.getenv("STRIPE_MAX_RPS", "25"))   # Stripe test mode allows 25/s, live 100/s
+PAYMENT_MAX_RETRIES = 4
+PAYMENT_RETRY_BASE = 0.5            # Seconds; doubled per attempt, plus jitter
+STRIPE_THREADS = int(os.getenv("STRIPE_THREADS", "32"))
+
+Operation = Callable[[Any, str], Awaitable[Dict[str, Any]]]
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+_stripe_pool: Optional[ThreadPoolExecutor] = None
+
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking call (Stripe SDK) on the payment thread pool"""
+    global _stripe_pool
+    if _stripe_pool is None:
+        _stripe_pool = ThreadPoolExecutor(max_workers=STRIPE_THREADS, thread_name_prefix="stripe")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_stripe_pool, functools.partial(fn, *args, **kwargs))
+
+
+def idempotency_key(batch_id: str, index: int, item: Any) -> str:
+    """Stable key for one batch item: the same batch re-run yields the same keys"""
+    digest = hashlib.sha1(json.dumps(item, sort_keys=True, default=str).encode()).hexdigest()[:12]
+    return f"{batch_id}:{index}:{digest}"
+
+
+def exception_result(e: Exception) -> Dict[str, Any]:
+    """Failure result for an exception (Stripe errors included), flagged so the executor knows what to retry"""
+    status = getattr(e, "http_status", None) or 0
+    kinds = {cls.__name__ for cls in type(e).__mro__}
+    rate_limited = status == 429 or "RateLimitError" in kinds
+    return {
+        "ok": False,
+        "error": str(e) or type(e).__name__,
+        "rate_limited": rate_limited,
+        "retryable": rate_limited or status >= 500 or "APIConnectionError" in kinds,
+    }
+
+
+class RatePacer:
+    """Token bucket shared by all workers: `rate` requests/sec, bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds` (after a 429) and drop the burst"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+        # Refill from the end of the pause, not from the last acquire
+        self._updated = self._paused_until
+
+
+class BatchCheckpoint:
+    """Append-only record of the items of one batch that already succeeded"""
+
+    def __init__(self, checkpoint_dir: Path, batch_id: str):
+        self.path = Path(checkpoint_dir) / f"{batch_id}.jsonl"
+        self._fh = None
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        done: Dict[str, Dict[str, Any]] = {}
+        if not self.path.exists():
+            return done
+        with open(self.path, "r") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break   # Torn last line from a crash mid-write
+                done[record["key"]] = record["result"]
+        return done
+
+    def record(self, key: str, result: Dict[str, Any]):
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "a")
+        self._fh.write(json.dumps({"key": key, "result": result, "at": _now()}, default=str) + "\n")
+        self._fh.flush()
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+class PaymentExecutor:
+    """Runs batch operations with bounded concurrency, pacing and checkpoints"""
+
+    def __init__(
+        self,
+        concurrency: int = PAYMENT_CONCURRENCY,
+        rate: Optional[float] = STRIPE_MAX_RPS,
+        checkpoint_dir: Path = CHECKPOINT_DIR,
+        max_retries: int = PAYMENT_MAX_RETRIES,
+        retry_base: float = PAYMENT_RETRY_BASE
+    ):
+        self.concurrency = max(1, concurrency)
+        self.pacer = RatePacer(rate) if rate else None
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.last_batch: Optional[Dict[str, Any]] = None
+        self.stats = {
+            "batches": 0,
+            "items": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "resumed": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "busy_seconds": 0.0,
+        }
+
+    async def _attempt(self, op: Operation, item: Any, key: str, paced: bool) -> Dict[str, Any]:
+        attempt = 0
+        while True:
+            if paced and self.pacer:
+                await self.pacer.acquire()
+            try:
+                result = await op(item, key)
+            except Exception as e:
+                result = exception_result(e)
+            if result.get("ok") or not result.get("retryable") or attempt >= self.max_retries:
+                return result
+            delay = float(result.get("retry_after") or self.retry_base * 2 ** attempt)
+            if result.get("rate_limited"):
+                self.stats["rate_limited"] += 1
+                if paced and self.pacer:
+                    self.pacer.pause(delay)
+            self.stats["retries"] += 1
+            attempt += 1
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+    async def stream(
+        self,
+        batch_id: str,
+        items: List[Any],
+        op: Operation,
+        paced: bool = True,
+        checkpoint: bool = False,
+        key_fn: Callable[[str, int, Any], str] = idempotency_key
+    ) -> AsyncIterator[Tuple[int, Any, Dict[str, Any]]]:
+        """
+        Yield (index, item, result) as items complete (checkpointed ones first)
+
+        paced: take a token from the Stripe bucket before every attempt
+        checkpoint: record successes and skip the ones already recorded
+        """
+        keys = [key_fn(batch_id, i, item) for i, item in enumerate(items)]
+        ckpt = BatchCheckpoint(self.checkpoint_dir, batch_id) if checkpoint else None
+        done = ckpt.load() if ckpt else {}
+
+        pending = []
+        for i, key in enumerate(keys):
+            if key in done:
+                self.stats["resumed"] += 1
+                yield i, items[i], {**done[key], "resumed": True}
+            else:
+                pending.append(i)
+
+        out: asyncio.Queue = asyncio.Queue()
+        queue = iter(pending)
+
+        async def worker():
+            try:
+                for i in queue:
+                    result = await self._attempt(op, items[i], keys[i], paced)
+                    result.setdefault("idempotency_key", keys[i])
+                    if ckpt and result.get("ok"):
+                        ckpt.record(keys[i], result)
+                    await out.put((i, items[i], result))
+            except Exception as e:
+                await out.put((None, None, e))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(pending)))]
+        try:
+            for _ in range(len(pending)):
+                i, item, result = await out.get()
+                if i is None:
+                    raise result
+                yield i, item, result
+        finally:
+            for w in workers:
+                w.cancel()
+            if ckpt:
+                ckpt.close()
+
+    async def run(
+        self,
+        batch_id: str,
+        items: List[Any],
+        op: Operation,
+        paced: bool = True,
+        checkpoint: bool = False,
+        key_fn: Callable[[str, int, Any], str] = idempotency_key,
+        keep_results: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run a whole batch; counts are folded in as results stream in
+
+        results come back in item order (or are dropped with keep_results=False
+        for batches only the totals are wanted from).
+        """
+        started = time.perf_counter()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items) if keep_results else []
+        successful = failed = resumed = 0
+        async for i, _, result in self.stream(batch_id, items, op, paced, checkpoint, key_fn):
+            if result.get("ok"):
+                successful += 1
+                resumed += bool(result.get("resumed"))
+            else:
+                failed += 1
+            if keep_results:
+                results[i] = result
+        elapsed = time.perf_counter() - started
+
+        self.stats["batches"] += 1
+        self.stats["items"] += len(items)
+        self.stats["succeeded"] += successful - resumed
+        self.stats["failed"] += failed
+        self.stats["busy_seconds"] += elapsed
+        summary = {
+            "batch_id": batch_id,
+            "total": len(items),
+            "successful": successful,
+            "failed": failed,
+            "resumed": resumed,
+            "elapsed_seconds": round(elapsed, 3),
+            "items_per_second": round((len(items) - resumed) / elapsed, 1) if elapsed > 0 else None,
+            "completed_at": _now(),
+        }
+        self.last_batch = summary
+        return {**summary, "results": results}
+
+    def get_stats(self) -> Dict[str, Any]:
+        busy = self.stats["busy_seconds"]
+        return {
+            **self.stats,
+            "busy_seconds": round(busy, 3),
+            "items_per_second": round((self.stats["succeeded"] + self.stats["failed"]) / busy, 1) if busy else None,
+            "concurrency": self.concurrency,
+            "max_rps": self.pacer.rate if self.pacer else None,
+            "last_batch": self.last_batch,
+        }
+
+
+_executor: Optional[PaymentExecutor] = None
+
+
+def get_payment_executor() -> PaymentExecutor:
+    """Get singleton payment executor (one Stripe rate budget per process)"""
+    global _executor
+    if _executor is None:
+        _executor = PaymentExecutor()
+    return _executor
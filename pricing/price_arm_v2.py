@@ -21,6 +21,14 @@ import math
 import random
 import logging
 
+# Try numpy for batch quoting, fallback to per-item loop
+try:
+    import numpy as np
+    from monetization.pricing_arm import round_cents
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 logger = logging.getLogger("price_arm_v2")
 
 
@@ -126,43 +134,8 @@ class PriceArmV2:
         """
         risk_data = risk_data or {}
 
-        # Extract signals
-        segment = self._detect_segment(opportunity)
-        platform = opportunity.get("platform", "unknown").lower()
-        urgency = opportunity.get("urgency", "normal").lower()
-        description = opportunity.get("description", "")
-
-        # Get base multipliers
-        seg_config = SEGMENT_PRICING.get(segment, SEGMENT_PRICING["startup"])
-        platform_config = PLATFORM_PRICING.get(platform, {"ceiling_mult": 1.3, "floor_mult": 0.5})
-
-        # Calculate adjustments
-        adjustments = {}
-
-        # 1. Segment adjustment
-        segment_mult = seg_config["multiplier"]
-        adjustments["segment"] = segment_mult
-
-        # 2. Urgency adjustment
-        urgency_mult = URGENCY_ADJUSTMENTS.get(urgency, 1.0)
-        adjustments["urgency"] = urgency_mult
-
-        # 3. Platform adjustment (normalize to platform norms)
-        platform_mid = (platform_config["ceiling_mult"] + platform_config["floor_mult"]) / 2
-        adjustments["platform"] = platform_mid
-
-        # 4. Complexity adjustment (from description length)
-        complexity_mult = self._estimate_complexity(description)
-        adjustments["complexity"] = complexity_mult
-
-        # 5. Demand adjustment (time-of-day, day-of-week)
-        demand_mult = self._demand_multiplier()
-        adjustments["demand"] = demand_mult
-
-        # 6. Risk adjustment
-        risk_score = risk_data.get("overall_risk", 0.3)
-        risk_mult = 1.0 + (risk_score * 0.3)  # Up to 30% premium for risky opps
-        adjustments["risk"] = risk_mult
+        segment, platform, urgency, seg_config, platform_config, adjustments = \
+            self._quote_inputs(opportunity, risk_data, self._demand_multiplier())
 
         # Calculate target price
         combined_mult = 1.0
@@ -193,33 +166,157 @@ class PriceArmV2:
             guardrails_applied.append(f"platform_ceiling ({platform})")
 
         # Calculate price range
-        elasticity = seg_config["elasticity"]
         min_price = target_price * seg_config["floor_pct"]
         max_price = target_price * 1.2
 
         # Ensure min doesn't go below cost
         min_price = max(min_price, estimated_cost * (1 + self.min_margin * 0.5))
 
+        result = self._quote_result(
+            base_value, segment, platform, urgency, seg_config, adjustments, combined_mult,
+            round(target_price, 2), round(min_price, 2), round(max_price, 2), guardrails_applied
+        )
+
+        logger.info(f"Price quote: ${result['target_price']:.0f} (range: ${result['min_price']:.0f}-${result['max_price']:.0f})")
+
+        return result
+
+    def quote_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Generate pricing quotes for many opportunities at once.
+
+        Each item is {"opportunity", "base_value", "risk_data"}. Signal
+        extraction stays per item; the multiplier product, guardrails and
+        price range run as array ops when numpy is available. Results
+        match quote() per item.
+        """
+        if not items:
+            return []
+
+        if not HAS_NUMPY:
+            return [
+                self.quote(i["opportunity"], i["base_value"], i.get("risk_data"))
+                for i in items
+            ]
+
+        demand_mult = self._demand_multiplier()
+        inputs = [
+            self._quote_inputs(i["opportunity"], i.get("risk_data") or {}, demand_mult)
+            for i in items
+        ]
+        n = len(items)
+
+        base = np.asarray([i["base_value"] for i in items], dtype=np.float64)
+        combined = np.ones(n)
+        for name in ("segment", "urgency", "platform", "complexity", "demand", "risk"):
+            combined = combined * np.asarray([x[5][name] for x in inputs], dtype=np.float64)
+        target = base * combined
+
+        refund_capped = self._refund_rate > self.max_refund_rate
+        if refund_capped:
+            target = target * 0.9
+
+        estimated_cost = base * 0.6
+        margin_floor = estimated_cost * (1 + self.min_margin)
+        margin_hit = target < margin_floor
+        target = np.where(margin_hit, margin_floor, target)
+
+        ceiling = base * np.asarray([x[4]["ceiling_mult"] for x in inputs], dtype=np.float64)
+        ceiling_hit = target > ceiling
+        target = np.where(ceiling_hit, ceiling, target)
+
+        floor_pct = np.asarray([x[3]["floor_pct"] for x in inputs], dtype=np.float64)
+        min_price = np.maximum(target * floor_pct, estimated_cost * (1 + self.min_margin * 0.5))
+        max_price = target * 1.2
+
+        combined_l = combined.tolist()
+        target_l = round_cents(target).tolist()
+        min_l = round_cents(min_price).tolist()
+        max_l = round_cents(max_price).tolist()
+        margin_l = margin_hit.tolist()
+        ceiling_l = ceiling_hit.tolist()
+
+        results = []
+        for k, (segment, platform, urgency, seg_config, _, adjustments) in enumerate(inputs):
+            guardrails_applied = []
+            if refund_capped:
+                guardrails_applied.append(f"refund_rate_ceiling ({self._refund_rate:.2%})")
+            if margin_l[k]:
+                guardrails_applied.append(f"min_margin ({self.min_margin:.0%})")
+            if ceiling_l[k]:
+                guardrails_applied.append(f"platform_ceiling ({platform})")
+            results.append(self._quote_result(
+                items[k]["base_value"], segment, platform, urgency, seg_config, adjustments,
+                combined_l[k], target_l[k], min_l[k], max_l[k], guardrails_applied
+            ))
+
+        logger.info(f"Price quote batch: {n} quotes")
+        return results
+
+    def _quote_inputs(self, opportunity: Dict[str, Any], risk_data: Dict[str, Any],
+                      demand_mult: float) -> tuple:
+        """Extract signals and per-factor multipliers for one opportunity"""
+        # Extract signals
+        segment = self._detect_segment(opportunity)
+        platform = opportunity.get("platform", "unknown").lower()
+        urgency = opportunity.get("urgency", "normal").lower()
+        description = opportunity.get("description", "")
+
+        # Get base multipliers
+        seg_config = SEGMENT_PRICING.get(segment, SEGMENT_PRICING["startup"])
+        platform_config = PLATFORM_PRICING.get(platform, {"ceiling_mult": 1.3, "floor_mult": 0.5})
+
+        # Calculate adjustments
+        adjustments = {}
+
+        # 1. Segment adjustment
+        adjustments["segment"] = seg_config["multiplier"]
+
+        # 2. Urgency adjustment
+        adjustments["urgency"] = URGENCY_ADJUSTMENTS.get(urgency, 1.0)
+
+        # 3. Platform adjustment (normalize to platform norms)
+        adjustments["platform"] = (platform_config["ceiling_mult"] + platform_config["floor_mult"]) / 2
+
+        # 4. Complexity adjustment (from description length)
+        adjustments["complexity"] = self._estimate_complexity(description)
+
+        # 5. Demand adjustment (time-of-day, day-of-week)
+        adjustments["demand"] = demand_mult
+
+        # 6. Risk adjustment
+        risk_score = risk_data.get("overall_risk", 0.3)
+        adjustments["risk"] = 1.0 + (risk_score * 0.3)  # Up to 30% premium for risky opps
+
+        return segment, platform, urgency, seg_config, platform_config, adjustments
+
+    def _quote_result(self, base_value: float, segment: str, platform: str, urgency: str,
+                      seg_config: Dict[str, Any], adjustments: Dict[str, float],
+                      combined_mult: float, target_price: float, min_price: float,
+                      max_price: float, guardrails_applied: List[str]) -> Dict[str, Any]:
+        """Build the quote response from rounded prices"""
+        elasticity = seg_config["elasticity"]
+
         # Determine strategy
         strategy = self._select_strategy(segment, platform, elasticity)
 
         # Build reasoning
         reasoning = [
             f"base=${base_value:.0f}",
-            f"segment={segment} ({segment_mult:.2f}x)",
-            f"urgency={urgency} ({urgency_mult:.2f}x)",
-            f"platform={platform} ({platform_mid:.2f}x)",
-            f"complexity={complexity_mult:.2f}x",
-            f"demand={demand_mult:.2f}x",
-            f"risk={risk_mult:.2f}x",
+            f"segment={segment} ({adjustments['segment']:.2f}x)",
+            f"urgency={urgency} ({adjustments['urgency']:.2f}x)",
+            f"platform={platform} ({adjustments['platform']:.2f}x)",
+            f"complexity={adjustments['complexity']:.2f}x",
+            f"demand={adjustments['demand']:.2f}x",
+            f"risk={adjustments['risk']:.2f}x",
             f"combined={combined_mult:.2f}x",
             f"strategy={strategy.value}"
         ]
 
         quote = PricingQuote(
-            target_price=round(target_price, 2),
-            min_price=round(min_price, 2),
-            max_price=round(max_price, 2),
+            target_price=target_price,
+            min_price=min_price,
+            max_price=max_price,
             strategy=strategy,
             elasticity=elasticity,
             confidence=self._calculate_confidence(segment),
@@ -228,8 +325,6 @@ class PriceArmV2:
             reasoning=reasoning
         )
 
-        logger.info(f"Price quote: ${quote.target_price:.0f} (range: ${quote.min_price:.0f}-${quote.max_price:.0f})")
-
         return {
             "target_price": quote.target_price,
             "min_price": quote.min_price,
@@ -474,3 +569,8 @@ def quote_price(opportunity: Dict[str, Any], base_value: float,
                 risk_data: Dict[str, Any] = None) -> Dict[str, Any]:
     """Convenience function to get price quote"""
     return get_price_arm().quote(opportunity, base_value, risk_data)
+
+
+def quote_price_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convenience function to quote many opportunities at once"""
+    return get_price_arm().quote_batch(items)
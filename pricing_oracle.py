@@ -1,7 +1,16 @@
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
+import asyncio
 import httpx
 
+# Try numpy for batch pricing, fallback to per-item loop
+try:
+    import numpy as np
+    from monetization.pricing_arm import round_cents
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 def now_iso():
     return datetime.now(timezone.utc).isoformat() + "Z"
 
@@ -18,6 +27,41 @@ async def calculate_dynamic_price(
     # Get agent's current load
     agent_data = await _get_agent_data(agent)
     
+    past_purchases = 0
+    buyer = context.get("buyer")
+    if buyer:
+        past_purchases = await _get_past_purchases(agent, buyer)
+    
+    factors = _price_factors(base_price, agent_data, context, past_purchases, datetime.now(timezone.utc))
+    
+    # CALCULATE FINAL PRICE
+    final_multiplier = (
+        factors["demand"] *
+        factors["capacity"] *
+        factors["time"] *
+        factors["loyalty"] *
+        factors["competition"]
+    )
+    
+    final_price = round(base_price * final_multiplier, 2)
+    
+    # Floor and ceiling
+    min_price = base_price * 0.75
+    max_price = base_price * 2.0
+    final_price = max(min_price, min(max_price, final_price))
+    
+    return _price_result(base_price, final_price, final_multiplier, factors)
+
+
+def _price_factors(
+    base_price: float,
+    agent_data: Dict[str, Any],
+    context: Dict[str, Any],
+    past_purchases: int,
+    now: datetime
+) -> Dict[str, float]:
+    """Compute the five pricing multipliers for one quote"""
+    
     # Initialize multipliers
     demand_multiplier = 1.0
     capacity_multiplier = 1.0
@@ -42,8 +86,8 @@ async def calculate_dynamic_price(
         capacity_multiplier = 1.15
     
     # TIME MULTIPLIER (0.9 - 1.2x)
-    hour = datetime.now(timezone.utc).hour
-    day_of_week = datetime.now(timezone.utc).weekday()
+    hour = now.hour
+    day_of_week = now.weekday()
     
     # Weekends: slight premium
     if day_of_week >= 5:
@@ -58,9 +102,7 @@ async def calculate_dynamic_price(
         time_multiplier = 1.05
     
     # LOYALTY MULTIPLIER (0.85 - 1.0x)
-    buyer = context.get("buyer")
-    if buyer:
-        past_purchases = await _get_past_purchases(agent, buyer)
+    if context.get("buyer"):
         if past_purchases >= 5:
             loyalty_multiplier = 0.85
         elif past_purchases >= 3:
@@ -77,39 +119,106 @@ async def calculate_dynamic_price(
         elif avg_competitor_price > base_price:
             competition_multiplier = 1.05
     
-    # CALCULATE FINAL PRICE
-    final_multiplier = (
-        demand_multiplier *
-        capacity_multiplier *
-        time_multiplier *
-        loyalty_multiplier *
-        competition_multiplier
-    )
-    
-    final_price = round(base_price * final_multiplier, 2)
-    
-    # Floor and ceiling
-    min_price = base_price * 0.75
-    max_price = base_price * 2.0
-    final_price = max(min_price, min(max_price, final_price))
-    
+    return {
+        "demand": demand_multiplier,
+        "capacity": capacity_multiplier,
+        "time": time_multiplier,
+        "loyalty": loyalty_multiplier,
+        "competition": competition_multiplier
+    }
+
+
+def _price_result(
+    base_price: float,
+    final_price: float,
+    final_multiplier: float,
+    factors: Dict[str, float]
+) -> Dict[str, Any]:
+    """Build the quote response for one item"""
     return {
         "ok": True,
         "base_price": base_price,
         "final_price": final_price,
         "multiplier": round(final_multiplier, 2),
         "factors": {
-            "demand": round(demand_multiplier, 2),
-            "capacity": round(capacity_multiplier, 2),
-            "time": round(time_multiplier, 2),
-            "loyalty": round(loyalty_multiplier, 2),
-            "competition": round(competition_multiplier, 2)
+            "demand": round(factors["demand"], 2),
+            "capacity": round(factors["capacity"], 2),
+            "time": round(factors["time"], 2),
+            "loyalty": round(factors["loyalty"], 2),
+            "competition": round(factors["competition"], 2)
         },
         "savings": round(base_price - final_price, 2) if final_price < base_price else 0,
         "premium": round(final_price - base_price, 2) if final_price > base_price else 0
     }
 
 
+async def price_batch(
+    items: List[Dict[str, Any]],
+    max_concurrency: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Price many items at once.
+    
+    Each item is {"base_price", "agent", "context"}. Agent lookups are
+    deduplicated (one fetch per agent, shared by the loyalty check) and
+    the final multiplier/floor/ceiling math runs as array ops when numpy
+    is available. Results match calculate_dynamic_price() per item.
+    """
+    if not items:
+        return []
+    
+    # One fetch per distinct agent over a shared client
+    agents = list({item["agent"] for item in items})
+    sem = asyncio.Semaphore(max_concurrency)
+    async with httpx.AsyncClient(timeout=10) as client:
+        async def fetch(agent: str) -> Dict[str, Any]:
+            async with sem:
+                return await _get_agent_data(agent, client=client)
+        fetched = await asyncio.gather(*(fetch(a) for a in agents))
+    agent_data = dict(zip(agents, fetched))
+    
+    # Past purchases per (agent, buyer), computed from the fetched records
+    purchases: Dict[tuple, int] = {}
+    now = datetime.now(timezone.utc)
+    bases: List[float] = []
+    all_factors: List[Dict[str, float]] = []
+    for item in items:
+        agent = item["agent"]
+        context = item.get("context") or {}
+        buyer = context.get("buyer")
+        past = 0
+        if buyer:
+            key = (agent, buyer)
+            if key not in purchases:
+                purchases[key] = _count_paid_purchases(agent_data[agent], buyer)
+            past = purchases[key]
+        base_price = item["base_price"]
+        bases.append(base_price)
+        all_factors.append(_price_factors(base_price, agent_data[agent], context, past, now))
+    
+    if HAS_NUMPY:
+        base = np.asarray(bases, dtype=np.float64)
+        # Same left-to-right product order as the scalar path
+        mult = np.asarray([f["demand"] for f in all_factors], dtype=np.float64)
+        for name in ("capacity", "time", "loyalty", "competition"):
+            mult = mult * np.asarray([f[name] for f in all_factors], dtype=np.float64)
+        final = round_cents(base * mult)
+        final = np.maximum(base * 0.75, np.minimum(base * 2.0, final))
+        multipliers = mult.tolist()
+        finals = final.tolist()
+    else:
+        multipliers, finals = [], []
+        for base_price, f in zip(bases, all_factors):
+            m = f["demand"] * f["capacity"] * f["time"] * f["loyalty"] * f["competition"]
+            multipliers.append(m)
+            finals.append(max(base_price * 0.75, min(base_price * 2.0, round(base_price * m, 2))))
+    
+    return [
+        _price_result(b, fp, m, f)
+        for b, fp, m, f in zip(bases, finals, multipliers, all_factors)
+    ]
+
+
 async def suggest_optimal_pricing(
     service_type: str,
     agent: str,
@@ -235,27 +344,31 @@ async def get_competitive_pricing(
     }
 
 
-async def _get_agent_data(agent: str) -> Dict[str, Any]:
-    """Get agent data from main API"""
-    async with httpx.AsyncClient(timeout=10) as client:
-        try:
-            r = await client.post(
-                "https://aigentsy-ame-runtime.onrender.com/user",
-                json={"username": agent}
-            )
-            return r.json().get("record", {})
-        except Exception:
-            return {}
+async def _get_agent_data(agent: str, client: httpx.AsyncClient = None) -> Dict[str, Any]:
+    """Get agent data from main API (reuses client when given)"""
+    if client is None:
+        async with httpx.AsyncClient(timeout=10) as own_client:
+            return await _get_agent_data(agent, client=own_client)
+    try:
+        r = await client.post(
+            "https://aigentsy-ame-runtime.onrender.com/user",
+            json={"username": agent}
+        )
+        return r.json().get("record", {})
+    except Exception:
+        return {}
 
 
 async def _get_past_purchases(agent: str, buyer: str) -> int:
     """Count past purchases between agent and buyer"""
     agent_data = await _get_agent_data(agent)
-    
+    return _count_paid_purchases(agent_data, buyer)
+
+
+def _count_paid_purchases(agent_data: Dict[str, Any], buyer: str) -> int:
+    """Count paid invoices for buyer in an agent record"""
     invoices = agent_data.get("invoices", [])
-    count = sum(1 for inv in invoices if inv.get("buyer") == buyer and inv.get("status") == "paid")
-    
-    return count
+    return sum(1 for inv in invoices if inv.get("buyer") == buyer and inv.get("status") == "paid")
 
 
 # ============================================================
@@ -306,6 +306,25 @@ class ProtocolGateway:
             limit=limit
         )
     
+    def query_agents(
+        self,
+        capabilities: List[str] = None,
+        agent_types: List[str] = None,
+        tiers: List[str] = None,
+        min_reputation: int = 0,
+        verified_only: bool = False,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """Top agents matching all capabilities, any type and any tier"""
+        return self.registry.query_agents(
+            capabilities=capabilities,
+            agent_types=agent_types,
+            tiers=tiers,
+            min_reputation=min_reputation,
+            verified_only=verified_only,
+            limit=limit
+        )
+    
     def get_leaderboard(self, limit: int = 20) -> Dict[str, Any]:
         """Get agent leaderboard"""
         return self.registry.get_leaderboard(limit)
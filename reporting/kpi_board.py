@@ -14,14 +14,46 @@ Features:
 Impact: Measure everything, make data-driven decisions
 """
 
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, Optional, List, Tuple, Union
+from datetime import datetime, timezone
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import defaultdict, deque
 import logging
 
 logger = logging.getLogger("kpi_board")
 
+# Rollup resolutions: name -> (bucket width seconds, ring slots)
+RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "minute": (60, 180),      # 3 hours
+    "hour": (3600, 24 * 14),  # 14 days
+    "day": (86400, 400),      # ~13 months
+}
+
+# Fields summed per rollup bucket (order = slot layout)
+ROLLUP_FIELDS = (
+    "revenue", "spend", "tokens", "outcomes", "wins", "refunds", "assured",
+    "payback_sum", "payback_count",
+)
+_F = {name: i for i, name in enumerate(ROLLUP_FIELDS)}
+
+MAX_RAW_EVENTS = 1000         # Raw event tail kept when keep_events=True
+MAX_SNAPSHOTS = 1440          # KPISnapshot history cap
+
+
+def _event_epoch(ts: Any) -> float:
+    """Event timestamp (datetime, ISO string or epoch seconds) as epoch seconds"""
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    if isinstance(ts, datetime):
+        return (ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)).timestamp()
+    if isinstance(ts, str):
+        try:
+            dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+            return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp()
+        except ValueError:
+            pass
+    return datetime.now(timezone.utc).timestamp()
+
 
 @dataclass
 class KPISnapshot:
@@ -37,6 +69,115 @@ class KPISnapshot:
     total_spend: float
 
 
+class RollupRing:
+    """
+    Fixed-size ring of time buckets for one resolution.
+
+    Slot i holds bucket number keys[i] (epoch // width) and its summed
+    ROLLUP_FIELDS. Writing to a slot whose bucket has aged out resets it,
+    so memory is width-independent: slots x len(ROLLUP_FIELDS) floats.
+    """
+
+    def __init__(self, width: int, slots: int):
+        self.width = width
+        self.slots = slots
+        self.keys: List[int] = [-1] * slots
+        self.values: List[List[float]] = [[0.0] * len(ROLLUP_FIELDS) for _ in range(slots)]
+
+    def _slot_for(self, bucket: int) -> Optional[List[float]]:
+        i = bucket % self.slots
+        key = self.keys[i]
+        if key == bucket:
+            return self.values[i]
+        if key > bucket:
+            return None  # Older than the ring covers
+        self.keys[i] = bucket
+        row = self.values[i]
+        for j in range(len(row)):
+            row[j] = 0.0
+        return row
+
+    def add(self, epoch: float, deltas: List[float]):
+        row = self._slot_for(int(epoch // self.width))
+        if row is not None:
+            for j, v in enumerate(deltas):
+                if v:
+                    row[j] += v
+
+    def range(self, start_epoch: float, end_epoch: float) -> List[Tuple[int, List[float]]]:
+        """(bucket start epoch, values) for live buckets in [start, end], oldest first"""
+        first = int(start_epoch // self.width)
+        last = int(end_epoch // self.width)
+        first = max(first, last - self.slots + 1)
+        out = []
+        for bucket in range(first, last + 1):
+            i = bucket % self.slots
+            if self.keys[i] == bucket:
+                out.append((bucket * self.width, self.values[i]))
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "width": self.width,
+            "buckets": {str(k): list(self.values[i]) for i, k in enumerate(self.keys) if k >= 0},
+        }
+
+    def merge(self, data: Dict[str, Any]):
+        """Add another worker's buckets (same width) into this ring"""
+        for key, values in data.get("buckets", {}).items():
+            bucket = int(key)
+            row = self._slot_for(bucket)
+            if row is not None:
+                for j, v in enumerate(values[:len(row)]):
+                    row[j] += v
+
+
+class PaybackDigest:
+    """
+    Streaming quantiles for payback days.
+
+    Payback is reported in (whole or tenth-of-a) days, so a value -> count
+    histogram is exact, bounded by the number of distinct values, and
+    mergeable across workers by adding counts.
+    """
+
+    def __init__(self):
+        self.counts: Dict[float, int] = defaultdict(int)
+        self.n = 0
+
+    @staticmethod
+    def _key(value: Union[int, float]) -> Union[int, float]:
+        return value if isinstance(value, int) else round(float(value), 1)
+
+    def add(self, value: Union[int, float], count: int = 1):
+        self.counts[self._key(value)] += count
+        self.n += count
+
+    def quantile(self, q: float) -> Union[int, float]:
+        """Value at rank int(q * n) of the sorted values (0 when empty)"""
+        if not self.n:
+            return 0
+        rank = min(self.n - 1, int(q * self.n))
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen > rank:
+                return value
+        return value
+
+    def to_dict(self) -> Dict[str, int]:
+        return {str(k): c for k, c in self.counts.items()}
+
+    def merge(self, data: Dict[str, int]):
+        for key, count in data.items():
+            value = float(key)
+            self.add(int(value) if value.is_integer() and "." not in key else value, count)
+
+    def clear(self):
+        self.counts.clear()
+        self.n = 0
+
+
 class KPIBoard:
     """
     Real-time KPI tracking and exposure
@@ -47,11 +188,17 @@ class KPIBoard:
     - Unit economics (CAC:LTV)
     - Quality metrics (win rate, refund rate)
     - AIGx assurance share
+
+    Memory is bounded: events fold into running totals, per-engine counters,
+    per-minute/hour/day rollup rings and a payback digest. Raw events are
+    only kept (last max_events) when keep_events is set. Boards from several
+    workers combine with merge(other.export_state()).
     """
 
-    def __init__(self):
-        self._events: List[Dict] = []
-        self._snapshots: List[KPISnapshot] = []
+    def __init__(self, keep_events: bool = False, max_events: int = MAX_RAW_EVENTS):
+        self.keep_events = keep_events
+        self._events: deque = deque(maxlen=max_events)
+        self._snapshots: deque = deque(maxlen=MAX_SNAPSHOTS)
 
         # Aggregated metrics
         self._total_revenue: float = 0.0
@@ -65,9 +212,15 @@ class KPIBoard:
         # Per-engine tracking
         self._engine_revenue: Dict[str, float] = defaultdict(float)
         self._engine_outcomes: Dict[str, int] = defaultdict(int)
+        self._engine_wins: Dict[str, int] = defaultdict(int)
 
         # Payback tracking
-        self._payback_days: List[int] = []
+        self._payback = PaybackDigest()
+
+        # Time-bucketed rollups
+        self._rollups: Dict[str, RollupRing] = {
+            name: RollupRing(width, slots) for name, (width, slots) in RESOLUTIONS.items()
+        }
 
     def emit(self, event: Dict[str, Any]):
         """
@@ -84,7 +237,8 @@ class KPIBoard:
         - assured: AIGx assured
         - refunded: was refunded
         """
-        self._events.append(event)
+        if self.keep_events:
+            self._events.append(event)
 
         # Update aggregates
         revenue = event.get("revenue", 0)
@@ -94,6 +248,7 @@ class KPIBoard:
         assured = event.get("assured", False)
         refunded = event.get("refunded", False)
         engine = event.get("engine", "unknown")
+        payback = event.get("payback_days")
 
         self._total_revenue += revenue
         self._total_spend += spend
@@ -110,10 +265,22 @@ class KPIBoard:
         # Engine tracking
         self._engine_revenue[engine] += revenue
         self._engine_outcomes[engine] += 1
+        if success:
+            self._engine_wins[engine] += 1
 
         # Payback days
-        if event.get("payback_days"):
-            self._payback_days.append(event["payback_days"])
+        if payback:
+            self._payback.add(payback)
+
+        # Rollups
+        deltas = [
+            revenue, spend, tokens, 1,
+            1 if success else 0, 1 if refunded else 0, 1 if assured else 0,
+            payback or 0, 1 if payback else 0,
+        ]
+        epoch = _event_epoch(event.get("ts"))
+        for ring in self._rollups.values():
+            ring.add(epoch, deltas)
 
     def get_kpis(self) -> Dict[str, Any]:
         """Get current KPIs"""
@@ -121,11 +288,7 @@ class KPIBoard:
         cash_per_token = self._total_revenue / max(1, self._total_tokens_used)
 
         # Payback median
-        payback_median = 0
-        if self._payback_days:
-            sorted_days = sorted(self._payback_days)
-            mid = len(sorted_days) // 2
-            payback_median = sorted_days[mid]
+        payback_median = self._payback.quantile(0.5)
 
         # CAC:LTV ratio (simplified)
         cac_ltv_ratio = self._total_spend / max(1, self._total_revenue) if self._total_revenue > 0 else 0
@@ -149,6 +312,7 @@ class KPIBoard:
         return {
             "cash_per_token": round(cash_per_token, 4),
             "payback_days_median": payback_median,
+            "payback_days_p90": self._payback.quantile(0.9),
             "cac_ltv_ratio": round(cac_ltv_ratio, 4),
             "win_rate": round(win_rate, 4),
             "refund_rate": round(refund_rate, 4),
@@ -164,9 +328,7 @@ class KPIBoard:
         """Get KPIs for specific engine"""
         revenue = self._engine_revenue.get(engine, 0)
         outcomes = self._engine_outcomes.get(engine, 0)
-
-        engine_events = [e for e in self._events if e.get("engine") == engine]
-        wins = sum(1 for e in engine_events if e.get("success"))
+        wins = self._engine_wins.get(engine, 0)
 
         return {
             "engine": engine,
@@ -195,20 +357,103 @@ class KPIBoard:
         self._snapshots.append(snapshot)
         return snapshot
 
+    @staticmethod
+    def _bucket_metric(metric: str, row: List[float]) -> float:
+        """Value of a KPI (or raw rollup field) for one bucket"""
+        outcomes = row[_F["outcomes"]]
+        if metric == "cash_per_token":
+            return round(row[_F["revenue"]] / max(1, row[_F["tokens"]]), 4)
+        if metric in ("payback_days_median", "payback_days"):
+            # Per-bucket mean; the digest holds the exact all-time quantiles
+            return round(row[_F["payback_sum"]] / row[_F["payback_count"]], 2) if row[_F["payback_count"]] else 0
+        if metric == "cac_ltv_ratio":
+            return round(row[_F["spend"]] / row[_F["revenue"]], 4) if row[_F["revenue"]] > 0 else 0
+        if metric == "win_rate":
+            return round(row[_F["wins"]] / max(1, outcomes), 4)
+        if metric == "refund_rate":
+            return round(row[_F["refunds"]] / max(1, outcomes), 4)
+        if metric == "assured_share":
+            return round(row[_F["assured"]] / max(1, outcomes), 4)
+        if metric == "total_revenue":
+            return round(row[_F["revenue"]], 2)
+        if metric == "total_spend":
+            return round(row[_F["spend"]], 2)
+        if metric in _F:
+            return row[_F[metric]]
+        return 0
+
     def get_trend(self, metric: str, hours: int = 24) -> List[Dict[str, Any]]:
-        """Get trend for a metric over time"""
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        """
+        Get trend for a metric over time
 
-        relevant_snapshots = [
-            s for s in self._snapshots
-            if s.timestamp >= cutoff
-        ]
+        One point per rollup bucket with activity, at the finest resolution
+        that covers the window (minute <= 3h, hour <= 14d, else day). Rates
+        are per bucket; total_revenue/total_spend are the bucket's sums.
+        """
+        window = hours * 3600
+        resolution = next(
+            (name for name, (width, slots) in RESOLUTIONS.items() if width * slots >= window),
+            "day",
+        )
+        now = datetime.now(timezone.utc).timestamp()
+        ring = self._rollups[resolution]
 
         return [
-            {"ts": s.timestamp.isoformat(), "value": getattr(s, metric, 0)}
-            for s in relevant_snapshots
+            {
+                "ts": datetime.fromtimestamp(start, timezone.utc).isoformat(),
+                "value": self._bucket_metric(metric, row),
+            }
+            for start, row in ring.range(now - window, now)
+            if row[_F["outcomes"]]
         ]
 
+    def export_state(self) -> Dict[str, Any]:
+        """JSON-serializable aggregates for merging into another worker's board"""
+        return {
+            "totals": {
+                "revenue": self._total_revenue,
+                "spend": self._total_spend,
+                "tokens": self._total_tokens_used,
+                "outcomes": self._total_outcomes,
+                "wins": self._wins,
+                "refunds": self._refunds,
+                "assured": self._assured_count,
+            },
+            "engines": {
+                engine: {
+                    "revenue": self._engine_revenue[engine],
+                    "outcomes": self._engine_outcomes[engine],
+                    "wins": self._engine_wins.get(engine, 0),
+                }
+                for engine in self._engine_outcomes
+            },
+            "payback": self._payback.to_dict(),
+            "rollups": {name: ring.to_dict() for name, ring in self._rollups.items()},
+        }
+
+    def merge(self, state: Dict[str, Any]):
+        """Add another board's export_state() into this one"""
+        totals = state.get("totals", {})
+        self._total_revenue += totals.get("revenue", 0)
+        self._total_spend += totals.get("spend", 0)
+        self._total_tokens_used += totals.get("tokens", 0)
+        self._total_outcomes += totals.get("outcomes", 0)
+        self._wins += totals.get("wins", 0)
+        self._refunds += totals.get("refunds", 0)
+        self._assured_count += totals.get("assured", 0)
+
+        for engine, e in state.get("engines", {}).items():
+            self._engine_revenue[engine] += e.get("revenue", 0)
+            self._engine_outcomes[engine] += e.get("outcomes", 0)
+            self._engine_wins[engine] += e.get("wins", 0)
+
+        self._payback.merge(state.get("payback", {}))
+
+        for name, data in state.get("rollups", {}).items():
+            ring = self._rollups.get(name)
+            if ring is not None and data.get("width") == ring.width:
+                ring.merge(data)
+
     def reset(self):
         """Reset all metrics"""
         self._events.clear()
@@ -221,14 +466,20 @@ class KPIBoard:
         self._assured_count = 0
         self._engine_revenue.clear()
         self._engine_outcomes.clear()
-        self._payback_days.clear()
+        self._engine_wins.clear()
+        self._payback.clear()
+        self._rollups = {
+            name: RollupRing(width, slots) for name, (width, slots) in RESOLUTIONS.items()
+        }
 
     def get_stats(self) -> Dict[str, Any]:
         """Get board statistics"""
         return {
-            "total_events": len(self._events),
+            "total_events": self._total_outcomes,
+            "raw_events_kept": len(self._events),
             "snapshots": len(self._snapshots),
             "engines_tracked": len(self._engine_revenue),
+            "payback_distinct_values": len(self._payback.counts),
             "kpis": self.get_kpis()
         }
 
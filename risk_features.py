@@ -0,0 +1,394 @@
+"""
+AiGentsy Risk Features
+Streaming per-user fraud features, maintained as events arrive
+
+check_fraud_signals() used to rebuild its velocity signals on every call
+by scanning the global action log (every user's history) and parsing each
+timestamp. RiskFeatureEngine keeps the features per user instead, updated
+in O(1) (amortized) per event:
+
+    checks_1h       fraud checks (actions) in the last hour
+    bids_1h         bids placed in the last hour
+    refunds_30d     refund ledger entries in the last 30 days
+    failed_30d      failed payments / chargebacks in the last 30 days
+    new_devices_30d devices first seen in the last 30 days
+    amount z-score  running mean / variance of ledger amounts (Welford)
+    withdrawals     running count and total of checked withdrawals
+
+Windows are deques of event times; an event is evicted when the window
+slides past it, so reads only touch expired entries. Events come from
+fraud checks, bids (intent events) and ledger entries; sync_user() ingests
+only the ledger entries appended since the last sync of that record.
+
+rescore_all() re-syncs and scores every user from precomputed features in
+one pass (no actions are logged). get_stats() reports feature freshness:
+event ingest lag and how long ago each user's features were last synced.
+"""
+import threading
+import time
+from bisect import insort
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+HOUR = 3600
+DAY = 86400
+WINDOWS = {
+    "checks": HOUR, "bids": HOUR, "refunds": 30 * DAY, "failed": 30 * DAY,
+    "ledger_failed": 30 * DAY, "new_devices": 30 * DAY,
+}
+MAX_DEVICES_TRACKED = 50            # Per user; older devices are forgotten first
+MIN_ZSCORE_SAMPLES = 10             # Amount z-score needs this many ledger amounts
+RECENT_SIGNALS = 5
+
+REFUND_BASES = ("refund",)                                  # substring match on ledger basis
+FAILED_BASES = ("failed", "chargeback", "dispute_loss")
+WITHDRAWAL_BASES = ("payout", "withdrawal")
+
+
+def _epoch(ts: Any) -> Optional[float]:
+    """Epoch seconds from an ISO string (Z / +00:00 / both) or a number"""
+    if ts is None:
+        return None
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    try:
+        value = str(ts)
+        while value.endswith("Z"):
+            value = value[:-1]
+        dt = datetime.fromisoformat(value)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _matches(basis: str, keywords: tuple) -> bool:
+    return any(k in basis for k in keywords)
+
+
+def _ledger_basis(entry: Dict[str, Any]) -> str:
+    """Lower-cased kind of a ledger entry (basis, else type)"""
+    return str(entry.get("basis") or entry.get("type") or "").lower()
+
+
+class _UserFeatures:
+    """Sliding windows and running aggregates for one user"""
+
+    __slots__ = (
+        "checks", "bids", "refunds", "failed", "ledger_failed", "new_devices", "devices",
+        "amount_n", "amount_mean", "amount_m2", "withdrawals", "withdrawal_total",
+        "risk_total", "risk_checks", "high_risk", "recent_signals",
+        "ledger_seen", "last_event", "synced_at",
+    )
+
+    def __init__(self):
+        self.checks: deque = deque()
+        self.bids: deque = deque()
+        self.refunds: deque = deque()
+        self.failed: deque = deque()            # Failed payments reported by checks
+        self.ledger_failed: deque = deque()     # Failed payments / chargebacks in the ledger
+        self.new_devices: deque = deque()
+        self.devices: Dict[str, float] = {}
+        self.amount_n = 0
+        self.amount_mean = 0.0
+        self.amount_m2 = 0.0
+        self.withdrawals = 0
+        self.withdrawal_total = 0.0
+        self.risk_total = 0
+        self.risk_checks = 0
+        self.high_risk = 0
+        self.recent_signals: deque = deque(maxlen=RECENT_SIGNALS)
+        self.ledger_seen = 0
+        self.last_event: Optional[float] = None
+        self.synced_at: Optional[float] = None
+
+    def reset_ledger(self):
+        """Drop everything derived from the user's ledger (before re-ingesting it)"""
+        self.refunds.clear()
+        self.ledger_failed.clear()
+        self.amount_n = 0
+        self.amount_mean = 0.0
+        self.amount_m2 = 0.0
+        self.ledger_seen = 0
+
+    def window(self, name: str, now: float) -> int:
+        dq = getattr(self, name)
+        cutoff = now - WINDOWS[name]
+        while dq and dq[0] <= cutoff:
+            dq.popleft()
+        return len(dq)
+
+    def push(self, name: str, ts: float, now: float):
+        dq = getattr(self, name)
+        if ts <= now - WINDOWS[name]:
+            return
+        if not dq or ts >= dq[-1]:
+            dq.append(ts)
+        else:
+            insort(dq, ts)      # Out-of-order (backfilled) event
+        self.window(name, now)
+
+    def add_amount(self, amount: float):
+        self.amount_n += 1
+        delta = amount - self.amount_mean
+        self.amount_mean += delta / self.amount_n
+        self.amount_m2 += delta * (amount - self.amount_mean)
+
+    def zscore(self, amount: float) -> Optional[float]:
+        if self.amount_n < MIN_ZSCORE_SAMPLES:
+            return None
+        std = (self.amount_m2 / (self.amount_n - 1)) ** 0.5
+        if std <= 0:
+            return None
+        return (amount - self.amount_mean) / std
+
+
+class RiskFeatureEngine:
+    """Per-user rolling fraud features, fed by checks, bids and ledger entries"""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._users: Dict[str, _UserFeatures] = {}
+        self._lock = threading.RLock()
+        self.stats = {
+            "events": 0,
+            "checks": 0,
+            "high_risk_checks": 0,
+            "ledger_entries": 0,
+            "syncs": 0,
+            "max_ingest_lag_s": 0.0,
+            "total_ingest_lag_s": 0.0,
+            "lagged_events": 0,
+            "last_event_at": None,
+            "last_rescore": None,
+        }
+
+    def _user(self, username: str) -> _UserFeatures:
+        features = self._users.get(username)
+        if features is None:
+            features = self._users[username] = _UserFeatures()
+        return features
+
+    def _observe(self, features: _UserFeatures, ts: float, now: float, live: bool = True):
+        self.stats["events"] += 1
+        lag = now - ts
+        if live and lag > 0:
+            self.stats["lagged_events"] += 1
+            self.stats["total_ingest_lag_s"] += lag
+            self.stats["max_ingest_lag_s"] = max(self.stats["max_ingest_lag_s"], lag)
+        if features.last_event is None or ts > features.last_event:
+            features.last_event = ts
+        self.stats["last_event_at"] = now
+
+    # ---------- events ----------
+
+    def record_check(
+        self,
+        username: str,
+        action_type: str,
+        risk_score: int,
+        signals: List[str],
+        amount: Optional[float] = None,
+        device_id: Optional[str] = None,
+        failed_payment: bool = False,
+        ts: Optional[float] = None
+    ):
+        """A fraud check ran for this user's action"""
+        now = self._clock()
+        ts = now if ts is None else ts
+        with self._lock:
+            features = self._user(username)
+            features.push("checks", ts, now)
+            features.risk_total += risk_score
+            features.risk_checks += 1
+            self.stats["checks"] += 1
+            if risk_score >= 40:
+                features.high_risk += 1
+                self.stats["high_risk_checks"] += 1
+                features.recent_signals.append(list(signals))
+            if action_type == "withdrawal" and amount is not None:
+                features.withdrawals += 1
+                features.withdrawal_total += amount
+            if failed_payment:
+                features.push("failed", ts, now)
+            if device_id:
+                self._see_device(features, str(device_id), ts, now)
+            self._observe(features, ts, now)
+
+    def record_bid(self, username: str, amount: Optional[float] = None, ts: Any = None):
+        """The user placed a bid (intent event)"""
+        now = self._clock()
+        ts = _epoch(ts) or now
+        with self._lock:
+            features = self._user(username)
+            features.push("bids", ts, now)
+            self._observe(features, ts, now)
+
+    def record_device(self, username: str, device_id: str, ts: Any = None):
+        now = self._clock()
+        ts = _epoch(ts) or now
+        with self._lock:
+            features = self._user(username)
+            self._see_device(features, str(device_id), ts, now)
+            self._observe(features, ts, now)
+
+    def _see_device(self, features: _UserFeatures, device_id: str, ts: float, now: float):
+        if device_id in features.devices:
+            return
+        if len(features.devices) >= MAX_DEVICES_TRACKED:
+            features.devices.pop(next(iter(features.devices)))
+        features.devices[device_id] = ts
+        features.push("new_devices", ts, now)
+
+    def record_ledger(self, username: str, entry: Dict[str, Any]):
+        """One ledger entry (credit, debit, refund, payout...) for this user"""
+        now = self._clock()
+        ts = _epoch(entry.get("ts") or entry.get("timestamp")) or now
+        with self._lock:
+            features = self._user(username)
+            self._ingest_ledger(features, entry, ts, now)
+            self._observe(features, ts, now)
+
+    def _ingest_ledger(self, features: _UserFeatures, entry: Dict[str, Any], ts: float, now: float):
+        self.stats["ledger_entries"] += 1
+        basis = _ledger_basis(entry)
+        if _matches(basis, REFUND_BASES):
+            features.push("refunds", ts, now)
+        if _matches(basis, FAILED_BASES):
+            features.push("ledger_failed", ts, now)
+        try:
+            amount = abs(float(entry.get("amount") or 0))
+        except (TypeError, ValueError):
+            amount = 0.0
+        if amount:
+            features.add_amount(amount)
+
+    def sync_user(self, user: Dict[str, Any], username: Optional[str] = None) -> Optional[str]:
+        """
+        Ingest the ledger entries appended to a user record since its last sync
+
+        Ledgers are append-only lists, so only entries past the remembered
+        length are read; a ledger shorter than that means the record was
+        replaced, and the user's ledger features are rebuilt from it. Bids
+        are not in the user record (they live on the
+        buyer's intents) and come in through record_bid().
+        """
+        username = username or user.get("username") or user.get("consent", {}).get("username")
+        if not username:
+            return None
+        ledger = user.get("ownership", {}).get("ledger") or []
+        now = self._clock()
+        with self._lock:
+            features = self._user(username)
+            if len(ledger) < features.ledger_seen:
+                features.reset_ledger()     # Record was replaced; rebuild from the top
+            newest = None
+            for entry in ledger[features.ledger_seen:]:
+                if not isinstance(entry, dict):
+                    continue
+                ts = _epoch(entry.get("ts") or entry.get("timestamp")) or now
+                self._ingest_ledger(features, entry, ts, now)
+                newest = ts if newest is None else max(newest, ts)
+            if newest is not None:
+                self._observe(features, newest, now, live=False)   # Backfill: entry age is not ingest lag
+            features.ledger_seen = len(ledger)
+            features.synced_at = now
+            self.stats["syncs"] += 1
+        return username
+
+    # ---------- reads ----------
+
+    def features(self, username: str, amount: Optional[float] = None) -> Dict[str, Any]:
+        """Current feature values for a user (zeros for an unseen user)"""
+        now = self._clock()
+        with self._lock:
+            features = self._users.get(username)
+            if features is None:
+                features = _UserFeatures()
+            z = features.zscore(amount) if amount is not None else None
+            return {
+                "checks_1h": features.window("checks", now),
+                "bids_1h": features.window("bids", now),
+                "refunds_30d": features.window("refunds", now),
+                "failed_payments_30d": features.window("failed", now) + features.window("ledger_failed", now),
+                "new_devices_30d": features.window("new_devices", now),
+                "devices_seen": len(features.devices),
+                "amount_samples": features.amount_n,
+                "amount_mean": round(features.amount_mean, 2),
+                "amount_zscore": round(z, 2) if z is not None else None,
+                "withdrawals": features.withdrawals,
+                "avg_withdrawal": features.withdrawal_total / features.withdrawals if features.withdrawals else None,
+                "total_checks": features.risk_checks,
+                "high_risk_checks": features.high_risk,
+                "avg_risk_score": features.risk_total / features.risk_checks if features.risk_checks else 0,
+                "recent_signals": list(features.recent_signals)[::-1],
+                "last_event_age_s": round(now - features.last_event, 1) if features.last_event else None,
+                "synced_age_s": round(now - features.synced_at, 1) if features.synced_at else None,
+            }
+
+    def rescore_all(
+        self,
+        users: Iterable[Dict[str, Any]],
+        score_fn: Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Batch re-scoring: sync every user record, then score it with
+        score_fn(features, user) -> {"risk_score", "signals"}
+        """
+        started = time.perf_counter()
+        scored = []
+        for user in users:
+            username = self.sync_user(user)
+            if not username:
+                continue
+            result = score_fn(self.features(username), user)
+            scored.append({"username": username, **result})
+        scored.sort(key=lambda r: r["risk_score"], reverse=True)
+        elapsed = time.perf_counter() - started
+        self.stats["last_rescore"] = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "users": len(scored),
+            "seconds": round(elapsed, 3),
+        }
+        return {
+            "ok": True,
+            "users": len(scored),
+            "review": len([r for r in scored if r["risk_score"] >= 40]),
+            "block": len([r for r in scored if r["risk_score"] >= 60]),
+            "elapsed_seconds": round(elapsed, 3),
+            "scores": scored,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Engine counters plus feature freshness across tracked users"""
+        now = self._clock()
+        with self._lock:
+            synced = sorted(now - f.synced_at for f in self._users.values() if f.synced_at)
+            lagged = self.stats["lagged_events"]
+            stats = {k: v for k, v in self.stats.items() if k not in ("total_ingest_lag_s", "lagged_events")}
+            stats["max_ingest_lag_s"] = round(stats["max_ingest_lag_s"], 1)
+            stats["avg_ingest_lag_s"] = round(self.stats["total_ingest_lag_s"] / lagged, 1) if lagged else 0.0
+            stats["users_tracked"] = len(self._users)
+            stats["users_synced"] = len(synced)
+            stats["synced_age_s"] = {
+                "p50": round(synced[len(synced) // 2], 1),
+                "p95": round(synced[int(len(synced) * 0.95)], 1),
+                "max": round(synced[-1], 1),
+            } if synced else None
+            if stats["last_event_at"]:
+                stats["last_event_age_s"] = round(now - stats["last_event_at"], 1)
+                stats["last_event_at"] = datetime.fromtimestamp(stats["last_event_at"], timezone.utc).isoformat()
+            return stats
+
+
+_engine: Optional[RiskFeatureEngine] = None
+
+
+def get_risk_engine() -> RiskFeatureEngine:
+    """Get singleton risk feature engine"""
+    global _engine
+    if _engine is None:
+        _engine = RiskFeatureEngine()
+    return _engine
@@ -5,6 +5,7 @@ Endpoints:
 - GET /api/status - Overall API credential status
 - GET /api/credentials/missing - List missing credentials
 - GET /api/packs - List all API packs with status
+- GET /api/breakers - Circuit breaker snapshot (error rate, latency)
 """
 
 import logging
@@ -125,6 +126,27 @@ async def get_api_packs():
         }
 
 
+@router.get("/breakers")
+async def get_breaker_snapshot():
+    """
+    Circuit breaker snapshot
+
+    Per-key state, error rate, slow-call rate and latency over the
+    rolling breaker window
+    """
+    try:
+        from connectors.health_breakers import snapshot
+
+        return {"ok": True, **snapshot()}
+
+    except Exception as e:
+        logger.error(f"Breaker snapshot error: {e}")
+        return {
+            "ok": False,
+            "error": str(e)
+        }
+
+
 def log_api_status_on_startup():
     """
     Log API credential status on startup
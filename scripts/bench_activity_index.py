@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Activity Index
+
+Builds 100,000 users with up to a year of activeDays each (20% active
+today) and compares how the daily job finds today's active users and their
+streaks: the previous scan (`today in active_days` on every user, then
+parsing and sorting every active day to count the streak) against the
+ActivityIndex (today's set collected as activity arrives, bitset streaks).
+JSONBin I/O is not included; the batched write replaces one read+write
+per active user with a single write.
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aigx_engine as ae
+
+USERS = 100_000
+ACTIVE_TODAY = 0.2
+
+
+def build(rng: random.Random):
+    now = datetime.now(timezone.utc)
+    calendar = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(365, -1, -1)]
+    users = []
+    for i in range(USERS):
+        start = rng.randrange(366)
+        days = [d for d in calendar[start:-1] if rng.random() < 0.8]
+        if rng.random() < ACTIVE_TODAY:
+            days.append(calendar[-1])
+        users.append({"username": f"agent_{i}", "activityTracking": {"activeDays": days}})
+    return users, now
+
+
+def previous_scan(users, today):
+    found = {}
+    for user in users:
+        active_days = user["activityTracking"]["activeDays"]
+        if today in active_days:
+            sorted_dates = sorted(datetime.strptime(d, "%Y-%m-%d") for d in active_days)
+            check, streak = sorted_dates[-1], 0
+            for d in reversed(sorted_dates):
+                if d != check:
+                    break
+                streak += 1
+                check -= timedelta(days=1)
+            found[user["username"]] = streak
+    return found
+
+
+def main():
+    rng = random.Random(5)
+    users, now = build(rng)
+    today, day = now.strftime("%Y-%m-%d"), now.date().toordinal()
+    print(f"{USERS:,} users, {sum(len(u['activityTracking']['activeDays']) for u in users):,} stored active days")
+
+    start = time.perf_counter()
+    expected = previous_scan(users, today)
+    t_prev = time.perf_counter() - start
+
+    index = ae.ActivityIndex()
+    start = time.perf_counter()
+    for user in users:
+        index.load(user["username"], user["activityTracking"]["activeDays"])
+    t_load = time.perf_counter() - start
+    index.mark_complete(day)
+    for user in users:
+        if user["activityTracking"]["activeDays"][-1:] == [today]:
+            index.mark(user["username"], day)
+
+    start = time.perf_counter()
+    active = index.active_on(day)
+    streaks = {u: index.streak(u, day) for u in active}
+    t_index = time.perf_counter() - start
+    assert streaks == expected
+
+    print(f"  previous: scan all users + parse/sort streaks : {t_prev * 1000:8.1f} ms ({len(expected):,} active)")
+    print(f"  index: one-time load from activeDays          : {t_load * 1000:8.1f} ms")
+    print(f"  index: today's set + bitset streaks           : {t_index * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Agent Registry
+
+Registers 1,000,000 agents, applies 500,000 reputation updates, then times
+capability/type/tier searches, multi-predicate top-k queries and the
+leaderboard against the previous approach (copy every agent id, intersect,
+build a public dict per match and sort; sort all agents for the
+leaderboard, baseline reimplemented below). Memory per agent is measured
+with tracemalloc for the __slots__ dataclasses against __dict__-backed
+copies of the same fields.
+"""
+
+import dataclasses
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agent_registry as ar
+
+AGENTS = 1_000_000
+UPDATES = 500_000
+QUERIES = 20
+MEMORY_SAMPLE = 100_000
+
+
+def scan_search(registry, capability=None, agent_type=None, min_reputation=0, limit=50):
+    """The search_agents() body before the score index"""
+    candidates = set(registry._agents.keys())
+    if capability:
+        candidates &= registry._agents_by_capability[ar.Capability(capability)]
+    if agent_type:
+        candidates &= registry._agents_by_type[ar.AgentType(agent_type)]
+    results = []
+    for agent_id in candidates:
+        agent = registry._agents[agent_id]
+        if not agent.is_active or agent.reputation.score < min_reputation:
+            continue
+        results.append(agent.to_public_dict())
+    results.sort(key=lambda x: x["reputation"]["score"], reverse=True)
+    return len(results), results[:limit]
+
+
+def scan_leaderboard(registry, limit=20):
+    agents = list(registry._agents.values())
+    agents.sort(key=lambda a: (a.reputation.score, a.reputation.jobs_completed), reverse=True)
+    return agents[:limit]
+
+
+def unslotted(cls):
+    return dataclasses.make_dataclass(f"Dict{cls.__name__}", [(f.name, f.type, f) for f in dataclasses.fields(cls)])
+
+
+def per_object(factory) -> float:
+    gc.collect()
+    tracemalloc.start()
+    objs = [factory(i) for i in range(MEMORY_SAMPLE)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return size / MEMORY_SAMPLE
+
+
+def timed(fn, n=QUERIES):
+    start = time.perf_counter()
+    for _ in range(n):
+        out = fn()
+    return (time.perf_counter() - start) / n * 1000, out
+
+
+def main():
+    rng = random.Random(48)
+    caps = [c.value for c in ar.Capability]
+    types = [t.value for t in ar.AgentType]
+
+    # Memory: one agent + reputation, slotted vs __dict__ copies of the same fields
+    DictRep, DictAgent = unslotted(ar.AgentReputation), unslotted(ar.RegisteredAgent)
+
+    def agent(rep_cls, agent_cls):
+        return lambda i: agent_cls(
+            agent_id=f"agent_{i:016x}", agent_type=ar.AgentType.GPT, name=f"n{i}", description="d",
+            capabilities=[ar.Capability.RESEARCH], owner_id=None, api_endpoint=None, public_key=None,
+            reputation=rep_cls(jobs_completed=3, score=61))
+    slots = per_object(agent(ar.AgentReputation, ar.RegisteredAgent))
+    plain = per_object(agent(DictRep, DictAgent))
+    print(f"memory per agent: __dict__ {plain:6.0f} B, __slots__ {slots:6.0f} B "
+          f"(-{(plain - slots) * AGENTS / 1e6:.0f} MB at {AGENTS:,} agents)")
+
+    registry = ar.AgentRegistry()
+    start = time.perf_counter()
+    ids = []
+    for i in range(AGENTS):
+        result = registry.register(rng.choice(types), f"agent {i}", "bench", rng.sample(caps, rng.randint(1, 4)),
+                                   owner_id=f"owner{i % 50_000}")
+        ids.append(result["agent_id"])
+    t_register = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(UPDATES):
+        registry.update_reputation(rng.choice(ids), job_completed=rng.random() < 0.9, on_time=rng.random() < 0.8,
+                                   rating=rng.choice((None, 3.0, 4.0, 5.0)), disputed=rng.random() < 0.03)
+    t_update = time.perf_counter() - start
+    print(f"{AGENTS:,} agents: register {AGENTS / t_register:,.0f}/s, update_reputation {UPDATES / t_update:,.0f}/s")
+
+    cases = {
+        "capability": dict(capability="code_generation"),
+        "capability+type": dict(capability="research", agent_type="claude"),
+        "min_reputation=85": dict(min_reputation=85),
+        "all agents": dict(),
+    }
+    for name, kwargs in cases.items():
+        t_scan, (total_scan, _) = timed(lambda: scan_search(registry, **kwargs), 3)
+        t_new, result = timed(lambda: registry.search_agents(**kwargs))
+        assert result["total_matching"] == total_scan
+        print(f"  search {name:<20}: scan {t_scan:8.1f} ms vs indexed {t_new:7.2f} ms ({total_scan:,} matching)")
+
+    t_new, result = timed(lambda: registry.query_agents(
+        capabilities=["code_generation", "code_review"], agent_types=["claude", "gpt"], tiers=["gold", "platinum"], limit=10))
+    print(f"  query 2 caps x 2 types x 2 tiers  : {t_new:7.2f} ms ({result['total_matching']:,} matching, top 10)")
+
+    t_scan, top_scan = timed(lambda: scan_leaderboard(registry), 3)
+    t_new, board = timed(lambda: registry.get_leaderboard())
+    assert [a.agent_id for a in top_scan] == [e["agent_id"] for e in board["leaderboard"]]
+    print(f"  leaderboard top 20           : sort {t_scan:8.1f} ms vs buckets {t_new:7.2f} ms (same order)")
+
+    t_scan, _ = timed(lambda: [len([a for a in registry._agents.values() if a.is_active]),
+                               len([a for a in registry._agents.values() if a.is_verified])], 3)
+    t_new, _ = timed(lambda: registry.get_stats())
+    print(f"  get_stats                    : scan {t_scan:8.1f} ms vs counters {t_new:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
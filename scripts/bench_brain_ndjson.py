@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Brain NDJSON Export/Import
+
+Builds a yield memory of 5,000 users x 20 patterns and compares peak
+memory (tracemalloc) of exporting it as one JSON document (export_memory's
+approach, applied to every user) against streaming iter_memory_ndjson()
+to a file, then times a chunked import of that file and a resumed import
+from the midpoint cursor.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import brain_persistence as bp
+
+USERS = 5_000
+PATTERNS_PER_USER = 20
+
+
+def peak_mb(fn) -> float:
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1e6
+
+
+def main():
+    import logging
+    logging.disable(logging.INFO)
+    tmp = Path(tempfile.mkdtemp())
+    bp._persistence = bp.BrainPersistence(brain_dir=tmp / "brain")
+
+    import yield_memory as ym
+    for u in range(USERS):
+        username = f"user{u:05d}"
+        patterns = [ym.YieldPattern(id=f"pat_{u}_{i}", pattern_type="outreach", category="SUCCESS",
+                                    context={"platform": "reddit", "budget": u % 500, "i": i},
+                                    action={"model": "claude", "steps": i}, outcome={"roas": 2.0},
+                                    score=2.0) for i in range(PATTERNS_PER_USER)]
+        ym._YIELD_MEMORY[username] = patterns
+        ym._PATTERN_INDEX[username] = {p.id: p for p in patterns}
+
+    blob_file = tmp / "memory.json"
+    ndjson_file = tmp / "memory.ndjson"
+
+    def export_blob():
+        data = json.dumps({u: ym._user_record(u) for u in ym._YIELD_MEMORY}, indent=2)
+        blob_file.write_text(data)
+
+    def export_stream():
+        with open(ndjson_file, "wb") as f:
+            for line in ym.iter_memory_ndjson():
+                f.write(line)
+
+    start = time.perf_counter()
+    blob_peak = peak_mb(export_blob)
+    t_blob = time.perf_counter() - start
+    start = time.perf_counter()
+    stream_peak = peak_mb(export_stream)
+    t_stream = time.perf_counter() - start
+
+    print(f"{USERS:,} users x {PATTERNS_PER_USER} patterns "
+          f"({blob_file.stat().st_size / 1e6:.0f} MB blob, {ndjson_file.stat().st_size / 1e6:.0f} MB ndjson)")
+    print(f"  export one JSON document : peak {blob_peak:8.1f} MB (timed under tracemalloc: {t_blob:.1f} s)")
+    print(f"  export NDJSON stream     : peak {stream_peak:8.1f} MB (timed under tracemalloc: {t_stream:.1f} s)")
+
+    ym._YIELD_MEMORY.clear()
+    ym._PATTERN_INDEX.clear()
+    start = time.perf_counter()
+    with open(ndjson_file, "rb") as f:
+        result = ym.import_memory_ndjson(line for n, line in enumerate(f) if n <= USERS // 2)
+    t_half = time.perf_counter() - start
+    start = time.perf_counter()
+    with open(ndjson_file, "rb") as f:
+        resumed = ym.import_memory_ndjson(f, cursor=result["cursor"])
+    t_resume = time.perf_counter() - start
+    bp.get_persistence().flush()
+    print(f"  import first half        : {t_half:8.2f} s ({result['imported']:,} users, cursor {result['cursor']})")
+    print(f"  resume from cursor       : {t_resume:8.2f} s ({resumed['imported']:,} imported, "
+          f"{resumed['skipped']:,} skipped, {len(ym._YIELD_MEMORY):,} users total)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Brain Persistence
+
+Builds a yield memory of 5,000 users x 20 patterns plus a 20,000-pattern
+MetaHive, then runs 100 saves where each touches a few users (as
+_maybe_save_yield_memory does). Compares rewriting the combined blob with
+indent=2 (the previous local tier, before any JSONBin round trip) against
+the delta log, fed either the full dicts or only the touched users:
+caller-side latency, bytes written per save and reload time.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import brain_persistence as bp
+
+USERS = 5_000
+PATTERNS_PER_USER = 20
+HIVE_PATTERNS = 20_000
+SAVES = 100
+USERS_TOUCHED = 3
+
+
+def pattern(rng: random.Random, pid: str) -> dict:
+    return {"id": pid, "pattern_type": rng.choice(["outreach", "pricing", "fulfillment"]),
+            "context": {"platform": rng.choice(["reddit", "upwork", "hn"]), "budget": rng.randint(50, 5000)},
+            "action": {"model": rng.choice(["claude", "gpt4", "gemini"]), "steps": rng.randint(1, 9)},
+            "outcome": {"roas": round(rng.uniform(0, 4), 3), "revenue": round(rng.uniform(0, 900), 2)},
+            "weight": round(rng.random(), 4), "created_at": "2026-01-01T00:00:00+00:00"}
+
+
+def build(rng: random.Random):
+    yield_memory = {
+        "yield_memory": {f"user{u}": [pattern(rng, f"y{u}_{i}") for i in range(PATTERNS_PER_USER)]
+                         for u in range(USERS)},
+        "user_ai_preferences": {f"user{u}": {"category_preferences": {"dev": "claude"}, "model_performance": {}}
+                                for u in range(USERS)},
+        "user_count": USERS,
+        "saved_at": bp._now(),
+    }
+    metahive = {"hive_patterns": [pattern(rng, f"h{i}") for i in range(HIVE_PATTERNS)],
+                "contributor_stats": {}, "pattern_count": HIVE_PATTERNS, "saved_at": bp._now()}
+    return yield_memory, metahive
+
+
+def touch(rng: random.Random, yield_memory: dict) -> list:
+    users = [f"user{rng.randrange(USERS)}" for _ in range(USERS_TOUCHED)]
+    for user in users:
+        yield_memory["yield_memory"][user].append(pattern(rng, f"new{time.perf_counter_ns()}"))
+    yield_memory["saved_at"] = bp._now()
+    return users
+
+
+def reset_metrics(store: bp.BrainPersistence) -> int:
+    store.metrics["save_ms_total"] = 0.0
+    store.metrics["saves"] = 0
+    return store.metrics["bytes_written"]
+
+
+def main():
+    import logging
+    logging.disable(logging.INFO)
+    rng = random.Random(4)
+    tmp = Path(tempfile.mkdtemp())
+    yield_memory, metahive = build(rng)
+
+    legacy_file = tmp / "brain_learning.json"
+    start = time.perf_counter()
+    for _ in range(5):
+        touch(rng, yield_memory)
+        with open(legacy_file, "w") as f:
+            json.dump({"saved_at": bp._now(), "version": "2.0", "metahive": metahive,
+                       "ai_family": {}, "yield_memory": yield_memory}, f, indent=2, default=str)
+    t_legacy = (time.perf_counter() - start) / 5
+    legacy_bytes = legacy_file.stat().st_size
+
+    store = bp.BrainPersistence(brain_dir=tmp / "brain")
+    store.save_metahive(metahive)
+    store.save_yield_memory(yield_memory)
+    store.flush()
+
+    # Full dicts each save (diffed per entry)
+    seed_bytes = reset_metrics(store)
+    for _ in range(SAVES):
+        touch(rng, yield_memory)
+        store.save_yield_memory(yield_memory)
+    store.flush()
+    m_full = store.get_storage_stats()["metrics"]
+    full_per_save = (m_full["bytes_written"] - seed_bytes) / SAVES
+
+    # Only the touched users (what yield_memory's dirty-user tracking sends)
+    seed_bytes = reset_metrics(store)
+    for _ in range(SAVES):
+        users = touch(rng, yield_memory)
+        store.save_store("yield_memory", {
+            "yield_memory": {u: yield_memory["yield_memory"][u] for u in users},
+            "user_ai_preferences": {u: yield_memory["user_ai_preferences"][u] for u in users},
+            "user_count": USERS, "saved_at": yield_memory["saved_at"],
+        }, partial=True)
+    store.flush()
+    m = store.get_storage_stats()["metrics"]
+    per_save = (m["bytes_written"] - seed_bytes) / SAVES
+
+    start = time.perf_counter()
+    fresh = bp.BrainPersistence(brain_dir=tmp / "brain")
+    fresh.load_yield_memory()
+    t_yield = time.perf_counter() - start
+    fresh.load_metahive()
+    t_both = time.perf_counter() - start
+
+    print(f"{USERS:,} users x {PATTERNS_PER_USER} patterns + {HIVE_PATTERNS:,} hive patterns, "
+          f"{USERS_TOUCHED} users touched per save ({bp.HAS_ORJSON and 'orjson' or 'json'}"
+          f"+{bp.HAS_ZSTD and 'zstd' or 'zlib'})")
+    print(f"  full blob, indent=2      : {t_legacy * 1000:8.1f} ms/save, {legacy_bytes / 1e6:8.2f} MB/save")
+    print(f"  delta log, full dicts    : {m_full['save_ms_avg']:8.1f} ms/save, {full_per_save / 1e3:8.2f} KB/save")
+    print(f"  delta log, dirty users   : {m['save_ms_avg']:8.2f} ms/save, {per_save / 1e3:8.2f} KB/save "
+          f"(background write avg {m['write_ms_avg']:.1f} ms, {m['compactions']} compactions)")
+    print(f"  lazy load yield_memory   : {t_yield * 1000:8.1f} ms (all sub-stores {t_both * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
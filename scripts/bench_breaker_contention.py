@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Circuit Breaker Contention
+
+64 concurrent callers record outcomes on breakers, first as threads
+(spread over many keys, then all on one hot key) and then as asyncio
+tasks through call(). A run with every breaker() call serialized behind
+one global lock stands in for the previous single-lock design.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connectors import health_breakers as hb
+
+CALLERS = 64
+OPS_PER_CALLER = 5000
+KEYS = [f"bench_connector_{i}" for i in range(32)]
+FAILURE_RATE = 0.05
+
+hb.NDJSON_LOG = Path(tempfile.mkdtemp()) / "run.ndjson"
+
+
+def run_threads(keys, global_lock=None) -> float:
+    barrier = threading.Barrier(CALLERS + 1)
+
+    def worker(seed):
+        rng = random.Random(seed)
+        picks = [(rng.choice(keys), rng.random() > FAILURE_RATE, rng.uniform(5, 50))
+                 for _ in range(OPS_PER_CALLER)]
+        barrier.wait()
+        for key, ok, latency in picks:
+            if global_lock is not None:
+                with global_lock:
+                    hb.breaker(key, ok, latency_ms=latency)
+            else:
+                hb.breaker(key, ok, latency_ms=latency)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(CALLERS)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    return CALLERS * OPS_PER_CALLER / (time.perf_counter() - start)
+
+
+async def run_async(keys) -> float:
+    async def ok():
+        return True
+
+    async def caller(seed):
+        rng = random.Random(seed)
+        for _ in range(OPS_PER_CALLER // 5):
+            try:
+                await hb.call(rng.choice(keys), ok)
+            except hb.CircuitOpenError:
+                pass
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller(i) for i in range(CALLERS)))
+    return CALLERS * (OPS_PER_CALLER // 5) / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{CALLERS} concurrent callers, {OPS_PER_CALLER} ops each, {FAILURE_RATE:.0%} failures")
+    print(f"  threads, {len(KEYS)} keys, global lock : {run_threads(KEYS, threading.Lock()):>10,.0f} ops/sec")
+    print(f"  threads, {len(KEYS)} keys, per-key lock: {run_threads(KEYS):>10,.0f} ops/sec")
+    print(f"  threads, 1 hot key, per-key lock  : {run_threads(KEYS[:1]):>10,.0f} ops/sec")
+    print(f"  asyncio call(), {len(KEYS)} keys        : {asyncio.run(run_async(KEYS)):>10,.0f} ops/sec")
+
+    snap = hb.snapshot()["breakers"]
+    sample = snap[KEYS[0]]
+    print(f"  snapshot[{KEYS[0]}]: state={sample['state']} calls={sample['calls']} "
+          f"error_rate={sample['error_rate']} avg_latency_ms={sample['avg_latency_ms']}")
+
+
+if __name__ == "__main__":
+    main()
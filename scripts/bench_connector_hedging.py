@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Connector Hedging
+
+Runs the same outcome against two local stub connectors whose latency has
+a heavy tail (most calls fast, a few very slow), once in sequential mode
+and once in hedged race mode, and reports p50/p95/p99 end-to-end latency.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connectors.base import Connector, ConnectorHealth, ConnectorResult
+from connectors.registry import ConnectorRegistry, execute_outcome
+
+N_CALLS = 400
+FAST_MS = (8, 20)
+SLOW_MS = (250, 400)
+SLOW_PROB = 0.08
+
+
+class StubConnector(Connector):
+    """In-process connector with a fast body and a slow tail"""
+    capabilities = ["stub.fetch"]
+    avg_latency_ms = 15.0
+    success_rate = 0.99
+
+    def __init__(self, name: str, seed: int):
+        super().__init__({})
+        self.name = name
+        self.rng = random.Random(seed)
+
+    async def health(self) -> ConnectorHealth:
+        return ConnectorHealth(healthy=True, latency_ms=0)
+
+    async def execute(self, action, params, *, idempotency_key=None, timeout=30):
+        lo, hi = SLOW_MS if self.rng.random() < SLOW_PROB else FAST_MS
+        delay_ms = self.rng.uniform(lo, hi)
+        await asyncio.sleep(delay_ms / 1000)
+        return ConnectorResult(ok=True, data={"by": self.name}, latency_ms=delay_ms)
+
+    async def cost_estimate(self, action, params):
+        return None
+
+
+def outcome(i: int) -> dict:
+    return {
+        "outcome_type": "stub.fetch",
+        "inputs": {"i": i},
+        "sla": {"deadline_sec": 5},
+        "pricing": {"model": "fixed", "amount_usd": 1.0},
+        "risk": {"bond_usd": 0.0},
+        "proofs": [],
+        "idempotency_key": f"bench-{time.time_ns()}-{i}",
+    }
+
+
+def pct(sorted_ms, q):
+    return sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))]
+
+
+async def run(mode: str) -> dict:
+    registry = ConnectorRegistry()
+    registry.register(StubConnector(f"stub_a_{mode}", 1))
+    registry.register(StubConnector(f"stub_b_{mode}", 2))
+
+    latencies = []
+    launched = 0
+    for i in range(N_CALLS):
+        start = time.perf_counter()
+        res = await execute_outcome(registry, outcome(i), mode=mode, race_top_n=2, hedge=True)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert res["ok"], res
+        launched += res.get("launched", 1)
+
+    latencies.sort()
+    return {
+        "p50": pct(latencies, 0.50),
+        "p95": pct(latencies, 0.95),
+        "p99": pct(latencies, 0.99),
+        "calls_per_outcome": launched / N_CALLS,
+    }
+
+
+async def main():
+    print(f"{N_CALLS} outcomes, 2 stub connectors, {SLOW_PROB:.0%} slow tail {SLOW_MS} ms")
+    for mode in ("sequential", "race"):
+        r = await run(mode)
+        print(
+            f"  {mode:<10}  p50={r['p50']:6.1f} ms  p95={r['p95']:6.1f} ms  "
+            f"p99={r['p99']:6.1f} ms  connector calls/outcome={r['calls_per_outcome']:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Conversation Store
+
+Loads 20,000 open conversations, then runs monitor-style cycles that
+touch 50 of them (new message + state change) and persist. Compares the
+keyed JSONL store against rewriting the whole snapshot with indent=2 (the
+previous _save_conversations), and times reply matching through the
+(platform, user_id) index against a linear scan.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversation import conversation_manager as cm
+
+N_CONVERSATIONS = 20_000
+TOUCHED_PER_CYCLE = 50
+CYCLES = 20
+LOOKUPS = 2_000
+
+
+def seed(manager: cm.ConversationManager, rng: random.Random):
+    for i in range(N_CONVERSATIONS):
+        manager._add_conversation(cm.Conversation(
+            id=f"twitter_{i}_esc_{i:06x}",
+            platform="twitter",
+            user_id=str(1_000_000 + i),
+            username=f"user{i}",
+            contract_id=f"esc_{i:06x}",
+            opportunity_id=f"opp_{i}",
+            messages=[{"from_us": True, "text": "Saw your post about " + "x" * rng.randint(80, 200),
+                       "timestamp": "2026-01-01T00:00:00+00:00", "platform": "twitter"}],
+        ))
+    manager._save_conversations()
+
+
+def touch(manager: cm.ConversationManager, rng: random.Random):
+    for conv in rng.sample(list(manager.conversations.values()), TOUCHED_PER_CYCLE):
+        conv.messages.append({"from_us": False, "text": "how does pricing work?",
+                              "timestamp": "2026-01-02T00:00:00+00:00", "platform": "twitter"})
+        manager._mark_dirty(conv)
+        manager._set_state(conv, cm.ConversationState.IN_CONVERSATION.value)
+
+
+def legacy_save(manager: cm.ConversationManager, path: Path):
+    data = {"conversations": {cid: asdict(c) for cid, c in manager.conversations.items()}}
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+
+
+def main():
+    import logging
+    logging.disable(logging.INFO)
+    rng = random.Random(5)
+    tmp = Path(tempfile.mkdtemp())
+    manager = cm.ConversationManager(store=cm.ConversationStore(tmp / "conversations.jsonl", legacy_file=None))
+    seed(manager, rng)
+
+    t_store = t_legacy = 0.0
+    for _ in range(CYCLES):
+        touch(manager, rng)
+        start = time.perf_counter()
+        manager._save_conversations()
+        t_store += time.perf_counter() - start
+
+        start = time.perf_counter()
+        legacy_save(manager, tmp / "conversations.json")
+        t_legacy += time.perf_counter() - start
+
+    print(f"{N_CONVERSATIONS:,} conversations, {TOUCHED_PER_CYCLE} touched per cycle, {CYCLES} cycles")
+    print(f"  full snapshot rewrite (indent=2): {t_legacy / CYCLES * 1000:8.1f} ms/cycle")
+    print(f"  keyed JSONL append              : {t_store / CYCLES * 1000:8.2f} ms/cycle")
+
+    start = time.perf_counter()
+    manager.store.compact(manager.conversations)
+    print(f"  compaction                      : {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    start = time.perf_counter()
+    reloaded = cm.ConversationManager(store=cm.ConversationStore(tmp / "conversations.jsonl", legacy_file=None))
+    print(f"  reload + index                  : {(time.perf_counter() - start) * 1000:8.1f} ms "
+          f"({len(reloaded.conversations):,} conversations)")
+
+    user_ids = [str(1_000_000 + rng.randrange(N_CONVERSATIONS)) for _ in range(LOOKUPS)]
+    start = time.perf_counter()
+    for uid in user_ids:
+        next((c for c in manager.conversations.values()
+              if c.platform == "twitter" and c.user_id == uid), None)
+    t_scan = time.perf_counter() - start
+    start = time.perf_counter()
+    for uid in user_ids:
+        manager._find_conversation_by_user("twitter", uid)
+    t_index = time.perf_counter() - start
+    print(f"  reply match, linear scan        : {t_scan / LOOKUPS * 1e6:8.1f} us/lookup")
+    print(f"  reply match, index              : {t_index / LOOKUPS * 1e6:8.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Deal Store
+
+Loads 1,000,000 deals into a DealStore (journal in a temp dir) and measures
+put rate, transitions/sec (journaled, re-indexed, published to a change
+feed subscriber), indexed find() against a scan of the deals list, and
+journal replay on restart. The old path is costed per operation: locate
+the deal with a list scan, then serialize the whole deals array for the
+rewrite (before any JSONBin round trip).
+"""
+
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import deal_store as ds
+import ndjson_stream
+from dealgraph import DealState
+
+DEALS = 1_000_000
+AGENTS = 20_000
+BUYERS = 50_000
+TRANSITIONS = 200_000
+SCANS = 20
+CHAIN = [DealState.ACCEPTED, DealState.ESCROW_HELD, DealState.BONDS_STAKED, DealState.IN_PROGRESS]
+
+
+def build(rng: random.Random):
+    now = ds._now()
+    for i in range(DEALS):
+        yield {
+            "id": f"deal_{i:07d}",
+            "intent_id": f"intent_{i:07d}",
+            "state": "PROPOSED",
+            "buyer": f"buyer{rng.randrange(BUYERS)}",
+            "lead_agent": f"agent{rng.randrange(AGENTS)}",
+            "job_value": rng.randint(50, 5000),
+            "created_at": now,
+            "updated_at": now,
+            "jv_partners": [{"username": f"agent{rng.randrange(AGENTS)}", "split": 0.3}] if i % 5 == 0 else [],
+            "escrow": {"status": "pending"},
+            "delivery": {},
+            "state_history": [{"state": "PROPOSED", "at": now, "by": "bench"}],
+        }
+
+
+def main():
+    import logging
+    logging.disable(logging.WARNING)
+    rng = random.Random(44)
+    tmp = Path(tempfile.mkdtemp())
+
+    store = ds.DealStore(tmp / "deals")
+    start = time.perf_counter()
+    for deal in build(rng):
+        store.put(deal)
+    t_put = time.perf_counter() - start
+    deals = store.all()
+    print(f"{DEALS:,} deals ({ndjson_stream.HAS_ORJSON and 'orjson' or 'json'}), "
+          f"journal {store.journal_path.stat().st_size / 1e6:.0f} MB")
+    print(f"  put                          : {DEALS / t_put:10,.0f} deals/s")
+
+    # Old path: scan for the deal, then serialize the whole array for the rewrite
+    ids = [f"deal_{rng.randrange(DEALS):07d}" for _ in range(SCANS)]
+    start = time.perf_counter()
+    for deal_id in ids:
+        next(d for d in deals if d.get("id") == deal_id)
+    t_scan = (time.perf_counter() - start) / SCANS
+    start = time.perf_counter()
+    json.dumps(deals, default=str)
+    t_rewrite = time.perf_counter() - start
+    print(f"  list: scan for deal          : {t_scan * 1000:10.1f} ms/op")
+    print(f"  list: serialize deals array  : {t_rewrite * 1000:10.1f} ms/op "
+          f"(-> {1 / (t_scan + t_rewrite):.2f} transitions/s)")
+
+    feed = []
+    store.subscribe(lambda change: feed.append(change["seq"]) if change["to_state"] == "IN_PROGRESS" else None)
+    progress = {}
+    start = time.perf_counter()
+    for _ in range(TRANSITIONS):
+        deal_id = f"deal_{rng.randrange(DEALS):07d}"
+        step = progress.get(deal_id, 0)
+        if step == len(CHAIN):
+            continue
+        store.transition(deal_id, CHAIN[step], "bench")
+        progress[deal_id] = step + 1
+    t_transition = time.perf_counter() - start
+    done = sum(progress.values())
+    print(f"  store: transition            : {done / t_transition:10,.0f} transitions/s "
+          f"({done:,} ok, {len(feed):,} IN_PROGRESS events to the subscriber)")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        store.update(f"deal_{rng.randrange(DEALS):07d}", lambda d: d["delivery"].update(note="x") or {"ok": True})
+    t_update = (time.perf_counter() - start) / 1000
+    print(f"  store: update (copy+journal) : {1 / t_update:10,.0f} updates/s")
+
+    queries = {
+        "state=IN_PROGRESS": dict(state="IN_PROGRESS"),
+        "lead_agent": dict(lead_agent="agent7"),
+        "buyer+state": dict(buyer="buyer9", state="PROPOSED"),
+        "jv_partner": dict(jv_partner="agent7"),
+    }
+    for name, filters in queries.items():
+        start = time.perf_counter()
+        [d for d in deals if all(ds._state(d.get(f)) == v for f, v in filters.items() if f != "jv_partner")
+         and ("jv_partner" not in filters or any(p["username"] == filters["jv_partner"] for p in d["jv_partners"]))]
+        t_list = time.perf_counter() - start
+        start = time.perf_counter()
+        found = store.find(**filters)
+        t_find = time.perf_counter() - start
+        print(f"  find {name:<24}: {t_find * 1000:8.2f} ms vs list scan {t_list * 1000:8.1f} ms ({len(found):,} deals)")
+
+    start = time.perf_counter()
+    batch = store.changes(since=store.get_stats()["seq"] - 1000)
+    print(f"  changes(since=latest-1000)   : {(time.perf_counter() - start) * 1000:10.2f} ms ({len(batch['changes']):,} entries)")
+
+    store.close()
+    del store, deals, found, progress
+    gc.collect()
+    start = time.perf_counter()
+    reopened = ds.DealStore(tmp / "deals")
+    t_replay = time.perf_counter() - start
+    print(f"  restart: journal replay      : {t_replay:10.2f} s ({reopened.get_stats()['replayed']:,} records)")
+    start = time.perf_counter()
+    reopened.compact()
+    reopened.close()
+    t_compact = time.perf_counter() - start
+    del reopened
+    gc.collect()
+    start = time.perf_counter()
+    ds.DealStore(tmp / "deals")
+    t_snapshot = time.perf_counter() - start
+    print(f"  compact / load from snapshot : {t_compact:10.2f} s / {t_snapshot:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
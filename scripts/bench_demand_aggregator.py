@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Demand Aggregator
+
+Simulates a year of hourly discovery cycles across 1,000 SKUs through the
+append-only demand store (record + cluster query every cycle), then times
+a few cycles of the previous JSON-rewrite implementation at steady state
+(30 days of history) for comparison.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spawn import demand_aggregator as da
+
+N_SKUS = 1000
+SKUS_PER_CYCLE = 60
+CYCLE_HOURS = 1
+DAYS = 365
+
+
+def batch(rng: random.Random, sku_id: str, ts: datetime) -> dict:
+    n = rng.randint(1, 4)
+    urgency = dict(Counter(rng.choice(["immediate", "normal", "normal", "flexible"]) for _ in range(n)))
+    return {
+        "sku_id": sku_id,
+        "ts": ts.isoformat(),
+        "t": ts.timestamp(),
+        "count": n,
+        "avg_value": round(rng.uniform(30, 500), 2),
+        "urgency_dist": urgency,
+        "platforms": dict(Counter(rng.choice(["reddit", "hn", "upwork"]) for _ in range(n))),
+        "cycle_id": f"c{ts:%Y%m%d%H}",
+    }
+
+
+def query_clusters(store: da.DemandStore) -> int:
+    """Same work as get_demand_clusters() over the store"""
+    return sum(1 for sku_id in store.sku_ids() if store.window(sku_id, "7d").meets_thresholds())
+
+
+def run_store(rng: random.Random) -> None:
+    tmp = Path(tempfile.mkdtemp())
+    store = da.DemandStore(events_dir=tmp / "demand_events", legacy_file=None)
+    skus = [f"sku_{i}" for i in range(N_SKUS)]
+
+    start = datetime.now(timezone.utc) - timedelta(days=DAYS)
+    cycles = DAYS * 24 // CYCLE_HOURS
+    records = 0
+    elapsed = 0.0   # record + query only, excludes generating the synthetic batches
+    for c in range(cycles):
+        ts = start + timedelta(hours=c * CYCLE_HOURS)
+        batches = [batch(rng, sku, ts) for sku in rng.sample(skus, SKUS_PER_CYCLE)]
+        t0 = time.perf_counter()
+        store.append(batches, ts.timestamp())
+        query_clusters(store)
+        elapsed += time.perf_counter() - t0
+        records += len(batches)
+
+    files = list((tmp / "demand_events").glob("*.jsonl"))
+    size_mb = sum(f.stat().st_size for f in files) / 1e6
+    print(f"append-only store: {cycles:,} cycles, {records:,} batches in {elapsed:.1f}s "
+          f"({elapsed / cycles * 1000:.2f} ms/cycle)")
+    print(f"  on disk after rotation: {len(files)} day files, {size_mb:.1f} MB")
+
+
+def run_legacy(rng: random.Random, path: str, cycles: int = 5) -> None:
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("legacy_demand", path)
+    legacy = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(legacy)
+
+    tmp = Path(tempfile.mkdtemp())
+    legacy.DATA_DIR = tmp
+    legacy.DEMAND_FILE = tmp / "demand_signals.json"
+
+    # Steady state: 30 days of hourly history
+    now = datetime.now(timezone.utc)
+    data = {}
+    for h in range(30 * 24):
+        ts = now - timedelta(hours=30 * 24 - h)
+        for sku in rng.sample(range(N_SKUS), SKUS_PER_CYCLE):
+            b = batch(rng, f"sku_{sku}", ts)
+            data.setdefault(b.pop("sku_id"), {"events": []})["events"].append(b)
+    legacy.DEMAND_FILE.write_text(json.dumps(data, indent=2))
+
+    opps = [{"_matched_sku": f"sku_{rng.randrange(N_SKUS)}", "value": 120, "_urgency": "normal",
+             "platform": "reddit"} for _ in range(SKUS_PER_CYCLE * 3)]
+    t0 = time.perf_counter()
+    for c in range(cycles):
+        legacy.record_demand(opps, f"legacy{c}")
+        legacy.get_demand_clusters()
+    per_cycle = (time.perf_counter() - t0) / cycles
+    print(f"previous JSON rewrite at 30-day steady state: {per_cycle * 1000:.0f} ms/cycle "
+          f"(~{per_cycle * DAYS * 24 / CYCLE_HOURS / 60:.0f} min/year)")
+
+
+def main():
+    import logging
+    logging.disable(logging.INFO)
+    rng = random.Random(11)
+    run_store(rng)
+    if len(sys.argv) > 1:
+        # Optional: path to the previous demand_aggregator.py for comparison
+        run_legacy(rng, sys.argv[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Discovery Keyword Filters
+
+Runs synthetic opportunities through intent scoring, safety screening
+and the fulfillability filter, and reports opps/sec. Also checks the
+shared keyword matcher against plain substring tests for every group.
+"""
+
+import copy
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from discovery.keyword_matcher import get_keyword_matcher
+from discovery.intent_signals import IntentScorer
+from discovery.safety_filter import SafetyFilter
+from discovery.fulfillability_filter import filter_fulfillable
+
+N_OPPS = 5_000
+
+FILLER = (
+    "hello there we have a small thing that could use some attention from "
+    "someone with the right background please read the details below thanks"
+).split()
+
+
+def build_opps(matcher):
+    vocab = sorted({kw for kws in matcher.groups.values() for kw in kws})
+    opps = []
+    for i in range(N_OPPS):
+        words = random.choices(FILLER, k=random.randint(20, 200))
+        for _ in range(random.randint(0, 6)):
+            words.insert(random.randrange(len(words) + 1), random.choice(vocab).upper() if random.random() < 0.2 else random.choice(vocab))
+        opps.append({
+            "id": f"opp_{i}",
+            "title": " ".join(words[:8]),
+            "body": " ".join(words[8:]),
+            "platform": random.choice(["reddit", "upwork", "craigslist", "hackernews"]),
+            "value": random.choice([0, 5, 150, 2500]),
+        })
+    return opps
+
+
+def check_parity(matcher, opps):
+    for opp in opps:
+        text = f"{opp['title']} {opp['body']}"
+        hits = matcher.scan(text)
+        lower = text.lower()
+        for group, keywords in matcher.groups.items():
+            expected = sum(1 for kw in keywords if kw in lower)
+            assert matcher.count(hits, group) == expected, (group, text)
+
+
+def main():
+    random.seed(7)
+    logging.disable(logging.WARNING)
+    matcher = get_keyword_matcher()
+    opps = build_opps(matcher)
+
+    check_parity(matcher, opps[:1000])
+    matcher._scan_cached.cache_clear()
+
+    scorer, safety = IntentScorer(), SafetyFilter()
+    work = copy.deepcopy(opps)
+
+    t0 = time.perf_counter()
+    for opp in work:
+        scorer.enrich_intent(opp)
+        safety.risk_screen(opp)
+    kept = filter_fulfillable(work)
+    elapsed = time.perf_counter() - t0
+
+    print("=" * 60)
+    print(f"DISCOVERY FILTER BENCHMARK ({N_OPPS:,} opps)")
+    print("=" * 60)
+    print(f"keywords compiled: {len(matcher._implied)} in {len(matcher.groups)} groups ({matcher.backend})")
+    print(f"intent + safety + fulfillability: {N_OPPS / elapsed:,.0f} opps/sec ({elapsed * 1000:.1f} ms)")
+    print(f"fulfillable kept: {len(kept)}")
+    print(f"scan cache: {matcher.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
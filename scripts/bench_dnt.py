@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Do Not Touch Registry
+
+Checks 1M URLs drawn from a pool of discovery-style URLs through
+is_blocked() and the check_many() batch path, plus a cold pass where
+every URL is new, and reports checks/sec.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compliance.do_not_touch import DNTRegistry
+
+N_CHECKS = 1_000_000
+POOL_SIZE = 50_000
+
+HOSTS = ["www.reddit.com", "news.ycombinator.com", "www.upwork.com", "github.com",
+         "remoteok.com", "weworkremotely.com", "www.indeed.com", "dev.to"]
+BLOCKED = ["https://m.facebook.com/groups/{}", "https://www.fbi.gov/{}", "https://army.mil/{}",
+           "https://warez-host.net/{}", "https://foo.gov.uk/{}"]
+
+
+def build_pool(rng: random.Random, n: int, tag: str = "") -> list:
+    pool = []
+    for i in range(n):
+        if rng.random() < 0.05:
+            pool.append(rng.choice(BLOCKED).format(f"{tag}{i}"))
+        else:
+            pool.append(f"https://{rng.choice(HOSTS)}/jobs/{tag}{i}?ref=feed")
+    return pool
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(7)
+    pool = build_pool(rng, POOL_SIZE)
+    urls = [rng.choice(pool) for _ in range(N_CHECKS)]
+    cold = build_pool(rng, 200_000, tag="c")
+
+    dnt = DNTRegistry()
+    dnt.check_many(pool)  # warm caches
+
+    is_blocked = dnt.is_blocked
+    t_single = timed(lambda: [is_blocked(u) for u in urls])
+    t_batch = timed(lambda: dnt.check_many(urls))
+    t_cold = timed(lambda: dnt.check_many(cold))
+
+    blocked = sum(1 for b, _ in dnt.check_many(urls) if b)
+    print(f"{N_CHECKS:,} checks over {POOL_SIZE:,} distinct URLs ({blocked / N_CHECKS:.1%} blocked)")
+    print(f"  is_blocked()        : {N_CHECKS / t_single:>12,.0f} checks/sec")
+    print(f"  check_many()        : {N_CHECKS / t_batch:>12,.0f} checks/sec")
+    print(f"  cold (unique URLs)  : {len(cold) / t_cold:>12,.0f} checks/sec")
+
+
+if __name__ == "__main__":
+    main()
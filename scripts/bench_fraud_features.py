@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Fraud Risk Features
+
+Fills the action log with 200,000 checks across 10,000 users and times one
+fraud check the old way (scan the whole log for the user's velocity,
+failed-payment and withdrawal signals, parsing every timestamp; baseline
+reimplemented below with well-formed timestamps, since the original crashed
+on the second check for a user) against reading the user's precomputed
+features from the risk feature engine. Then times batch re-scoring of all
+users (first sync, then an incremental re-sync after a few new ledger
+entries each) and the profile/stats reads that used to scan the log.
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fraud_detector as fd
+from risk_features import RiskFeatureEngine
+
+USERS = 10_000
+ACTIONS = 200_000
+LEDGER_PER_USER = 50
+CHECKS = 200
+ACTION_TYPES = ("purchase", "withdrawal", "bid", "large_purchase")
+BASES = ("revenue", "payout", "stripe_refund", "slo_breach_refund", "payment_failed", "revenue")
+
+
+def scan_check(log, username, action_type, metadata, user_data):
+    """Signals 1, 2 and 5 of check_fraud_signals() before the feature engine"""
+    now = datetime.now(timezone.utc)
+    recent = [a for a in log if a["username"] == username
+              and (now - datetime.fromisoformat(a["timestamp"])).total_seconds() < 3600]
+    failed = sum(1 for a in log if a["username"] == username and a.get("failed_payment"))
+    score = 30 if len(recent) > fd.MAX_ACTIONS_PER_HOUR else 0
+    score += 25 if failed >= fd.MAX_FAILED_PAYMENTS else 0
+    if action_type == "withdrawal":
+        past = [a for a in log if a["username"] == username and a["action_type"] == "withdrawal"]
+        if past:
+            avg = sum(float(a["metadata"].get("amount", 0)) for a in past) / len(past)
+            score += 10 if float(metadata.get("amount", 0)) > avg * 5 else 0
+    return score
+
+
+def scan_profile(log, username):
+    actions = [a for a in log if a["username"] == username]
+    return len(actions), len([a for a in actions if a["risk_score"] >= 40])
+
+
+def user_record(i, rng, start):
+    ledger = [{"ts": (start + timedelta(hours=rng.random() * 24 * 45)).isoformat(), "amount": round(rng.lognormvariate(3, 1), 2),
+               "currency": "USD", "basis": rng.choice(BASES)} for _ in range(LEDGER_PER_USER)]
+    ledger.sort(key=lambda e: e["ts"])
+    return {"username": f"user{i}", "outcomeScore": rng.randint(0, 100), "ownership": {"ledger": ledger}}
+
+
+def main():
+    rng = random.Random(49)
+    now = time.time()
+    start = datetime.now(timezone.utc) - timedelta(days=45)
+    engine = RiskFeatureEngine()
+
+    log = []
+    t0 = time.perf_counter()
+    for i in range(ACTIONS):
+        username = f"user{rng.randrange(USERS)}"
+        action_type = rng.choice(ACTION_TYPES)
+        ts = now - rng.random() * 7200
+        amount = round(rng.lognormvariate(4, 1), 2)
+        risk = rng.choice((0, 0, 10, 20, 45))
+        log.append({"username": username, "action_type": action_type, "metadata": {"amount": amount},
+                    "timestamp": datetime.fromtimestamp(ts, timezone.utc).isoformat(), "risk_score": risk})
+        engine.record_check(username, action_type, risk, [], amount=amount if action_type == "withdrawal" else None, ts=ts)
+    print(f"{ACTIONS:,} logged checks over {USERS:,} users ({(time.perf_counter() - t0) / ACTIONS * 1e6:.1f} us/event incl. setup)")
+
+    targets = [f"user{rng.randrange(USERS)}" for _ in range(CHECKS)]
+    meta = {"amount": 250.0}
+    user_data = {"outcomeScore": 50}
+
+    t0 = time.perf_counter()
+    old_scores = [scan_check(log, u, "withdrawal", meta, user_data) for u in targets[:20]]
+    t_scan = (time.perf_counter() - t0) / 20
+    t0 = time.perf_counter()
+    new_scores = []
+    for u in targets:
+        features = engine.features(u, 250.0)
+        new_scores.append(fd._score_signals(features, user_data, "withdrawal", meta)[0])
+    t_new = (time.perf_counter() - t0) / CHECKS
+    agree = sum(1 for a, b in zip(old_scores, new_scores) if a == b)
+    print(f"  fraud check signals      : scan {t_scan * 1000:8.2f} ms vs features {t_new * 1000:6.3f} ms "
+          f"({t_scan / t_new:,.0f}x; velocity/withdrawal scores agree {agree}/20)")
+
+    t0 = time.perf_counter()
+    for u in targets[:20]:
+        scan_profile(log, u)
+    t_scan = (time.perf_counter() - t0) / 20
+    t0 = time.perf_counter()
+    for u in targets:
+        engine.features(u)
+    t_new = (time.perf_counter() - t0) / CHECKS
+    print(f"  risk profile             : scan {t_scan * 1000:8.2f} ms vs features {t_new * 1000:6.3f} ms")
+
+    users = [user_record(i, rng, start) for i in range(USERS)]
+
+    def score(features, user):
+        risk_score, signals = fd._score_signals(features, user, "rescore", {})
+        return {"risk_score": risk_score, "signals": signals}
+
+    result = engine.rescore_all(users, score)
+    first = result["elapsed_seconds"]
+    for user in users:
+        ledger = user["ownership"]["ledger"]
+        for _ in range(3):
+            ledger.append({"ts": datetime.now(timezone.utc).isoformat(), "amount": 20.0, "currency": "USD", "basis": "revenue"})
+    result = engine.rescore_all(users, score)
+    stats = engine.get_stats()
+    print(f"  rescore {USERS:,} users     : first sync {first:6.2f} s ({USERS * LEDGER_PER_USER:,} ledger entries), "
+          f"re-sync +3/user {result['elapsed_seconds']:6.2f} s ({result['review']:,} review, {result['block']:,} block)")
+    print(f"  freshness                : synced age p95 {stats['synced_age_s']['p95']} s, "
+          f"avg ingest lag {stats['avg_ingest_lag_s']} s over {stats['events']:,} events")
+
+
+if __name__ == "__main__":
+    main()
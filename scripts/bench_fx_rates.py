@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark - FX Rate Service
+
+Serves the rates API from an httpx.MockTransport with 150 ms simulated
+latency. Compares the old per-request pattern (new client + fetch, then
+convert) against conversions from the service's in-memory table, a
+pricing page through convert_many() vs one convert_currency() per cell,
+backdated lookups in a full history ring, and 1,000 concurrent refresh()
+calls against the single-flight guard.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+import currency_engine as ce
+
+API_LATENCY = 0.15
+REQUESTS = 20
+CONVERSIONS = 100_000
+PRICES = 500
+CURRENCIES = ["USD", "EUR", "GBP"]
+CONCURRENT_REFRESHES = 1_000
+
+fetches = 0
+
+
+async def handler(request: httpx.Request) -> httpx.Response:
+    global fetches
+    fetches += 1
+    await asyncio.sleep(API_LATENCY)
+    return httpx.Response(200, json={"date": "2026-01-01", "rates": {"EUR": 0.91, "GBP": 0.78, "JPY": 151.2}})
+
+
+async def main():
+    transport = httpx.MockTransport(handler)
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        async with httpx.AsyncClient(transport=transport, timeout=5) as client:
+            data = (await client.get(ce.FX_API_URL)).json()
+        ce.convert_currency(100, "USD", "EUR", {"USD": {"EUR": data["rates"]["EUR"]}})
+    t_old = (time.perf_counter() - start) / REQUESTS
+
+    service = ce.get_fx_service()
+    service._client = httpx.AsyncClient(transport=transport, timeout=5)
+    await service.refresh()
+    start = time.perf_counter()
+    for _ in range(CONVERSIONS):
+        ce.convert_currency(100, "USD", "EUR")
+    t_new = (time.perf_counter() - start) / CONVERSIONS
+    print(f"  fetch-then-convert (old)     : {t_old * 1000:10.1f} ms/conversion")
+    print(f"  convert from memory          : {t_new * 1e6:10.2f} us/conversion")
+
+    prices = [round(4.99 + i * 0.5, 2) for i in range(PRICES)]
+    start = time.perf_counter()
+    for _ in range(20):
+        [[ce.convert_currency(p, "USD", c)["to_amount"] for p in prices] for c in CURRENCIES]
+    t_cells = (time.perf_counter() - start) / 20
+    start = time.perf_counter()
+    for _ in range(20):
+        ce.convert_many(prices, "USD", CURRENCIES)
+    t_many = (time.perf_counter() - start) / 20
+    print(f"  pricing page {PRICES}x{len(CURRENCIES)} cells     : {t_cells * 1000:8.2f} ms per-cell vs "
+          f"{t_many * 1000:.2f} ms convert_many")
+
+    now = time.time()
+    for i in range(2 * ce.FX_HISTORY_SIZE):
+        service._record(ce._cross_rates({"EUR": 0.9 + i * 1e-5, "GBP": 0.78}), None)
+        service._history_ts[-1] = now - (2 * ce.FX_HISTORY_SIZE - i) * 3600
+    start = time.perf_counter()
+    for i in range(CONVERSIONS):
+        service.convert_at(100, "USD", "EUR", now - (i % 700) * 3600)
+    t_at = (time.perf_counter() - start) / CONVERSIONS
+    label = f"convert_at ({len(service._history):,}-entry ring)"
+    print(f"  {label:<29}: {t_at * 1e6:10.2f} us/conversion")
+
+    before = fetches
+    start = time.perf_counter()
+    await asyncio.gather(*[service.refresh() for _ in range(CONCURRENT_REFRESHES)])
+    t_flight = time.perf_counter() - start
+    label = f"{CONCURRENT_REFRESHES:,} concurrent refresh()"
+    print(f"  {label:<29}: {fetches - before} fetch in {t_flight * 1000:.0f} ms "
+          f"({service.stats['joined_inflight']:,} joined)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
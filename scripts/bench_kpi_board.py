@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark - KPI Board
+
+Emits 1M outcome events spread over 30 days into a KPIBoard and reports
+emit throughput, retained memory (tracemalloc) against holding every raw
+event (the previous _events/_payback_days lists), get_trend() latency at
+each rollup resolution, and merging two workers' boards.
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reporting.kpi_board import KPIBoard
+
+N_EVENTS = 1_000_000
+SPAN_SECONDS = 30 * 86400
+ENGINES = [f"engine_{i}" for i in range(12)]
+
+
+def events(rng: random.Random, n: int, now: float):
+    for i in range(n):
+        yield {
+            "ts": now - SPAN_SECONDS + i * SPAN_SECONDS / n,
+            "opp_id": f"opp_{i}",
+            "revenue": rng.uniform(0, 400),
+            "spend": rng.uniform(0, 60),
+            "tokens": rng.randint(200, 8000),
+            "engine": rng.choice(ENGINES),
+            "success": rng.random() < 0.4,
+            "assured": rng.random() < 0.2,
+            "refunded": rng.random() < 0.03,
+            "payback_days": rng.randint(1, 90) if rng.random() < 0.3 else 0,
+        }
+
+
+def main():
+    rng = random.Random(9)
+    now = time.time()
+
+    board = KPIBoard()
+    batch = list(events(rng, N_EVENTS, now))
+    start = time.perf_counter()
+    for e in batch:
+        board.emit(e)
+    t_emit = time.perf_counter() - start
+    del batch
+
+    # Retained memory: a fresh board fed from a generator under tracemalloc
+    tracemalloc.start()
+    sized = KPIBoard()
+    for e in events(random.Random(9), N_EVENTS, now):
+        sized.emit(e)
+    board_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    del sized
+
+    tracemalloc.start()
+    raw = list(events(random.Random(9), 100_000, now))
+    raw_mb = tracemalloc.get_traced_memory()[0] / 1e6 * N_EVENTS / 100_000
+    del raw
+    tracemalloc.stop()
+
+    print(f"{N_EVENTS:,} events over 30 days, {len(ENGINES)} engines")
+    print(f"  emit                  : {N_EVENTS / t_emit:>10,.0f} events/sec")
+    print(f"  board memory          : {board_mb:>10.2f} MB (raw event list would hold ~{raw_mb:,.0f} MB)")
+
+    for hours in (2, 24, 24 * 30):
+        start = time.perf_counter()
+        for _ in range(1000):
+            points = board.get_trend("win_rate", hours)
+        per_call = (time.perf_counter() - start) / 1000 * 1e6
+        print(f"  get_trend({hours:>3}h)      : {per_call:>10.1f} us ({len(points)} points)")
+
+    other = KPIBoard()
+    for e in events(random.Random(10), 100_000, now):
+        other.emit(e)
+    start = time.perf_counter()
+    board.merge(other.export_state())
+    print(f"  merge worker board    : {(time.perf_counter() - start) * 1000:>10.1f} ms "
+          f"(total_outcomes={board.get_kpis()['total_outcomes']:,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Discovery Parser Offload
+
+Parses a mix of small and large synthetic listing pages concurrently,
+once with every page parsed inline and once with large pages routed to
+the process pool, and reports pages/sec and event-loop lag for each.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from discovery.parser_executor import ParserExecutor, LoopLagMonitor
+
+N_PAGES = 60
+CONCURRENCY = 8
+
+
+def build_page(n_items: int) -> str:
+    rows = []
+    for i in range(n_items):
+        words = " ".join(random.choices(["need", "react", "developer", "budget", "urgent", "logo", "fix", "api"], k=40))
+        rows.append(f'<article class="job"><a href="/job/{i}">Job posting number {i}</a><p>{words}</p></article>')
+    return "<html><body>" + "".join(rows) + "</body></html>"
+
+
+async def run(pages, processes: int) -> dict:
+    executor = ParserExecutor({'processes': processes, 'monitor_loop_lag': False})
+    executor.start()
+    await asyncio.sleep(0.5)  # let workers finish warming
+
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor.start()
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    async def parse(page):
+        async with sem:
+            return await executor.parse('html', page, 'bench', 'https://example.com')
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(parse(p) for p in pages))
+    elapsed = time.perf_counter() - t0
+
+    await asyncio.sleep(monitor.interval * 2)  # record the wakeup that was blocked last
+    await monitor.stop()
+    await executor.close()
+    return {
+        'pages_per_sec': len(pages) / elapsed,
+        'opps': sum(len(r) for r in results),
+        'lag': monitor.get_stats(),
+        'offloaded': executor.stats['parsed_offloaded'],
+    }
+
+
+def main():
+    random.seed(3)
+    pages = [build_page(random.choice([5, 20, 400, 1200])) for _ in range(N_PAGES)]
+    total_kb = sum(len(p) for p in pages) / 1024
+
+    print("=" * 60)
+    print(f"PARSER OFFLOAD BENCHMARK ({N_PAGES} pages, {total_kb:,.0f} KB)")
+    print("=" * 60)
+    for label, procs in (("inline", 0), ("offload", min(4, os.cpu_count() or 1))):
+        r = asyncio.run(run(pages, procs))
+        lag = r['lag']
+        print(
+            f"{label:8s} {r['pages_per_sec']:7.1f} pages/sec  "
+            f"loop lag p50={lag['lag_ms_p50']}ms p95={lag['lag_ms_p95']}ms max={lag['lag_ms_max']}ms  "
+            f"(offloaded {r['offloaded']}, opps {r['opps']})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Payment Executor
+
+Points the Stripe SDK at a local Stripe stub (threaded HTTP server: 50 ms
+per request, 429 above 100 requests/sec, Idempotency-Key replay) and
+releases 200 matured escrows the old way (one auto_timeout_release() after
+another) and through auto_timeout_release_batch(). Then overdrives the
+stub to exercise 429 backoff, interrupts a batch half way and resumes it
+from its checkpoint (checking every payment intent is captured exactly
+once), and compares execute_batch_payment() against the per-payment user
+scan it replaced.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import stripe
+
+import batch_payments as bp
+import escrow_lite as el
+from currency_engine import credit_currency
+from payment_executor import PaymentExecutor
+
+STUB_LATENCY = 0.05
+STUB_MAX_RPS = 100
+ESCROWS = 200
+USERS = 20_000
+PAYMENTS = 2_000
+
+
+class StripeStub(BaseHTTPRequestHandler):
+    lock = threading.Lock()
+    window = deque()
+    replies = {}
+    captures = {}
+    rejected = 0
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        key = self.headers.get("Idempotency-Key")
+        match = re.fullmatch(r"/v1/payment_intents/(\w+)/capture", self.path)
+        with self.lock:
+            now = time.monotonic()
+            while self.window and now - self.window[0] > 1:
+                self.window.popleft()
+            if len(self.window) >= STUB_MAX_RPS:
+                StripeStub.rejected += 1
+                return self._reply(429, {"error": {"type": "invalid_request_error", "code": "rate_limit",
+                                                   "message": "Too many requests"}})
+            self.window.append(now)
+            if key in self.replies:
+                return self._reply(200, self.replies[key])
+        time.sleep(STUB_LATENCY)
+        if not match:
+            return self._reply(404, {"error": {"type": "invalid_request_error", "message": "Unknown path"}})
+        pi_id = match.group(1)
+        body = {"id": pi_id, "object": "payment_intent", "status": "succeeded", "amount": 5000, "amount_received": 5000}
+        with self.lock:
+            self.captures[pi_id] = self.captures.get(pi_id, 0) + 1
+            if key:
+                self.replies[key] = body
+        self._reply(200, body)
+
+
+def intents(prefix: str):
+    delivered = (datetime.now(timezone.utc) - timedelta(days=10)).isoformat()
+    return [
+        {"id": f"{prefix}_{i}", "status": "DELIVERED", "delivered_at": delivered, "payment_intent_id": f"pi_{prefix}{i}"}
+        for i in range(ESCROWS)
+    ]
+
+
+def scan_execute(batch, users):
+    """The per-payment user scan execute_batch_payment() did"""
+    for payment in batch["payments"]:
+        username = payment["username"]
+        for u in users:
+            if u.get("username") == username or u.get("consent", {}).get("username") == username:
+                credit_currency(u, float(payment["amount"]), payment["currency"], payment["reason"])
+                break
+
+
+async def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StripeStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stripe.api_base = f"http://127.0.0.1:{server.server_port}"
+    stripe.api_key = "sk_test_stub"
+    stripe.max_network_retries = 0
+    tmp = tempfile.mkdtemp()
+    print(f"Stripe stub: {STUB_LATENCY * 1000:.0f} ms/request, 429 above {STUB_MAX_RPS}/s")
+
+    start = time.perf_counter()
+    for intent in intents("seq"):
+        assert (await el.auto_timeout_release(intent))["ok"]
+    t_seq = time.perf_counter() - start
+    print(f"  {ESCROWS} releases, sequential       : {t_seq:6.2f} s ({ESCROWS / t_seq:6.1f}/s)")
+
+    executor = PaymentExecutor(concurrency=16, rate=80, checkpoint_dir=tmp)
+    result = await el.auto_timeout_release_batch(intents("batch"), executor=executor)
+    print(f"  {ESCROWS} releases, executor 16/80rps: {result['elapsed_seconds']:6.2f} s "
+          f"({ESCROWS / result['elapsed_seconds']:6.1f}/s, {result['released']} released)")
+
+    overdriven = PaymentExecutor(concurrency=64, rate=400, checkpoint_dir=tmp, retry_base=0.2)
+    rejected = StripeStub.rejected
+    result = await el.auto_timeout_release_batch(intents("hot"), executor=overdriven)
+    stats = overdriven.get_stats()
+    print(f"  {ESCROWS} releases, overdriven 64/400: {result['elapsed_seconds']:6.2f} s "
+          f"({result['released']} released, {StripeStub.rejected - rejected} x 429, {stats['retries']} retries)")
+
+    resumable = PaymentExecutor(concurrency=8, rate=80, checkpoint_dir=tmp)
+    batch = intents("resume")
+    try:
+        await asyncio.wait_for(el.auto_timeout_release_batch(batch, executor=resumable), timeout=1.0)
+    except asyncio.TimeoutError:
+        pass
+    before = sum(StripeStub.captures.get(i["payment_intent_id"], 0) for i in batch)
+    result = await el.auto_timeout_release_batch(intents("resume"), executor=resumable)
+    after = [StripeStub.captures.get(i["payment_intent_id"], 0) for i in batch]
+    resumed = sum(1 for r in result["results"] if r.get("resumed"))
+    print(f"  interrupted after 1 s, resumed      : {before} captured before, {resumed} skipped on resume, "
+          f"{result['released']} released, captures per intent {min(after)}..{max(after)}")
+
+    users = [{"username": f"agent{i}", "ownership": {}} for i in range(USERS)]
+    payments = [{"username": f"agent{(i * 7919) % USERS}", "amount": 25, "currency": "USD", "reason": "payout"}
+                for i in range(PAYMENTS)]
+    batch = await bp.create_batch_payment(payments, "bench_scan")
+    start = time.perf_counter()
+    scan_execute(batch, users)
+    t_scan = time.perf_counter() - start
+    batch = await bp.create_batch_payment(payments, "bench_index")
+    start = time.perf_counter()
+    batch = await bp.execute_batch_payment(batch, users, credit_currency, PaymentExecutor(checkpoint_dir=tmp))
+    t_index = time.perf_counter() - start
+    credited = sum(len(u["ownership"].get("ledger", [])) for u in users)
+    start = time.perf_counter()
+    again = await bp.execute_batch_payment(batch, users, credit_currency, PaymentExecutor(checkpoint_dir=tmp))
+    t_again = time.perf_counter() - start
+    recredited = sum(len(u["ownership"].get("ledger", [])) for u in users) - credited
+    print(f"  {PAYMENTS:,} credits over {USERS:,} users   : scan {t_scan * 1000:7.1f} ms vs index {t_index * 1000:6.1f} ms; "
+          f"re-submit {t_again * 1000:.1f} ms ({again['successful']:,} kept, {recredited} credited again)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Batch Pricing
+
+Quotes 10k items through the per-item paths and the batch APIs of
+pricing_oracle, monetization.pricing_arm and pricing.price_arm_v2,
+checks the results are identical and reports quotes/sec.
+
+Agent lookups are served from an in-process table so the numbers
+measure pricing work, not the network.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pricing_oracle
+from monetization.pricing_arm import PricingArm
+from pricing.price_arm_v2 import PriceArmV2
+
+N_ITEMS = 10_000
+N_AGENTS = 200
+N_BUYERS = 500
+
+
+def build_agents():
+    agents = {}
+    for a in range(N_AGENTS):
+        agents[f"agent_{a}"] = {
+            "active_projects": random.randint(0, 7),
+            "invoices": [
+                {"buyer": f"buyer_{random.randrange(N_BUYERS)}", "status": random.choice(["paid", "open"])}
+                for _ in range(random.randint(0, 20))
+            ]
+        }
+    return agents
+
+
+def build_items():
+    items = []
+    for _ in range(N_ITEMS):
+        context = {"active_intents": random.randint(0, 15)}
+        if random.random() < 0.6:
+            context["buyer"] = f"buyer_{random.randrange(N_BUYERS)}"
+        if random.random() < 0.3:
+            context["similar_agents"] = [{"price": random.uniform(50, 500)} for _ in range(3)]
+        items.append({
+            "base_price": round(random.uniform(20, 2000), 2),
+            "agent": f"agent_{random.randrange(N_AGENTS)}",
+            "context": context
+        })
+    return items
+
+
+def rate(n, seconds):
+    return f"{n / seconds:,.0f} quotes/sec ({seconds * 1000:.1f} ms)"
+
+
+async def bench_oracle(items, agents):
+    async def fake_agent_data(agent, client=None):
+        await asyncio.sleep(0)
+        return agents.get(agent, {})
+
+    pricing_oracle._get_agent_data = fake_agent_data
+
+    t0 = time.perf_counter()
+    single = [await pricing_oracle.calculate_dynamic_price(i["base_price"], i["agent"], i["context"]) for i in items]
+    t1 = time.perf_counter()
+    batch = await pricing_oracle.price_batch(items)
+    t2 = time.perf_counter()
+
+    assert single == batch, "pricing_oracle batch results differ from per-item path"
+    print(f"pricing_oracle   per-item: {rate(len(items), t1 - t0)}")
+    print(f"pricing_oracle   batch:    {rate(len(items), t2 - t1)}")
+
+
+def bench_arm():
+    arm = PricingArm()
+    base = [round(random.uniform(20, 2000), 2) for _ in range(N_ITEMS)]
+    fx = [random.choice([1.0, 0.92, 0.79, 1.36]) for _ in range(N_ITEMS)]
+    load = [random.random() for _ in range(N_ITEMS)]
+    wave = [random.random() for _ in range(N_ITEMS)]
+    cogs = [random.uniform(0, 1500) for _ in range(N_ITEMS)]
+
+    t0 = time.perf_counter()
+    single = [arm.suggest(base[i], fx_rate=fx[i], load_pct=load[i], wave_score=wave[i], cogs=cogs[i]) for i in range(N_ITEMS)]
+    t1 = time.perf_counter()
+    batch = arm.suggest_batch(base, fx_rate=fx, load_pct=load, wave_score=wave, cogs=cogs)
+    t2 = time.perf_counter()
+
+    assert single == batch, "PricingArm batch results differ from per-item path"
+    print(f"PricingArm       per-item: {rate(N_ITEMS, t1 - t0)}")
+    print(f"PricingArm       batch:    {rate(N_ITEMS, t2 - t1)}")
+
+
+def bench_arm_v2():
+    arm = PriceArmV2()
+    items = [{
+        "opportunity": {
+            "platform": random.choice(["upwork", "fiverr", "linkedin", "direct", "github", "reddit"]),
+            "urgency": random.choice(["critical", "high", "normal", "low", "flexible"]),
+            "value": random.uniform(10, 8000),
+            "description": "x" * random.randint(0, 3000)
+        },
+        "base_value": round(random.uniform(20, 5000), 2),
+        "risk_data": {"overall_risk": random.random()}
+    } for _ in range(N_ITEMS)]
+
+    t0 = time.perf_counter()
+    single = [arm.quote(i["opportunity"], i["base_value"], i["risk_data"]) for i in items]
+    t1 = time.perf_counter()
+    batch = arm.quote_batch(items)
+    t2 = time.perf_counter()
+
+    assert single == batch, "PriceArmV2 batch results differ from per-item path"
+    print(f"PriceArmV2       per-item: {rate(N_ITEMS, t1 - t0)}")
+    print(f"PriceArmV2       batch:    {rate(N_ITEMS, t2 - t1)}")
+
+
+def main():
+    random.seed(42)
+    print("=" * 60)
+    print(f"BATCH PRICING BENCHMARK ({N_ITEMS:,} items)")
+    print("=" * 60)
+    asyncio.run(bench_oracle(build_items(), build_agents()))
+    bench_arm()
+    bench_arm_v2()
+
+
+if __name__ == "__main__":
+    main()
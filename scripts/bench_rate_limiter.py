@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Unified Rate Limiter
+
+1. Combined rate: three components (collector, robots guard, headless)
+   hit one host, each with its own limiter vs one shared limiter.
+2. Fairness: 50 concurrent waiters on one host; Jain's index of grants
+   per equal-cost waiter, and grant / token share of double-cost waiters
+   (FIFO reservations: one turn each, costlier turns use more budget).
+3. Cross-process: 4 worker processes sharing a SQLite-backed limit.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compliance.rate_limit import RateLimiter, SQLiteBackend
+
+HOST = "jobs.example.com"
+RATE = 40.0        # requests/sec allowed for HOST
+CAPACITY = 2
+DURATION = 2.0
+
+
+async def hammer(limiter: RateLimiter, deadline: float, tokens: float = 1.0) -> int:
+    grants = 0
+    while True:
+        await limiter.acquire(HOST, tokens)
+        if time.time() >= deadline:
+            return grants
+        grants += 1
+
+
+async def combined_rate(shared: bool) -> float:
+    limiters = [RateLimiter(host_rates={HOST: {'rate': RATE, 'capacity': CAPACITY}})]
+    limiters = limiters * 3 if shared else limiters + [
+        RateLimiter(host_rates={HOST: {'rate': RATE, 'capacity': CAPACITY}}) for _ in range(2)
+    ]
+    deadline = time.time() + DURATION
+    counts = await asyncio.gather(*(hammer(l, deadline) for l in limiters for _ in range(4)))
+    return sum(counts) / DURATION
+
+
+async def fairness():
+    limiter = RateLimiter(host_rates={HOST: {'rate': RATE * 5, 'capacity': CAPACITY}})
+    deadline = time.time() + DURATION
+    weights = [1.0] * 40 + [2.0] * 10
+    counts = await asyncio.gather(*(hammer(limiter, deadline, w) for w in weights))
+    equal = counts[:40]
+    jain = sum(equal) ** 2 / (len(equal) * sum(c * c for c in equal))
+    ratio = (sum(counts[40:]) / 10) / (sum(equal) / 40)
+    return jain, ratio, limiter.get_stats()
+
+
+def _worker(db_path: str, deadline: float, out):
+    limiter = RateLimiter(host_rates={HOST: {'rate': RATE, 'capacity': CAPACITY}},
+                          backend=SQLiteBackend(db_path))
+    out.put(asyncio.run(hammer(limiter, deadline)))
+
+
+def cross_process(n_procs: int = 4) -> float:
+    db_path = os.path.join(tempfile.mkdtemp(), "rate_limit.db")
+    SQLiteBackend(db_path)  # create schema before workers race for it
+    out = multiprocessing.Queue()
+    deadline = time.time() + 0.5 + DURATION
+    procs = [multiprocessing.Process(target=_worker, args=(db_path, deadline, out)) for _ in range(n_procs)]
+    for p in procs:
+        p.start()
+    total = sum(out.get() for _ in procs)
+    for p in procs:
+        p.join()
+    return total / (DURATION + 0.5)
+
+
+def main():
+    print(f"Host limit {RATE:.0f} req/s (burst {CAPACITY}), {DURATION:.0f}s runs")
+    print(f"  separate limiters x3 : {asyncio.run(combined_rate(False)):6.1f} req/s to host")
+    print(f"  shared limiter       : {asyncio.run(combined_rate(True)):6.1f} req/s to host")
+
+    jain, ratio, stats = asyncio.run(fairness())
+    print(f"  fairness (50 waiters @ {RATE * 5:.0f}/s): Jain index {jain:.3f}, "
+          f"double-cost waiters {ratio:.2f}x grants / {2 * ratio:.2f}x tokens, max wait {stats['max_wait_time'] * 1000:.0f} ms")
+
+    print(f"  4 processes, SQLite  : {cross_process():6.1f} req/s to host")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Securitization Waterfall
+
+Builds an SPV with 5,000 pooled outcomes and three tranches of 10,000
+holders each, then compares the previous per-holder loop (sort tranches,
+share and round() per holder, baseline reimplemented below) against the
+array-backed distribute_cash_flows(), pool building with the full OCS
+re-sum per added outcome against the running sums, and times
+simulate_waterfall() over 10,000 scenarios x 12 months.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import securitization_desk as sd
+
+OUTCOMES = 5_000
+HOLDERS_PER_TRANCHE = 10_000
+RUNS = 10
+SCENARIOS = 10_000
+MONTHS = 12
+
+
+def legacy_distribute(spv_id: str, fee_pct: float = sd.SERVICING_FEE_PCT) -> list:
+    """The per-holder waterfall loop distribute_cash_flows() used (no state change)"""
+    spv = sd._SPVs[spv_id]
+    tranches_ordered = sorted(
+        [sd._TRANCHES[t["tranche_id"]] for t in spv["tranches_issued"] if t["tranche_id"] in sd._TRANCHES],
+        key=lambda t: t["priority"]
+    )
+    distributions = []
+    remaining = sd._CASH_POOL[spv_id]
+    for tranche in tranches_ordered:
+        if remaining <= 0:
+            break
+        total_holdings = sum(h["amount"] for h in tranche["holders"])
+        if total_holdings <= 0:
+            continue
+        target_dist = min(remaining, tranche["outstanding"] * tranche["target_yield"] / 12)
+        servicing_fee = round(target_dist * fee_pct, 2)
+        net_dist = target_dist - servicing_fee
+        for holder in tranche["holders"]:
+            share = holder["amount"] / total_holdings
+            holder_dist = round(net_dist * share, 2)
+            if holder_dist > 0:
+                distributions.append({
+                    "tranche_id": tranche["id"],
+                    "holder_id": holder["buyer_id"],
+                    "amount": holder_dist,
+                    "servicing_fee": round(servicing_fee * share, 4),
+                    "at": sd._now()
+                })
+        remaining -= target_dist
+    return distributions
+
+
+def main():
+    rng = random.Random(46)
+    spv_id = sd.create_spv("bench", target_size=10_000_000, max_concentration_pct=1.0)["spv_id"]
+
+    start = time.perf_counter()
+    for i in range(OUTCOMES):
+        sd.add_outcome_to_pool(spv_id, f"outcome_{i}", rng.uniform(500, 5000), rng.randint(80, 100))
+    t_pool = time.perf_counter() - start
+    outcomes = sd._SPVs[spv_id]["outcomes"]
+    start = time.perf_counter()
+    for n in range(1, 501):
+        head = outcomes[:n * OUTCOMES // 500]
+        sum(o["ocs"] * o["expected_value"] for o in head) / sum(o["expected_value"] for o in head)
+    t_resum = (time.perf_counter() - start) * OUTCOMES / 500
+    print(f"{OUTCOMES:,} outcomes, 3 x {HOLDERS_PER_TRANCHE:,} holders (numpy: {sd.HAS_NUMPY})")
+    print(f"  build pool, re-sum per outcome   : {t_resum * 1000:8.1f} ms (estimated from 500 re-sums)")
+    print(f"  build pool, running sums         : {t_pool * 1000:8.1f} ms")
+
+    size = sd._SPVs[spv_id]["current_size"]
+    start = time.perf_counter()
+    for tranche_type, share in (("junior", 0.2), ("senior", 0.4), ("mezzanine", 0.2)):
+        tranche_id = sd.issue_tranche(spv_id, tranche_type, round(size * share / 1.5, 2), min_purchase=1)["tranche_id"]
+        face = sd._TRANCHES[tranche_id]["amount"]
+        for h in range(HOLDERS_PER_TRANCHE):
+            sd.buy_tranche(tranche_id, f"lp_{rng.randrange(3 * HOLDERS_PER_TRANCHE)}", face / HOLDERS_PER_TRANCHE * 0.99)
+    t_buy = time.perf_counter() - start
+    print(f"  {3 * HOLDERS_PER_TRANCHE:,} buy_tranche calls          : {t_buy * 1000:8.1f} ms")
+
+    t_legacy = t_new = 0.0
+    for _ in range(RUNS):
+        sd.receive_cash_flow(spv_id, f"outcome_{rng.randrange(OUTCOMES)}", 2_000_000)
+        start = time.perf_counter()
+        expected = legacy_distribute(spv_id)
+        t_legacy += time.perf_counter() - start
+        start = time.perf_counter()
+        result = sd.distribute_cash_flows(spv_id)
+        t_new += time.perf_counter() - start
+        assert [(d["holder_id"], d["amount"], d["servicing_fee"]) for d in expected] == \
+            [(d["holder_id"], d["amount"], d["servicing_fee"]) for d in result["distributions"]]
+    print(f"  distribute, per-holder loop      : {t_legacy / RUNS * 1000:8.1f} ms/run")
+    print(f"  distribute, array waterfall      : {t_new / RUNS * 1000:8.1f} ms/run "
+          f"({len(result['distributions']):,} holder payouts, identical amounts)")
+
+    cash = np.random.default_rng(46).lognormal(mean=11, sigma=1.0, size=(SCENARIOS, MONTHS))
+    start = time.perf_counter()
+    sim = sd.simulate_waterfall(spv_id, cash, holder_id="lp_7")
+    t_sim = time.perf_counter() - start
+    junior = next(t for t in sim["tranches"] if t["type"] == "junior")
+    print(f"  simulate {SCENARIOS:,} x {MONTHS} months     : {t_sim * 1000:8.1f} ms "
+          f"(junior shortfall rate {junior['shortfall_rate']:.2%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark - SKU Genome Repository
+
+Writes 10,000 genomes with save_many(), then compares listing them by
+globbing and parsing every file (the previous list_all_genomes) against
+the in-memory repository: cold load, warm list, status index lookup,
+load_many() and the cost of picking up one externally modified file.
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sku import sku_genome as sg
+
+N_GENOMES = 10_000
+VERTICALS = ["dev", "design", "content", "data", "marketing", "automation"]
+
+
+def make(rng: random.Random, i: int) -> sg.SKUGenome:
+    g = sg.SKUGenome(sku_id=f"sku-{i:05d}", created_at=sg._now(),
+                     status=rng.choice(["incubating"] * 6 + ["graduated"] * 3 + ["retired"]),
+                     segments=[rng.choice(VERTICALS)])
+    g.telemetry["csat_scores"] = [round(rng.uniform(3, 5), 1) for _ in range(rng.randint(0, 50))]
+    g.telemetry["fulfillment_count"] = rng.randint(0, 200)
+    return g
+
+
+def glob_and_parse(genomes_dir: Path) -> list:
+    return [sg.SKUGenome(**json.loads(f.read_text())) for f in genomes_dir.glob("*.json")]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    import logging
+    logging.disable(logging.INFO)
+    rng = random.Random(3)
+    sg.GENOMES_DIR = Path(tempfile.mkdtemp()) / "genomes"
+    repo = sg.GenomeRepository(sg.GENOMES_DIR, remote=None)
+
+    genomes = [make(rng, i) for i in range(N_GENOMES)]
+    saved, t_save = timed(lambda: repo.save_many(genomes))
+    size_mb = sum(f.stat().st_size for f in sg.GENOMES_DIR.glob("*.json")) / 1e6
+    print(f"{N_GENOMES:,} genomes, {size_mb:.1f} MB on disk")
+    print(f"  save_many                      : {t_save:8.1f} ms ({saved:,} saved)")
+
+    _, t_glob = timed(lambda: glob_and_parse(sg.GENOMES_DIR))
+    print(f"  glob + parse every file        : {t_glob:8.1f} ms per list")
+
+    cold = sg.GenomeRepository(sg.GENOMES_DIR, remote=None)
+    _, t_cold = timed(cold.all)
+    _, t_warm = timed(cold.all)
+    incubating, t_status = timed(lambda: cold.by_status("incubating"))
+    ids = [f"sku-{rng.randrange(N_GENOMES):05d}" for _ in range(1000)]
+    _, t_many = timed(lambda: cold.load_many(ids))
+    print(f"  repository cold load           : {t_cold:8.1f} ms")
+    print(f"  repository warm list           : {t_warm:8.1f} ms per list")
+    print(f"  by_status('incubating')        : {t_status:8.1f} ms ({len(incubating):,} genomes)")
+    print(f"  load_many(1,000 ids)           : {t_many:8.1f} ms")
+
+    # Another process rewrites one genome: only that file is re-read
+    other = sg.GenomeRepository(sg.GENOMES_DIR, remote=None)
+    changed = cold.get("sku-00042")
+    changed.status = "retired"
+    time.sleep(0.01)
+    other.save_many([changed])
+    loads_before = cold.stats["loads"]
+    _, t_refresh = timed(cold.all)
+    print(f"  list after 1 external change   : {t_refresh:8.1f} ms "
+          f"({cold.stats['loads'] - loads_before} file re-read)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark - SLO Engine
+
+Backfills 100,000 SLO contracts (1,000 agents, 2,000 buyers; created,
+staked, then delivered or breached: ~290,000 events) through
+bulk_track_slo_events(), then times agent and buyer dashboards read from
+the incremental aggregates against the previous implementation (scan every
+contract once per dashboard, and once more per tier; baseline reimplemented
+below) and checks the summaries agree. Also times single tracked events
+and a re-run of the same backfill (all duplicates).
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import slo_engine as se
+
+CONTRACTS = 100_000
+AGENTS = 1_000
+BUYERS = 2_000
+DASHBOARDS = 50
+
+
+def scan_agent_summary(agent_username):
+    """The counting part of get_agent_slo_dashboard() before the aggregates"""
+    contracts = [c for c in se.SLO_CONTRACTS_DB.values() if c.get("agent") == agent_username]
+    active = [c for c in contracts if c["status"] == "ACTIVE"]
+    completed = [c for c in contracts if c["status"] == "COMPLETED"]
+    breached = [c for c in contracts if c["status"] == "BREACHED"]
+    on_time = len([c for c in completed if c.get("on_time")])
+    for tier in se.SLO_TIERS.keys():
+        tier_contracts = [c for c in contracts if c["tier"] == tier]
+        [c for c in tier_contracts if c["status"] == "COMPLETED"]
+    sorted(completed, key=lambda x: x.get("delivered_at", ""), reverse=True)[:5]
+    return {
+        "total_contracts": len(contracts),
+        "active_contracts": len(active),
+        "completed_contracts": len(completed),
+        "breached_contracts": len(breached),
+        "on_time_rate": round((on_time / len(completed)) * 100 if completed else 0, 1),
+        "total_bonuses_earned": round(sum(c.get("bonus_amount", 0) for c in completed), 2),
+        "total_bonds_at_risk": round(sum(c.get("bond_stake_amount", 0) for c in active), 2),
+    }
+
+
+def scan_buyer_summary(buyer_username):
+    contracts = [c for c in se.SLO_CONTRACTS_DB.values() if c.get("buyer") == buyer_username]
+    return {
+        "total_contracts": len(contracts),
+        "active_contracts": len([c for c in contracts if c["status"] == "ACTIVE"]),
+        "breached_contracts": len([c for c in contracts if c["status"] == "BREACHED"]),
+        "total_protection_paid": round(sum(c["protection_fee"] for c in contracts), 2),
+    }
+
+
+def history(rng):
+    start = datetime.now(timezone.utc) - timedelta(days=180)
+    tiers = list(se.SLO_TIERS)
+    events = []
+    for i in range(CONTRACTS):
+        cid = f"slo_bench_{i}"
+        tier = rng.choice(tiers)
+        created = start + timedelta(minutes=rng.random() * 175 * 24 * 60)
+        days = se.SLO_TIERS[tier]["delivery_days"]
+        value = rng.randint(50, 5000)
+        contract = {
+            "agent": f"agent{rng.randrange(AGENTS)}", "buyer": f"buyer{rng.randrange(BUYERS)}", "tier": tier,
+            "delivery_deadline": (created + timedelta(days=days)).isoformat(), "job_value": value,
+            "adjusted_price": value * se.SLO_TIERS[tier]["price_multiplier"],
+            "agent_bond": value * se.SLO_TIERS[tier]["bond_percentage"],
+            "protection_fee": value * se.SLO_TIERS[tier]["protection_fee"],
+            "early_bonus": value * se.SLO_TIERS[tier]["early_bonus_percentage"],
+        }
+        events.append({"event_id": f"{cid}:created", "contract_id": cid, "event_type": "created",
+                       "event_data": contract, "timestamp": created.isoformat()})
+        events.append({"event_id": f"{cid}:staked", "contract_id": cid, "event_type": "staked",
+                       "event_data": {"amount": contract["agent_bond"]}, "timestamp": (created + timedelta(minutes=5)).isoformat()})
+        outcome = rng.random()
+        if outcome < 0.85:
+            delivered = created + timedelta(hours=rng.lognormvariate(3.5, 0.8))
+            events.append({"event_id": f"{cid}:delivered", "contract_id": cid, "event_type": "delivered",
+                           "event_data": {"delivered_at": delivered.isoformat(),
+                                          "bonus_amount": contract["early_bonus"] if delivered < created + timedelta(days=days / 2) else 0},
+                           "timestamp": delivered.isoformat()})
+        elif outcome < 0.9:
+            breached = created + timedelta(days=days, hours=1)
+            events.append({"event_id": f"{cid}:breached", "contract_id": cid, "event_type": "breached",
+                           "event_data": {"buyer_refunded": contract["protection_fee"] + contract["agent_bond"] * 0.3},
+                           "timestamp": breached.isoformat()})
+    rng.shuffle(events)
+    return events
+
+
+def main():
+    rng = random.Random(50)
+    events = history(rng)
+
+    result = se.bulk_track_slo_events(events)
+    print(f"backfill {len(events):,} events ({result['contracts']:,} contracts): {result['elapsed_seconds']:.2f} s "
+          f"({len(events) / result['elapsed_seconds']:,.0f} events/s)")
+    result = se.bulk_track_slo_events(events)
+    print(f"  re-run same backfill     : {result['elapsed_seconds']:.2f} s ({result['duplicates']:,} duplicates skipped)")
+
+    agents = [f"agent{rng.randrange(AGENTS)}" for _ in range(DASHBOARDS)]
+    buyers = [f"buyer{rng.randrange(BUYERS)}" for _ in range(DASHBOARDS)]
+
+    start = time.perf_counter()
+    scanned = [scan_agent_summary(a) for a in agents[:10]]
+    t_scan = (time.perf_counter() - start) / 10
+    start = time.perf_counter()
+    dashboards = [se.get_agent_slo_dashboard(a) for a in agents]
+    t_new = (time.perf_counter() - start) / DASHBOARDS
+    agree = sum(1 for s, d in zip(scanned, dashboards) if all(d["summary"][k] == v for k, v in s.items()))
+    print(f"  agent dashboard          : scan {t_scan * 1000:7.2f} ms vs aggregates {t_new * 1000:6.3f} ms "
+          f"(summaries agree {agree}/10; p50/p90 delivery {dashboards[0]['summary']['delivery_hours']['p50']}/"
+          f"{dashboards[0]['summary']['delivery_hours']['p90']} h)")
+
+    start = time.perf_counter()
+    scanned = [scan_buyer_summary(b) for b in buyers[:10]]
+    t_scan = (time.perf_counter() - start) / 10
+    start = time.perf_counter()
+    dashboards = [se.get_buyer_slo_dashboard(b) for b in buyers]
+    t_new = (time.perf_counter() - start) / DASHBOARDS
+    agree = sum(1 for s, d in zip(scanned, dashboards) if all(d["summary"][k] == v for k, v in s.items()))
+    print(f"  buyer dashboard          : scan {t_scan * 1000:7.2f} ms vs aggregates {t_new * 1000:6.3f} ms "
+          f"(summaries agree {agree}/10)")
+
+    ids = [f"slo_bench_{rng.randrange(CONTRACTS)}" for _ in range(10_000)]
+    start = time.perf_counter()
+    for cid in ids:
+        se.track_slo_performance_event(cid, "viewed", {})
+    t_track = (time.perf_counter() - start) / len(ids)
+    print(f"  track_slo_performance_event: {t_track * 1e6:.1f} us/event")
+
+
+if __name__ == "__main__":
+    main()
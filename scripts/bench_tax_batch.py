@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Batch Tax Engine
+
+Builds 20,000 users with 200 ledger entries each over three tax years and
+compares the previous year-end flow (calculate_annual_earnings per user,
+then generate_1099_nec re-scanning the ledger for eligible agents, plus a
+per-quarter scan for the breakdown) against one TaxYearScan pass per user,
+and times the chunked TaxBatchJob writing the full 1099/quarterly/VAT CSV.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tax_reporting as tr
+
+USERS = 20_000
+ENTRIES_PER_USER = 200
+YEAR = 2025
+BASES = ["revenue"] * 6 + ["platform_fee"] * 2 + ["insurance_premium", "factoring_fee", "deposit"]
+
+
+def build(rng: random.Random):
+    users = []
+    for i in range(USERS):
+        ledger = []
+        for j in range(ENTRIES_PER_USER):
+            y = rng.choice([YEAR - 1, YEAR, YEAR + 1])
+            ledger.append({"ts": f"{y}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00Z",
+                           "basis": rng.choice(BASES), "amount": round(rng.uniform(-20, 90), 2),
+                           "currency": rng.choice(["USD"] * 6 + ["EUR", "GBP"]), "ref": f"job_{j}"})
+        users.append({"username": f"agent_{i}", "profile": {"name": f"Agent {i}"},
+                      "ownership": {"ledger": ledger}})
+    return users
+
+
+def annual_scan(user):
+    """calculate_annual_earnings' loop: parse every timestamp"""
+    gross = fees = 0.0
+    for entry in user["ownership"]["ledger"]:
+        if tr._year(entry.get("ts", "")) != YEAR:
+            continue
+        amount = float(entry.get("amount", 0))
+        if entry.get("basis") == "revenue" and amount > 0:
+            gross += amount
+        if entry.get("basis") in ("platform_fee", "insurance_premium", "factoring_fee"):
+            fees += abs(amount)
+    return round(gross, 2)
+
+
+def range_scan(user, start, end):
+    """generate_quarterly_report / calculate_vat_liability's loop"""
+    total = 0.0
+    for entry in user["ownership"]["ledger"]:
+        ts = entry.get("ts", "")
+        if ts < start or ts > end:
+            continue
+        total += float(entry.get("amount", 0))
+    return total
+
+
+def previous_flow(users):
+    """batch_generate_1099s (earnings, then 1099 re-scan) + quarterly and VAT scans"""
+    ranges = tr._quarter_ranges(YEAR) + [(f"{YEAR}-01-01", f"{YEAR}-12-31")]
+    for user in users:
+        if annual_scan(user) >= tr.FORM_1099_THRESHOLD:
+            annual_scan(user)
+        for start, end in ranges:
+            range_scan(user, start, end)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(42)
+    users = build(rng)
+    print(f"{USERS:,} users, {USERS * ENTRIES_PER_USER:,} ledger entries")
+
+    _, t_prev = timed(lambda: previous_flow(users))
+    _, t_batch = timed(lambda: tr.batch_generate_1099s(users, YEAR))
+    _, t_scan = timed(lambda: [tr.scan_tax_year(u, YEAR) for u in users])
+    print(f"  previous: earnings + 1099 re-scan + 5 range scans : {t_prev:8.2f} s")
+    print(f"  batch_generate_1099s (one scan per user)          : {t_batch:8.2f} s")
+    print(f"  scan_tax_year, all aggregates                     : {t_scan:8.2f} s")
+
+    tr.TAX_EXPORT_DIR = Path(tempfile.mkdtemp())
+
+    async def run_job():
+        job = tr.start_batch_1099_job(users, YEAR)
+        await job.task
+        return job
+
+    job, t_job = timed(lambda: asyncio.run(run_job()))
+    progress = job.progress()
+    print(f"  TaxBatchJob to CSV ({tr.TAX_JOB_CHUNK}/chunk)                  : {t_job:8.2f} s "
+          f"({progress['eligible_for_1099']:,} eligible, {job.path.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
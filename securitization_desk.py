@@ -15,15 +15,29 @@ Revenue flow:
 - Distribute: Senior first → Mezz → Junior
 - 0.15% servicing fee to AiGentsy on all distributions
 
+Waterfall engine:
+- Each SPV keeps its tranches in priority order (no sort per distribution)
+- Each tranche keeps holder amounts in an array; pro-rata shares and
+  rounding are one vector op per tranche (NumPy, pure-Python fallback)
+- simulate_waterfall() runs many cash-flow scenarios at once for pricing
+
 Usage:
     from securitization_desk import create_spv, issue_tranche, buy_tranche, distribute_cash_flows
 """
 
+from bisect import insort
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Union
 from uuid import uuid4
 from collections import defaultdict
 
+try:
+    import numpy as np
+    from array_rounding import round_array
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 def _now():
     return datetime.now(timezone.utc).isoformat() + "Z"
 
@@ -64,6 +78,72 @@ _TRANCHE_HOLDINGS: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 _CASH_POOL: Dict[str, float] = defaultdict(float)
 _DISTRIBUTIONS: List[Dict[str, Any]] = []
 
+# Indexes (derived from the records above; rebuilt if those change underneath)
+_WATERFALLS: Dict[str, List[Dict[str, Any]]] = {}  # spv_id -> tranches in priority order
+_BOOKS: Dict[str, "_TrancheBook"] = {}             # tranche_id -> holder amounts
+_POOLS: Dict[str, Dict[str, Any]] = {}             # spv_id -> outcome index + running sums
+
+
+class _TrancheBook:
+    """Holder amounts of one tranche, rows in purchase order (= tranche["holders"])"""
+
+    __slots__ = ("holdings", "amounts", "_array")
+
+    def __init__(self, holdings: Sequence[Dict[str, Any]] = ()):
+        self.holdings: List[Dict[str, Any]] = list(holdings)
+        self.amounts: List[float] = [h["amount"] for h in self.holdings]
+        self._array = None
+
+    def add(self, holding: Dict[str, Any]):
+        self.holdings.append(holding)
+        self.amounts.append(holding["amount"])
+        self._array = None
+
+    def total(self) -> float:
+        # Builtin sum over the same values in the same order as the
+        # per-holder generator it replaces, so totals (and shares) match
+        return sum(self.amounts)
+
+    def array(self):
+        if self._array is None:
+            self._array = np.array(self.amounts, dtype=float)
+        return self._array
+
+
+def _book(tranche: Dict[str, Any]) -> _TrancheBook:
+    book = _BOOKS.get(tranche["id"])
+    if book is None or len(book.holdings) != len(tranche["holders"]):
+        book = _BOOKS[tranche["id"]] = _TrancheBook(tranche["holders"])
+    return book
+
+
+def _waterfall(spv: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """SPV tranches in priority order (issue order within a priority)"""
+    ordered = _WATERFALLS.get(spv["id"])
+    if ordered is None or len(ordered) != len(spv["tranches_issued"]):
+        ordered = _WATERFALLS[spv["id"]] = sorted(
+            [_TRANCHES[t["tranche_id"]] for t in spv["tranches_issued"] if t["tranche_id"] in _TRANCHES],
+            key=lambda t: t["priority"]
+        )
+    return ordered
+
+
+def _pool(spv: Dict[str, Any]) -> Dict[str, Any]:
+    """Outcome index (first entry per outcome_id) and running value / OCS-weighted sums"""
+    pool = _POOLS.get(spv["id"])
+    if pool is None or pool["count"] != len(spv["outcomes"]):
+        pool = _POOLS[spv["id"]] = {"by_id": {}, "value": 0, "ocs_value": 0, "count": 0}
+        for outcome in spv["outcomes"]:
+            _pool_add(pool, outcome)
+    return pool
+
+
+def _pool_add(pool: Dict[str, Any], outcome: Dict[str, Any]):
+    pool["by_id"].setdefault(outcome["outcome_id"], outcome)
+    pool["value"] += outcome["expected_value"]
+    pool["ocs_value"] += outcome["ocs"] * outcome["expected_value"]
+    pool["count"] += 1
+
 
 class SecuritizationDesk:
     """
@@ -160,12 +240,13 @@ class SecuritizationDesk:
             "status": "POOLED"
         }
 
+        pool = _pool(spv)
         spv["outcomes"].append(outcome_entry)
         spv["current_size"] = new_size
 
-        # Update weighted OCS
-        total_value = sum(o["expected_value"] for o in spv["outcomes"])
-        weighted_ocs = sum(o["ocs"] * o["expected_value"] for o in spv["outcomes"]) / total_value
+        # Update weighted OCS (running sums, accumulated in pool order)
+        _pool_add(pool, outcome_entry)
+        weighted_ocs = pool["ocs_value"] / pool["value"]
         spv["weighted_ocs"] = round(weighted_ocs, 1)
 
         spv["events"].append({
@@ -259,13 +340,16 @@ class SecuritizationDesk:
             "events": [{"type": "TRANCHE_ISSUED", "at": _now()}]
         }
 
+        ordered = _waterfall(spv)
         _TRANCHES[tranche_id] = tranche
+        _BOOKS[tranche_id] = _TrancheBook()
         spv["tranches_issued"].append({
             "tranche_id": tranche_id,
             "type": tranche_type,
             "priority": tranche_config["priority"],
             "amount": amount
         })
+        insort(ordered, tranche, key=lambda t: t["priority"])
 
         return {
             "ok": True,
@@ -298,7 +382,8 @@ class SecuritizationDesk:
         if amount < tranche["min_purchase"]:
             return {"ok": False, "error": "below_minimum_purchase", "min": tranche["min_purchase"]}
 
-        remaining = tranche["amount"] - sum(h["amount"] for h in tranche["holders"])
+        book = _book(tranche)
+        remaining = tranche["amount"] - book.total()
         if amount > remaining:
             return {"ok": False, "error": "exceeds_available", "available": remaining}
 
@@ -313,6 +398,7 @@ class SecuritizationDesk:
         }
 
         tranche["holders"].append(holding)
+        book.add(holding)
         _TRANCHE_HOLDINGS[buyer_id].append(holding)
 
         tranche["events"].append({
@@ -323,7 +409,7 @@ class SecuritizationDesk:
         })
 
         # Check if fully subscribed
-        total_subscribed = sum(h["amount"] for h in tranche["holders"])
+        total_subscribed = book.total()
         if total_subscribed >= tranche["amount"]:
             tranche["status"] = "SUBSCRIBED"
 
@@ -350,11 +436,7 @@ class SecuritizationDesk:
             return {"ok": False, "error": "spv_not_found"}
 
         # Find outcome in pool
-        outcome = None
-        for o in spv["outcomes"]:
-            if o["outcome_id"] == outcome_id:
-                outcome = o
-                break
+        outcome = _pool(spv)["by_id"].get(outcome_id)
 
         if not outcome:
             return {"ok": False, "error": "outcome_not_in_pool"}
@@ -392,21 +474,17 @@ class SecuritizationDesk:
         if available_cash <= 0:
             return {"ok": False, "error": "no_cash_to_distribute"}
 
-        # Sort tranches by priority
-        tranches_ordered = sorted(
-            [_TRANCHES[t["tranche_id"]] for t in spv["tranches_issued"] if t["tranche_id"] in _TRANCHES],
-            key=lambda t: t["priority"]
-        )
-
         distributions = []
         remaining = available_cash
+        now = _now()
 
-        for tranche in tranches_ordered:
+        for tranche in _waterfall(spv):
             if remaining <= 0:
                 break
 
             # Calculate pro-rata distribution to holders
-            total_holdings = sum(h["amount"] for h in tranche["holders"])
+            book = _book(tranche)
+            total_holdings = book.total()
             if total_holdings <= 0:
                 continue
 
@@ -417,19 +495,7 @@ class SecuritizationDesk:
             servicing_fee = round(target_dist * self.servicing_fee_pct, 2)
             net_dist = target_dist - servicing_fee
 
-            for holder in tranche["holders"]:
-                share = holder["amount"] / total_holdings
-                holder_dist = round(net_dist * share, 2)
-
-                if holder_dist > 0:
-                    holder["distributions_received"] += holder_dist
-                    distributions.append({
-                        "tranche_id": tranche["id"],
-                        "holder_id": holder["buyer_id"],
-                        "amount": holder_dist,
-                        "servicing_fee": round(servicing_fee * share, 4),
-                        "at": _now()
-                    })
+            distributions.extend(self._pay_holders(tranche, book, total_holdings, net_dist, servicing_fee, now))
 
             tranche["distributions_made"] += net_dist
             remaining -= target_dist
@@ -452,6 +518,141 @@ class SecuritizationDesk:
             "remaining_pool": round(remaining, 2)
         }
 
+    def _pay_holders(
+        self,
+        tranche: Dict[str, Any],
+        book: _TrancheBook,
+        total_holdings: float,
+        net_dist: float,
+        servicing_fee: float,
+        now: str
+    ) -> List[Dict[str, Any]]:
+        """Pro-rata split of one tranche's net distribution (holders with a positive amount)"""
+        tranche_id = tranche["id"]
+        holdings = book.holdings
+
+        if HAS_NUMPY:
+            shares = book.array() / total_holdings
+            amounts = round_array(net_dist * shares, 2)
+            paid = np.flatnonzero(amounts > 0)
+            rows = zip(paid.tolist(), amounts[paid].tolist(), round_array(servicing_fee * shares[paid], 4).tolist())
+        else:
+            rows = []
+            for i, amount in enumerate(book.amounts):
+                share = amount / total_holdings
+                holder_dist = round(net_dist * share, 2)
+                if holder_dist > 0:
+                    rows.append((i, holder_dist, round(servicing_fee * share, 4)))
+
+        distributions = []
+        for i, holder_dist, holder_fee in rows:
+            holder = holdings[i]
+            holder["distributions_received"] += holder_dist
+            distributions.append({
+                "tranche_id": tranche_id,
+                "holder_id": holder["buyer_id"],
+                "amount": holder_dist,
+                "servicing_fee": holder_fee,
+                "at": now
+            })
+        return distributions
+
+    def simulate_waterfall(
+        self,
+        spv_id: str,
+        cash_flows: Union[Sequence[float], Sequence[Sequence[float]]],
+        *,
+        include_pool: bool = False,
+        holder_id: str = None,
+        percentiles: Sequence[float] = (5, 50, 95)
+    ) -> Dict[str, Any]:
+        """
+        Run the waterfall over many cash-flow scenarios at once (for pricing).
+
+        cash_flows is one cash amount per scenario, or a scenarios x months
+        matrix; undistributed cash carries into the next month as it does in
+        the pool. Nothing is mutated. Per tranche (and optionally per holder)
+        returns the distribution over scenarios of total net payout, plus
+        how often the tranche was paid short of its monthly target.
+        """
+        if not HAS_NUMPY:
+            return {"ok": False, "error": "numpy_not_available"}
+
+        spv = _SPVs.get(spv_id)
+        if not spv:
+            return {"ok": False, "error": "spv_not_found"}
+
+        cash = np.asarray(cash_flows, dtype=float)
+        if cash.ndim == 1:
+            cash = cash[:, None]
+        if cash.ndim != 2 or cash.size == 0:
+            return {"ok": False, "error": "cash_flows_must_be_1d_or_2d"}
+        n_scenarios, n_months = cash.shape
+
+        remaining = np.full(n_scenarios, _CASH_POOL.get(spv_id, 0.0) if include_pool else 0.0)
+        fees = np.zeros(n_scenarios)
+        tranches = []
+        holder_net = np.zeros(n_scenarios) if holder_id else None
+
+        ordered = [(t, _book(t)) for t in _waterfall(spv)]
+        ordered = [(t, book, book.total()) for t, book in ordered]
+        net_totals = [np.zeros(n_scenarios) for _ in ordered]
+        short = [0] * len(ordered)
+        holder_shares = [None] * len(ordered)
+        if holder_id:
+            for k, (tranche, book, total_holdings) in enumerate(ordered):
+                rows = [i for i, h in enumerate(book.holdings) if h["buyer_id"] == holder_id]
+                if rows and total_holdings > 0:
+                    holder_shares[k] = book.array()[rows] / total_holdings
+
+        for month in range(n_months):
+            remaining = remaining + cash[:, month]
+            for k, (tranche, book, total_holdings) in enumerate(ordered):
+                if total_holdings <= 0:
+                    continue
+                scheduled = tranche["outstanding"] * tranche["target_yield"] / 12
+                target = np.minimum(np.maximum(remaining, 0.0), scheduled)
+                fee = round_array(target * self.servicing_fee_pct, 2)
+                net = target - fee
+                net_totals[k] += net
+                fees += fee
+                remaining = remaining - target
+                short[k] += int(np.count_nonzero(target < scheduled))
+                if holder_shares[k] is not None:
+                    paid = round_array(np.outer(net, holder_shares[k]).ravel(), 2).reshape(n_scenarios, -1)
+                    holder_net += paid.clip(min=0).sum(axis=1)
+
+        def summary(values) -> Dict[str, float]:
+            stats = {"mean": round(float(values.mean()), 2), "min": round(float(values.min()), 2),
+                     "max": round(float(values.max()), 2)}
+            for p, v in zip(percentiles, np.percentile(values, list(percentiles)).tolist()):
+                stats[f"p{p:g}"] = round(v, 2)
+            return stats
+
+        for k, (tranche, book, total_holdings) in enumerate(ordered):
+            tranches.append({
+                "tranche_id": tranche["id"],
+                "type": tranche["type"],
+                "priority": tranche["priority"],
+                "holders": len(book.holdings),
+                "scheduled_monthly": round(tranche["outstanding"] * tranche["target_yield"] / 12, 2),
+                "net_distributed": summary(net_totals[k]),
+                "shortfall_rate": round(short[k] / (n_scenarios * n_months), 4) if total_holdings > 0 else None
+            })
+
+        result = {
+            "ok": True,
+            "spv_id": spv_id,
+            "scenarios": n_scenarios,
+            "months": n_months,
+            "tranches": tranches,
+            "servicing_fees": summary(fees),
+            "remaining_pool": summary(remaining)
+        }
+        if holder_id:
+            result["holder"] = {"holder_id": holder_id, "net_received": summary(holder_net)}
+        return result
+
     def get_spv(self, spv_id: str) -> Optional[Dict[str, Any]]:
         """Get SPV details"""
         return _SPVs.get(spv_id)
@@ -518,6 +719,11 @@ def distribute_cash_flows(spv_id: str) -> Dict[str, Any]:
     return _desk.distribute_cash_flows(spv_id)
 
 
+def simulate_waterfall(spv_id: str, cash_flows, **kwargs) -> Dict[str, Any]:
+    """Simulate distributions over many cash-flow scenarios (no state change)"""
+    return _desk.simulate_waterfall(spv_id, cash_flows, **kwargs)
+
+
 def get_spv(spv_id: str) -> Optional[Dict[str, Any]]:
     """Get SPV details"""
     return _desk.get_spv(spv_id)
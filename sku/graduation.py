@@ -24,6 +24,7 @@ from sku.sku_genome import (
     load_genome,
     save_genome,
     list_all_genomes,
+    list_genomes_by_status,
     GENOMES_DIR,
 )
 
@@ -231,18 +232,13 @@ async def graduate_sku(sku_id: str) -> Dict[str, Any]:
 
 def get_incubating_skus() -> List[str]:
     """Return sku_ids of all genomes with status == 'incubating'."""
-    genomes = list_all_genomes()
-    return [g.sku_id for g in genomes if g.status == "incubating"]
+    return [g.sku_id for g in list_genomes_by_status("incubating")]
 
 
 def get_graduated_skus() -> List[Dict[str, Any]]:
     """Return summaries of all graduated SKUs (the user-facing library)."""
-    genomes = list_all_genomes()
     results = []
-    for g in genomes:
-        if g.status != "graduated":
-            continue
-
+    for g in list_genomes_by_status("graduated"):
         t = g.telemetry
         csat_scores = t.get("csat_scores", [])
         results.append({
@@ -21,6 +21,7 @@ import json
 import logging
 import os
 import statistics
+import threading
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
@@ -107,64 +108,322 @@ class SKUGenome:
 
 
 # ─── PERSISTENCE ─────────────────────────────────────────────────────────────
+#
+# GenomeRepository keeps every genome file parsed in memory, keyed by sku_id,
+# with secondary indexes by status and vertical (segment). A cached entry is
+# reused while its file's (mtime_ns, size) is unchanged, and listing skips
+# the directory scan while the directory's own mtime is unchanged, so saves
+# by other processes are picked up on the next read. get()/load_many() hand
+# out copies, so edits stay private until save_genome()/save_many() caches a
+# copy of the saved genome and re-indexes it; the listings (all, by_status,
+# by_vertical) return the cached instances and are read-only.
+#
+# Remote (JSONBin) sync is batched on a background thread instead of a
+# network round trip inside every save.
+
+REMOTE_SYNC_KEY = "sku_genomes"
+REMOTE_SYNC_INTERVAL = 30.0   # seconds between background flushes
+REMOTE_SYNC_BATCH = 200       # flush early once this many genomes are queued
+
 
 def _genome_path(sku_id: str) -> Path:
     return GENOMES_DIR / f"{sku_id}.json"
 
 
+def _stamp(st: os.stat_result) -> tuple:
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _copy_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_value(v) for v in value]
+    return value
+
+
+def _clone(genome: SKUGenome) -> SKUGenome:
+    """Deep copy of a genome (fields are JSON-shaped; much faster than copy.deepcopy)"""
+    return SKUGenome(**{k: _copy_value(v) for k, v in vars(genome).items()})
+
+
+class _RemoteSync:
+    """Coalesces genome saves and pushes them to JSONBin in one request per batch"""
+
+    def __init__(self, interval: float = REMOTE_SYNC_INTERVAL, batch: int = REMOTE_SYNC_BATCH):
+        self.interval = interval
+        self.batch = batch
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"queued": 0, "flushed": 0, "batches": 0, "failures": 0}
+
+    def enqueue(self, records: Dict[str, Dict[str, Any]]):
+        with self._lock:
+            self._pending.update(records)
+            self.stats["queued"] += len(records)
+            full = len(self._pending) >= self.batch
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="genome-remote-sync", daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> bool:
+        """Push everything queued so far; re-queues on failure"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return True
+        ok = False
+        try:
+            from brain_persistence import get_persistence
+            bp = get_persistence()
+            if not bp.use_jsonbin:
+                return True  # JSONBin not configured: nothing to sync
+            ok = bp.merge_into_jsonbin(REMOTE_SYNC_KEY, batch)
+        except Exception as e:
+            logger.warning(f"Genome remote sync failed: {e}")
+        if ok:
+            self.stats["flushed"] += len(batch)
+            self.stats["batches"] += 1
+        else:
+            self.stats["failures"] += 1
+            with self._lock:
+                # Newer saves queued meanwhile win over the failed batch
+                self._pending = {**batch, **self._pending}
+        return ok
+
+
+class GenomeRepository:
+    """In-memory genome index over data/genomes/*.json"""
+
+    def __init__(self, genomes_dir: Path = GENOMES_DIR, remote: Optional[_RemoteSync] = None):
+        self.genomes_dir = Path(genomes_dir)
+        self.remote = remote
+        self._genomes: Dict[str, SKUGenome] = {}
+        self._stamps: Dict[str, tuple] = {}
+        self._status_of: Dict[str, str] = {}
+        self._verticals_of: Dict[str, tuple] = {}
+        self._by_status: Dict[str, set] = {}
+        self._by_vertical: Dict[str, set] = {}
+        self._dir_stamp: Optional[tuple] = None
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "loads": 0, "writes": 0}
+
+    def path(self, sku_id: str) -> Path:
+        return self.genomes_dir / f"{sku_id}.json"
+
+    # ── indexes ──
+
+    def _index(self, genome: SKUGenome, stamp: tuple):
+        sku_id = genome.sku_id
+        self._unindex(sku_id)
+        self._genomes[sku_id] = genome
+        self._stamps[sku_id] = stamp
+        self._status_of[sku_id] = genome.status
+        self._by_status.setdefault(genome.status, set()).add(sku_id)
+        verticals = tuple(genome.segments or ())
+        self._verticals_of[sku_id] = verticals
+        for v in verticals:
+            self._by_vertical.setdefault(v, set()).add(sku_id)
+
+    def _unindex(self, sku_id: str):
+        if self._genomes.pop(sku_id, None) is None:
+            return
+        self._stamps.pop(sku_id, None)
+        status = self._status_of.pop(sku_id, None)
+        if status in self._by_status:
+            self._by_status[status].discard(sku_id)
+        for v in self._verticals_of.pop(sku_id, ()):
+            if v in self._by_vertical:
+                self._by_vertical[v].discard(sku_id)
+
+    # ── reads ──
+
+    def _read(self, sku_id: str, stamp: tuple) -> Optional[SKUGenome]:
+        try:
+            genome = SKUGenome(**json.loads(self.path(sku_id).read_text()))
+        except Exception as e:
+            logger.error(f"Failed to load genome {sku_id}: {e}")
+            return None
+        self.stats["loads"] += 1
+        self._index(genome, stamp)
+        return genome
+
+    def get(self, sku_id: str) -> Optional[SKUGenome]:
+        """A private copy of one genome, re-read only if its file changed"""
+        try:
+            stamp = _stamp(os.stat(self.path(sku_id)))
+        except OSError:
+            with self._lock:
+                self._unindex(sku_id)
+            return None
+        with self._lock:
+            if self._stamps.get(sku_id) == stamp:
+                self.stats["hits"] += 1
+                genome = self._genomes[sku_id]
+            else:
+                genome = self._read(sku_id, stamp)
+            return _clone(genome) if genome is not None else None
+
+    def refresh(self):
+        """Stat every genome file; re-read changed ones and drop deleted ones"""
+        # Saves land via os.replace(), which bumps the directory mtime, so an
+        # unchanged directory means no genome was added, replaced or removed
+        try:
+            dir_stamp = _stamp(os.stat(self.genomes_dir))
+        except OSError:
+            dir_stamp = None
+        if dir_stamp is not None and dir_stamp == self._dir_stamp:
+            return
+        seen = {}
+        if dir_stamp is not None:
+            with os.scandir(self.genomes_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        seen[entry.name[:-5]] = _stamp(entry.stat())
+        with self._lock:
+            for sku_id in [s for s in self._genomes if s not in seen]:
+                self._unindex(sku_id)
+            for sku_id, stamp in seen.items():
+                if self._stamps.get(sku_id) != stamp:
+                    self._read(sku_id, stamp)
+            self._dir_stamp = dir_stamp
+
+    def all(self) -> List[SKUGenome]:
+        """Every cached genome (read-only; get() a copy to edit)"""
+        self.refresh()
+        with self._lock:
+            return list(self._genomes.values())
+
+    def load_many(self, sku_ids: List[str]) -> Dict[str, SKUGenome]:
+        """Genomes for the given ids that exist, keyed by sku_id"""
+        out = {}
+        for sku_id in sku_ids:
+            genome = self.get(sku_id)
+            if genome:
+                out[sku_id] = genome
+        return out
+
+    def by_status(self, status: str) -> List[SKUGenome]:
+        self.refresh()
+        with self._lock:
+            return [self._genomes[s] for s in self._by_status.get(status, ())]
+
+    def by_vertical(self, vertical: str) -> List[SKUGenome]:
+        self.refresh()
+        with self._lock:
+            return [self._genomes[s] for s in self._by_vertical.get(vertical, ())]
+
+    # ── writes ──
+
+    def _write(self, genome: SKUGenome) -> Optional[Dict[str, Any]]:
+        """Atomic write: .tmp → os.replace(); returns the saved dict"""
+        path = self.path(genome.sku_id)
+        tmp_path = str(path) + ".tmp"
+        try:
+            data = genome.to_dict()
+            Path(tmp_path).write_text(json.dumps(data, separators=(",", ":"), default=str))
+            os.replace(tmp_path, str(path))
+        except Exception as e:
+            logger.error(f"Failed to save genome {genome.sku_id}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return None
+        with self._lock:
+            # Cache a copy: the caller may keep editing its instance
+            self._index(_clone(genome), _stamp(os.stat(path)))
+        self.stats["writes"] += 1
+        return data
+
+    def save_many(self, genomes: List[SKUGenome]) -> int:
+        """Write each genome, then queue one remote sync batch. Returns count saved."""
+        self.genomes_dir.mkdir(parents=True, exist_ok=True)
+        saved = {}
+        for genome in genomes:
+            data = self._write(genome)
+            if data is not None:
+                saved[genome.sku_id] = data
+        if saved and self.remote is not None:
+            self.remote.enqueue(saved)
+        return len(saved)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "cached": len(self._genomes),
+                "by_status": {k: len(v) for k, v in self._by_status.items() if v},
+                "verticals": sum(1 for v in self._by_vertical.values() if v),
+                "remote_sync": dict(self.remote.stats) if self.remote else None,
+            }
+
+
+_repository: Optional[GenomeRepository] = None
+
+
+def get_genome_repository() -> GenomeRepository:
+    """Get singleton genome repository (rebuilt if GENOMES_DIR is repointed)"""
+    global _repository
+    if _repository is None or _repository.genomes_dir != GENOMES_DIR:
+        _repository = GenomeRepository(GENOMES_DIR, remote=_RemoteSync())
+    return _repository
+
+
 def load_genome(sku_id: str) -> Optional[SKUGenome]:
     """Load genome from data/genomes/{sku_id}.json"""
-    path = _genome_path(sku_id)
-    if not path.exists():
-        return None
-    try:
-        data = json.loads(path.read_text())
-        return SKUGenome(**data)
-    except Exception as e:
-        logger.error(f"Failed to load genome {sku_id}: {e}")
-        return None
+    return get_genome_repository().get(sku_id)
+
+
+def load_many(sku_ids: List[str]) -> Dict[str, SKUGenome]:
+    """Load several genomes at once, keyed by sku_id (missing ids omitted)"""
+    return get_genome_repository().load_many(sku_ids)
 
 
 def save_genome(genome: SKUGenome) -> bool:
-    """Atomic write: .tmp → os.replace()"""
-    GENOMES_DIR.mkdir(parents=True, exist_ok=True)
-    path = _genome_path(genome.sku_id)
-    tmp_path = str(path) + ".tmp"
-    try:
-        data = genome.to_dict()
-        Path(tmp_path).write_text(json.dumps(data, indent=2, default=str))
-        os.replace(tmp_path, str(path))
+    """Atomic write of one genome; remote sync is queued, not awaited"""
+    ok = get_genome_repository().save_many([genome]) == 1
+    if ok:
         logger.info(f"Genome saved: {genome.sku_id} v{genome.version} ({genome.status})")
+    return ok
 
-        # Also persist to JSONBin for cross-deploy survival
-        try:
-            from brain_persistence import get_persistence
-            bp = get_persistence()
-            bp._save_to_jsonbin(f"genome_{genome.sku_id}", data)
-        except Exception:
-            pass  # JSONBin is best-effort
 
-        return True
-    except Exception as e:
-        logger.error(f"Failed to save genome {genome.sku_id}: {e}")
-        # Clean up tmp file
-        try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
-        return False
+def save_many(genomes: List[SKUGenome]) -> int:
+    """Save several genomes with a single queued remote sync. Returns count saved."""
+    saved = get_genome_repository().save_many(genomes)
+    logger.info(f"Genomes saved: {saved}/{len(genomes)}")
+    return saved
 
 
 def list_all_genomes() -> List[SKUGenome]:
     """Load all genomes from disk."""
-    genomes = []
-    if not GENOMES_DIR.exists():
-        return genomes
-    for f in GENOMES_DIR.glob("*.json"):
-        g = load_genome(f.stem)
-        if g:
-            genomes.append(g)
-    return genomes
+    return get_genome_repository().all()
+
+
+def list_genomes_by_status(status: str) -> List[SKUGenome]:
+    """Genomes with the given status (incubating | graduated | retired)."""
+    return get_genome_repository().by_status(status)
+
+
+def list_genomes_by_vertical(vertical: str) -> List[SKUGenome]:
+    """Genomes serving the given segment/vertical."""
+    return get_genome_repository().by_vertical(vertical)
+
+
+def flush_remote_sync() -> bool:
+    """Push queued genome saves to JSONBin now (e.g. before shutdown)."""
+    remote = get_genome_repository().remote
+    return remote.flush() if remote else True
 
 
 # ─── GENOME CREATION ─────────────────────────────────────────────────────────
@@ -5,6 +5,10 @@ AiGentsy SLO Engine - Feature #9
 Dashboard wrapper and analytics for the SLO tiers system.
 Provides user-friendly APIs, performance tracking, and reporting.
 
+Tracked events keep contracts and per-agent / per-buyer SLO aggregates
+(on-time and breach counts, delivery latency quantiles) up to date, so
+dashboards read running totals; bulk_track_slo_events() backfills history.
+
 Integrates with:
 - slo_tiers.py (existing SLO tier system)
 - outcome_oracle.py (SLO outcome tracking)
@@ -12,8 +16,10 @@ Integrates with:
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, NamedTuple
 import json
+import math
+import threading
 
 # Import existing SLO tiers module
 try:
@@ -79,6 +85,334 @@ except ImportError:
 SLO_CONTRACTS_DB = {}
 SLO_PERFORMANCE_DB = {}
 
+# Incremental SLO aggregates
+#
+# Each contract contributes to the aggregates of its agent (overall and per
+# tier) and of its buyer. When a tracked event changes a contract, its old
+# contribution is taken out and the new one put in, so the dashboards read
+# running totals instead of scanning SLO_CONTRACTS_DB. Delivery latency
+# (hours from creation to delivery) goes into a sparse log-bucket histogram
+# for quantiles (within LATENCY_BUCKET_GROWTH / 2 relative error).
+LATENCY_MIN_HOURS = 0.1
+LATENCY_BUCKET_GROWTH = 0.1
+LATENCY_QUANTILES = (0.5, 0.9, 0.99)
+RECENT_COMPLETIONS = 5
+
+_LOG_GROWTH = math.log1p(LATENCY_BUCKET_GROWTH)
+_SLO_LOCK = threading.RLock()
+
+
+class _ContractView(NamedTuple):
+    """What one contract contributes to the aggregates"""
+    agent: Optional[str]
+    buyer: Optional[str]
+    tier: Optional[str]
+    status: Optional[str]
+    on_time: bool
+    bonus: float
+    bond_at_risk: float
+    protection_fee: float
+    refund: float
+    delivery_hours: Optional[float]
+    delivered_at: str
+    deadline_ts: Optional[float]
+
+
+class _SLOAggregate:
+    """Running totals over a set of contracts (one agent, agent tier, or buyer)"""
+
+    __slots__ = (
+        "total", "active", "completed", "breached", "on_time", "bonuses", "bonds_at_risk",
+        "protection_paid", "refunds", "deliveries", "latency", "active_ids", "completed_ids", "recent",
+    )
+
+    def __init__(self, track_ids: bool = False):
+        self.total = 0
+        self.active = 0
+        self.completed = 0
+        self.breached = 0
+        self.on_time = 0
+        self.bonuses = 0.0
+        self.bonds_at_risk = 0.0
+        self.protection_paid = 0.0
+        self.refunds = 0.0
+        self.deliveries = 0
+        self.latency: Dict[int, int] = {}
+        self.active_ids: Optional[set] = set() if track_ids else None
+        self.completed_ids: Optional[set] = set() if track_ids else None
+        self.recent: Optional[List[tuple]] = [] if track_ids else None
+
+    def on_time_rate(self) -> float:
+        return (self.on_time / self.completed) * 100 if self.completed else 0
+
+    def breach_rate(self) -> float:
+        closed = self.completed + self.breached
+        return (self.breached / closed) * 100 if closed else 0
+
+    def latency_quantiles(self) -> Dict[str, Optional[float]]:
+        out = {f"p{int(q * 100)}": None for q in LATENCY_QUANTILES}
+        if not self.deliveries:
+            return out
+        buckets = sorted(self.latency.items())
+        for q in LATENCY_QUANTILES:
+            rank = max(1, math.ceil(q * self.deliveries))
+            seen = 0
+            for bucket, count in buckets:
+                seen += count
+                if seen >= rank:
+                    out[f"p{int(q * 100)}"] = round(_bucket_hours(bucket), 1)
+                    break
+        return out
+
+
+_AGENT_AGG: Dict[str, _SLOAggregate] = {}
+_AGENT_TIER_AGG: Dict[tuple, _SLOAggregate] = {}
+_BUYER_AGG: Dict[str, _SLOAggregate] = {}
+_CONTRACT_VIEWS: Dict[str, _ContractView] = {}
+_CONTRACT_ORDER: Dict[str, int] = {}      # Position in SLO_CONTRACTS_DB, to list contracts in that order
+_CONTRACT_EVENTS: Dict[str, Dict[str, Any]] = {}
+_TRACKED_EVENT_IDS: set = set()
+
+
+def _parse_ts(ts_iso: str) -> Optional[datetime]:
+    try:
+        dt = datetime.fromisoformat(str(ts_iso).replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _latency_bucket(hours: float) -> int:
+    if hours <= LATENCY_MIN_HOURS:
+        return 0
+    return int(math.log(hours / LATENCY_MIN_HOURS) / _LOG_GROWTH) + 1
+
+
+def _bucket_hours(bucket: int) -> float:
+    if bucket == 0:
+        return LATENCY_MIN_HOURS
+    return LATENCY_MIN_HOURS * math.exp((bucket - 0.5) * _LOG_GROWTH)
+
+
+def _contract_view(contract: Dict[str, Any]) -> _ContractView:
+    status = contract.get("status")
+    created = _parse_ts(contract.get("created_at"))
+    delivery_hours = None
+    if status == "COMPLETED" and contract.get("delivered_at") and created:
+        delivered = _parse_ts(contract["delivered_at"])
+        if delivered:
+            delivery_hours = max((delivered - created).total_seconds() / 3600, 0.0)
+    refund = 0.0
+    if status == "BREACHED":
+        last_action = (contract.get("enforcement_actions") or [{}])[-1]
+        # enforce_slo_breach() records "buyer_refund"; tracked breaches carry "buyer_refunded"
+        refund = float(last_action.get("buyer_refunded", last_action.get("buyer_refund", 0)) or 0)
+    deadline = _parse_ts(contract.get("delivery_deadline"))
+    return _ContractView(
+        agent=contract.get("agent"),
+        buyer=contract.get("buyer"),
+        tier=contract.get("tier"),
+        status=status,
+        on_time=status == "COMPLETED" and bool(contract.get("on_time")),
+        bonus=float(contract.get("bonus_amount", 0) or 0) if status == "COMPLETED" else 0.0,
+        bond_at_risk=float(contract.get("bond_stake_amount", 0) or 0) if status == "ACTIVE" else 0.0,
+        protection_fee=float(contract.get("protection_fee", 0) or 0),
+        refund=refund,
+        delivery_hours=delivery_hours,
+        delivered_at=contract.get("delivered_at") or "",
+        deadline_ts=deadline.timestamp() if deadline else None
+    )
+
+
+def _fold(agg: _SLOAggregate, view: _ContractView, contract_id: str, sign: int):
+    agg.total += sign
+    agg.protection_paid += sign * view.protection_fee
+    if view.status == "ACTIVE":
+        agg.active += sign
+        agg.bonds_at_risk += sign * view.bond_at_risk
+        if agg.active_ids is not None:
+            if sign > 0:
+                agg.active_ids.add(contract_id)
+            else:
+                agg.active_ids.discard(contract_id)
+    elif view.status == "COMPLETED":
+        agg.completed += sign
+        agg.on_time += sign * view.on_time
+        agg.bonuses += sign * view.bonus
+        if view.delivery_hours is not None:
+            bucket = _latency_bucket(view.delivery_hours)
+            agg.deliveries += sign
+            count = agg.latency.get(bucket, 0) + sign
+            if count:
+                agg.latency[bucket] = count
+            else:
+                agg.latency.pop(bucket, None)
+        if agg.completed_ids is not None:
+            _fold_recent(agg, view, contract_id, sign)
+    elif view.status == "BREACHED":
+        agg.breached += sign
+        agg.refunds += sign * view.refund
+
+
+def _fold_recent(agg: _SLOAggregate, view: _ContractView, contract_id: str, sign: int):
+    """Keep the RECENT_COMPLETIONS latest deliveries without sorting every completion"""
+    entry = (view.delivered_at, contract_id)
+    if sign > 0:
+        agg.completed_ids.add(contract_id)
+        if len(agg.recent) < RECENT_COMPLETIONS or entry > agg.recent[-1]:
+            agg.recent.append(entry)
+            agg.recent.sort(reverse=True)
+            del agg.recent[RECENT_COMPLETIONS:]
+        return
+    agg.completed_ids.discard(contract_id)
+    if entry in agg.recent:
+        # Rare (a completed contract changed again): rebuild from the remaining completions
+        agg.recent = sorted(
+            ((_CONTRACT_VIEWS[cid].delivered_at, cid) for cid in agg.completed_ids),
+            reverse=True
+        )[:RECENT_COMPLETIONS]
+
+
+def _aggregates(view: _ContractView) -> List[_SLOAggregate]:
+    aggs = []
+    if view.agent:
+        agent = _AGENT_AGG.get(view.agent)
+        if agent is None:
+            agent = _AGENT_AGG[view.agent] = _SLOAggregate(track_ids=True)
+        aggs.append(agent)
+        if view.tier:
+            key = (view.agent, view.tier)
+            tier = _AGENT_TIER_AGG.get(key)
+            if tier is None:
+                tier = _AGENT_TIER_AGG[key] = _SLOAggregate()
+            aggs.append(tier)
+    if view.buyer:
+        buyer = _BUYER_AGG.get(view.buyer)
+        if buyer is None:
+            buyer = _BUYER_AGG[view.buyer] = _SLOAggregate(track_ids=True)
+        aggs.append(buyer)
+    return aggs
+
+
+def _in_db_order(contract_ids: set) -> List[str]:
+    return sorted(contract_ids, key=lambda cid: _CONTRACT_ORDER.get(cid, 0))
+
+
+def _reindex_contract(contract_id: str, contract: Dict[str, Any]):
+    """Swap a contract's old contribution to the aggregates for its current one"""
+    old = _CONTRACT_VIEWS.get(contract_id)
+    if old is not None:
+        for agg in _aggregates(old):
+            _fold(agg, old, contract_id, -1)
+    view = _contract_view(contract)
+    _CONTRACT_VIEWS[contract_id] = view
+    for agg in _aggregates(view):
+        _fold(agg, view, contract_id, +1)
+
+
+def _complete_contract(contract_id: str, data: Dict[str, Any], timestamp: str) -> Optional[Dict[str, Any]]:
+    """
+    Contract from a created event or snapshot, with the fields
+    slo_tiers.create_slo_contract() sets filled in from SLO_TIERS.
+    None if it has no agent, an unknown tier or an unreadable created_at.
+    """
+    tier_name = data.get("tier") or "standard"
+    if not data.get("agent") or tier_name not in SLO_TIERS:
+        return None
+    created_at = data.get("created_at") or timestamp
+    created = _parse_ts(created_at)
+    if created is None:
+        return None
+    
+    tier = SLO_TIERS[tier_name]
+    job_value = float(data.get("job_value", 0) or 0)
+    adjusted_price = round(job_value * tier["price_multiplier"], 2)
+    protection_fee = round(job_value * tier["protection_fee"], 2)
+    return {
+        "buyer": None,
+        "status": "ACTIVE",
+        "delivery_deadline": (created + timedelta(days=tier["delivery_days"])).isoformat(),
+        "job_value": job_value,
+        "adjusted_price": adjusted_price,
+        "agent_bond": round(job_value * tier["bond_percentage"], 2),
+        "protection_fee": protection_fee,
+        "total_payment": round(adjusted_price + protection_fee, 2),
+        "early_bonus": round(job_value * tier["early_bonus_percentage"], 2),
+        "bond_staked": False,
+        "bond_stake_amount": 0.0,
+        "delivered_at": None,
+        "breach_detected": False,
+        "enforcement_actions": [],
+        **data,
+        "tier": tier_name,
+        "created_at": created_at,
+        "id": data.get("id") or contract_id
+    }
+
+
+def _apply_slo_event(
+    contract_id: str,
+    event_type: str,
+    event_data: Dict[str, Any],
+    timestamp: str,
+    reindex: bool = True
+) -> Optional[Dict[str, Any]]:
+    """
+    Bring the stored contract up to date with one event.
+
+    An event carrying the full contract ("contract": {...}, e.g. as returned
+    by slo_tiers) replaces the stored state; otherwise created / staked /
+    delivered / breached events update the fields slo_tiers would set.
+    """
+    snapshot = event_data.get("contract")
+    contract = SLO_CONTRACTS_DB.get(contract_id)
+    
+    if isinstance(snapshot, dict):
+        contract = _complete_contract(contract_id, snapshot, timestamp)
+        if contract is None:
+            return None
+    elif contract is None:
+        if event_type != "created":
+            return None
+        contract = _complete_contract(contract_id, event_data, timestamp)
+        if contract is None:
+            return None
+    elif event_type == "staked":
+        contract["bond_staked"] = True
+        contract["bond_stake_amount"] = float(event_data.get("amount", contract.get("agent_bond", 0)))
+        contract["bond_staked_at"] = timestamp
+    elif event_type == "delivered" and contract.get("status") == "ACTIVE":
+        delivered_at = event_data.get("delivered_at") or timestamp
+        on_time = event_data.get("on_time")
+        if on_time is None:
+            deadline = _parse_ts(contract.get("delivery_deadline"))
+            delivered = _parse_ts(delivered_at)
+            on_time = bool(deadline and delivered and delivered <= deadline)
+        bonus_amount = float(event_data.get("bonus_amount", 0))
+        contract["status"] = "COMPLETED"
+        contract["delivered_at"] = delivered_at
+        contract["on_time"] = on_time
+        contract["early_bonus_awarded"] = bonus_amount > 0
+        contract["bonus_amount"] = bonus_amount
+    elif event_type == "breached" and contract.get("status") == "ACTIVE":
+        contract["status"] = "BREACHED"
+        contract["breach_detected"] = True
+        contract["breach_detected_at"] = event_data.get("detected_at") or timestamp
+        contract.setdefault("enforcement_actions", []).append({
+            "action": "AUTO_ENFORCEMENT",
+            "buyer_refunded": float(event_data.get("buyer_refunded", 0)),
+            "at": timestamp
+        })
+    else:
+        return contract     # Nothing the aggregates depend on changed
+    
+    if contract_id not in SLO_CONTRACTS_DB:
+        _CONTRACT_ORDER[contract_id] = len(_CONTRACT_ORDER)
+    SLO_CONTRACTS_DB[contract_id] = contract
+    if reindex:
+        _reindex_contract(contract_id, contract)
+    return contract
+
 
 def get_all_slo_tiers() -> Dict[str, Any]:
     """
@@ -245,40 +579,138 @@ def compare_slo_tiers(base_price: float) -> Dict[str, Any]:
 def track_slo_performance_event(
     contract_id: str,
     event_type: str,
-    event_data: Dict[str, Any]
+    event_data: Dict[str, Any],
+    timestamp: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Track SLO performance event for analytics.
     
+    Updates the stored contract and the agent/buyer SLO aggregates in place.
+    
     Args:
         contract_id: SLO contract ID
         event_type: Type of event (created/staked/delivered/breached)
-        event_data: Event details
+        event_data: Event details (may carry the full "contract")
+        timestamp: When the event happened (defaults to now)
     
     Returns:
         Tracking confirmation
     """
-    event_id = f"slo_event_{contract_id}_{int(datetime.now(timezone.utc).timestamp())}"
+    with _SLO_LOCK:
+        event = _record_slo_event(contract_id, event_type, event_data, timestamp)
+    
+    return {
+        "success": True,
+        "event_id": event["event_id"],
+        "event_type": event_type,
+        "tracked_at": event["timestamp"]
+    }
+
+
+def _record_slo_event(
+    contract_id: str,
+    event_type: str,
+    event_data: Dict[str, Any],
+    timestamp: Optional[str] = None,
+    event_id: Optional[str] = None,
+    reindex: bool = True,
+    require_applied: bool = False
+) -> Optional[Dict[str, Any]]:
+    timestamp = timestamp or datetime.now(timezone.utc).isoformat()
+    
+    applied = _apply_slo_event(contract_id, event_type, event_data or {}, timestamp, reindex)
+    if applied is None and require_applied:
+        return None
+    
+    # Store in performance DB
+    if contract_id not in SLO_PERFORMANCE_DB:
+        SLO_PERFORMANCE_DB[contract_id] = []
+    
+    history = SLO_PERFORMANCE_DB[contract_id]
+    if not event_id:
+        event_id = f"slo_event_{contract_id}_{int(datetime.now(timezone.utc).timestamp())}_{len(history)}"
     
     event = {
         "event_id": event_id,
         "contract_id": contract_id,
         "event_type": event_type,
         "event_data": event_data,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": timestamp
     }
     
-    # Store in performance DB
-    if contract_id not in SLO_PERFORMANCE_DB:
-        SLO_PERFORMANCE_DB[contract_id] = []
+    history.append(event)
+    _TRACKED_EVENT_IDS.add(event_id)
     
-    SLO_PERFORMANCE_DB[contract_id].append(event)
+    summary = _CONTRACT_EVENTS.get(contract_id)
+    if summary is None:
+        summary = _CONTRACT_EVENTS[contract_id] = {"events": 0, "by_type": {}, "first_event_at": timestamp, "last_event_at": timestamp}
+    summary["events"] += 1
+    summary["by_type"][event_type] = summary["by_type"].get(event_type, 0) + 1
+    summary["first_event_at"] = min(summary["first_event_at"], timestamp)
+    summary["last_event_at"] = max(summary["last_event_at"], timestamp)
+    
+    return event
+
+
+def bulk_track_slo_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Backfill historical SLO events.
+    
+    Events ({"contract_id", "event_type", "event_data", "timestamp", optional
+    "event_id"}) are applied in timestamp order; events whose event_id was
+    already tracked are skipped, so a backfill can be re-run safely. Events
+    for a contract that is unknown (or whose created event is unusable) are
+    counted as unapplied and not recorded. The aggregates are updated once
+    per touched contract, after all its events.
+    
+    Args:
+        events: Historical events
+    
+    Returns:
+        Counts of tracked, duplicate, invalid and unapplied events
+    """
+    started = datetime.now(timezone.utc)
+    tracked = duplicates = invalid = unapplied = 0
+    contracts = set()
+    
+    ordered = sorted(
+        (e for e in events if isinstance(e, dict)),
+        key=lambda e: (e.get("timestamp") is None, str(e.get("timestamp") or ""))
+    )
+    invalid = len(events) - len(ordered)
+    
+    with _SLO_LOCK:
+        for e in ordered:
+            if not e.get("contract_id") or not e.get("event_type"):
+                invalid += 1
+                continue
+            if e.get("event_id") and e["event_id"] in _TRACKED_EVENT_IDS:
+                duplicates += 1
+                continue
+            event = _record_slo_event(
+                e["contract_id"], e["event_type"], e.get("event_data") or {}, e.get("timestamp"), e.get("event_id"),
+                reindex=False, require_applied=True
+            )
+            if event is None:
+                # No contract to apply it to (yet): not recorded, so a later run can still apply it
+                unapplied += 1
+                continue
+            contracts.add(e["contract_id"])
+            tracked += 1
+        
+        # Fold each touched contract into the aggregates once, in its final state
+        for contract_id in contracts:
+            if contract_id in SLO_CONTRACTS_DB:
+                _reindex_contract(contract_id, SLO_CONTRACTS_DB[contract_id])
     
     return {
         "success": True,
-        "event_id": event_id,
-        "event_type": event_type,
-        "tracked_at": event["timestamp"]
+        "tracked": tracked,
+        "duplicates": duplicates,
+        "invalid": invalid,
+        "unapplied": unapplied,
+        "contracts": len(contracts),
+        "elapsed_seconds": round((datetime.now(timezone.utc) - started).total_seconds(), 3)
     }
 
 
@@ -330,19 +762,30 @@ def get_slo_contract_status(contract_id: str) -> Dict[str, Any]:
             "is_overdue": remaining_hours < 0
         },
         "financials": {
-            "job_value": contract["job_value"],
-            "adjusted_price": contract["adjusted_price"],
-            "agent_bond": contract["agent_bond"],
-            "bond_staked": contract["bond_staked"],
-            "protection_fee": contract["protection_fee"],
-            "early_bonus_potential": contract["early_bonus"]
+            "job_value": contract.get("job_value"),
+            "adjusted_price": contract.get("adjusted_price"),
+            "agent_bond": contract.get("agent_bond"),
+            "bond_staked": contract.get("bond_staked"),
+            "protection_fee": contract.get("protection_fee"),
+            "early_bonus_potential": contract.get("early_bonus")
         },
         "parties": {
-            "agent": contract["agent"],
-            "buyer": contract["buyer"]
+            "agent": contract.get("agent"),
+            "buyer": contract.get("buyer")
         }
     }
     
+    # Event history aggregates (kept up to date by track_slo_performance_event)
+    events = _CONTRACT_EVENTS.get(contract_id)
+    if events:
+        status["events"] = {
+            "total": events["events"],
+            "by_type": dict(events["by_type"]),
+            "breach_count": events["by_type"].get("breached", 0),
+            "first_event_at": events["first_event_at"],
+            "last_event_at": events["last_event_at"]
+        }
+    
     # Add delivery info if delivered
     if contract.get("delivered_at"):
         delivered_at = datetime.fromisoformat(contract["delivered_at"].replace("Z", "+00:00"))
@@ -371,80 +814,70 @@ def get_agent_slo_dashboard(agent_username: str) -> Dict[str, Any]:
     """
     Get agent's SLO performance dashboard.
     
+    Reads the agent's running SLO aggregates; cost does not grow with the
+    number of contracts (beyond listing the active ones).
+    
     Args:
         agent_username: Agent username
     
     Returns:
         Dashboard with performance metrics and active contracts
     """
-    # Get agent's contracts
-    agent_contracts = [
-        c for c in SLO_CONTRACTS_DB.values()
-        if c.get("agent") == agent_username
-    ]
-    
-    # Calculate metrics
-    total_contracts = len(agent_contracts)
-    active_contracts = [c for c in agent_contracts if c["status"] == "ACTIVE"]
-    completed_contracts = [c for c in agent_contracts if c["status"] == "COMPLETED"]
-    breached_contracts = [c for c in agent_contracts if c["status"] == "BREACHED"]
-    
-    # On-time delivery rate
-    on_time_count = len([c for c in completed_contracts if c.get("on_time")])
-    on_time_rate = (on_time_count / len(completed_contracts)) * 100 if completed_contracts else 0
-    
-    # Total bonuses earned
-    total_bonuses = sum(c.get("bonus_amount", 0) for c in completed_contracts)
-    
-    # Total bonds at risk
-    total_bonds_at_risk = sum(c.get("bond_stake_amount", 0) for c in active_contracts)
-    
-    # Tier breakdown
-    tier_stats = {}
-    for tier in SLO_TIERS.keys():
-        tier_contracts = [c for c in agent_contracts if c["tier"] == tier]
-        tier_completed = [c for c in tier_contracts if c["status"] == "COMPLETED"]
-        tier_on_time = [c for c in tier_completed if c.get("on_time")]
+    with _SLO_LOCK:
+        agg = _AGENT_AGG.get(agent_username) or _SLOAggregate(track_ids=True)
+        
+        # Tier breakdown
+        tier_stats = {}
+        for tier in SLO_TIERS.keys():
+            tier_agg = _AGENT_TIER_AGG.get((agent_username, tier)) or _SLOAggregate()
+            tier_stats[tier] = {
+                "total": tier_agg.total,
+                "active": tier_agg.active,
+                "completed": tier_agg.completed,
+                "on_time": tier_agg.on_time,
+                "on_time_rate": tier_agg.on_time_rate(),
+                "breached": tier_agg.breached,
+                "delivery_hours": tier_agg.latency_quantiles()
+            }
+        
+        active_contracts = [SLO_CONTRACTS_DB[cid] for cid in _in_db_order(agg.active_ids)]
+        recent_completions = [SLO_CONTRACTS_DB[cid] for _, cid in agg.recent]
         
-        tier_stats[tier] = {
-            "total": len(tier_contracts),
-            "active": len([c for c in tier_contracts if c["status"] == "ACTIVE"]),
-            "completed": len(tier_completed),
-            "on_time": len(tier_on_time),
-            "on_time_rate": (len(tier_on_time) / len(tier_completed)) * 100 if tier_completed else 0
+        summary = {
+            "total_contracts": agg.total,
+            "active_contracts": agg.active,
+            "completed_contracts": agg.completed,
+            "breached_contracts": agg.breached,
+            "on_time_rate": round(agg.on_time_rate(), 1),
+            "breach_rate": round(agg.breach_rate(), 1),
+            "total_bonuses_earned": round(agg.bonuses, 2),
+            "total_bonds_at_risk": round(agg.bonds_at_risk, 2),
+            "delivery_hours": agg.latency_quantiles()
         }
     
     return {
         "agent_username": agent_username,
-        "summary": {
-            "total_contracts": total_contracts,
-            "active_contracts": len(active_contracts),
-            "completed_contracts": len(completed_contracts),
-            "breached_contracts": len(breached_contracts),
-            "on_time_rate": round(on_time_rate, 1),
-            "total_bonuses_earned": round(total_bonuses, 2),
-            "total_bonds_at_risk": round(total_bonds_at_risk, 2)
-        },
+        "summary": summary,
         "tier_performance": tier_stats,
         "active_contracts": [
             {
                 "contract_id": c["id"],
-                "tier": c["tier"],
-                "deadline": c["delivery_deadline"],
-                "bond_staked": c["bond_stake_amount"],
-                "potential_bonus": c["early_bonus"]
+                "tier": c.get("tier"),
+                "deadline": c.get("delivery_deadline"),
+                "bond_staked": c.get("bond_stake_amount"),
+                "potential_bonus": c.get("early_bonus")
             }
             for c in active_contracts
         ],
         "recent_completions": [
             {
                 "contract_id": c["id"],
-                "tier": c["tier"],
+                "tier": c.get("tier"),
                 "delivered_at": c.get("delivered_at"),
                 "on_time": c.get("on_time"),
                 "bonus_earned": c.get("bonus_amount", 0)
             }
-            for c in sorted(completed_contracts, key=lambda x: x.get("delivered_at", ""), reverse=True)[:5]
+            for c in recent_completions
         ]
     }
 
@@ -459,48 +892,37 @@ def get_buyer_slo_dashboard(buyer_username: str) -> Dict[str, Any]:
     Returns:
         Dashboard with active contracts and protections
     """
-    # Get buyer's contracts
-    buyer_contracts = [
-        c for c in SLO_CONTRACTS_DB.values()
-        if c.get("buyer") == buyer_username
-    ]
-    
-    active_contracts = [c for c in buyer_contracts if c["status"] == "ACTIVE"]
-    completed_contracts = [c for c in buyer_contracts if c["status"] == "COMPLETED"]
-    breached_contracts = [c for c in buyer_contracts if c["status"] == "BREACHED"]
-    
-    # Calculate total protection
-    total_protection_fees_paid = sum(c["protection_fee"] for c in buyer_contracts)
-    total_refunds_received = sum(
-        c.get("enforcement_actions", [{}])[-1].get("buyer_refunded", 0)
-        for c in breached_contracts
-    )
+    now = datetime.now(timezone.utc).timestamp()
+    
+    with _SLO_LOCK:
+        agg = _BUYER_AGG.get(buyer_username) or _SLOAggregate(track_ids=True)
+        active_contracts = [(SLO_CONTRACTS_DB[cid], _CONTRACT_VIEWS[cid]) for cid in _in_db_order(agg.active_ids)]
+        
+        summary = {
+            "total_contracts": agg.total,
+            "active_contracts": agg.active,
+            "completed_on_time": agg.on_time,
+            "breached_contracts": agg.breached,
+            "breach_rate": round(agg.breach_rate(), 1),
+            "total_protection_paid": round(agg.protection_paid, 2),
+            "total_refunds_received": round(agg.refunds, 2),
+            "net_protection_cost": round(agg.protection_paid - agg.refunds, 2),
+            "delivery_hours": agg.latency_quantiles()
+        }
     
     return {
         "buyer_username": buyer_username,
-        "summary": {
-            "total_contracts": len(buyer_contracts),
-            "active_contracts": len(active_contracts),
-            "completed_on_time": len([c for c in completed_contracts if c.get("on_time")]),
-            "breached_contracts": len(breached_contracts),
-            "total_protection_paid": round(total_protection_fees_paid, 2),
-            "total_refunds_received": round(total_refunds_received, 2),
-            "net_protection_cost": round(total_protection_fees_paid - total_refunds_received, 2)
-        },
+        "summary": summary,
         "active_contracts": [
             {
                 "contract_id": c["id"],
-                "agent": c["agent"],
-                "tier": c["tier"],
-                "deadline": c["delivery_deadline"],
-                "hours_remaining": max(
-                    (datetime.fromisoformat(c["delivery_deadline"].replace("Z", "+00:00")) - 
-                     datetime.now(timezone.utc)).total_seconds() / 3600,
-                    0
-                ),
-                "protection_fee_paid": c["protection_fee"]
+                "agent": c.get("agent"),
+                "tier": c.get("tier"),
+                "deadline": c.get("delivery_deadline"),
+                "hours_remaining": max((view.deadline_ts - now) / 3600, 0) if view.deadline_ts else 0,
+                "protection_fee_paid": c.get("protection_fee")
             }
-            for c in active_contracts
+            for c, view in active_contracts
         ]
     }
 
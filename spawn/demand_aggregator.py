@@ -4,20 +4,30 @@ DEMAND AGGREGATOR
 Accumulates _matched_sku demand signals across discovery cycles.
 Detects spawn-worthy demand clusters when rolling thresholds are met.
 
-Storage: data/demand_signals.json — one entry per SKU with timestamped events.
+Storage: data/demand_events/YYYY-MM-DD.jsonl — an append-only log, one
+line per (cycle, SKU) batch, one file per UTC day. Pruning is file
+rotation: day files older than the 30-day window are deleted.
+
+In memory every SKU keeps running totals for its 24h / 7d / 30d windows.
+Appending a batch adds it to each window; batches leave a window as it
+slides past them, so queries read precomputed aggregates instead of
+re-parsing timestamps. The store tails the log files, so batches written
+by other processes are picked up on the next query.
 
 Spawn thresholds (7-day rolling window):
   - Count >= 20 matched opportunities
   - Average opportunity value >= $100
   - At least 10% of opportunities have "immediate" urgency
 
-Events older than 30 days are pruned on each write.
+A legacy data/demand_signals.json is imported into the log once.
 """
 
+import heapq
 import json
 import logging
 import os
-from collections import Counter
+import threading
+from collections import Counter, deque
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -25,7 +35,8 @@ from typing import Any, Dict, List, Optional
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
-DEMAND_FILE = DATA_DIR / "demand_signals.json"
+DEMAND_FILE = DATA_DIR / "demand_signals.json"   # legacy snapshot, imported once
+EVENTS_DIR = DATA_DIR / "demand_events"
 
 
 # ─── THRESHOLDS ──────────────────────────────────────────────────────────────
@@ -35,35 +46,9 @@ SPAWN_THRESHOLD_AVG_VALUE = 100.0    # Average value >= $100
 SPAWN_THRESHOLD_IMMEDIATE_PCT = 0.05  # At least 5% immediate urgency
 ROLLING_WINDOW_DAYS = 30             # Prune events older than 30d
 
-
-# ─── PERSISTENCE ─────────────────────────────────────────────────────────────
-
-def _load_signals() -> Dict[str, Any]:
-    """Load demand signals from disk."""
-    if not DEMAND_FILE.exists():
-        return {}
-    try:
-        return json.loads(DEMAND_FILE.read_text())
-    except Exception as e:
-        logger.error(f"Failed to load demand signals: {e}")
-        return {}
-
-
-def _save_signals(data: Dict[str, Any]) -> bool:
-    """Atomic write for demand signals."""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    tmp_path = str(DEMAND_FILE) + ".tmp"
-    try:
-        Path(tmp_path).write_text(json.dumps(data, indent=2, default=str))
-        os.replace(tmp_path, str(DEMAND_FILE))
-        return True
-    except Exception as e:
-        logger.error(f"Failed to save demand signals: {e}")
-        try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
-        return False
+WINDOWS = {"24h": 1, "7d": 7, "30d": ROLLING_WINDOW_DAYS}
+_WIDEST = max(WINDOWS, key=WINDOWS.get)
+_NARROWEST_SECONDS = min(WINDOWS.values()) * 86400
 
 
 def _now_iso() -> str:
@@ -79,10 +64,275 @@ def _parse_ts(ts_str: str) -> datetime:
         return datetime.now(timezone.utc)
 
 
-def _prune_events(events: List[Dict], max_age_days: int = ROLLING_WINDOW_DAYS) -> List[Dict]:
-    """Remove events older than max_age_days."""
-    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
-    return [e for e in events if _parse_ts(e.get("ts", "")) > cutoff]
+# ─── ROLLING AGGREGATES ─────────────────────────────────────────────────────
+
+def _add_counts(totals: Dict[str, int], counts: Dict[str, int], sign: int):
+    for key, c in counts.items():
+        n = totals.get(key, 0) + sign * c
+        if n:
+            totals[key] = n
+        else:
+            totals.pop(key, None)
+
+
+class _Window:
+    """Running totals for one SKU over one trailing window"""
+
+    __slots__ = ("seconds", "start", "count", "value_cents", "batches", "urgency", "platforms")
+
+    def __init__(self, days: int):
+        self.seconds = days * 86400
+        self.start = 0          # absolute index of the oldest batch still inside
+        self.count = 0
+        self.value_cents = 0    # sum(avg_value * count) in cents, exact
+        self.batches = 0
+        self.urgency: Dict[str, int] = {}
+        self.platforms: Dict[str, int] = {}
+
+    def apply(self, batch: tuple, sign: int):
+        _, count, value_cents, urgency, platforms = batch
+        self.count += sign * count
+        self.value_cents += sign * value_cents
+        self.batches += sign
+        _add_counts(self.urgency, urgency, sign)
+        _add_counts(self.platforms, platforms, sign)
+
+    def avg_value(self) -> float:
+        # Exact half-up rounding of the average, in whole cents
+        if self.count <= 0:
+            return 0.0
+        return (2 * self.value_cents + self.count) // (2 * self.count) / 100
+
+    def immediate_pct(self) -> float:
+        return round(self.urgency.get("immediate", 0) / max(sum(self.urgency.values()), 1), 4)
+
+    def meets_thresholds(self) -> bool:
+        return (
+            self.count >= SPAWN_THRESHOLD_7D_COUNT
+            and self.avg_value() >= SPAWN_THRESHOLD_AVG_VALUE
+            and self.immediate_pct() >= SPAWN_THRESHOLD_IMMEDIATE_PCT
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_value": self.avg_value(),
+            "immediate_pct": self.immediate_pct(),
+            "urgency_dist": dict(self.urgency),
+            "platforms": dict(self.platforms),
+            "event_batches": self.batches,
+        }
+
+
+class _SkuDemand:
+    """Batches for one SKU (oldest first) plus a _Window per WINDOWS entry"""
+
+    __slots__ = ("batches", "base", "windows", "next_expiry")
+
+    def __init__(self):
+        self.batches: deque = deque()   # (epoch, count, value_cents, urgency, platforms)
+        self.base = 0                   # absolute index of batches[0]
+        self.windows = {name: _Window(days) for name, days in WINDOWS.items()}
+        self.next_expiry: Optional[float] = None   # when the next batch leaves some window
+
+    def add(self, batch: tuple):
+        self.batches.append(batch)
+        for w in self.windows.values():
+            w.apply(batch, +1)
+
+    def advance(self, now: float) -> Optional[float]:
+        """
+        Slide every window to now and drop batches that left the widest
+        one. Returns when the next batch will leave a window (None if empty).
+        """
+        end = self.base + len(self.batches)
+        next_expiry = None
+        for w in self.windows.values():
+            cutoff = now - w.seconds
+            while w.start < end and self.batches[w.start - self.base][0] <= cutoff:
+                w.apply(self.batches[w.start - self.base], -1)
+                w.start += 1
+            if w.start < end:
+                expiry = self.batches[w.start - self.base][0] + w.seconds
+                if next_expiry is None or expiry < next_expiry:
+                    next_expiry = expiry
+        oldest = self.windows[_WIDEST].start
+        while self.base < oldest:
+            self.batches.popleft()
+            self.base += 1
+        return next_expiry
+
+
+class DemandStore:
+    """Append-only demand log with per-SKU rolling aggregates"""
+
+    def __init__(self, events_dir: Path = EVENTS_DIR, legacy_file: Optional[Path] = DEMAND_FILE):
+        self.events_dir = Path(events_dir)
+        self.legacy_file = legacy_file
+        self._skus: Dict[str, _SkuDemand] = {}
+        self._expiry_heap: List[tuple] = []   # (expiry, sku_id); stale entries skipped
+        self._offsets: Dict[str, int] = {}   # day file name -> bytes consumed
+        self._last_rotation: Optional[str] = None
+        self._lock = threading.Lock()
+        self._migrate_legacy()
+
+    # ── log files ──
+
+    def _day_file(self, epoch: float) -> Path:
+        day = datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%d")
+        return self.events_dir / f"{day}.jsonl"
+
+    def _oldest_day(self, now: float) -> str:
+        return (datetime.fromtimestamp(now, timezone.utc) - timedelta(days=ROLLING_WINDOW_DAYS)).strftime("%Y-%m-%d")
+
+    def append(self, records: List[Dict[str, Any]], now: Optional[float] = None):
+        """Append batch records to the day file and fold them into the aggregates"""
+        if not records:
+            return
+        now = datetime.now(timezone.utc).timestamp() if now is None else now
+        self.events_dir.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps(r, separators=(",", ":"), default=str) + "\n" for r in records)
+        # One write per cycle with O_APPEND keeps lines from concurrent writers intact
+        fd = os.open(self._day_file(now), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, lines.encode("utf-8"))
+        finally:
+            os.close(fd)
+        self.sync(now)
+
+    def sync(self, now: Optional[float] = None):
+        """Read log lines appended since the last sync, then slide the windows"""
+        now = datetime.now(timezone.utc).timestamp() if now is None else now
+        with self._lock:
+            if self.events_dir.exists():
+                oldest = self._oldest_day(now)
+                for path in sorted(self.events_dir.glob("*.jsonl")):
+                    if path.stem < oldest:
+                        continue
+                    self._tail(path)
+            self._expire(now)
+            self._rotate(now)
+
+    def _expire(self, now: float):
+        """Advance only the SKUs that have a batch leaving a window by now"""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expiry, sku_id = heapq.heappop(heap)
+            sku = self._skus.get(sku_id)
+            if sku is None or sku.next_expiry != expiry:
+                continue
+            sku.next_expiry = sku.advance(now)
+            if sku.next_expiry is None:
+                del self._skus[sku_id]
+            else:
+                heapq.heappush(heap, (sku.next_expiry, sku_id))
+
+    def _tail(self, path: Path):
+        offset = self._offsets.get(path.name, 0)
+        try:
+            if path.stat().st_size <= offset:
+                return
+            with open(path, "rb") as f:
+                f.seek(offset)
+                chunk = f.read()
+        except OSError:
+            return
+        # Only consume complete lines; a concurrent writer may be mid-line
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except Exception as e:
+                logger.warning(f"Skipping bad demand record in {path.name}: {e}")
+        self._offsets[path.name] = offset + end
+
+    def _apply(self, record: Dict[str, Any]):
+        sku_id = record.get("sku_id")
+        if not sku_id:
+            return
+        epoch = record.get("t")
+        if epoch is None:
+            epoch = _parse_ts(record.get("ts", "")).timestamp()
+        count = int(record.get("count", 0))
+        batch = (
+            float(epoch),
+            count,
+            int(round(float(record.get("avg_value", 0)) * 100)) * count,
+            record.get("urgency_dist") or {},
+            record.get("platforms") or {},
+        )
+        sku = self._skus.get(sku_id)
+        if sku is None:
+            sku = self._skus[sku_id] = _SkuDemand()
+        sku.add(batch)
+        expiry = batch[0] + _NARROWEST_SECONDS
+        if sku.next_expiry is None or expiry < sku.next_expiry:
+            sku.next_expiry = expiry
+            heapq.heappush(self._expiry_heap, (expiry, sku_id))
+
+    def _rotate(self, now: float):
+        """Delete day files that fell out of the rolling window (once per day)"""
+        oldest = self._oldest_day(now)
+        if self._last_rotation == oldest or not self.events_dir.exists():
+            return
+        self._last_rotation = oldest
+        for path in self.events_dir.glob("*.jsonl"):
+            if path.stem < oldest:
+                try:
+                    path.unlink()
+                    self._offsets.pop(path.name, None)
+                except OSError as e:
+                    logger.warning(f"Failed to rotate {path.name}: {e}")
+
+    def _migrate_legacy(self):
+        """Import data/demand_signals.json into the log if the log is empty"""
+        if not self.legacy_file or not Path(self.legacy_file).exists():
+            return
+        if self.events_dir.exists() and any(self.events_dir.glob("*.jsonl")):
+            return
+        try:
+            data = json.loads(Path(self.legacy_file).read_text())
+        except Exception as e:
+            logger.error(f"Failed to load legacy demand signals: {e}")
+            return
+
+        records = []
+        for sku_id, sku_data in data.items():
+            for e in sku_data.get("events", []):
+                epoch = _parse_ts(e.get("ts", "")).timestamp()
+                records.append({**e, "sku_id": sku_id, "t": epoch})
+        records.sort(key=lambda r: r["t"])
+
+        self.events_dir.mkdir(parents=True, exist_ok=True)
+        by_file: Dict[Path, List[str]] = {}
+        for r in records:
+            by_file.setdefault(self._day_file(r["t"]), []).append(
+                json.dumps(r, separators=(",", ":"), default=str) + "\n"
+            )
+        for path, lines in by_file.items():
+            with open(path, "a") as f:
+                f.writelines(lines)
+        logger.info(f"Imported {len(records)} legacy demand events into {self.events_dir}")
+
+    # ── queries ──
+
+    def window(self, sku_id: str, name: str) -> Optional[_Window]:
+        sku = self._skus.get(sku_id)
+        return sku.windows[name] if sku else None
+
+    def sku_ids(self) -> List[str]:
+        return list(self._skus)
+
+
+_store: Optional[DemandStore] = None
+
+
+def get_demand_store() -> DemandStore:
+    """Get or create the shared demand store"""
+    global _store
+    if _store is None:
+        _store = DemandStore()
+    return _store
 
 
 # ─── RECORD DEMAND ──────────────────────────────────────────────────────────
@@ -99,7 +349,6 @@ def record_demand(opportunities: List[Dict], cycle_id: str) -> Dict[str, Any]:
 
     Returns: {"recorded": int, "skus_updated": int}
     """
-    data = _load_signals()
     skus_updated = set()
     recorded = 0
 
@@ -113,10 +362,9 @@ def record_demand(opportunities: List[Dict], cycle_id: str) -> Dict[str, Any]:
             sku_groups[matched_sku] = []
         sku_groups[matched_sku].append(opp)
 
+    now = datetime.now(timezone.utc)
+    records = []
     for sku_id, opps in sku_groups.items():
-        if sku_id not in data:
-            data[sku_id] = {"events": []}
-
         # Compute stats for this batch
         values = [float(o.get("value", 0) or o.get("estimated_value", 0) or 0) for o in opps]
         avg_value = round(sum(values) / max(len(values), 1), 2)
@@ -124,22 +372,24 @@ def record_demand(opportunities: List[Dict], cycle_id: str) -> Dict[str, Any]:
         urgency_dist = dict(Counter(o.get("_urgency", "normal") for o in opps))
         platform_dist = dict(Counter(o.get("platform", "unknown") for o in opps))
 
-        event = {
-            "ts": _now_iso(),
+        records.append({
+            "sku_id": sku_id,
+            "ts": now.isoformat(),
+            "t": now.timestamp(),
             "count": len(opps),
             "avg_value": avg_value,
             "urgency_dist": urgency_dist,
             "platforms": platform_dist,
             "cycle_id": cycle_id,
-        }
-
-        data[sku_id]["events"].append(event)
-        data[sku_id]["events"] = _prune_events(data[sku_id]["events"])
+        })
 
         skus_updated.add(sku_id)
         recorded += len(opps)
 
-    _save_signals(data)
+    try:
+        get_demand_store().append(records, now.timestamp())
+    except Exception as e:
+        logger.error(f"Failed to save demand signals: {e}")
 
     logger.info(
         f"Demand recorded: {recorded} opportunities across {len(skus_updated)} SKUs "
@@ -155,12 +405,11 @@ def record_demand(opportunities: List[Dict], cycle_id: str) -> Dict[str, Any]:
 
 # ─── DEMAND CLUSTERS ────────────────────────────────────────────────────────
 
-def _compute_7d_stats(events: List[Dict]) -> Dict[str, Any]:
-    """Compute 7-day rolling window stats from events."""
-    cutoff = datetime.now(timezone.utc) - timedelta(days=7)
-    recent = [e for e in events if _parse_ts(e.get("ts", "")) > cutoff]
+def _compute_7d_stats(sku_id: str) -> Dict[str, Any]:
+    """7-day rolling window stats for a SKU from the precomputed aggregates."""
+    window = get_demand_store().window(sku_id, "7d")
 
-    if not recent:
+    if window is None or not window.batches:
         return {
             "count_7d": 0,
             "avg_value": 0.0,
@@ -169,36 +418,25 @@ def _compute_7d_stats(events: List[Dict]) -> Dict[str, Any]:
             "platforms": {},
         }
 
-    total_count = sum(e.get("count", 0) for e in recent)
-    total_value = sum(e.get("avg_value", 0) * e.get("count", 1) for e in recent)
-    avg_value = round(total_value / max(total_count, 1), 2)
-
-    # Aggregate urgency
-    urgency_totals: Dict[str, int] = {}
-    for e in recent:
-        for u, c in e.get("urgency_dist", {}).items():
-            urgency_totals[u] = urgency_totals.get(u, 0) + c
-
-    total_urgency = sum(urgency_totals.values())
-    immediate_count = urgency_totals.get("immediate", 0)
-    immediate_pct = round(immediate_count / max(total_urgency, 1), 4)
-
-    # Aggregate platforms
-    platform_totals: Dict[str, int] = {}
-    for e in recent:
-        for p, c in e.get("platforms", {}).items():
-            platform_totals[p] = platform_totals.get(p, 0) + c
-
+    stats = window.stats()
     return {
-        "count_7d": total_count,
-        "avg_value": avg_value,
-        "immediate_pct": immediate_pct,
-        "total_events": len(recent),
-        "platforms": platform_totals,
-        "urgency_dist": urgency_totals,
+        "count_7d": stats["count"],
+        "avg_value": stats["avg_value"],
+        "immediate_pct": stats["immediate_pct"],
+        "total_events": stats["event_batches"],
+        "platforms": stats["platforms"],
+        "urgency_dist": stats["urgency_dist"],
     }
 
 
+def _meets_thresholds(stats: Dict[str, Any]) -> bool:
+    return (
+        stats["count_7d"] >= SPAWN_THRESHOLD_7D_COUNT
+        and stats["avg_value"] >= SPAWN_THRESHOLD_AVG_VALUE
+        and stats["immediate_pct"] >= SPAWN_THRESHOLD_IMMEDIATE_PCT
+    )
+
+
 def get_demand_clusters() -> List[Dict[str, Any]]:
     """
     Get demand clusters exceeding ALL spawn thresholds.
@@ -206,18 +444,18 @@ def get_demand_clusters() -> List[Dict[str, Any]]:
     Returns sorted list of spawn-worthy SKUs with demand scores.
     demand_score = count_7d * avg_value * (1 + immediate_pct)
     """
-    data = _load_signals()
+    store = get_demand_store()
+    store.sync()
     clusters = []
 
-    for sku_id, sku_data in data.items():
-        events = sku_data.get("events", [])
-        stats = _compute_7d_stats(events)
+    sku_ids = store.sku_ids()
+    for sku_id in sku_ids:
+        # Threshold check straight off the running totals
+        if not store.window(sku_id, "7d").meets_thresholds():
+            continue
+        stats = _compute_7d_stats(sku_id)
 
-        if (
-            stats["count_7d"] >= SPAWN_THRESHOLD_7D_COUNT
-            and stats["avg_value"] >= SPAWN_THRESHOLD_AVG_VALUE
-            and stats["immediate_pct"] >= SPAWN_THRESHOLD_IMMEDIATE_PCT
-        ):
+        if _meets_thresholds(stats):
             demand_score = round(
                 stats["count_7d"] * stats["avg_value"] * (1 + stats["immediate_pct"]),
                 2,
@@ -236,58 +474,24 @@ def get_demand_clusters() -> List[Dict[str, Any]]:
 
     logger.info(
         f"Demand clusters: {len(clusters)} SKUs exceed spawn thresholds "
-        f"(of {len(data)} tracked)"
+        f"(of {len(sku_ids)} tracked)"
     )
     return clusters
 
 
 def get_sku_demand(sku_id: str) -> Dict[str, Any]:
     """Get detailed demand stats for one SKU across 24h, 7d, and 30d windows."""
-    data = _load_signals()
-    sku_data = data.get(sku_id, {"events": []})
-    events = sku_data.get("events", [])
+    store = get_demand_store()
+    store.sync()
 
-    if not events:
+    if store.window(sku_id, "30d") is None:
         return {
             "sku_id": sku_id,
             "has_data": False,
             "windows": {},
         }
 
-    now = datetime.now(timezone.utc)
-
-    windows = {}
-    for window_name, days in [("24h", 1), ("7d", 7), ("30d", 30)]:
-        cutoff = now - timedelta(days=days)
-        recent = [e for e in events if _parse_ts(e.get("ts", "")) > cutoff]
-
-        total_count = sum(e.get("count", 0) for e in recent)
-        total_value = sum(e.get("avg_value", 0) * e.get("count", 1) for e in recent)
-        avg_value = round(total_value / max(total_count, 1), 2)
-
-        urgency_totals: Dict[str, int] = {}
-        for e in recent:
-            for u, c in e.get("urgency_dist", {}).items():
-                urgency_totals[u] = urgency_totals.get(u, 0) + c
-
-        total_urgency = sum(urgency_totals.values())
-        immediate_pct = round(
-            urgency_totals.get("immediate", 0) / max(total_urgency, 1), 4
-        )
-
-        platform_totals: Dict[str, int] = {}
-        for e in recent:
-            for p, c in e.get("platforms", {}).items():
-                platform_totals[p] = platform_totals.get(p, 0) + c
-
-        windows[window_name] = {
-            "count": total_count,
-            "avg_value": avg_value,
-            "immediate_pct": immediate_pct,
-            "urgency_dist": urgency_totals,
-            "platforms": platform_totals,
-            "event_batches": len(recent),
-        }
+    windows = {name: store.window(sku_id, name).stats() for name in WINDOWS}
 
     # Check spawn readiness
     stats_7d = windows.get("7d", {})
@@ -312,41 +516,30 @@ def get_sku_demand(sku_id: str) -> Dict[str, Any]:
 
 def should_spawn(sku_id: str) -> bool:
     """Check if a SKU has enough demand to trigger a spawn."""
-    data = _load_signals()
-    sku_data = data.get(sku_id, {"events": []})
-    events = sku_data.get("events", [])
-
-    if not events:
-        return False
-
-    stats = _compute_7d_stats(events)
-    return (
-        stats["count_7d"] >= SPAWN_THRESHOLD_7D_COUNT
-        and stats["avg_value"] >= SPAWN_THRESHOLD_AVG_VALUE
-        and stats["immediate_pct"] >= SPAWN_THRESHOLD_IMMEDIATE_PCT
-    )
+    get_demand_store().sync()
+    return _meets_thresholds(_compute_7d_stats(sku_id))
 
 
 def get_all_demand_summary() -> Dict[str, Any]:
     """Get a summary of all demand signals across all SKUs."""
-    data = _load_signals()
+    store = get_demand_store()
+    store.sync()
     summaries = []
 
-    for sku_id, sku_data in data.items():
-        events = sku_data.get("events", [])
-        stats_7d = _compute_7d_stats(events)
+    for sku_id in store.sku_ids():
+        stats_7d = _compute_7d_stats(sku_id)
         summaries.append({
             "sku_id": sku_id,
             "count_7d": stats_7d["count_7d"],
             "avg_value": stats_7d["avg_value"],
             "immediate_pct": stats_7d["immediate_pct"],
-            "spawn_ready": should_spawn(sku_id),
+            "spawn_ready": _meets_thresholds(stats_7d),
         })
 
     summaries.sort(key=lambda x: x["count_7d"], reverse=True)
 
     return {
-        "total_skus_tracked": len(data),
+        "total_skus_tracked": len(summaries),
         "spawn_ready_count": sum(1 for s in summaries if s["spawn_ready"]),
         "skus": summaries,
     }
@@ -1,9 +1,23 @@
 """
 AiGentsy Automated Tax Reporting
 1099 generation, VAT compliance, quarterly reports
+
+Every report is built from one TaxYearScan pass over the user's ledger, which
+accumulates annual earnings, quarterly totals and VAT together. Year-end
+1099 runs over the whole user base go through TaxBatchJob: chunked in a
+worker thread, with progress, writing one CSV row per user to disk.
 """
+import asyncio
+import csv
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional
+from uuid import uuid4
 
 def _now():
     return datetime.now(timezone.utc).isoformat()
@@ -18,6 +32,13 @@ def _year(ts_iso: str) -> int:
 # Tax thresholds
 FORM_1099_THRESHOLD = 600.0  # $600 minimum for 1099-NEC
 VAT_REGISTRATION_THRESHOLD = 85000.0  # UK VAT threshold (example)
+VAT_STANDARD_RATE = 0.20  # Rate applied to EUR/GBP ledger entries
+VAT_CURRENCIES = ("EUR", "GBP")
+
+# Batch jobs
+TAX_EXPORT_DIR = Path(__file__).parent / "data" / "tax_exports"
+TAX_JOB_CHUNK = 500  # Users per worker-thread chunk
+MAX_TAX_JOBS = 20  # Finished jobs kept for progress/download
 
 # Tax rates by region
 TAX_RATES = {
@@ -36,90 +57,261 @@ TAX_RATES = {
 }
 
 
-def calculate_annual_earnings(
+# ============ SINGLE-PASS TAX SCAN ============
+
+DEFAULT_PAYER_INFO = {
+    "name": "AiGentsy Inc.",
+    "ein": "XX-XXXXXXX",  # Replace with actual EIN
+    "address": "123 Platform St",
+    "city": "San Francisco",
+    "state": "CA",
+    "zip": "94102"
+}
+
+# Deductible ledger bases -> expense type reported on exports
+_EXPENSE_TYPES = {
+    "platform_fee": "platform_fee",
+    "insurance_premium": "insurance",
+    "factoring_fee": "factoring_fee"
+}
+
+
+def _in_year(ts: Any, year: int, current_year: int) -> bool:
+    """
+    _year(ts) == year without parsing timestamps that can't match: a
+    parseable ISO string's year is its first four characters, and an
+    unparseable one only counts towards the current year.
+    """
+    if year != current_year and isinstance(ts, str) and ts[:4] != str(year):
+        return False
+    return _year(ts) == year
+
+
+def _quarter_ranges(year: int) -> List[tuple]:
+    return [
+        (f"{year}-01-01", f"{year}-03-31"),
+        (f"{year}-04-01", f"{year}-06-30"),
+        (f"{year}-07-01", f"{year}-09-30"),
+        (f"{year}-10-01", f"{year}-12-31")
+    ]
+
+
+class TaxYearScan:
+    """
+    Every tax aggregate for one user and year from a single ledger pass.
+
+    Annual earnings select entries by _year(ts); quarterly and VAT totals
+    select by ISO string range, exactly as the per-report functions always
+    have. Income/expense entry lists are only kept when collect_entries is
+    set (batch runs don't need them).
+    """
+
+    def __init__(self, year: int, collect_entries: bool = False):
+        self.year = year
+        self.gross_income = 0.0
+        self.platform_fees = 0.0
+        self.expenses = 0.0
+        self.income_count = 0
+        self.income_entries = [] if collect_entries else None
+        self.expense_entries = [] if collect_entries else None
+        self.quarter_gross = [0.0] * 4
+        self.quarter_expenses = [0.0] * 4
+        self.vat_collected = 0.0
+        self.vat_paid = 0.0
+        self.quarter_vat_collected = [0.0] * 4
+        self.quarter_vat_paid = [0.0] * 4
+        self.quarters = _quarter_ranges(year)
+        self.year_range = (f"{year}-01-01", f"{year}-12-31")
+        self.current_year = datetime.now(timezone.utc).year
+
+    def add(self, entry: Dict[str, Any]):
+        self.scan((entry,))
+
+    def scan(self, ledger: List[Dict[str, Any]]):
+        """Accumulate ledger entries (hot loop: totals are kept in locals)"""
+        year, current_year = self.year, self.current_year
+        year_start, year_end = self.year_range
+        quarters = self.quarters
+        income_entries, expense_entries = self.income_entries, self.expense_entries
+        quarter_gross, quarter_expenses = self.quarter_gross, self.quarter_expenses
+        quarter_vat_collected, quarter_vat_paid = self.quarter_vat_collected, self.quarter_vat_paid
+        gross_income, platform_fees, expenses = self.gross_income, self.platform_fees, self.expenses
+        vat_collected, vat_paid = self.vat_collected, self.vat_paid
+        income_count = self.income_count
+        vat_fraction = VAT_STANDARD_RATE / (1 + VAT_STANDARD_RATE)
+        
+        for entry in ledger:
+            ts = entry.get("ts", "")
+            in_year = _in_year(ts, year, current_year)
+            in_range = isinstance(ts, str) and year_start <= ts <= year_end
+            if not (in_year or in_range):
+                continue
+            
+            basis = entry.get("basis", "")
+            amount = float(entry.get("amount", 0))
+            is_income = basis == "revenue" and amount > 0
+            expense_type = _EXPENSE_TYPES.get(basis)
+            
+            if in_year:
+                if is_income:
+                    gross_income += amount
+                    income_count += 1
+                    if income_entries is not None:
+                        income_entries.append({"date": entry.get("ts"), "amount": amount, "ref": entry.get("ref", "")})
+                
+                if expense_type:
+                    if basis == "platform_fee":
+                        platform_fees += abs(amount)
+                    else:
+                        expenses += abs(amount)
+                    if expense_entries is not None:
+                        expense_entries.append({
+                            "date": entry.get("ts"),
+                            "amount": abs(amount),
+                            "type": expense_type,
+                            "ref": entry.get("ref", "")
+                        })
+            
+            if not in_range:
+                continue
+            
+            quarter = None
+            for q, (start_date, end_date) in enumerate(quarters):
+                if start_date <= ts <= end_date:
+                    quarter = q
+                    break
+            
+            if quarter is not None:
+                if is_income:
+                    quarter_gross[quarter] += amount
+                if expense_type:
+                    quarter_expenses[quarter] += abs(amount)
+            
+            if entry.get("currency", "USD") in VAT_CURRENCIES:
+                if is_income:
+                    vat_amount = amount * vat_fraction
+                    vat_collected += vat_amount
+                    if quarter is not None:
+                        quarter_vat_collected[quarter] += vat_amount
+                if basis in ("platform_fee", "insurance_premium"):
+                    vat_amount = abs(amount) * vat_fraction
+                    vat_paid += vat_amount
+                    if quarter is not None:
+                        quarter_vat_paid[quarter] += vat_amount
+        
+        self.gross_income, self.platform_fees, self.expenses = gross_income, platform_fees, expenses
+        self.vat_collected, self.vat_paid = vat_collected, vat_paid
+        self.income_count = income_count
+
+    def earnings(self) -> Dict[str, Any]:
+        """calculate_annual_earnings() result"""
+        total_expenses = self.platform_fees + self.expenses
+        result = {
+            "year": self.year,
+            "gross_income": round(self.gross_income, 2),
+            "platform_fees": round(self.platform_fees, 2),
+            "other_expenses": round(self.expenses, 2),
+            "total_expenses": round(total_expenses, 2),
+            "net_income": round(self.gross_income - total_expenses, 2),
+            "total_transactions": self.income_count
+        }
+        if self.income_entries is not None:
+            result["income_entries"] = self.income_entries
+            result["expense_entries"] = self.expense_entries
+        return result
+
+    def quarterly_report(self, quarter: int) -> Dict[str, Any]:
+        """generate_quarterly_report() result (quarter 1-4)"""
+        start_date, end_date = self.quarters[quarter - 1]
+        gross_income = self.quarter_gross[quarter - 1]
+        expenses = self.quarter_expenses[quarter - 1]
+        return {
+            "year": self.year,
+            "quarter": quarter,
+            "period": f"{start_date} to {end_date}",
+            "gross_income": round(gross_income, 2),
+            "expenses": round(expenses, 2),
+            "net_income": round(gross_income - expenses, 2),
+            "generated_at": _now()
+        }
+
+    def vat_liability(self, quarter: int = None) -> Dict[str, Any]:
+        """calculate_vat_liability() result (whole year unless quarter is 1-4)"""
+        if quarter in (1, 2, 3, 4):
+            start_date, end_date = self.quarters[quarter - 1]
+            collected = self.quarter_vat_collected[quarter - 1]
+            paid = self.quarter_vat_paid[quarter - 1]
+        else:
+            start_date, end_date = self.year_range
+            collected, paid = self.vat_collected, self.vat_paid
+        return {
+            "year": self.year,
+            "quarter": quarter,
+            "period": f"{start_date} to {end_date}",
+            "vat_collected": round(collected, 2),
+            "vat_paid": round(paid, 2),
+            "net_vat_owed": round(collected - paid, 2),
+            "currency": "EUR/GBP",
+            "generated_at": _now()
+        }
+
+
+def scan_tax_year(
     user: Dict[str, Any],
-    year: int = None
-) -> Dict[str, Any]:
+    year: int = None,
+    collect_entries: bool = False
+) -> TaxYearScan:
     """
-    Calculate agent's total earnings for a tax year
+    Scan a user's ledger once for every tax aggregate of a year
     """
     if not year:
         year = datetime.now(timezone.utc).year
     
-    ledger = user.get("ownership", {}).get("ledger", [])
-    
-    gross_income = 0.0
-    platform_fees = 0.0
-    expenses = 0.0
-    
-    income_entries = []
-    expense_entries = []
-    
-    for entry in ledger:
-        entry_year = _year(entry.get("ts", ""))
-        
-        if entry_year != year:
-            continue
-        
-        basis = entry.get("basis", "")
-        amount = float(entry.get("amount", 0))
-        
-        # Income
-        if basis == "revenue" and amount > 0:
-            gross_income += amount
-            income_entries.append({
-                "date": entry.get("ts"),
-                "amount": amount,
-                "ref": entry.get("ref", "")
-            })
-        
-        # Platform fees (deductible expense)
-        if basis == "platform_fee":
-            platform_fees += abs(amount)
-            expense_entries.append({
-                "date": entry.get("ts"),
-                "amount": abs(amount),
-                "type": "platform_fee",
-                "ref": entry.get("ref", "")
-            })
-        
-        # Insurance (deductible expense)
-        if basis == "insurance_premium":
-            expenses += abs(amount)
-            expense_entries.append({
-                "date": entry.get("ts"),
-                "amount": abs(amount),
-                "type": "insurance",
-                "ref": entry.get("ref", "")
-            })
-        
-        # Factoring fees (deductible expense)
-        if basis == "factoring_fee":
-            expenses += abs(amount)
-            expense_entries.append({
-                "date": entry.get("ts"),
-                "amount": abs(amount),
-                "type": "factoring_fee",
-                "ref": entry.get("ref", "")
-            })
-    
-    # Calculate net income
-    total_expenses = platform_fees + expenses
-    net_income = gross_income - total_expenses
+    scan = TaxYearScan(year, collect_entries=collect_entries)
+    scan.scan(user.get("ownership", {}).get("ledger", []))
+    return scan
+
+
+def _form_1099(
+    user: Dict[str, Any],
+    year: int,
+    gross_income: float,
+    payer_info: Dict[str, Any] = None
+) -> Dict[str, Any]:
+    """1099-NEC form body for an agent already known to be above the threshold"""
+    username = user.get("consent", {}).get("username") or user.get("username")
+    profile = user.get("profile", {})
     
     return {
-        "year": year,
-        "gross_income": round(gross_income, 2),
-        "platform_fees": round(platform_fees, 2),
-        "other_expenses": round(expenses, 2),
-        "total_expenses": round(total_expenses, 2),
-        "net_income": round(net_income, 2),
-        "total_transactions": len(income_entries),
-        "income_entries": income_entries,
-        "expense_entries": expense_entries
+        "form_type": "1099-NEC",
+        "tax_year": year,
+        "payer": payer_info or DEFAULT_PAYER_INFO,
+        "recipient": {
+            "name": profile.get("name", username),
+            "tin": profile.get("ssn") or profile.get("ein") or "XXXXX",  # Taxpayer ID
+            "address": profile.get("address", ""),
+            "city": profile.get("city", ""),
+            "state": profile.get("state", ""),
+            "zip": profile.get("zip", "")
+        },
+        "box_1_nonemployee_compensation": round(gross_income, 2),
+        "federal_income_tax_withheld": 0.0,  # No withholding for 1099-NEC
+        "state_income_tax_withheld": 0.0,
+        "generated_at": _now(),
+        "due_date": f"{year + 1}-01-31"  # 1099s due Jan 31
     }
 
 
+def calculate_annual_earnings(
+    user: Dict[str, Any],
+    year: int = None
+) -> Dict[str, Any]:
+    """
+    Calculate agent's total earnings for a tax year
+    """
+    return scan_tax_year(user, year, collect_entries=True).earnings()
+
+
 def generate_1099_nec(
     user: Dict[str, Any],
     year: int = None,
@@ -144,39 +336,7 @@ def generate_1099_nec(
             "message": f"Gross income ${gross_income} is below $600 threshold"
         }
     
-    # Default payer info
-    if not payer_info:
-        payer_info = {
-            "name": "AiGentsy Inc.",
-            "ein": "XX-XXXXXXX",  # Replace with actual EIN
-            "address": "123 Platform St",
-            "city": "San Francisco",
-            "state": "CA",
-            "zip": "94102"
-        }
-    
-    # Get agent info
-    username = user.get("consent", {}).get("username") or user.get("username")
-    profile = user.get("profile", {})
-    
-    form_1099 = {
-        "form_type": "1099-NEC",
-        "tax_year": year,
-        "payer": payer_info,
-        "recipient": {
-            "name": profile.get("name", username),
-            "tin": profile.get("ssn") or profile.get("ein") or "XXXXX",  # Taxpayer ID
-            "address": profile.get("address", ""),
-            "city": profile.get("city", ""),
-            "state": profile.get("state", ""),
-            "zip": profile.get("zip", "")
-        },
-        "box_1_nonemployee_compensation": round(gross_income, 2),
-        "federal_income_tax_withheld": 0.0,  # No withholding for 1099-NEC
-        "state_income_tax_withheld": 0.0,
-        "generated_at": _now(),
-        "due_date": f"{year + 1}-01-31"  # 1099s due Jan 31
-    }
+    form_1099 = _form_1099(user, year, gross_income, payer_info)
     
     return {
         "ok": True,
@@ -232,51 +392,10 @@ def generate_quarterly_report(
     """
     Generate quarterly tax report (Q1, Q2, Q3, Q4)
     """
-    # Define quarter date ranges
-    quarters = {
-        1: (f"{year}-01-01", f"{year}-03-31"),
-        2: (f"{year}-04-01", f"{year}-06-30"),
-        3: (f"{year}-07-01", f"{year}-09-30"),
-        4: (f"{year}-10-01", f"{year}-12-31")
-    }
-    
-    if quarter not in quarters:
+    if quarter not in (1, 2, 3, 4):
         return {"error": "invalid_quarter", "valid_quarters": [1, 2, 3, 4]}
     
-    start_date, end_date = quarters[quarter]
-    
-    # Filter ledger entries for this quarter
-    ledger = user.get("ownership", {}).get("ledger", [])
-    
-    gross_income = 0.0
-    expenses = 0.0
-    
-    for entry in ledger:
-        ts = entry.get("ts", "")
-        
-        if ts < start_date or ts > end_date:
-            continue
-        
-        basis = entry.get("basis", "")
-        amount = float(entry.get("amount", 0))
-        
-        if basis == "revenue" and amount > 0:
-            gross_income += amount
-        
-        if basis in ["platform_fee", "insurance_premium", "factoring_fee"]:
-            expenses += abs(amount)
-    
-    net_income = gross_income - expenses
-    
-    return {
-        "year": year,
-        "quarter": quarter,
-        "period": f"{start_date} to {end_date}",
-        "gross_income": round(gross_income, 2),
-        "expenses": round(expenses, 2),
-        "net_income": round(net_income, 2),
-        "generated_at": _now()
-    }
+    return scan_tax_year(user, year).quarterly_report(quarter)
 
 
 def calculate_vat_liability(
@@ -287,63 +406,7 @@ def calculate_vat_liability(
     """
     Calculate VAT liability for EU/UK agents
     """
-    ledger = user.get("ownership", {}).get("ledger", [])
-    
-    # If quarter specified, filter
-    if quarter:
-        quarters = {
-            1: (f"{year}-01-01", f"{year}-03-31"),
-            2: (f"{year}-04-01", f"{year}-06-30"),
-            3: (f"{year}-07-01", f"{year}-09-30"),
-            4: (f"{year}-10-01", f"{year}-12-31")
-        }
-        start_date, end_date = quarters.get(quarter, (f"{year}-01-01", f"{year}-12-31"))
-    else:
-        start_date = f"{year}-01-01"
-        end_date = f"{year}-12-31"
-    
-    vat_collected = 0.0  # VAT on sales
-    vat_paid = 0.0       # VAT on purchases
-    
-    for entry in ledger:
-        ts = entry.get("ts", "")
-        
-        if ts < start_date or ts > end_date:
-            continue
-        
-        basis = entry.get("basis", "")
-        amount = float(entry.get("amount", 0))
-        currency = entry.get("currency", "USD")
-        
-        # Only process EUR/GBP transactions
-        if currency not in ["EUR", "GBP"]:
-            continue
-        
-        # VAT on revenue (output VAT)
-        if basis == "revenue" and amount > 0:
-            vat_rate = 0.20  # 20% standard rate
-            vat_amount = amount * (vat_rate / (1 + vat_rate))
-            vat_collected += vat_amount
-        
-        # VAT on expenses (input VAT - can be reclaimed)
-        if basis in ["platform_fee", "insurance_premium"]:
-            vat_rate = 0.20
-            vat_amount = abs(amount) * (vat_rate / (1 + vat_rate))
-            vat_paid += vat_amount
-    
-    # Net VAT owed (collected - paid)
-    vat_owed = vat_collected - vat_paid
-    
-    return {
-        "year": year,
-        "quarter": quarter,
-        "period": f"{start_date} to {end_date}",
-        "vat_collected": round(vat_collected, 2),
-        "vat_paid": round(vat_paid, 2),
-        "net_vat_owed": round(vat_owed, 2),
-        "currency": "EUR/GBP",
-        "generated_at": _now()
-    }
+    return scan_tax_year(user, year).vat_liability(quarter)
 
 
 def generate_annual_tax_summary(
@@ -356,17 +419,15 @@ def generate_annual_tax_summary(
     if not year:
         year = datetime.now(timezone.utc).year
     
-    earnings = calculate_annual_earnings(user, year)
+    scan = scan_tax_year(user, year, collect_entries=True)
+    earnings = scan.earnings()
     estimated_taxes = calculate_estimated_taxes(earnings, region="US")
     
     # Check 1099 eligibility
     requires_1099 = earnings["gross_income"] >= FORM_1099_THRESHOLD
     
     # Get quarterly breakdown
-    quarters = []
-    for q in [1, 2, 3, 4]:
-        q_report = generate_quarterly_report(user, year, q)
-        quarters.append(q_report)
+    quarters = [scan.quarterly_report(q) for q in [1, 2, 3, 4]]
     
     return {
         "year": year,
@@ -397,21 +458,18 @@ def batch_generate_1099s(
     below_threshold = []
     
     for user in users:
-        earnings = calculate_annual_earnings(user, year)
+        gross_income = round(scan_tax_year(user, year).gross_income, 2)
         
-        if earnings["gross_income"] >= FORM_1099_THRESHOLD:
-            form_1099 = generate_1099_nec(user, year)
-            
-            if form_1099.get("ok"):
-                eligible_agents.append({
-                    "username": user.get("username"),
-                    "gross_income": earnings["gross_income"],
-                    "form_1099": form_1099["form_1099_nec"]
-                })
+        if gross_income >= FORM_1099_THRESHOLD:
+            eligible_agents.append({
+                "username": user.get("username"),
+                "gross_income": gross_income,
+                "form_1099": _form_1099(user, year, gross_income)
+            })
         else:
             below_threshold.append({
                 "username": user.get("username"),
-                "gross_income": earnings["gross_income"]
+                "gross_income": gross_income
             })
     
     return {
@@ -426,6 +484,58 @@ def batch_generate_1099s(
     }
 
 
+CSV_HEADER = ["Date", "Type", "Description", "Amount", "Category"]
+
+
+def iter_tax_csv_rows(
+    user: Dict[str, Any],
+    year: int = None
+) -> Iterator[List[Any]]:
+    """
+    Accountant CSV rows (header, income, then expenses) from one ledger pass.
+    Income rows are yielded as they are found; only expense rows are held.
+    """
+    if not year:
+        year = datetime.now(timezone.utc).year
+    
+    yield CSV_HEADER
+    
+    current_year = datetime.now(timezone.utc).year
+    expense_rows = []
+    for entry in user.get("ownership", {}).get("ledger", []):
+        if not _in_year(entry.get("ts", ""), year, current_year):
+            continue
+        
+        basis = entry.get("basis", "")
+        amount = float(entry.get("amount", 0))
+        
+        if basis == "revenue" and amount > 0:
+            yield [entry.get("ts"), "Income", f"Job: {entry.get('ref', '')}", amount, "Revenue"]
+        
+        expense_type = _EXPENSE_TYPES.get(basis)
+        if expense_type:
+            expense_rows.append([entry.get("ts"), "Expense", expense_type, abs(amount), "Business Expense"])
+    
+    yield from expense_rows
+
+
+def _csv_line(row: List[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue()
+
+
+def iter_tax_csv(
+    user: Dict[str, Any],
+    year: int = None
+) -> Iterator[str]:
+    """
+    export_tax_csv() as CSV text, one line at a time (for StreamingResponse)
+    """
+    for row in iter_tax_csv_rows(user, year):
+        yield _csv_line(row)
+
+
 def export_tax_csv(
     user: Dict[str, Any],
     year: int = None
@@ -436,31 +546,8 @@ def export_tax_csv(
     if not year:
         year = datetime.now(timezone.utc).year
     
-    earnings = calculate_annual_earnings(user, year)
-    
     # CSV format: Date, Type, Description, Amount, Category
-    csv_rows = []
-    csv_rows.append(["Date", "Type", "Description", "Amount", "Category"])
-    
-    # Income entries
-    for entry in earnings["income_entries"]:
-        csv_rows.append([
-            entry["date"],
-            "Income",
-            f"Job: {entry['ref']}",
-            entry["amount"],
-            "Revenue"
-        ])
-    
-    # Expense entries
-    for entry in earnings["expense_entries"]:
-        csv_rows.append([
-            entry["date"],
-            "Expense",
-            entry["type"],
-            entry["amount"],
-            "Business Expense"
-        ])
+    csv_rows = list(iter_tax_csv_rows(user, year))
     
     return {
         "ok": True,
@@ -469,3 +556,181 @@ def export_tax_csv(
         "rows": csv_rows,
         "total_rows": len(csv_rows)
     }
+
+
+# ============ BATCH 1099 JOBS ============
+
+BATCH_CSV_HEADER = [
+    "username", "recipient_name", "tin", "address", "city", "state", "zip",
+    "gross_income", "platform_fees", "other_expenses", "net_income", "transactions",
+    "q1_gross", "q1_expenses", "q2_gross", "q2_expenses",
+    "q3_gross", "q3_expenses", "q4_gross", "q4_expenses",
+    "vat_collected", "vat_paid", "net_vat_owed",
+    "estimated_tax", "requires_1099"
+]
+
+
+def _batch_row(user: Dict[str, Any], scan: TaxYearScan) -> List[Any]:
+    earnings = scan.earnings()
+    vat = scan.vat_liability()
+    username = user.get("consent", {}).get("username") or user.get("username")
+    profile = user.get("profile", {})
+    
+    row = [
+        user.get("username"),
+        profile.get("name", username),
+        profile.get("ssn") or profile.get("ein") or "XXXXX",
+        profile.get("address", ""),
+        profile.get("city", ""),
+        profile.get("state", ""),
+        profile.get("zip", ""),
+        earnings["gross_income"],
+        earnings["platform_fees"],
+        earnings["other_expenses"],
+        earnings["net_income"],
+        earnings["total_transactions"]
+    ]
+    for q in range(4):
+        row += [round(scan.quarter_gross[q], 2), round(scan.quarter_expenses[q], 2)]
+    row += [
+        vat["vat_collected"],
+        vat["vat_paid"],
+        vat["net_vat_owed"],
+        calculate_estimated_taxes(earnings, region="US")["total_estimated_tax"],
+        earnings["gross_income"] >= FORM_1099_THRESHOLD
+    ]
+    return row
+
+
+class TaxBatchJob:
+    """
+    Year-end 1099 run over the whole user base.
+
+    Users are scanned in chunks in a worker thread (one ledger pass each) and
+    written to a CSV under TAX_EXPORT_DIR as they go, so neither the forms
+    nor the report ever sit in memory. The file carries TINs and is created
+    owner-only.
+    """
+
+    def __init__(self, users: List[Dict[str, Any]], year: int = None, chunk_size: int = TAX_JOB_CHUNK):
+        self.job_id = f"tax_{uuid4().hex[:12]}"
+        self.year = year or datetime.now(timezone.utc).year
+        self.users = users
+        self.chunk_size = max(1, chunk_size)
+        self.status = "queued"
+        self.total = len(users)
+        self.processed = 0
+        self.eligible = 0
+        self.below_threshold = 0
+        self.gross_income = 0.0
+        self.errors: List[Dict[str, Any]] = []
+        self.path = TAX_EXPORT_DIR / f"{self.job_id}_{self.year}_1099.csv"
+        self.created_at = _now()
+        self.started_at = None
+        self.finished_at = None
+        self.duration_ms = None
+        self.task = None
+
+    def _open(self):
+        TAX_EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        return os.fdopen(fd, "w", newline="")
+
+    def _run_chunk(self, writer, users: List[Dict[str, Any]]):
+        for user in users:
+            try:
+                scan = scan_tax_year(user, self.year)
+                row = _batch_row(user, scan)
+            except (ValueError, TypeError, AttributeError) as e:
+                if len(self.errors) < 100:
+                    self.errors.append({"username": user.get("username"), "error": str(e)})
+                self.processed += 1
+                continue
+            writer.writerow(row)
+            self.gross_income += row[7]
+            if row[-1]:
+                self.eligible += 1
+            else:
+                self.below_threshold += 1
+            self.processed += 1
+
+    async def run(self):
+        self.status = "running"
+        self.started_at = _now()
+        start = time.perf_counter()
+        try:
+            with self._open() as f:
+                writer = csv.writer(f)
+                writer.writerow(BATCH_CSV_HEADER)
+                for i in range(0, self.total, self.chunk_size):
+                    await asyncio.to_thread(self._run_chunk, writer, self.users[i:i + self.chunk_size])
+            self.status = "completed"
+        except Exception as e:
+            self.status = "failed"
+            self.errors.append({"error": str(e)})
+        finally:
+            self.users = []  # Don't pin the snapshot once done
+            self.finished_at = _now()
+            self.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    def progress(self) -> Dict[str, Any]:
+        return {
+            "ok": True,
+            "job_id": self.job_id,
+            "year": self.year,
+            "status": self.status,
+            "processed": self.processed,
+            "total": self.total,
+            "percent": round(self.processed / self.total * 100, 1) if self.total else 100.0,
+            "eligible_for_1099": self.eligible,
+            "below_threshold": self.below_threshold,
+            "total_gross_income": round(self.gross_income, 2),
+            "errors": self.errors,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_ms": self.duration_ms
+        }
+
+    def iter_csv(self, chunk_bytes: int = 64 * 1024) -> Iterator[bytes]:
+        """Stream the finished report file"""
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_bytes)
+                if not chunk:
+                    break
+                yield chunk
+
+
+_TAX_JOBS: "OrderedDict[str, TaxBatchJob]" = OrderedDict()
+_TAX_JOBS_LOCK = threading.Lock()
+
+
+def start_batch_1099_job(
+    users: List[Dict[str, Any]],
+    year: int = None,
+    chunk_size: int = TAX_JOB_CHUNK
+) -> TaxBatchJob:
+    """
+    Register a batch 1099 job and schedule it on the running event loop
+    """
+    job = TaxBatchJob(users, year, chunk_size)
+    with _TAX_JOBS_LOCK:
+        _TAX_JOBS[job.job_id] = job
+        while len(_TAX_JOBS) > MAX_TAX_JOBS:
+            _, old = _TAX_JOBS.popitem(last=False)
+            if old.status in ("completed", "failed"):
+                try:
+                    old.path.unlink()
+                except OSError:
+                    pass
+            else:
+                _TAX_JOBS[old.job_id] = old  # Never evict a running job
+                _TAX_JOBS.move_to_end(old.job_id, last=False)
+                break
+    job.task = asyncio.get_running_loop().create_task(job.run())
+    return job
+
+
+def get_tax_job(job_id: str) -> Optional[TaxBatchJob]:
+    return _TAX_JOBS.get(job_id)
@@ -399,7 +399,7 @@ async def warranty_buyer_claims_get(username: str):
     return get_buyer_claims(username)
 
 # ============================================================
-# FEATURE #9: SLO (7 endpoints)
+# FEATURE #9: SLO (9 endpoints)
 # ============================================================
 
 @app.get("/slo/tiers")
@@ -441,6 +441,23 @@ async def slo_buyer_dashboard_get(username: str):
     from slo_engine import get_buyer_slo_dashboard
     return get_buyer_slo_dashboard(username)
 
+@app.post("/slo/track")
+async def slo_track_post(
+    contract_id: str,
+    event_type: str,
+    event_data: Optional[Dict[str, Any]] = None,
+    timestamp: Optional[str] = None
+):
+    """Track SLO event (updates contract and dashboard aggregates)"""
+    from slo_engine import track_slo_performance_event
+    return track_slo_performance_event(contract_id, event_type, event_data or {}, timestamp)
+
+@app.post("/slo/events/bulk")
+async def slo_events_bulk_post(events: List[Dict[str, Any]]):
+    """Backfill historical SLO events"""
+    from slo_engine import bulk_track_slo_events
+    return bulk_track_slo_events(events)
+
 @app.get("/slo/recommend")
 async def slo_recommend_get(
     urgency: str = "medium",
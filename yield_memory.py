@@ -52,7 +52,7 @@ NEW: AI-SPECIFIC PATTERNS
 ═══════════════════════════════════════════════════════════════════════════════
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 from uuid import uuid4
 from collections import defaultdict
@@ -69,6 +69,7 @@ SUCCESS_THRESHOLD = 1.5
 FAILURE_THRESHOLD = 0.5
 PATTERN_DECAY_DAYS = 60
 MIN_REPLAYS_FOR_CONFIDENCE = 3
+NDJSON_FORMAT = "yield_memory"  # Bulk export/import stream format (see ndjson_stream)
 
 
 def _now() -> str:
@@ -187,6 +188,7 @@ class UserAIPreferences:
 _YIELD_MEMORY: Dict[str, List[YieldPattern]] = {}
 _USER_AI_PREFERENCES: Dict[str, UserAIPreferences] = {}
 _PATTERN_INDEX: Dict[str, Dict[str, YieldPattern]] = defaultdict(dict)  # username -> {id: pattern}
+_DIRTY_USERS: set = set()  # users changed since the last save (persisted as a partial delta)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -232,6 +234,7 @@ def store_pattern(
     # Initialize user memory if needed
     if username not in _YIELD_MEMORY:
         _YIELD_MEMORY[username] = []
+    _DIRTY_USERS.add(username)
     
     # Check for duplicate
     for existing in _YIELD_MEMORY[username]:
@@ -434,6 +437,7 @@ def report_pattern_replay(
     
     pattern.replay_count += 1
     pattern.last_replayed = _now()
+    _DIRTY_USERS.add(username)
     
     if success:
         pattern.success_on_replay += 1
@@ -475,6 +479,7 @@ def _update_ai_preferences(
         _USER_AI_PREFERENCES[username] = UserAIPreferences(username=username)
     
     prefs = _USER_AI_PREFERENCES[username]
+    _DIRTY_USERS.add(username)
     
     # Update model performance
     if ai_model not in prefs.model_performance:
@@ -633,6 +638,7 @@ def compress_memory(username: str) -> Dict[str, Any]:
     discarded = len(patterns) - len(kept)
     
     _YIELD_MEMORY[username] = kept
+    _DIRTY_USERS.add(username)
     
     # Rebuild index
     _PATTERN_INDEX[username] = {p.id: p for p in kept}
@@ -700,25 +706,57 @@ def get_memory_stats(username: str) -> Dict[str, Any]:
 # EXPORT/IMPORT
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def export_memory(username: str) -> str:
-    """Export user's memory as JSON"""
-    
-    if username not in _YIELD_MEMORY:
-        return json.dumps({"patterns": [], "ai_preferences": None})
-    
-    patterns = [p.to_dict() for p in _YIELD_MEMORY[username]]
+def _user_record(username: str) -> Dict[str, Any]:
+    """One user's patterns + AI preferences (the unit of export/import)"""
     ai_prefs = None
-    
     if username in _USER_AI_PREFERENCES:
         prefs = _USER_AI_PREFERENCES[username]
         ai_prefs = {
             "category_preferences": prefs.category_preferences,
             "model_performance": prefs.model_performance
         }
+    return {
+        "patterns": [p.to_dict() for p in _YIELD_MEMORY.get(username, [])],
+        "ai_preferences": ai_prefs
+    }
+
+
+def _parse_user_record(data: Dict[str, Any]) -> Tuple[List[YieldPattern], Optional[UserAIPreferences]]:
+    """Validate a user record; raises ValueError/KeyError/TypeError if malformed"""
+    raw_patterns = data.get("patterns", [])
+    if not isinstance(raw_patterns, list):
+        raise TypeError("patterns must be a list")
+    patterns = [YieldPattern.from_dict(p) for p in raw_patterns]
+
+    prefs = None
+    raw_prefs = data.get("ai_preferences")
+    if raw_prefs:
+        if not isinstance(raw_prefs, dict):
+            raise TypeError("ai_preferences must be an object")
+        prefs = UserAIPreferences(username="")
+        prefs.category_preferences = raw_prefs.get("category_preferences", {})
+        prefs.model_performance = raw_prefs.get("model_performance", {})
+    return patterns, prefs
+
+
+def _apply_user_record(username: str, patterns: List[YieldPattern], prefs: Optional[UserAIPreferences]):
+    """Replace a user's memory with an imported record"""
+    _YIELD_MEMORY[username] = patterns
+    _PATTERN_INDEX[username] = {p.id: p for p in patterns}
+    _DIRTY_USERS.add(username)
+    if prefs is not None:
+        prefs.username = username
+        _USER_AI_PREFERENCES[username] = prefs
+
+
+def export_memory(username: str) -> str:
+    """Export user's memory as JSON"""
+    
+    if username not in _YIELD_MEMORY:
+        return json.dumps({"patterns": [], "ai_preferences": None})
     
     return json.dumps({
-        "patterns": patterns,
-        "ai_preferences": ai_prefs,
+        **_user_record(username),
         "exported_at": _now()
     }, indent=2)
 
@@ -727,43 +765,73 @@ def import_memory(username: str, json_data: str) -> Dict[str, Any]:
     """Import memory from JSON"""
     
     try:
-        data = json.loads(json_data)
-        
-        patterns = [YieldPattern.from_dict(p) for p in data.get("patterns", [])]
-        _YIELD_MEMORY[username] = patterns
-        _PATTERN_INDEX[username] = {p.id: p for p in patterns}
-        
-        # Import AI preferences if present
-        if data.get("ai_preferences"):
-            prefs = UserAIPreferences(username=username)
-            prefs.category_preferences = data["ai_preferences"].get("category_preferences", {})
-            prefs.model_performance = data["ai_preferences"].get("model_performance", {})
-            _USER_AI_PREFERENCES[username] = prefs
-        
+        patterns, prefs = _parse_user_record(json.loads(json_data))
+        _apply_user_record(username, patterns, prefs)
         return {"ok": True, "imported_patterns": len(patterns)}
         
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
 
-def export_for_metahive(username: str, min_score: float = 2.0) -> List[Dict[str, Any]]:
+def iter_memory_ndjson(after: Optional[str] = None, usernames: Optional[List[str]] = None) -> Iterator[bytes]:
     """
-    Export high-quality patterns for MetaHive contribution.
-    
-    Only exports patterns that exceed min_score and have been validated through replays.
+    Stream every user's memory as NDJSON, one user per line in username order.
+
+    after= resumes an export past that username (an import's cursor). Only the
+    username list is materialized; each record is built as it is written.
     """
-    
-    if username not in _YIELD_MEMORY:
-        return []
-    
-    exportable = []
-    for p in _YIELD_MEMORY[username]:
+    from ndjson_stream import dumps_line, header
+
+    users = set(usernames) if usernames is not None else set(_YIELD_MEMORY) | set(_USER_AI_PREFERENCES)
+    users = sorted(u for u in users if after is None or u > after)
+    yield header(NDJSON_FORMAT, users=len(users), after=after)
+    for username in users:
+        if username in _YIELD_MEMORY or username in _USER_AI_PREFERENCES:
+            yield dumps_line({"username": username, **_user_record(username)})
+
+
+def _parse_ndjson_user(record: Dict[str, Any]) -> Tuple[str, Any]:
+    username = record["username"]
+    if not isinstance(username, str) or not username:
+        raise ValueError("username must be a non-empty string")
+    return username, (username, *_parse_user_record(record))
+
+
+def _apply_ndjson_users(items: List[Tuple[str, List[YieldPattern], Optional[UserAIPreferences]]]):
+    for username, patterns, prefs in items:
+        _apply_user_record(username, patterns, prefs)
+    _save_yield_memory_state()  # persist each chunk so the returned cursor is durable
+
+
+def memory_importer(cursor: Optional[str] = None, import_id: Optional[str] = None, chunk_size: int = None):
+    """
+    NDJSON importer for iter_memory_ndjson() output.
+
+    Each record replaces that user's memory (same as import_memory). Feed it
+    with ndjson_stream.import_ndjson(importer, lines) or
+    aimport_ndjson(importer, request.stream()).
+    """
+    from ndjson_stream import NDJSONImporter, IMPORT_CHUNK
+
+    return NDJSONImporter(NDJSON_FORMAT, _parse_ndjson_user, _apply_ndjson_users,
+                          cursor=cursor, chunk_size=chunk_size or IMPORT_CHUNK, import_id=import_id)
+
+
+def import_memory_ndjson(lines: Iterable, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Import an NDJSON memory export from any iterable of lines (e.g. an open file)"""
+    from ndjson_stream import import_ndjson
+
+    return import_ndjson(memory_importer(cursor=cursor), lines)
+
+
+def _metahive_exportable(username: str, min_score: float) -> Iterator[Dict[str, Any]]:
+    for p in _YIELD_MEMORY.get(username, ()):
         if (p.category == "SUCCESS" and 
             p.score >= min_score and 
             p.replay_count >= MIN_REPLAYS_FOR_CONFIDENCE and
             p.confidence >= 0.6):
             
-            exportable.append({
+            yield {
                 "pattern_type": p.pattern_type,
                 "context": p.context,
                 "action": p.action,
@@ -771,9 +839,24 @@ def export_for_metahive(username: str, min_score: float = 2.0) -> List[Dict[str,
                 "ai_model": p.ai_model,
                 "task_category": p.task_category,
                 "confidence": p.confidence
-            })
+            }
+
+
+def export_for_metahive(username: str, min_score: float = 2.0) -> List[Dict[str, Any]]:
+    """
+    Export high-quality patterns for MetaHive contribution.
+    
+    Only exports patterns that exceed min_score and have been validated through replays.
+    """
     
-    return exportable
+    return list(_metahive_exportable(username, min_score))
+
+
+def iter_metahive_exports(min_score: float = 2.0, after: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """export_for_metahive() across all users, lazily, in username order (each item has a username)"""
+    for username in sorted(u for u in _YIELD_MEMORY if after is None or u > after):
+        for item in _metahive_exportable(username, min_score):
+            yield {"username": username, **item}
 
 
 def export_ai_learnings_for_family(username: str) -> Dict[str, Any]:
@@ -894,28 +977,34 @@ def _load_yield_memory_state():
 
 
 def _save_yield_memory_state():
-    """Save Yield Memory state to persistent storage"""
+    """Save users changed since the last save to persistent storage"""
+    if not _DIRTY_USERS:
+        return
+    dirty = list(_DIRTY_USERS)
+    _DIRTY_USERS.clear()
     try:
         from brain_persistence import save_yield_memory_learning
 
         # Convert patterns to dicts
         yield_dict = {}
-        for username, patterns in _YIELD_MEMORY.items():
-            yield_dict[username] = [p.to_dict() for p in patterns]
+        for username in dirty:
+            yield_dict[username] = [p.to_dict() for p in _YIELD_MEMORY.get(username, [])]
 
         # Convert AI preferences
         prefs_dict = {}
-        for username, prefs in _USER_AI_PREFERENCES.items():
-            prefs_dict[username] = {
-                "category_preferences": prefs.category_preferences,
-                "model_performance": prefs.model_performance
-            }
+        for username in dirty:
+            prefs = _USER_AI_PREFERENCES.get(username)
+            if prefs:
+                prefs_dict[username] = {
+                    "category_preferences": prefs.category_preferences,
+                    "model_performance": prefs.model_performance
+                }
 
-        save_yield_memory_learning(yield_dict, prefs_dict)
-        total_patterns = sum(len(p) for p in _YIELD_MEMORY.values())
-        print(f"💾 Saved Yield Memory: {total_patterns} patterns for {len(_YIELD_MEMORY)} users")
+        save_yield_memory_learning(yield_dict, prefs_dict, partial=True, user_count=len(_YIELD_MEMORY))
+        print(f"💾 Saved Yield Memory: {len(dirty)} changed users of {len(_YIELD_MEMORY)}")
 
     except Exception as e:
+        _DIRTY_USERS.update(dirty)
         print(f"⚠️ Could not save Yield Memory state: {e}")
 
 